@@ -0,0 +1,130 @@
+"""
+Micro-benchmarks of the bpy-free kernels in bleliza_utilities.core, run
+with a plain Python interpreter (no Blender needed):
+
+    python benchmarks/bench_core.py --sizes small,medium --output core.json
+
+The results use the same format as bleliza_bench.py, so they can be
+compared to a baseline with
+
+    python benchmarks/bleliza_bench.py --compare core.json --baseline core_baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bleliza_utilities.core import grid, islands, names, uv  # noqa: E402
+
+# size name -> number of grid tiles per side / islands / image names
+SIZES = {
+    "small": {"side": 100, "islands": 1000, "names": 1000},
+    "medium": {"side": 500, "islands": 20000, "names": 20000},
+    "large": {"side": 1500, "islands": 200000, "names": 200000},
+}
+
+
+def _grid_topology(side):
+    """Loop starts/totals and loop edge indices of a side×side quad grid."""
+    faces = side * side
+    x, y = np.meshgrid(np.arange(side), np.arange(side))
+    x, y = x.reshape(-1), y.reshape(-1)
+    horizontal = side * (side + 1)  # edges along X come first
+    bottom = y * side + x
+    top = (y + 1) * side + x
+    left = horizontal + x * side + y
+    right = horizontal + (x + 1) * side + y
+    loop_edges = np.stack((bottom, right, top, left), axis=1).reshape(-1)
+    return np.arange(faces) * 4, np.full(faces, 4), loop_edges
+
+
+def _island_vertices(count):
+    """Vertex count and edge array of *count* separate 3×3-vertex patches."""
+    patch_edges = []
+    for row in range(3):
+        for col in range(3):
+            v = row * 3 + col
+            if col < 2:
+                patch_edges.append((v, v + 1))
+            if row < 2:
+                patch_edges.append((v, v + 3))
+    patch_edges = np.array(patch_edges)
+    offsets = (np.arange(count) * 9)[:, None, None]
+    return count * 9, (patch_edges[None] + offsets).reshape(-1)
+
+
+def _cases(params):
+    rng = np.random.default_rng(0)
+    side = params["side"]
+
+    starts, totals, loop_edges = _grid_topology(side)
+    mask = rng.random(side * side) < 0.6
+    vertex_count, edge_vertices = _island_vertices(params["islands"])
+    labels, count = islands.vertex_island_labels(vertex_count, edge_vertices)
+    z = rng.random(vertex_count)
+    centers = rng.random((side * side, 3))
+    uvs = rng.random(side * side * 8).astype(np.float32)
+    image_names = [f"tile_{i}.png.{i % 1000:03d}" if i % 3 else f"tile_{i}.tga" for i in range(params["names"])]
+    matcher = names.compile_name_matcher(r"roof_\d+", 'REGEX')
+
+    return {
+        "face_islands": lambda: islands.face_island_labels(starts, totals, loop_edges),
+        "face_islands_masked": lambda: islands.face_island_labels(starts, totals, loop_edges, mask),
+        "vertex_islands": lambda: islands.vertex_island_labels(vertex_count, edge_vertices),
+        "island_min_max": lambda: islands.island_min_max(labels, count, z),
+        "grid_order": lambda: grid.grid_order(centers),
+        "detail_uv_scale": lambda: uv.scale_uvs(uvs, 10.0, 10.0),
+        "dds_filenames": lambda: [names.dds_filename(name) for name in image_names],
+        "name_matcher": lambda: [matcher(name) for name in image_names],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="small,medium", help=f"comma-separated sizes ({', '.join(SIZES)})")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case and size")
+    parser.add_argument("--output", default="", help="write the results JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in [name.strip() for name in args.sizes.split(",") if name.strip()]:
+        params = SIZES[size]
+        for name, kernel in _cases(params).items():
+            times = []
+            for _ in range(max(1, args.repeat)):
+                start = time.perf_counter()
+                kernel()
+                times.append(time.perf_counter() - start)
+            results.append({
+                "case": name,
+                "size": size,
+                "params": params,
+                "seconds_min": min(times),
+                "seconds_median": statistics.median(times),
+                "runs": times,
+            })
+            print(f"[core] {name:<22} {size:<7} {min(times) * 1000.0:10.2f} ms")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
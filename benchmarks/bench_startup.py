@@ -0,0 +1,85 @@
+"""
+Measure how long importing and registering the add-on takes, and which
+heavy modules it pulls in on the way.
+
+    blender -b --factory-startup -P benchmarks/bench_startup.py -- --repeat 20
+
+Each round removes the add-on's modules from sys.modules, then times the
+import and register() separately and unregisters again.  The first round
+is the cold one (module files read and compiled, or loaded from
+__pycache__); later rounds show the steady cost of a script reload.
+
+With --fake it runs in plain Python against the fake bpy layer in
+fakebpy/.  The fake layer itself imports NumPy, so the heavy-module list
+is only meaningful inside Blender.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+ADDON_MODULE = "bleliza_utilities"
+
+# Modules the add-on should only import on the first operator run
+HEAVY_MODULES = ("numpy", "csv", "cProfile", "pstats", "tomllib", "bmesh")
+
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else argv[1:]
+    parser = argparse.ArgumentParser(prog="bench_startup.py")
+    parser.add_argument("--repeat", type=int, default=10, help="import/register rounds")
+    parser.add_argument("--fake", action="store_true", help="run against the fake bpy layer in plain Python")
+    return parser.parse_args(argv)
+
+
+def _drop_addon_modules():
+    for name in [name for name in sys.modules if name == ADDON_MODULE or name.startswith(ADDON_MODULE + ".")]:
+        del sys.modules[name]
+
+
+def measure(repeat):
+    import importlib
+
+    sys.path.insert(0, REPO_DIR)
+    preloaded = {name for name in HEAVY_MODULES if name in sys.modules}
+    rounds = []
+    pulled_in = set()
+    for _ in range(repeat):
+        _drop_addon_modules()
+        before = set(sys.modules)
+        start = time.perf_counter()
+        addon = importlib.import_module(ADDON_MODULE)
+        imported = time.perf_counter()
+        addon.register()
+        registered = time.perf_counter()
+        addon.unregister()
+        pulled_in |= {name for name in HEAVY_MODULES if name in set(sys.modules) - before}
+        rounds.append((imported - start, registered - imported))
+    return rounds, preloaded, pulled_in
+
+
+def main():
+    args = parse_args(sys.argv)
+    if args.fake:
+        sys.path.insert(0, BENCH_DIR)
+        import fakebpy
+        fakebpy.install()
+
+    rounds, preloaded, pulled_in = measure(max(1, args.repeat))
+    cold_import, cold_register = rounds[0]
+    warm = rounds[1:] or rounds
+    print(f"cold:  import {cold_import * 1000.0:8.2f} ms   register {cold_register * 1000.0:8.2f} ms")
+    print(f"warm:  import {statistics.median(r[0] for r in warm) * 1000.0:8.2f} ms   "
+          f"register {statistics.median(r[1] for r in warm) * 1000.0:8.2f} ms   (median of {len(warm)})")
+    print(f"heavy modules imported by the add-on: {', '.join(sorted(pulled_in)) or 'none'}")
+    if preloaded:
+        print(f"already loaded before the add-on (not attributable): {', '.join(sorted(preloaded))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Benchmark the BleLIZA operators on synthetic scenes.
+
+    blender -b --factory-startup -P benchmarks/bleliza_bench.py -- \
+        --sizes small,medium --repeat 3 --output bench.json \
+        --baseline benchmarks/baseline.json
+
+Every case builds a fresh synthetic scene (see scenes.py) for every run
+and times only the operator call.  Results (best and median seconds plus
+the operator's work counters) are written as JSON.  With --baseline the
+results are compared to a stored run and the exit code is 1 when a case
+got slower than --threshold times its baseline.  Comparing two result
+files needs no Blender:
+
+    python benchmarks/bleliza_bench.py --compare bench.json --baseline benchmarks/baseline.json
+
+Use --write-baseline to store the current results as the new baseline.
+
+With --fake the cases run in a plain Python interpreter against the fake
+bpy layer in fakebpy/.  The timings are then only good for spotting
+Python-side hot spots, but every result also records the bpy API calls
+the operator made, and the cases in BUDGETS fail when they exceed their
+call budget:
+
+    python benchmarks/bleliza_bench.py --fake --sizes small
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+# size name -> scene parameters
+SIZES = {
+    "small": {"materials": 10, "islands": 200, "columns": 4, "rows": 4},
+    "medium": {"materials": 100, "islands": 5000, "columns": 16, "rows": 16},
+    "large": {"materials": 500, "islands": 50000, "columns": 40, "rows": 40},
+}
+
+DEFAULT_THRESHOLD = 1.25
+# Slowdowns smaller than this are treated as noise whatever the ratio
+DEFAULT_MIN_DELTA = 0.005
+
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else argv[1:]
+    parser = argparse.ArgumentParser(prog="bleliza_bench.py")
+    parser.add_argument("--sizes", default="small,medium", help=f"comma-separated sizes ({', '.join(SIZES)})")
+    parser.add_argument("--cases", default="", help="comma-separated cases to run (default: all, see --list-cases)")
+    parser.add_argument("--list-cases", action="store_true", help="print the available cases and exit")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case and size")
+    parser.add_argument("--output", default="", help="write the results JSON to this path")
+    parser.add_argument("--baseline", default="", help="baseline results JSON to compare against")
+    parser.add_argument("--write-baseline", action="store_true", help="store the results as --baseline")
+    parser.add_argument("--compare", default="", help="compare this results JSON to --baseline (no Blender needed)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when a case takes more than this many times its baseline")
+    parser.add_argument("--fake", action="store_true",
+                        help="run against the fake bpy layer in plain Python and check the API call budgets")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                        help="ignore slowdowns smaller than this many seconds")
+    return parser.parse_args(argv)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cases
+#
+# A case is (setup, run): setup(params, scratch_dir) builds the scene and
+# returns keyword arguments for run(**kwargs), the timed operator call.
+# ─────────────────────────────────────────────────────────────────────────────
+def _material_scene(layout):
+    def setup(params, scratch_dir):
+        import scenes
+        scenes.build_material_scene(params["materials"], scratch_dir, layout)
+        return {}
+    return setup
+
+
+def _material_scene_without_dds(params, scratch_dir):
+    import scenes
+    info = scenes.build_material_scene(params["materials"], scratch_dir, "2024")
+    for filename in os.listdir(info["dds_dir"]):
+        os.remove(os.path.join(info["dds_dir"], filename))
+    return {}
+
+
+def _noisy_dds_scene(params, scratch_dir):
+    import bpy
+    import numpy as np
+    import scenes
+    from bleliza_utilities import core
+    info = scenes.build_material_scene(params["materials"], scratch_dir, "2024")
+    # Mipmapped noise: nothing is constant, although the last mip levels are
+    rng = np.random.default_rng(0)
+    for filename in os.listdir(info["dds_dir"]):
+        pixels = rng.integers(0, 256, (64, 64, 4), dtype=np.uint8)
+        core.dds.write_dds(os.path.join(info["dds_dir"], filename), pixels, "BC3")
+    bpy.ops.object.replace_textures_with_dds()
+    return {}
+
+
+def _atlas_scene(params, scratch_dir):
+    import bpy
+    import scenes
+    scenes.build_material_scene(params["materials"], scratch_dir, "2024")
+    bpy.ops.node.create_preset_2024()
+    return {"directory": os.path.join(scratch_dir, "atlas") + os.sep}
+
+
+def _island_scene(params, scratch_dir):
+    import scenes
+    scenes.build_island_scene(params["islands"])
+    return {}
+
+
+def _grid_scene(params, scratch_dir):
+    import scenes
+    info = scenes.build_grid_scene(params["columns"], params["rows"], scratch_dir)
+    return {
+        "grid_columns": info["columns"],
+        "grid_rows": info["rows"],
+        "tex_folder": info["dds_dir"] + os.sep,
+        "mat_prefix": "bench_",
+    }
+
+
+def _ground_lod_scene(params, scratch_dir):
+    import bpy
+    options = _grid_scene(params, scratch_dir)
+    bpy.ops.object.create_and_assign_materials(**options)
+    return {"mat_prefix": options["mat_prefix"]}
+
+
+def _operator(idname, **fixed):
+    def run(**options):
+        import bpy
+        category, name = idname.split(".")
+        return getattr(getattr(bpy.ops, category), name)(**fixed, **options)
+    run.idname = idname
+    return run
+
+
+CASES = {
+    "preset_2020": (_material_scene("2020"), _operator("node.create_preset_2020")),
+    "preset_2024": (_material_scene("2024"), _operator("node.create_preset_2024")),
+    "replace_textures": (_material_scene("2024"), _operator("object.replace_textures_with_dds")),
+    "remove_empty_texture_nodes": (_material_scene("2024"), _operator("object.remove_empty_textures_nodes")),
+    "texture_extend": (_material_scene("2024"), _operator("node.set_texture_extend")),
+    "materials_to_sat": (_material_scene("2024"), _operator("node.set_materials_to_sat")),
+    "bake_mapping": (_material_scene("2024"), _operator("node.bake_mapping_to_detail_uv")),
+    "scrub_props": (_material_scene("2024"), _operator("object.scrub_custom_props")),
+    "pipeline": (_material_scene("2024"), _operator("node.bleliza_run_pipeline", scope='SCENE')),
+    "audit": (_material_scene("2024"), _operator("object.bleliza_audit_scene", report_format='NONE')),
+    "convert_dds": (_material_scene_without_dds, _operator("object.bleliza_convert_missing_dds")),
+    "texture_atlas": (_atlas_scene, _operator("object.bleliza_build_texture_atlas")),
+    "constant_textures": (_noisy_dds_scene, _operator("object.bleliza_replace_constant_textures")),
+    "random_islands": (_island_scene, _operator("mesh.assign_random_materials_islands")),
+    "random_selected_islands": (
+        _island_scene,
+        _operator("mesh.assign_random_materials_selected_islands", material_name_filter="roof_"),
+    ),
+    "select_flat_islands": (_island_scene, _operator("mesh.select_flat_islands")),
+    "snap_islands": (_island_scene, _operator("object.snap_islands_to_terrain")),
+    "merge_materials": (_island_scene, _operator("object.bleliza_merge_equivalent_materials")),
+    "create_and_assign_materials": (_grid_scene, _operator("object.create_and_assign_materials")),
+    "ground_lod": (_ground_lod_scene, _operator("object.bleliza_create_ground_lod", workers=1)),
+}
+
+
+# case -> scene parameters -> maximum API calls per name, checked in --fake
+# runs.  The material scenes have params["materials"] materials with four
+# image textures each.  The presets rebuild every material's graph from
+# scratch, so their nodes.new budget is the size of that graph (12 nodes;
+# tests/test_operator_budgets.py checks every created node is kept).
+BUDGETS = {
+    "preset_2020": lambda params: {"nodes.new": 12 * params["materials"], "links.new": 15 * params["materials"],
+                                   "images.load": 0, "element_access": 0},
+    "preset_2024": lambda params: {"nodes.new": 12 * params["materials"], "links.new": 15 * params["materials"],
+                                   "images.load": 0, "element_access": 0},
+    "replace_textures": lambda params: {"images.load": 3 * params["materials"] + 1, "nodes.new": 0},
+    "remove_empty_texture_nodes": lambda params: {"nodes.new": 0},
+    "texture_extend": lambda params: {"nodes.new": 0, "links.new": 0},
+    "materials_to_sat": lambda params: {"nodes.new": 0},
+    "bake_mapping": lambda params: {"nodes.new": params["materials"], "uv_layers.new": 1, "element_access": 0},
+    "convert_dds": lambda params: {"images.load": 3 * params["materials"] + 1, "pixels_access": 0},
+    "texture_atlas": lambda params: {"element_access": 0, "pixels_access": 0, "nodes.new": 0,
+                                     "foreach_get": 6 * params["materials"] + 8},
+    # Noisy textures must stay: no link or node may be removed
+    "constant_textures": lambda params: {"images.load": 0, "links.remove": 0, "nodes.remove": 0},
+    "random_islands": lambda params: {"element_access": 0, "ray_cast": 0},
+    "random_selected_islands": lambda params: {"element_access": 0},
+    "select_flat_islands": lambda params: {"element_access": 0},
+    "snap_islands": lambda params: {"element_access": 0, "ray_cast": params["islands"]},
+    "merge_materials": lambda params: {"element_access": 0, "nodes.new": 0},
+    "create_and_assign_materials": lambda params: {
+        "element_access": 0,
+        "materials.new": params["columns"] * params["rows"],
+    },
+    "ground_lod": lambda params: {
+        "images.load": 0,
+        "pixels_access": 0,
+        "materials.new": params["columns"] * params["rows"],
+    },
+}
+
+
+def _last_counters():
+    """Work counters of the last instrumented operator run, if available."""
+    instrumentation = sys.modules.get("bleliza_utilities.instrumentation")
+    if instrumentation is None or not instrumentation.history:
+        return {}
+    return dict(instrumentation.history[-1]["counters"])
+
+
+def run_benchmarks(case_names, size_names, repeat, fake=False):
+    import bpy
+
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, REPO_DIR)
+    import bleliza_cli
+    bleliza_cli.ensure_addon()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bleliza_bench_") as scratch_dir:
+        # Saved so that "//" paths (the DDS folder is "../dds") resolve
+        os.makedirs(os.path.join(scratch_dir, "blend"))
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.join(scratch_dir, "blend", "bench.blend"))
+
+        for size in size_names:
+            params = SIZES[size]
+            for name in case_names:
+                setup, run = CASES[name]
+                times = []
+                outcome = None
+                counters = {}
+                api_calls = {}
+                for _ in range(repeat):
+                    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+                        bpy.ops.object.mode_set(mode='OBJECT')
+                    options = setup(params, scratch_dir)
+                    before = bpy.calls.copy() if fake else None
+                    start = time.perf_counter()
+                    outcome = run(**options)
+                    times.append(time.perf_counter() - start)
+                    counters = _last_counters()
+                    if fake:
+                        made = bpy.calls.copy()
+                        made.subtract(before)
+                        api_calls = {key: count for key, count in sorted(made.items()) if count}
+                entry = {
+                    "case": name,
+                    "size": size,
+                    "operator": run.idname,
+                    "params": params,
+                    "result": ",".join(sorted(outcome)),
+                    "seconds_min": min(times),
+                    "seconds_median": statistics.median(times),
+                    "runs": times,
+                    "counters": counters,
+                }
+                status = entry["result"]
+                if fake:
+                    entry["api_calls"] = api_calls
+                    over = {
+                        key: (api_calls.get(key, 0), limit)
+                        for key, limit in BUDGETS.get(name, lambda _: {})(params).items()
+                        if api_calls.get(key, 0) > limit
+                    }
+                    entry["over_budget"] = {key: list(value) for key, value in over.items()}
+                    if over:
+                        status += "  OVER BUDGET: " + ", ".join(
+                            f"{key} {count} > {limit}" for key, (count, limit) in sorted(over.items())
+                        )
+                results.append(entry)
+                print(f"[bench] {name:<28} {size:<7} {entry['seconds_min'] * 1000.0:10.1f} ms  {status}")
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta):
+    """Print current vs. baseline per case/size and return the list of
+    regressions (key, baseline seconds, current seconds)."""
+    def by_key(report):
+        return {f"{entry['case']}@{entry['size']}": entry for entry in report["results"]}
+
+    base = by_key(baseline)
+    regressions = []
+    print(f"  {'case@size':<40} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, entry in by_key(current).items():
+        if key not in base:
+            print(f"  {key:<40} {'-':>12} {entry['seconds_min'] * 1000.0:>12.1f}   (new)")
+            continue
+        before = base[key]["seconds_min"]
+        after = entry["seconds_min"]
+        ratio = after / before if before > 0 else float("inf")
+        regressed = ratio > threshold and after - before > min_delta
+        if regressed:
+            regressions.append((key, before, after))
+        print(f"  {key:<40} {before * 1000.0:>12.1f} {after * 1000.0:>12.1f} {ratio:>7.2f}"
+              + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    args = parse_args(sys.argv)
+    if args.list_cases:
+        for name, (_, run) in CASES.items():
+            print(f"{name:<28} {run.idname}")
+        return 0
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        case_names = [name.strip() for name in args.cases.split(",") if name.strip()] or list(CASES)
+        size_names = [name.strip() for name in args.sizes.split(",") if name.strip()]
+        unknown = [name for name in case_names if name not in CASES] + [name for name in size_names if name not in SIZES]
+        if unknown:
+            print(f"Unknown case(s)/size(s): {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        if args.fake:
+            sys.path.insert(0, BENCH_DIR)
+            import fakebpy
+            fakebpy.install()
+        current = run_benchmarks(case_names, size_names, max(1, args.repeat), fake=args.fake)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+        over_budget = [f"{entry['case']}@{entry['size']}" for entry in current["results"] if entry.get("over_budget")]
+        if over_budget:
+            print(f"API call budget exceeded: {', '.join(over_budget)}", file=sys.stderr)
+            return 1
+
+    if not args.baseline:
+        return 0
+    if args.write_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --write-baseline first", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.2f}x the baseline", file=sys.stderr)
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
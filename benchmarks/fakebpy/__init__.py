@@ -0,0 +1,97 @@
+"""
+A fake bpy/bmesh/mathutils layer for running BleLIZA operators in a plain
+Python interpreter (benchmarks, quick checks, the pytest suite in tests/),
+without Blender.
+
+    import fakebpy
+    fakebpy.install()            # before anything imports bpy
+    import bleliza_utilities
+    bleliza_utilities.register()
+
+    with fakebpy.budget({"nodes.new": 12 * material_count}):
+        result, reports = fakebpy.run_operator("node.create_preset_2024")
+
+It is deliberately small: only the API surface the add-on and
+benchmarks/scenes.py use is emulated, and anything unknown fails loudly
+(unknown node types raise like Blender does; unknown bpy.ops calls are
+counted and return {'FINISHED'}).  Timings measured against it say
+nothing about Blender itself; call counts (`calls`) do.
+"""
+
+import contextlib
+import sys
+import types
+
+from . import bmesh, bpy, mathutils
+
+calls = bpy.calls
+
+
+def install():
+    """Put the fake modules into sys.modules (idempotent)."""
+    bpy_extras = types.ModuleType("bpy_extras")
+    io_utils = types.ModuleType("bpy_extras.io_utils")
+
+    class ImportHelper:
+        filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+
+        def invoke(self, context, event):
+            return {'RUNNING_MODAL'}
+
+    class ExportHelper(ImportHelper):
+        pass
+
+    io_utils.ImportHelper = ImportHelper
+    io_utils.ExportHelper = ExportHelper
+    bpy_extras.io_utils = io_utils
+
+    addon_utils = types.ModuleType("addon_utils")
+    addon_utils.check = lambda module_name: (False, False)
+    addon_utils.enable = lambda module_name, default_set=False, persistent=False: None
+    addon_utils.disable = lambda module_name, default_set=False: None
+
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.types": bpy.types,
+        "bpy.props": bpy.props,
+        "bpy.utils": bpy.utils,
+        "bpy.path": bpy.path,
+        "bpy.app": bpy.app,
+        "bpy.app.handlers": bpy.app.handlers,
+        "bpy.ops": bpy.ops,
+        "bpy_extras": bpy_extras,
+        "bpy_extras.io_utils": io_utils,
+        "bmesh": bmesh,
+        "mathutils": mathutils,
+        "addon_utils": addon_utils,
+    })
+    return bpy
+
+
+def reset():
+    """Empty bpy.data and the call counters."""
+    bpy.reset()
+
+
+@contextlib.contextmanager
+def budget(limits):
+    """Fail with AssertionError if the block makes more API calls than
+    *limits* allows, e.g. {"nodes.new": 2 * len(materials)}.  Yields a
+    Counter of the calls made inside the block."""
+    before = calls.copy()
+    made = type(calls)()
+    yield made
+    made.update(calls)
+    made.subtract(before)
+    over = {name: (made[name], limit) for name, limit in limits.items() if made[name] > limit}
+    if over:
+        details = ", ".join(f"{name}: {count} > {limit}" for name, (count, limit) in sorted(over.items()))
+        raise AssertionError(f"API call budget exceeded ({details})")
+
+
+def run_operator(idname, **properties):
+    """Call a registered operator like bpy.ops.<idname>(**properties) and
+    return (result, reports), reports being (type set, message) pairs."""
+    category, name = idname.split(".")
+    result = getattr(getattr(bpy.ops, category), name)(**properties)
+    return result, list(bpy.last_reports)
@@ -0,0 +1,127 @@
+"""
+Minimal stand-in for Blender's bmesh module: vertices with coordinates,
+selection and edge adjacency, edges with other_vert(), faces with vertex
+lists, read from and written back to a fake bpy Mesh.
+"""
+
+import numpy as np
+
+from . import bpy
+from .mathutils import Vector
+
+
+class BMVert:
+    def __init__(self, index, co, select):
+        self.index = index
+        self.co = Vector(co)
+        self.select = select
+        self.hide = False
+        self.tag = False
+        self.link_edges = []
+        self.link_faces = []
+
+
+class BMEdge:
+    def __init__(self, index, verts, select):
+        self.index = index
+        self.verts = verts
+        self.select = select
+        self.tag = False
+        self.link_faces = []
+
+    def other_vert(self, vert):
+        a, b = self.verts
+        if vert is a:
+            return b
+        if vert is b:
+            return a
+        return None
+
+
+class BMFace:
+    def __init__(self, index, verts, edges, material_index, select):
+        self.index = index
+        self.verts = verts
+        self.edges = edges
+        self.material_index = material_index
+        self.select = select
+        self.tag = False
+
+
+class BMElemSeq(list):
+    def ensure_lookup_table(self):
+        pass
+
+    def index_update(self):
+        for index, element in enumerate(self):
+            element.index = index
+
+
+class BMesh:
+    def __init__(self):
+        self.verts = BMElemSeq()
+        self.edges = BMElemSeq()
+        self.faces = BMElemSeq()
+        self._mesh = None
+
+    def from_mesh(self, mesh):
+        bpy._count("bmesh.from_mesh")
+        self._mesh = mesh
+        coords = mesh.vertices._arrays["co"]
+        vert_select = mesh.vertices._arrays["select"][:, 0]
+        self.verts = BMElemSeq(BMVert(i, co, bool(sel)) for i, (co, sel) in enumerate(zip(coords, vert_select)))
+
+        edge_select = mesh.edges._arrays["select"][:, 0]
+        self.edges = BMElemSeq()
+        for i, ((a, b), sel) in enumerate(zip(mesh.edges._arrays["vertices"], edge_select)):
+            edge = BMEdge(i, (self.verts[a], self.verts[b]), bool(sel))
+            self.verts[a].link_edges.append(edge)
+            self.verts[b].link_edges.append(edge)
+            self.edges.append(edge)
+
+        loop_vertices = mesh.loops._arrays["vertex_index"][:, 0]
+        loop_edges = mesh.loops._arrays["edge_index"][:, 0]
+        polygons = mesh.polygons._arrays
+        self.faces = BMElemSeq()
+        for i, (start, total) in enumerate(zip(polygons["loop_start"][:, 0], polygons["loop_total"][:, 0])):
+            verts = [self.verts[v] for v in loop_vertices[start:start + total]]
+            edges = [self.edges[e] for e in loop_edges[start:start + total]]
+            face = BMFace(i, verts, edges, int(polygons["material_index"][i, 0]), bool(polygons["select"][i, 0]))
+            for element in verts + edges:
+                element.link_faces.append(face)
+            self.faces.append(face)
+
+    def to_mesh(self, mesh):
+        """Write back coordinates, selection and material indices (the
+        topology is assumed unchanged)."""
+        bpy._count("bmesh.to_mesh")
+        if len(self.verts) != len(mesh.vertices) or len(self.faces) != len(mesh.polygons):
+            raise NotImplementedError("fake bmesh cannot change the mesh topology")
+        mesh.vertices._arrays["co"][...] = np.array([tuple(v.co) for v in self.verts], dtype=np.float32).reshape(-1, 3)
+        mesh.vertices._arrays["select"][:, 0] = [v.select for v in self.verts]
+        mesh.edges._arrays["select"][:, 0] = [e.select for e in self.edges]
+        mesh.polygons._arrays["select"][:, 0] = [f.select for f in self.faces]
+        mesh.polygons._arrays["material_index"][:, 0] = [f.material_index for f in self.faces]
+
+    def select_flush(self, select):
+        for edge in self.edges:
+            edge.select = all(v.select for v in edge.verts)
+        for face in self.faces:
+            face.select = all(v.select for v in face.verts)
+
+    def free(self):
+        self.verts = self.edges = self.faces = BMElemSeq()
+
+
+def new():
+    return BMesh()
+
+
+def from_edit_mesh(mesh):
+    bm = BMesh()
+    bm.from_mesh(mesh)
+    return bm
+
+
+def update_edit_mesh(mesh, loop_triangles=True, destructive=True):
+    pass
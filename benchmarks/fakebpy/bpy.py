@@ -0,0 +1,1753 @@
+"""
+In-memory stand-in for the parts of Blender's bpy API used by BleLIZA.
+
+Meshes keep their element attributes in NumPy arrays (foreach_get /
+foreach_set behave like Blender's, including the length check), materials
+have node trees with typed sockets and links, images and textures can be
+loaded from real files on disk, and a small set of built-in operators
+(mode switching, material slots, orphan purge, saving) is emulated.
+Registered add-on operators can be called through bpy.ops as usual.
+
+Every API call worth budgeting is counted in `calls` ("nodes.new",
+"links.new", "images.load", "foreach_get", "element_access", "ops.<idname>",
+...), see fakebpy.budget().
+"""
+
+import collections
+import os
+import struct
+import types as _pytypes
+
+import numpy as np
+
+from .mathutils import Matrix, Vector
+
+calls = collections.Counter()
+
+
+def _count(name, amount=1):
+    calls[name] += amount
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Properties (bpy.props)
+#
+# Properties are descriptors: class annotations of Operators, PropertyGroups
+# and AddonPreferences and attributes assigned to bpy.types.Scene become
+# descriptors returning the default until a value is set on the instance.
+# ─────────────────────────────────────────────────────────────────────────────
+_KIND_DEFAULTS = {
+    "BOOL": False, "INT": 0, "FLOAT": 0.0, "STRING": "", "ENUM": "",
+    "POINTER": None, "FLOAT_VECTOR": (0.0, 0.0, 0.0), "INT_VECTOR": (0, 0, 0),
+    "BOOL_VECTOR": (False, False, False),
+}
+
+
+class _Property:
+    def __init__(self, kind, **options):
+        self.kind = kind
+        self.options = options
+        self.name = None
+
+    def default(self):
+        if self.kind == "COLLECTION":
+            return PropertyCollection(self.options.get("type"))
+        if self.kind == "ENUM" and "default" not in self.options:
+            items = self.options.get("items") or ()
+            if 'ENUM_FLAG' in self.options.get("options", ()):
+                return set()
+            return items[0][0] if items and not callable(items) else ""
+        value = self.options.get("default", _KIND_DEFAULTS[self.kind])
+        return set(value) if isinstance(value, set) else value
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__.setdefault("_rna_values", {})
+        if self.name not in values:
+            values[self.name] = self.default()
+        return values[self.name]
+
+    def __set__(self, instance, value):
+        instance.__dict__.setdefault("_rna_values", {})[self.name] = value
+
+
+def _prop_factory(kind):
+    def factory(**options):
+        return _Property(kind, **options)
+    factory.__name__ = kind.title().replace("_", "") + "Property"
+    return factory
+
+
+props = _pytypes.ModuleType("bpy.props")
+for _kind, _name in (
+    ("BOOL", "BoolProperty"), ("INT", "IntProperty"), ("FLOAT", "FloatProperty"),
+    ("STRING", "StringProperty"), ("ENUM", "EnumProperty"), ("POINTER", "PointerProperty"),
+    ("COLLECTION", "CollectionProperty"), ("FLOAT_VECTOR", "FloatVectorProperty"),
+    ("INT_VECTOR", "IntVectorProperty"), ("BOOL_VECTOR", "BoolVectorProperty"),
+):
+    setattr(props, _name, _prop_factory(_kind))
+
+
+class _RNAMeta(type):
+    """Turns annotated and later-assigned bpy.props into descriptors."""
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        for attr, value in namespace.get("__annotations__", {}).items():
+            if isinstance(value, _Property):
+                type.__setattr__(cls, attr, value)
+                value.__set_name__(cls, attr)
+
+    def __setattr__(cls, name, value):
+        if isinstance(value, _Property):
+            value.__set_name__(cls, name)
+        super().__setattr__(name, value)
+
+
+class bpy_struct(metaclass=_RNAMeta):
+    pass
+
+
+class PropertyCollection:
+    """CollectionProperty value."""
+
+    def __init__(self, item_type):
+        self._item_type = item_type
+        self._items = []
+
+    def add(self):
+        item = self._item_type() if self._item_type else bpy_struct()
+        self._items.append(item)
+        return item
+
+    def remove(self, index):
+        del self._items[index]
+
+    def clear(self):
+        self._items.clear()
+
+    def move(self, src, dst):
+        self._items.insert(dst, self._items.pop(src))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ID datablocks and bpy.data collections
+# ─────────────────────────────────────────────────────────────────────────────
+class ID(bpy_struct):
+    id_type = "ID"
+
+    def __init__(self, name):
+        self.name = name
+        self.library = None
+        self.use_fake_user = False
+        self._idprops = {}
+
+    # Custom properties.  As in Blender, the values of properties that
+    # add-ons registered through RNA are ID properties too and show up in
+    # keys(); bl_rna.properties tells them apart.
+    def _registered_values(self):
+        return self.__dict__.get("_rna_values", {})
+
+    def __getitem__(self, key):
+        if key not in self._idprops and key in self._registered_values():
+            return self._registered_values()[key]
+        return self._idprops[key]
+
+    def __setitem__(self, key, value):
+        self._idprops[key] = value
+
+    def __delitem__(self, key):
+        if key not in self._idprops and key in self._registered_values():
+            del self._registered_values()[key]
+            return
+        del self._idprops[key]
+
+    def __contains__(self, key):
+        return key in self._idprops or key in self._registered_values()
+
+    def keys(self):
+        return list(self._idprops.keys()) + [key for key in self._registered_values() if key not in self._idprops]
+
+    @property
+    def bl_rna(self):
+        properties = {
+            name for cls in type(self).__mro__ for name, value in vars(cls).items() if isinstance(value, _Property)
+        }
+        return _pytypes.SimpleNamespace(properties=properties)
+
+    def values(self):
+        return list(self._idprops.values())
+
+    def items(self):
+        return list(self._idprops.items())
+
+    def get(self, key, default=None):
+        return self._idprops.get(key, default)
+
+    @property
+    def users(self):
+        return _count_users(self) + (1 if self.use_fake_user else 0)
+
+    def user_remap(self, new_id):
+        _count("user_remap")
+        _remap_users(self, new_id)
+
+    def copy(self):
+        raise NotImplementedError(f"{type(self).__name__}.copy() is not emulated")
+
+    def __repr__(self):
+        return f"bpy.data.{self.id_type}['{self.name}']"
+
+
+class IDCollection:
+    def __init__(self, factory, label):
+        self._factory = factory
+        self._label = label
+        self._items = []
+
+    def _unique_name(self, name):
+        existing = {item.name for item in self._items}
+        if name not in existing:
+            return name
+        base, number = name, 1
+        while f"{base}.{number:03d}" in existing:
+            number += 1
+        return f"{base}.{number:03d}"
+
+    def _add(self, item):
+        item.name = self._unique_name(item.name)
+        self._items.append(item)
+        return item
+
+    def new(self, name, *args, **kwargs):
+        _count(f"{self._label}.new")
+        return self._add(self._factory(name, *args, **kwargs))
+
+    def remove(self, item, do_unlink=True):
+        _count(f"{self._label}.remove")
+        self._items.remove(item)
+        _remap_users(item, None)
+
+    def get(self, name, default=None):
+        for item in self._items:
+            if item.name == name:
+                return item
+        return default
+
+    def keys(self):
+        return [item.name for item in self._items]
+
+    def values(self):
+        return list(self._items)
+
+    def items(self):
+        return [(item.name, item) for item in self._items]
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return self.get(key) is not None
+        return key in self._items
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            item = self.get(key)
+            if item is None:
+                raise KeyError(f"bpy_prop_collection[key]: key \"{key}\" not found")
+            return item
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Meshes
+# ─────────────────────────────────────────────────────────────────────────────
+class _Element:
+    """Python proxy for one mesh element (vertex, edge, loop, polygon,
+    UV loop).  Attribute reads and writes go to the owning arrays."""
+
+    __slots__ = ("_collection", "index")
+
+    def __init__(self, collection, index):
+        object.__setattr__(self, "_collection", collection)
+        object.__setattr__(self, "index", index)
+
+    def __getattr__(self, name):
+        return self._collection._read(name, self.index)
+
+    def __setattr__(self, name, value):
+        self._collection._write(name, self.index, value)
+
+    def __eq__(self, other):
+        return (isinstance(other, _Element) and other._collection is self._collection
+                and other.index == self.index)
+
+    def __hash__(self):
+        return hash((id(self._collection), self.index))
+
+
+class ElementCollection:
+    """A mesh element collection whose attributes are NumPy arrays of shape
+    (len, width)."""
+
+    def __init__(self, fields, computed=None):
+        self._fields = fields  # name -> (dtype, width, default)
+        self._arrays = {name: np.zeros((0, width), dtype) for name, (dtype, width, _) in fields.items()}
+        self._computed = computed or {}  # name -> callable returning (len, width) array
+        self._size = 0
+
+    def add(self, count):
+        for name, (dtype, width, default) in self._fields.items():
+            extra = np.full((count, width), default, dtype=dtype)
+            self._arrays[name] = np.concatenate((self._arrays[name], extra))
+        self._size += count
+
+    def _array(self, name):
+        if name in self._arrays:
+            return self._arrays[name]
+        if name in self._computed:
+            return self._computed[name]()
+        raise AttributeError(f"bpy_prop_collection: attribute \"{name}\" not found")
+
+    def foreach_get(self, name, seq):
+        _count("foreach_get")
+        flat = self._array(name).reshape(-1)
+        if len(seq) != flat.size:
+            raise RuntimeError(
+                f"internal error setting the array: expected {flat.size} items, got {len(seq)}"
+            )
+        if isinstance(seq, np.ndarray):
+            seq[...] = flat.astype(seq.dtype)
+        else:
+            seq[:] = flat.tolist()
+
+    def foreach_set(self, name, seq):
+        _count("foreach_set")
+        if name not in self._arrays:
+            raise AttributeError(f"foreach_set: attribute \"{name}\" is read-only or does not exist")
+        target = self._arrays[name]
+        values = np.asarray(seq)
+        if values.size != target.size:
+            raise RuntimeError(f"internal error setting the array: expected {target.size} items, got {values.size}")
+        target[...] = values.reshape(target.shape).astype(target.dtype)
+
+    def _read(self, name, index):
+        array = self._array(name)
+        dtype, width, _ = self._fields.get(name, (array.dtype, array.shape[1], None))
+        value = array[index]
+        if name in ("co", "normal", "center"):
+            return _BoundVector(array, index)
+        if name == "uv":
+            return _BoundVector(array, index)
+        if width == 1:
+            value = value[0]
+            return bool(value) if array.dtype == bool else value.item()
+        return tuple(value.tolist())
+
+    def _write(self, name, index, value):
+        if name not in self._arrays:
+            raise AttributeError(f"attribute \"{name}\" is read-only")
+        self._arrays[name][index] = np.asarray(value).reshape(-1)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        _count("element_access")
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("bpy_prop_collection[index]: index out of range")
+        return _Element(self, index)
+
+    def __iter__(self):
+        _count("element_access", self._size)
+        return (_Element(self, index) for index in range(self._size))
+
+    def __bool__(self):
+        return self._size > 0
+
+
+class _BoundVector(Vector):
+    """Vector view writing through to a row of a mesh array."""
+
+    __slots__ = ()
+
+    def __init__(self, array, index):
+        self._v = array[index]
+
+
+class UVLayer(bpy_struct):
+    def __init__(self, name, loop_count):
+        self.name = name
+        self.active = False
+        self.active_render = False
+        self.data = ElementCollection({"uv": (np.float32, 2, 0.0)})
+        self.data.add(loop_count)
+
+
+class UVLayers:
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._layers = []
+
+    def new(self, name="UVMap", do_init=True):
+        _count("uv_layers.new")
+        layer = UVLayer(name, len(self._mesh.loops))
+        source = self.active
+        if do_init and source is not None:
+            layer.data._arrays["uv"][...] = source.data._arrays["uv"]
+        if not self._layers:
+            layer.active = layer.active_render = True
+        self._layers.append(layer)
+        return layer
+
+    def remove(self, layer):
+        self._layers.remove(layer)
+
+    @property
+    def active(self):
+        for layer in self._layers:
+            if layer.active:
+                return layer
+        return self._layers[0] if self._layers else None
+
+    def get(self, name, default=None):
+        for layer in self._layers:
+            if layer.name == name:
+                return layer
+        return default
+
+    def keys(self):
+        return [layer.name for layer in self._layers]
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            layer = self.get(key)
+            if layer is None:
+                raise KeyError(key)
+            return layer
+        return self._layers[key]
+
+    def __iter__(self):
+        return iter(list(self._layers))
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __bool__(self):
+        return bool(self._layers)
+
+
+class ColorAttribute(bpy_struct):
+    def __init__(self, name, type, domain, size):
+        self.name = name
+        self.data_type = type
+        self.domain = domain
+        self.data = ElementCollection({"color": (np.float32, 4, 0.0)})
+        self.data.add(size)
+
+
+class ColorAttributes:
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._attributes = []
+        self.active_color = None
+
+    def new(self, name, type, domain):
+        _count("color_attributes.new")
+        size = len(self._mesh.loops) if domain == 'CORNER' else len(self._mesh.vertices)
+        attribute = ColorAttribute(name, type, domain, size)
+        self._attributes.append(attribute)
+        return attribute
+
+    def remove(self, attribute):
+        self._attributes.remove(attribute)
+        if self.active_color is attribute:
+            self.active_color = None
+
+    def get(self, name, default=None):
+        for attribute in self._attributes:
+            if attribute.name == name:
+                return attribute
+        return default
+
+    def __iter__(self):
+        return iter(list(self._attributes))
+
+    def __len__(self):
+        return len(self._attributes)
+
+
+class MeshMaterials:
+    def __init__(self):
+        self._items = []
+
+    def append(self, material):
+        self._items.append(material)
+
+    def pop(self, index=-1):
+        return self._items.pop(index)
+
+    def clear(self):
+        self._items.clear()
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __setitem__(self, index, material):
+        self._items[index] = material
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+
+class Mesh(ID):
+    id_type = "meshes"
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.vertices = ElementCollection({
+            "co": (np.float32, 3, 0.0),
+            "select": (bool, 1, False),
+            "hide": (bool, 1, False),
+        })
+        self.edges = ElementCollection({
+            "vertices": (np.int32, 2, 0),
+            "select": (bool, 1, False),
+            "hide": (bool, 1, False),
+        })
+        self.loops = ElementCollection({
+            "vertex_index": (np.int32, 1, 0),
+            "edge_index": (np.int32, 1, 0),
+        })
+        self.polygons = ElementCollection(
+            {
+                "loop_start": (np.int32, 1, 0),
+                "loop_total": (np.int32, 1, 0),
+                "material_index": (np.int32, 1, 0),
+                "select": (bool, 1, False),
+                "hide": (bool, 1, False),
+                "use_smooth": (bool, 1, False),
+            },
+            computed={"center": self._polygon_centers},
+        )
+        self.uv_layers = UVLayers(self)
+        self.materials = MeshMaterials()
+        self.color_attributes = ColorAttributes(self)
+        self.attributes = {}
+
+    def _polygon_centers(self):
+        starts = self.polygons._arrays["loop_start"][:, 0].astype(np.int64)
+        totals = self.polygons._arrays["loop_total"][:, 0].astype(np.int64)
+        if not starts.size:
+            return np.zeros((0, 3), dtype=np.float32)
+        coords = self.vertices._arrays["co"][self.loops._arrays["vertex_index"][:, 0]]
+        order = np.repeat(starts, totals) + (np.arange(totals.sum()) - np.repeat(np.cumsum(totals) - totals, totals))
+        sums = np.add.reduceat(coords[order].astype(np.float64), np.concatenate(([0], np.cumsum(totals)[:-1])))
+        return (sums / totals[:, None]).astype(np.float32)
+
+    def from_pydata(self, vertices, edges, faces, shade_flat=True):
+        _count("from_pydata")
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self.vertices.add(len(vertices))
+        self.vertices._arrays["co"][-len(vertices):] = vertices
+
+        edge_index = {}
+        edge_list = []
+
+        def edge(a, b):
+            key = (a, b) if a < b else (b, a)
+            if key not in edge_index:
+                edge_index[key] = len(edge_list)
+                edge_list.append(key)
+            return edge_index[key]
+
+        for a, b in edges:
+            edge(int(a), int(b))
+        loop_vertices = []
+        loop_edges = []
+        starts = []
+        totals = []
+        for face in faces:
+            face = [int(v) for v in face]
+            starts.append(len(loop_vertices))
+            totals.append(len(face))
+            for corner, vertex in enumerate(face):
+                loop_vertices.append(vertex)
+                loop_edges.append(edge(vertex, face[(corner + 1) % len(face)]))
+
+        self.edges.add(len(edge_list))
+        if edge_list:
+            self.edges._arrays["vertices"][...] = np.array(edge_list, dtype=np.int32)
+        self.loops.add(len(loop_vertices))
+        self.loops._arrays["vertex_index"][:, 0] = loop_vertices
+        self.loops._arrays["edge_index"][:, 0] = loop_edges
+        self.polygons.add(len(starts))
+        self.polygons._arrays["loop_start"][:, 0] = starts
+        self.polygons._arrays["loop_total"][:, 0] = totals
+        for layer in self.uv_layers:
+            layer.data.add(len(loop_vertices) - len(layer.data))
+
+    def update(self, calc_edges=False, calc_edges_loose=False):
+        _count("mesh.update")
+
+    def validate(self, verbose=False, clean_customdata=True):
+        return False
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Node trees
+# ─────────────────────────────────────────────────────────────────────────────
+RGBA = (0.8, 0.8, 0.8, 1.0)
+
+# bl_idname -> (type, default name, inputs, outputs); sockets are
+# (name, socket type, default value)
+NODE_TYPES = {
+    "ShaderNodeOutputMaterial": ("OUTPUT_MATERIAL", "Material Output",
+                                 [("Surface", "SHADER", None), ("Volume", "SHADER", None),
+                                  ("Displacement", "VECTOR", (0.0, 0.0, 0.0))], []),
+    "ShaderNodeBsdfPrincipled": ("BSDF_PRINCIPLED", "Principled BSDF",
+                                 [("Base Color", "RGBA", RGBA), ("Metallic", "VALUE", 0.0),
+                                  ("Roughness", "VALUE", 0.5), ("IOR", "VALUE", 1.45),
+                                  ("Alpha", "VALUE", 1.0), ("Normal", "VECTOR", (0.0, 0.0, 0.0)),
+                                  ("Specular IOR Level", "VALUE", 0.5),
+                                  ("Emission Color", "RGBA", (1.0, 1.0, 1.0, 1.0)),
+                                  ("Emission Strength", "VALUE", 0.0)],
+                                 [("BSDF", "SHADER", None)]),
+    "ShaderNodeTexImage": ("TEX_IMAGE", "Image Texture",
+                           [("Vector", "VECTOR", (0.0, 0.0, 0.0))],
+                           [("Color", "RGBA", (0.0, 0.0, 0.0, 1.0)), ("Alpha", "VALUE", 0.0)]),
+    "ShaderNodeNormalMap": ("NORMAL_MAP", "Normal Map",
+                            [("Strength", "VALUE", 1.0), ("Color", "RGBA", (0.5, 0.5, 1.0, 1.0))],
+                            [("Normal", "VECTOR", (0.0, 0.0, 0.0))]),
+    "ShaderNodeMixRGB": ("MIX_RGB", "Mix",
+                         [("Fac", "VALUE", 0.5), ("Color1", "RGBA", (0.5, 0.5, 0.5, 1.0)),
+                          ("Color2", "RGBA", (0.5, 0.5, 0.5, 1.0))],
+                         [("Color", "RGBA", (0.0, 0.0, 0.0, 1.0))]),
+    "ShaderNodeMix": ("MIX", "Mix",
+                      [("Factor", "VALUE", 0.5), ("A", "RGBA", (0.5, 0.5, 0.5, 1.0)),
+                       ("B", "RGBA", (0.5, 0.5, 0.5, 1.0))],
+                      [("Result", "RGBA", (0.0, 0.0, 0.0, 1.0))]),
+    "ShaderNodeSeparateColor": ("SEPARATE_COLOR", "Separate Color",
+                                [("Color", "RGBA", RGBA)],
+                                [("Red", "VALUE", 0.0), ("Green", "VALUE", 0.0), ("Blue", "VALUE", 0.0)]),
+    "ShaderNodeSeparateRGB": ("SEPRGB", "Separate RGB",
+                              [("Image", "RGBA", RGBA)],
+                              [("R", "VALUE", 0.0), ("G", "VALUE", 0.0), ("B", "VALUE", 0.0)]),
+    "ShaderNodeUVMap": ("UVMAP", "UV Map", [], [("UV", "VECTOR", (0.0, 0.0, 0.0))]),
+    "ShaderNodeMapping": ("MAPPING", "Mapping",
+                          [("Vector", "VECTOR", (0.0, 0.0, 0.0)), ("Location", "VECTOR", (0.0, 0.0, 0.0)),
+                           ("Rotation", "VECTOR", (0.0, 0.0, 0.0)), ("Scale", "VECTOR", (1.0, 1.0, 1.0))],
+                          [("Vector", "VECTOR", (0.0, 0.0, 0.0))]),
+    "ShaderNodeTexCoord": ("TEX_COORD", "Texture Coordinate", [],
+                           [("Generated", "VECTOR", (0.0, 0.0, 0.0)), ("UV", "VECTOR", (0.0, 0.0, 0.0))]),
+    "ShaderNodeRGB": ("RGB", "RGB", [], [("Color", "RGBA", (0.5, 0.5, 0.5, 1.0))]),
+    "ShaderNodeValue": ("VALUE", "Value", [], [("Value", "VALUE", 0.5)]),
+    "ShaderNodeVertexColor": ("VERTEX_COLOR", "Color Attribute", [],
+                              [("Color", "RGBA", (0.0, 0.0, 0.0, 1.0)), ("Alpha", "VALUE", 0.0)]),
+    "ShaderNodeEmission": ("EMISSION", "Emission",
+                           [("Color", "RGBA", (1.0, 1.0, 1.0, 1.0)), ("Strength", "VALUE", 1.0)],
+                           [("Emission", "SHADER", None)]),
+}
+
+# Extra attributes (and defaults) per node type
+NODE_ATTRIBUTES = {
+    "TEX_IMAGE": {"image": None, "extension": 'REPEAT', "interpolation": 'Linear', "projection": 'FLAT'},
+    "UVMAP": {"uv_map": ""},
+    "MIX_RGB": {"blend_type": 'MIX', "use_clamp": False},
+    "MIX": {"blend_type": 'MIX', "data_type": 'RGBA', "clamp_result": False},
+    "MAPPING": {"vector_type": 'POINT'},
+    "NORMAL_MAP": {"space": 'TANGENT', "uv_map": ""},
+    "VERTEX_COLOR": {"layer_name": ""},
+}
+
+
+class NodeSocket(bpy_struct):
+    def __init__(self, node, name, socket_type, default, is_output, identifier):
+        self.node = node
+        self.name = name
+        self.identifier = identifier
+        self.type = socket_type
+        self.is_output = is_output
+        self.enabled = True
+        self.hide = False
+        self.default_value = list(default) if isinstance(default, tuple) else default
+
+    @property
+    def links(self):
+        tree_links = self.node.id_data.links
+        if self.is_output:
+            return [link for link in tree_links if link.from_socket is self]
+        return [link for link in tree_links if link.to_socket is self]
+
+    @property
+    def is_linked(self):
+        return bool(self.links)
+
+    def __repr__(self):
+        return f"<NodeSocket {self.node.name}.{self.name}>"
+
+
+class NodeSockets:
+    def __init__(self, sockets):
+        self._sockets = sockets
+
+    def get(self, key, default=None):
+        for socket in self._sockets:
+            if socket.name == key or socket.identifier == key:
+                return socket
+        return default
+
+    def keys(self):
+        return [socket.name for socket in self._sockets]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            socket = self.get(key)
+            if socket is None:
+                raise KeyError(f"bpy_prop_collection[key]: key \"{key}\" not found")
+            return socket
+        return self._sockets[key]
+
+    def __iter__(self):
+        return iter(self._sockets)
+
+    def __len__(self):
+        return len(self._sockets)
+
+    def __bool__(self):
+        return bool(self._sockets)
+
+
+class Node(bpy_struct):
+    def __init__(self, tree, bl_idname):
+        node_type, default_name, inputs, outputs = NODE_TYPES[bl_idname]
+        self.__dict__["id_data"] = tree
+        self.__dict__["_name"] = default_name
+        self.bl_idname = bl_idname
+        self.type = node_type
+        self.label = ""
+        self.location = (0.0, 0.0)
+        self.width = 140.0
+        self.mute = False
+        self.hide = False
+        self.parent = None
+        self.select = False
+        self.inputs = NodeSockets([
+            NodeSocket(self, name, socket_type, default, False, name)
+            for name, socket_type, default in inputs
+        ])
+        self.outputs = NodeSockets([
+            NodeSocket(self, name, socket_type, default, True, name)
+            for name, socket_type, default in outputs
+        ])
+        for attr, value in NODE_ATTRIBUTES.get(node_type, {}).items():
+            setattr(self, attr, value)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self.__dict__["_name"] = self.id_data.nodes._unique_name(value, self)
+
+    def __setattr__(self, name, value):
+        if name == "location":
+            value = Vector(value)
+        super().__setattr__(name, value)
+
+    def __repr__(self):
+        return f"<Node {self.bl_idname} '{self.name}'>"
+
+
+class NodeLink(bpy_struct):
+    def __init__(self, from_socket, to_socket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+        self.is_valid = True
+        self.is_muted = False
+
+
+class Nodes:
+    def __init__(self, tree):
+        self._tree = tree
+        self._nodes = []
+
+    def _unique_name(self, name, node=None):
+        existing = {other.name for other in self._nodes if other is not node}
+        if name not in existing:
+            return name
+        number = 1
+        while f"{name}.{number:03d}" in existing:
+            number += 1
+        return f"{name}.{number:03d}"
+
+    def new(self, type):
+        _count("nodes.new")
+        if type not in NODE_TYPES:
+            raise RuntimeError(f"Error: Node type {type} undefined")
+        node = Node(self._tree, type)
+        node.__dict__["_name"] = self._unique_name(node.name)
+        self._nodes.append(node)
+        return node
+
+    def remove(self, node):
+        _count("nodes.remove")
+        links = self._tree.links
+        links._links = [link for link in links._links if link.from_node is not node and link.to_node is not node]
+        self._nodes.remove(node)
+
+    def clear(self):
+        self._tree.links._links.clear()
+        self._nodes.clear()
+
+    @property
+    def active(self):
+        return self._nodes[-1] if self._nodes else None
+
+    def get(self, name, default=None):
+        for node in self._nodes:
+            if node.name == name:
+                return node
+        return default
+
+    def keys(self):
+        return [node.name for node in self._nodes]
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            node = self.get(key)
+            if node is None:
+                raise KeyError(f"bpy_prop_collection[key]: key \"{key}\" not found")
+            return node
+        return self._nodes[key]
+
+    def __iter__(self):
+        return iter(list(self._nodes))
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+class Links:
+    def __init__(self, tree):
+        self._tree = tree
+        self._links = []
+
+    def new(self, output, input, verify_limits=True):
+        _count("links.new")
+        if input.is_output or not output.is_output:
+            output, input = input, output
+        # An input socket takes one link; Blender replaces the old one
+        self._links = [link for link in self._links if link.to_socket is not input]
+        link = NodeLink(output, input)
+        self._links.append(link)
+        return link
+
+    def remove(self, link):
+        _count("links.remove")
+        self._links.remove(link)
+
+    def clear(self):
+        self._links.clear()
+
+    def __iter__(self):
+        return iter(list(self._links))
+
+    def __len__(self):
+        return len(self._links)
+
+    def __getitem__(self, index):
+        return self._links[index]
+
+
+class NodeTree(ID):
+    id_type = "node_groups"
+
+    def __init__(self, name="Shader Nodetree", tree_type='ShaderNodeTree'):
+        super().__init__(name)
+        self.bl_idname = tree_type
+        self.type = 'SHADER'
+        self.nodes = Nodes(self)
+        self.links = Links(self)
+
+    def _copy(self):
+        tree = NodeTree(self.name, self.bl_idname)
+        copies = {}
+        for node in self.nodes:
+            node_copy = Node(tree, node.bl_idname)
+            for attr, value in node.__dict__.items():
+                if attr not in ("id_data", "inputs", "outputs"):
+                    node_copy.__dict__[attr] = list(value) if isinstance(value, list) else value
+            for sockets, copied in ((node.inputs, node_copy.inputs), (node.outputs, node_copy.outputs)):
+                for socket, socket_copy in zip(sockets, copied):
+                    value = socket.default_value
+                    socket_copy.default_value = list(value) if isinstance(value, list) else value
+            tree.nodes._nodes.append(node_copy)
+            copies[id(node)] = node_copy
+        for link in self.links:
+            from_node, to_node = copies[id(link.from_node)], copies[id(link.to_node)]
+            tree.links._links.append(NodeLink(
+                from_node.outputs[list(link.from_node.outputs).index(link.from_socket)],
+                to_node.inputs[list(link.to_node.inputs).index(link.to_socket)],
+            ))
+        return tree
+
+
+class Material(ID):
+    id_type = "materials"
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.node_tree = None
+        self._use_nodes = False
+        self.diffuse_color = [0.8, 0.8, 0.8, 1.0]
+        self.metallic = 0.0
+        self.roughness = 0.4
+        self.blend_method = 'OPAQUE'
+        self.pass_index = 0
+
+    @property
+    def use_nodes(self):
+        return self._use_nodes
+
+    @use_nodes.setter
+    def use_nodes(self, value):
+        self._use_nodes = bool(value)
+        if value and self.node_tree is None:
+            tree = NodeTree()
+            output = tree.nodes.new("ShaderNodeOutputMaterial")
+            output.location = (300, 300)
+            bsdf = tree.nodes.new("ShaderNodeBsdfPrincipled")
+            bsdf.location = (10, 300)
+            tree.links.new(bsdf.outputs["BSDF"], output.inputs["Surface"])
+            self.node_tree = tree
+
+    def copy(self):
+        _count("id.copy")
+        mat = data.materials._add(Material(self.name))
+        for attr, value in self.__dict__.items():
+            if attr not in ("name", "library", "node_tree"):
+                mat.__dict__[attr] = list(value) if isinstance(value, list) else value
+        mat._idprops = dict(self._idprops)
+        if self.node_tree is not None:
+            mat.node_tree = self.node_tree._copy()
+        return mat
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Images and textures
+# ─────────────────────────────────────────────────────────────────────────────
+def _image_file_size(filepath):
+    """(width, height) from a DDS/PNG/JPEG header, (0, 0) if unknown."""
+    try:
+        with open(filepath, "rb") as f:
+            head = f.read(32)
+            if head[:4] == b"DDS ":
+                height, width = struct.unpack_from("<2I", head, 12)
+                return width, height
+            if head[:8] == b"\x89PNG\r\n\x1a\n":
+                return struct.unpack_from(">2I", head, 16)
+            if head[:2] == b"\xff\xd8":
+                f.seek(2)
+                while True:
+                    marker, length = struct.unpack(">2H", f.read(4))
+                    if 0xFFC0 <= marker <= 0xFFCF and marker not in (0xFFC4, 0xFFC8, 0xFFCC):
+                        height, width = struct.unpack(">xHH", f.read(5))
+                        return width, height
+                    f.seek(length - 2, 1)
+    except (OSError, struct.error):
+        pass
+    return 0, 0
+
+
+class ImagePixels:
+    """Image.pixels: flat RGBA float buffer with foreach_get/foreach_set."""
+
+    def __init__(self, image):
+        self._image = image
+
+    def _buffer(self):
+        image = self._image
+        if image._pixels is None:
+            width, height = image.size
+            image._pixels = np.zeros(width * height * 4, dtype=np.float32)
+            image._pixels[3::4] = 1.0
+        return image._pixels
+
+    def foreach_get(self, seq):
+        _count("foreach_get")
+        buffer = self._buffer()
+        if len(seq) != buffer.size:
+            raise RuntimeError(f"internal error setting the array: expected {buffer.size} items, got {len(seq)}")
+        seq[...] = buffer
+
+    def foreach_set(self, seq):
+        _count("foreach_set")
+        buffer = self._buffer()
+        values = np.asarray(seq, dtype=np.float32).reshape(-1)
+        if values.size != buffer.size:
+            raise RuntimeError(f"internal error setting the array: expected {buffer.size} items, got {values.size}")
+        buffer[...] = values
+        self._image.is_dirty = True
+
+    def __len__(self):
+        width, height = self._image.size
+        return width * height * 4
+
+    def __getitem__(self, index):
+        _count("pixels_access")
+        return self._buffer()[index]
+
+    def __setitem__(self, index, value):
+        _count("pixels_access")
+        self._buffer()[index] = value
+        self._image.is_dirty = True
+
+
+class Image(ID):
+    id_type = "images"
+
+    def __init__(self, name, width=0, height=0, alpha=False, float_buffer=False, filepath=""):
+        super().__init__(name)
+        self.filepath = filepath
+        self.source = 'FILE' if filepath else 'GENERATED'
+        self.size = [width, height]
+        self.generated_width = width
+        self.generated_height = height
+        self.colorspace_settings = _pytypes.SimpleNamespace(name='sRGB')
+        self.alpha_mode = 'STRAIGHT'
+        self.file_format = os.path.splitext(filepath)[1].lstrip(".").upper() or 'PNG'
+        self.channels = 4
+        self.depth = 32
+        self.is_float = float_buffer
+        self.is_dirty = False
+        self.packed_file = None
+        self._pixels = None
+        self.pixels = ImagePixels(self)
+
+    @property
+    def filepath_raw(self):
+        return self.filepath
+
+    @filepath_raw.setter
+    def filepath_raw(self, value):
+        self.filepath = value
+
+    @property
+    def has_data(self):
+        return self._pixels is not None
+
+    def scale(self, width, height):
+        _count("image.scale")
+        self.size = [width, height]
+        self._pixels = None
+
+    def reload(self):
+        _count("image.reload")
+        self.size = list(_image_file_size(path.abspath(self.filepath)))
+        self._pixels = None
+
+    def save(self, filepath=None, quality=None):
+        _count("image.save")
+        if filepath:
+            self.filepath = filepath
+        self.is_dirty = False
+
+    def save_render(self, filepath, scene=None, quality=None):
+        _count("image.save_render")
+
+    def pack(self):
+        if self.source == 'GENERATED':
+            # Blender packs generated images as PNG; the content is not emulated
+            self.source = 'FILE'
+            self.packed_file = _pytypes.SimpleNamespace(data=b"", size=0)
+            return
+        with open(path.abspath(self.filepath), "rb") as f:
+            content = f.read()
+        self.packed_file = _pytypes.SimpleNamespace(data=content, size=len(content))
+
+    def unpack(self, method='USE_LOCAL'):
+        self.packed_file = None
+
+
+class Images(IDCollection):
+    def load(self, filepath, check_existing=False):
+        _count("images.load")
+        absolute = os.path.normpath(path.abspath(filepath))
+        if check_existing:
+            for image in self._items:
+                if image.filepath and os.path.normpath(path.abspath(image.filepath)) == absolute:
+                    return image
+        if not os.path.exists(absolute):
+            raise RuntimeError(f"Error: Cannot read '{filepath}': No such file or directory")
+        width, height = _image_file_size(absolute)
+        return self._add(Image(os.path.basename(filepath), width, height, filepath=filepath))
+
+
+class Texture(ID):
+    id_type = "textures"
+
+    def __init__(self, name, type='IMAGE'):
+        super().__init__(name)
+        self.type = type
+        self.image = None
+        self.extension = 'REPEAT'
+
+
+class Text(ID):
+    id_type = "texts"
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._body = ""
+
+    def clear(self):
+        self._body = ""
+
+    def write(self, text):
+        self._body += text
+
+    def from_string(self, text):
+        self._body = text
+
+    def as_string(self):
+        return self._body
+
+    @property
+    def lines(self):
+        return [_pytypes.SimpleNamespace(body=line) for line in self._body.split("\n")]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Objects, collections and scenes
+# ─────────────────────────────────────────────────────────────────────────────
+class MaterialSlot(bpy_struct):
+    def __init__(self, obj, index):
+        self._obj = obj
+        self._index = index
+        self.link = 'DATA'
+
+    @property
+    def material(self):
+        return self._obj.data.materials[self._index]
+
+    @material.setter
+    def material(self, value):
+        self._obj.data.materials[self._index] = value
+
+    @property
+    def name(self):
+        material = self.material
+        return material.name if material else ""
+
+
+class Object(ID):
+    id_type = "objects"
+
+    def __init__(self, name, object_data=None):
+        super().__init__(name)
+        self.data = object_data
+        self.type = 'MESH' if isinstance(object_data, Mesh) else 'EMPTY'
+        self.mode = 'OBJECT'
+        self.matrix_world = Matrix()
+        self.active_material_index = 0
+        self.hide_viewport = False
+        self.parent = None
+        self._selected = False
+
+    @property
+    def material_slots(self):
+        if self.type != 'MESH':
+            return []
+        return [MaterialSlot(self, index) for index in range(len(self.data.materials))]
+
+    @property
+    def active_material(self):
+        slots = self.material_slots
+        return slots[self.active_material_index].material if slots else None
+
+    @property
+    def location(self):
+        return self.matrix_world.to_translation()
+
+    def select_get(self, view_layer=None):
+        return self._selected
+
+    def select_set(self, state, view_layer=None):
+        self._selected = bool(state)
+
+    def ray_cast(self, origin, direction, distance=1.70141e+38, depsgraph=None):
+        """Closest hit of the ray with the (fan-triangulated) faces, in
+        object space: (result, location, normal, face_index)."""
+        _count("ray_cast")
+        miss = (False, Vector((0, 0, 0)), Vector((0, 0, 0)), -1)
+        mesh = self.data
+        if self.type != 'MESH' or not len(mesh.polygons):
+            return miss
+
+        coords = mesh.vertices._arrays["co"].astype(np.float64)
+        loop_vertices = mesh.loops._arrays["vertex_index"][:, 0]
+        starts = mesh.polygons._arrays["loop_start"][:, 0]
+        totals = mesh.polygons._arrays["loop_total"][:, 0]
+        fan = np.maximum(totals - 2, 0)
+        faces = np.repeat(np.arange(len(starts)), fan)
+        corner = np.arange(fan.sum()) - np.repeat(np.cumsum(fan) - fan, fan) + 1
+        first = np.repeat(starts, fan)
+        v0 = coords[loop_vertices[first]]
+        v1 = coords[loop_vertices[first + corner]]
+        v2 = coords[loop_vertices[first + corner + 1]]
+        o = np.asarray(origin, dtype=np.float64)
+        d = np.asarray(direction, dtype=np.float64)
+
+        # Möller–Trumbore for all triangles at once
+        e1, e2 = v1 - v0, v2 - v0
+        p = np.cross(d, e2)
+        det = np.einsum("ij,ij->i", e1, p)
+        valid = np.abs(det) > 1e-12
+        inv = np.where(valid, 1.0 / np.where(valid, det, 1.0), 0.0)
+        s = o - v0
+        u = np.einsum("ij,ij->i", s, p) * inv
+        q = np.cross(s, e1)
+        v = (q @ d) * inv
+        t = np.einsum("ij,ij->i", e2, q) * inv
+        hit = valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= distance)
+        if not hit.any():
+            return miss
+        best = np.flatnonzero(hit)[np.argmin(t[hit])]
+        normal = np.cross(e1[best], e2[best])
+        normal /= np.linalg.norm(normal) or 1.0
+        return True, Vector(o + t[best] * d), Vector(normal), int(faces[best])
+
+
+class CollectionObjects:
+    def __init__(self):
+        self._objects = []
+
+    def link(self, obj):
+        if obj in self._objects:
+            raise RuntimeError(f"Object '{obj.name}' already in collection")
+        self._objects.append(obj)
+
+    def unlink(self, obj):
+        self._objects.remove(obj)
+
+    def get(self, name, default=None):
+        for obj in self._objects:
+            if obj.name == name:
+                return obj
+        return default
+
+    def __contains__(self, obj):
+        return obj in self._objects
+
+    def __iter__(self):
+        return iter(list(self._objects))
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class Collection(ID):
+    id_type = "collections"
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = CollectionObjects()
+        self.children = CollectionObjects()
+
+    @property
+    def all_objects(self):
+        seen = []
+        for obj in self.objects:
+            if obj not in seen:
+                seen.append(obj)
+        for child in self.children:
+            for obj in child.all_objects:
+                if obj not in seen:
+                    seen.append(obj)
+        return seen
+
+
+class LayerObjects:
+    def __init__(self, scene):
+        self._scene = scene
+        self.active = None
+
+    @property
+    def selected(self):
+        return [obj for obj in self._scene.objects if obj.select_get()]
+
+    def __iter__(self):
+        return iter(self._scene.objects)
+
+    def __len__(self):
+        return len(self._scene.objects)
+
+
+class ViewLayer(bpy_struct):
+    def __init__(self, scene):
+        self.name = "ViewLayer"
+        self.objects = LayerObjects(scene)
+
+    def update(self):
+        _count("view_layer.update")
+
+
+class Scene(ID):
+    id_type = "scenes"
+
+    def __init__(self, name="Scene"):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+        self.view_layers = [ViewLayer(self)]
+        self.frame_current = 1
+
+    @property
+    def objects(self):
+        return self.collection.all_objects
+
+
+class Context:
+    def __init__(self, blend_data):
+        self.blend_data = blend_data
+        self.scene = blend_data.scenes[0]
+        self.view_layer = self.scene.view_layers[0]
+        self.preferences = _pytypes.SimpleNamespace(addons={})
+        self.window_manager = _pytypes.SimpleNamespace(windows=[])
+        self.area = None
+        self.region = None
+        self.space_data = None
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    object = active_object
+
+    @property
+    def selected_objects(self):
+        return self.view_layer.objects.selected
+
+    @property
+    def mode(self):
+        obj = self.active_object
+        if obj is None or obj.mode == 'OBJECT':
+            return 'OBJECT'
+        return f"{obj.mode}_{obj.type}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# User tracking (Image.users, Material.users, ID.user_remap)
+# ─────────────────────────────────────────────────────────────────────────────
+def _reference_slots():
+    """Yield (container, attribute_or_index, referenced ID) for every
+    ID reference the add-on can create or follow."""
+    for material in data.materials:
+        if material.node_tree is not None:
+            for node in material.node_tree.nodes:
+                if getattr(node, "image", None) is not None:
+                    yield node, "image", node.image
+    for texture in data.textures:
+        if texture.image is not None:
+            yield texture, "image", texture.image
+    for mesh in data.meshes:
+        for index, material in enumerate(mesh.materials):
+            if material is not None:
+                yield mesh.materials, index, material
+    for obj in data.objects:
+        if obj.data is not None:
+            yield obj, "data", obj.data
+
+
+def _count_users(id_block):
+    count = sum(1 for _, _, target in _reference_slots() if target is id_block)
+    if isinstance(id_block, Object):
+        count += sum(1 for scene in data.scenes if id_block in scene.collection.all_objects)
+    return count
+
+
+def _remap_users(old, new):
+    for container, key, target in list(_reference_slots()):
+        if target is old:
+            if isinstance(key, int):
+                container[key] = new
+            else:
+                setattr(container, key, new)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# bpy.data
+# ─────────────────────────────────────────────────────────────────────────────
+class BlendData:
+    def __init__(self):
+        self.filepath = ""
+        self.is_dirty = False
+        self.objects = IDCollection(Object, "objects")
+        self.meshes = IDCollection(Mesh, "meshes")
+        self.materials = IDCollection(Material, "materials")
+        self.images = Images(Image, "images")
+        self.textures = IDCollection(Texture, "textures")
+        self.node_groups = IDCollection(NodeTree, "node_groups")
+        self.collections = IDCollection(Collection, "collections")
+        self.texts = IDCollection(Text, "texts")
+        self.scenes = IDCollection(Scene, "scenes")
+        for name in ("curves", "cameras", "lights", "worlds", "actions", "armatures"):
+            setattr(self, name, IDCollection(ID, name))
+        self.scenes._add(Scene())
+
+    @property
+    def is_saved(self):
+        return bool(self.filepath)
+
+    def batch_remove(self, ids):
+        _count("batch_remove")
+        for id_block in list(ids):
+            collection = getattr(self, id_block.id_type, None)
+            if collection is not None and id_block in collection:
+                collection._items.remove(id_block)
+                _remap_users(id_block, None)
+            if isinstance(id_block, Object):
+                for scene in self.scenes:
+                    if id_block in scene.collection.objects:
+                        scene.collection.objects.unlink(id_block)
+                    for view_layer in scene.view_layers:
+                        if view_layer.objects.active is id_block:
+                            view_layer.objects.active = None
+
+    def orphans_purge(self):
+        removed = 0
+        for name in ("materials", "images", "meshes", "textures", "node_groups"):
+            collection = getattr(self, name)
+            orphans = [block for block in collection if not block.use_fake_user and _count_users(block) == 0]
+            for block in orphans:
+                collection._items.remove(block)
+            removed += len(orphans)
+        return removed
+
+
+data = BlendData()
+context = Context(data)
+
+
+def reset():
+    """Start over with an empty file (keeps registered classes)."""
+    global data, context
+    data = BlendData()
+    context = Context(data)
+    calls.clear()
+    app.timers._timers.clear()
+    for handlers in vars(app.handlers).values():
+        if isinstance(handlers, list):
+            handlers.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# bpy.types
+# ─────────────────────────────────────────────────────────────────────────────
+class _OperatorProperties:
+    def __init__(self, operator):
+        self._operator = operator
+
+    def is_property_set(self, name, ghost=True):
+        return name in self._operator._set_properties
+
+
+class Operator(bpy_struct):
+    bl_idname = ""
+    bl_label = ""
+    bl_options = set()
+
+    def __init__(self):
+        self.reports = []
+        self.layout = None
+        self._set_properties = set()
+
+    @property
+    def properties(self):
+        return _OperatorProperties(self)
+
+    def report(self, report_type, message):
+        self.reports.append((set(report_type), message))
+
+    @classmethod
+    def poll(cls, context):
+        return True
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class Panel(bpy_struct):
+    pass
+
+
+class Menu(bpy_struct):
+    pass
+
+
+class UIList(bpy_struct):
+    pass
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+class AddonPreferences(bpy_struct):
+    bl_idname = ""
+
+
+bpy_types = _pytypes.ModuleType("bpy.types")
+for _cls in (Operator, Panel, Menu, UIList, PropertyGroup, AddonPreferences, ID, Object, Mesh,
+             Material, Image, Texture, Text, NodeTree, Node, NodeSocket, NodeLink, Collection,
+             Scene, ViewLayer, Context):
+    setattr(bpy_types, _cls.__name__, _cls)
+bpy_types.ShaderNodeTree = NodeTree
+bpy_types.bpy_struct = bpy_struct
+types = bpy_types
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# bpy.ops: registered operators plus a few emulated built-ins
+# ─────────────────────────────────────────────────────────────────────────────
+_registered_operators = {}
+
+
+def _op_mode_set(mode='OBJECT', toggle=False):
+    obj = context.active_object
+    if obj is None:
+        raise RuntimeError("Operator bpy.ops.object.mode_set.poll() failed, context is incorrect")
+    obj.mode = mode
+    return {'FINISHED'}
+
+
+def _op_select_all(action='TOGGLE'):
+    obj = context.active_object
+    mesh = obj.data
+    for elements in (mesh.vertices, mesh.edges, mesh.polygons):
+        select = elements._arrays["select"]
+        if action == 'SELECT':
+            select[...] = True
+        elif action == 'DESELECT':
+            select[...] = False
+        elif action == 'INVERT':
+            select[...] = ~select
+        else:
+            select[...] = not select.any()
+    return {'FINISHED'}
+
+
+def _remove_slot(obj, slot_index):
+    mesh = obj.data
+    mesh.materials.pop(slot_index)
+    indices = mesh.polygons._arrays["material_index"]
+    indices[indices > slot_index] -= 1
+    np.clip(indices, 0, max(len(mesh.materials) - 1, 0), out=indices)
+
+
+def _op_material_slot_remove():
+    obj = context.active_object
+    if obj is None or not obj.material_slots:
+        return {'CANCELLED'}
+    _remove_slot(obj, min(obj.active_material_index, len(obj.material_slots) - 1))
+    obj.active_material_index = max(0, min(obj.active_material_index, len(obj.material_slots) - 1))
+    return {'FINISHED'}
+
+
+def _op_material_slot_remove_unused():
+    obj = context.active_object
+    if obj is None or obj.type != 'MESH':
+        return {'CANCELLED'}
+    used = set(np.unique(obj.data.polygons._arrays["material_index"]).tolist())
+    for slot_index in reversed(range(len(obj.data.materials))):
+        if slot_index not in used:
+            _remove_slot(obj, slot_index)
+    return {'FINISHED'}
+
+
+def _op_orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=False):
+    data.orphans_purge()
+    return {'FINISHED'}
+
+
+def _op_save_as_mainfile(filepath="", copy=False, **_):
+    if not copy:
+        data.filepath = filepath
+    return {'FINISHED'}
+
+
+_BUILTIN_OPERATORS = {
+    "object.mode_set": _op_mode_set,
+    "mesh.select_all": _op_select_all,
+    "object.material_slot_remove": _op_material_slot_remove,
+    "object.material_slot_remove_unused": _op_material_slot_remove_unused,
+    "outliner.orphans_purge": _op_orphans_purge,
+    "wm.save_as_mainfile": _op_save_as_mainfile,
+    "wm.save_mainfile": lambda **_: {'FINISHED'},
+}
+
+
+class _OperatorCaller:
+    def __init__(self, idname):
+        self.idname = idname
+
+    def poll(self):
+        cls = _registered_operators.get(self.idname)
+        return cls.poll(context) if cls else True
+
+    def __call__(self, *args, **options):
+        _count(f"ops.{self.idname}")
+        cls = _registered_operators.get(self.idname)
+        if cls is not None:
+            if not cls.poll(context):
+                raise RuntimeError(f"Operator bpy.ops.{self.idname}.poll() failed, context is incorrect")
+            operator = cls()
+            for key, value in options.items():
+                setattr(operator, key, value)
+            operator._set_properties = set(options)
+            result = operator.execute(context)
+            last_reports[:] = operator.reports
+            return result
+        builtin = _BUILTIN_OPERATORS.get(self.idname)
+        if builtin is not None:
+            return builtin(**options)
+        return {'FINISHED'}
+
+
+class _OperatorCategory:
+    def __init__(self, category):
+        self._category = category
+
+    def __getattr__(self, name):
+        return _OperatorCaller(f"{self._category}.{name}")
+
+
+class _Ops(_pytypes.ModuleType):
+    def __getattr__(self, category):
+        if category.startswith("__"):
+            raise AttributeError(category)
+        return _OperatorCategory(category)
+
+
+ops = _Ops("bpy.ops")
+
+# Reports of the last operator called through bpy.ops
+last_reports = []
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# bpy.utils, bpy.path, bpy.app
+# ─────────────────────────────────────────────────────────────────────────────
+utils = _pytypes.ModuleType("bpy.utils")
+
+
+def _register_class(cls):
+    _count("register_class")
+    if issubclass(cls, Operator) and cls.bl_idname:
+        _registered_operators[cls.bl_idname] = cls
+
+
+def _unregister_class(cls):
+    if issubclass(cls, Operator):
+        _registered_operators.pop(cls.bl_idname, None)
+
+
+utils.register_class = _register_class
+utils.unregister_class = _unregister_class
+
+path = _pytypes.ModuleType("bpy.path")
+
+
+def _abspath(filepath, start=None, library=None):
+    if filepath.startswith("//"):
+        base = start or os.path.dirname(data.filepath)
+        return os.path.join(base, filepath[2:]) if base else filepath[2:]
+    return filepath
+
+
+path.abspath = _abspath
+path.basename = lambda filepath: os.path.basename(filepath[2:] if filepath.startswith("//") else filepath)
+path.relpath = lambda filepath, start=None: "//" + os.path.relpath(filepath, start or os.path.dirname(data.filepath))
+
+
+class _Timers:
+    def __init__(self):
+        self._timers = {}
+
+    def register(self, function, first_interval=0.0, persistent=False):
+        self._timers[function] = first_interval
+
+    def unregister(self, function):
+        if function not in self._timers:
+            raise ValueError("Error: function is not registered")
+        del self._timers[function]
+
+    def is_registered(self, function):
+        return function in self._timers
+
+    def run(self):
+        """Run every registered timer once (as if its interval elapsed);
+        timers returning None are unregistered."""
+        for function in list(self._timers):
+            interval = function()
+            if interval is None:
+                self._timers.pop(function, None)
+            else:
+                self._timers[function] = interval
+
+
+def _persistent(function):
+    return function
+
+
+app = _pytypes.ModuleType("bpy.app")
+app.version = (4, 1, 0)
+app.version_string = "4.1.0 (BleLIZA fake bpy)"
+app.binary_path = ""
+app.background = True
+app.timers = _Timers()
+app.handlers = _pytypes.ModuleType("bpy.app.handlers")
+for _name in ("depsgraph_update_post", "depsgraph_update_pre", "load_post", "load_pre",
+              "save_pre", "save_post", "undo_post", "redo_post"):
+    setattr(app.handlers, _name, [])
+app.handlers.persistent = _persistent
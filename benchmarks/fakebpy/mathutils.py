@@ -0,0 +1,164 @@
+"""Minimal stand-in for Blender's mathutils (Vector, Matrix, Quaternion)."""
+
+import math
+
+import numpy as np
+
+
+class Vector:
+    __slots__ = ("_v",)
+
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._v = np.array(values, dtype=np.float64).reshape(-1)
+
+    x = property(lambda self: float(self._v[0]), lambda self, value: self._v.__setitem__(0, value))
+    y = property(lambda self: float(self._v[1]), lambda self, value: self._v.__setitem__(1, value))
+    z = property(lambda self: float(self._v[2]), lambda self, value: self._v.__setitem__(2, value))
+
+    def __len__(self):
+        return self._v.size
+
+    def __iter__(self):
+        return iter(float(value) for value in self._v)
+
+    def __getitem__(self, index):
+        return float(self._v[index])
+
+    def __setitem__(self, index, value):
+        self._v[index] = value
+
+    def __array__(self, dtype=None, copy=None):
+        return self._v.astype(dtype) if dtype else self._v.copy()
+
+    def __add__(self, other):
+        return Vector(self._v + np.asarray(other, dtype=np.float64))
+
+    def __iadd__(self, other):
+        self._v += np.asarray(other, dtype=np.float64)
+        return self
+
+    def __sub__(self, other):
+        return Vector(self._v - np.asarray(other, dtype=np.float64))
+
+    def __mul__(self, scalar):
+        return Vector(self._v * scalar)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Vector(-self._v)
+
+    def __eq__(self, other):
+        return np.allclose(self._v, np.asarray(other, dtype=np.float64))
+
+    def __repr__(self):
+        return f"Vector({tuple(self)})"
+
+    @property
+    def length(self):
+        return float(np.linalg.norm(self._v))
+
+    def normalized(self):
+        length = self.length
+        return Vector(self._v / length if length else self._v)
+
+    def dot(self, other):
+        return float(np.dot(self._v, np.asarray(other, dtype=np.float64)))
+
+    def cross(self, other):
+        return Vector(np.cross(self._v, np.asarray(other, dtype=np.float64)))
+
+    def copy(self):
+        return Vector(self._v)
+
+    def to_tuple(self):
+        return tuple(self)
+
+
+class Quaternion:
+    """Rotation only; stored as a 3×3 matrix, which is all the add-on needs
+    (rotating vectors with q @ v)."""
+
+    def __init__(self, rotation=None):
+        self._m = np.eye(3) if rotation is None else np.array(rotation, dtype=np.float64)
+
+    def __matmul__(self, other):
+        if isinstance(other, Quaternion):
+            return Quaternion(self._m @ other._m)
+        return Vector(self._m @ np.asarray(other, dtype=np.float64))
+
+    def to_matrix(self):
+        return Matrix(self._m)
+
+    def inverted(self):
+        return Quaternion(self._m.T)
+
+
+class Matrix:
+    def __init__(self, rows=None):
+        self._m = np.eye(4) if rows is None else np.array(rows, dtype=np.float64)
+
+    @classmethod
+    def Identity(cls, size):
+        return cls(np.eye(size))
+
+    @classmethod
+    def Translation(cls, vector):
+        m = np.eye(4)
+        m[:3, 3] = np.asarray(vector, dtype=np.float64)[:3]
+        return cls(m)
+
+    @classmethod
+    def Scale(cls, factor, size, axis=None):
+        m = np.eye(size)
+        m[:3, :3] *= factor
+        return cls(m)
+
+    @classmethod
+    def Rotation(cls, angle, size, axis):
+        c, s = math.cos(angle), math.sin(angle)
+        rotations = {
+            'X': ((1, 0, 0), (0, c, -s), (0, s, c)),
+            'Y': ((c, 0, s), (0, 1, 0), (-s, 0, c)),
+            'Z': ((c, -s, 0), (s, c, 0), (0, 0, 1)),
+        }
+        m = np.eye(size)
+        m[:3, :3] = rotations[axis]
+        return cls(m)
+
+    def __len__(self):
+        return self._m.shape[0]
+
+    def __iter__(self):
+        return iter(Vector(row) for row in self._m)
+
+    def __getitem__(self, index):
+        return Vector(self._m[index])
+
+    def __array__(self, dtype=None, copy=None):
+        return self._m.astype(dtype) if dtype else self._m.copy()
+
+    def __matmul__(self, other):
+        if isinstance(other, Matrix):
+            return Matrix(self._m @ other._m)
+        v = np.asarray(other, dtype=np.float64)
+        if v.size == 3 and self._m.shape[0] == 4:
+            return Vector(self._m[:3, :3] @ v + self._m[:3, 3])
+        return Vector(self._m @ v)
+
+    def inverted(self):
+        return Matrix(np.linalg.inv(self._m))
+
+    def to_quaternion(self):
+        # Rotation part with the scale divided out
+        m = self._m[:3, :3]
+        return Quaternion(m / np.linalg.norm(m, axis=0))
+
+    def to_translation(self):
+        return Vector(self._m[:3, 3])
+
+    def copy(self):
+        return Matrix(self._m)
+
+    def __repr__(self):
+        return f"Matrix({self._m.tolist()})"
@@ -0,0 +1,227 @@
+"""
+Synthetic scenes for the BleLIZA benchmarks (see bleliza_bench.py).
+
+Every builder clears the current file first and returns a dict describing
+what it made, so benchmark cases can set up their operator call.  Images
+are generated in memory and named like the PNG exports of an MSFS project;
+matching dummy DDS files are written to the scratch folder.
+"""
+
+import os
+import random
+import struct
+
+import bpy
+
+# Image texture node names of the MSFS 2020 and 2024 material layouts
+# (the nodes the BleLIZA preset builders look for).
+TEXTURE_NODES = {
+    "2020": {
+        "base": "Base Color Texture",
+        "detail": "Detail Color(RGBA)",
+        "orm": "Occlusion(R) Roughness(G) Metallic(B)",
+        "detail_orm": "Detail Occlusion(R) Roughness(G) Metallic(B)",
+        "normal": "Normal Texture",
+    },
+    "2024": {
+        "base": "Base Color Texture (RGBA)",
+        "detail": "Detail Color (RGB), Alpha (A)",
+        "orm": "Occlusion (R), Roughness (G), Metallic (B)",
+        "detail_orm": "Detail Occlusion (R), Roughness (G), Metallic (B)",
+        "normal": "Normal Texture (RGB)",
+    },
+}
+
+TERRAIN_NAME = "groundMiddle"
+
+_DATA_COLLECTIONS = ("objects", "meshes", "materials", "images", "textures", "node_groups", "texts")
+
+
+def write_dummy_dds(path, size=4):
+    """Write a valid DXT1 DDS file of *size*×*size* pixels (one mip level)."""
+    blocks = max(1, size // 4) ** 2
+    header = struct.pack(
+        "<4s7I44x2I4s5I5I",
+        b"DDS ", 124,
+        0x1 | 0x2 | 0x4 | 0x1000 | 0x80000,  # CAPS | HEIGHT | WIDTH | PIXELFORMAT | LINEARSIZE
+        size, size, blocks * 8, 0, 1,
+        32, 0x4, b"DXT1", 0, 0, 0, 0, 0,     # pixel format: FOURCC DXT1
+        0x1000, 0, 0, 0, 0,                  # caps: TEXTURE
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(b"\x00\xf8\x00\xf8\x00\x00\x00\x00" * blocks)
+
+
+def reset_scene():
+    """Remove all datablocks the benchmarks create, keeping the scene and
+    the add-on registration."""
+    for name in _DATA_COLLECTIONS:
+        collection = getattr(bpy.data, name)
+        if len(collection):
+            bpy.data.batch_remove(list(collection))
+
+
+def _link_mesh_object(name, vertices, faces):
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices, [], faces)
+    mesh.uv_layers.new(name="UVMap")
+    mesh.update()
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def _activate(obj):
+    view_layer = bpy.context.view_layer
+    for other in view_layer.objects.selected:
+        other.select_set(False)
+    view_layer.objects.active = obj
+    obj.select_set(True)
+
+
+def _grid(columns, rows, size=1.0, z=0.0):
+    """Vertices and quads of a columns×rows grid of size×size tiles."""
+    vertices = [
+        (x * size, y * size, z)
+        for y in range(rows + 1)
+        for x in range(columns + 1)
+    ]
+    faces = [
+        (y * (columns + 1) + x, y * (columns + 1) + x + 1,
+         (y + 1) * (columns + 1) + x + 1, (y + 1) * (columns + 1) + x)
+        for y in range(rows)
+        for x in range(columns)
+    ]
+    return vertices, faces
+
+
+def _texture_node(nodes, name, image, location):
+    node = nodes.new("ShaderNodeTexImage")
+    node.name = node.label = name
+    node.image = image
+    node.location = location
+    return node
+
+
+def _msfs_material(name, layout, images, detail_image):
+    """A material shaped like an imported MSFS material: named texture
+    nodes, factor value nodes, a Mapping node on the detail textures and
+    one unlinked texture node."""
+    names = TEXTURE_NODES[layout]
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    principled = nodes.get("Principled BSDF")
+
+    base = _texture_node(nodes, names["base"], images["base"], (-600, 300))
+    orm = _texture_node(nodes, names["orm"], images["orm"], (-600, 0))
+    normal = _texture_node(nodes, names["normal"], images["normal"], (-600, -300))
+    detail = _texture_node(nodes, names["detail"], detail_image, (-600, 600))
+    _texture_node(nodes, names["detail_orm"], None, (-600, 900))
+
+    normal_map = nodes.new("ShaderNodeNormalMap")
+    normal_map.location = (-300, -300)
+    links.new(base.outputs["Color"], principled.inputs["Base Color"])
+    links.new(orm.outputs["Color"], principled.inputs["Roughness"])
+    links.new(normal.outputs["Color"], normal_map.inputs["Color"])
+    links.new(normal_map.outputs["Normal"], principled.inputs["Normal"])
+
+    for label, value in (("Metallic Factor", 0.0), ("Roughness Factor", 0.8), ("Emissive Scale", 0.0)):
+        node = nodes.new("ShaderNodeValue")
+        node.name = node.label = label
+        node.outputs[0].default_value = value
+
+    uv_map = nodes.new("ShaderNodeUVMap")
+    uv_map.uv_map = "UVMap"
+    mapping = nodes.new("ShaderNodeMapping")
+    mapping.vector_type = 'TEXTURE'
+    mapping.inputs["Scale"].default_value = (0.1, 0.1, 1.0)
+    links.new(uv_map.outputs["UV"], mapping.inputs["Vector"])
+    links.new(mapping.outputs["Vector"], detail.inputs["Vector"])
+
+    mat["aliza_material"] = 1
+    mat["exporter_junk"] = "x" * 64
+    return mat
+
+
+def build_material_scene(material_count, scratch_dir, layout="2024"):
+    """One strip mesh with *material_count* faces, each face using its own
+    MSFS material with unique base/ORM/normal images and a shared detail
+    image.  Dummy DDS files for every image go to <scratch_dir>/dds, which
+    is where the texture replacement looks for them ("../dds" next to a
+    .blend saved in <scratch_dir>/blend)."""
+    reset_scene()
+    dds_dir = os.path.join(scratch_dir, "dds")
+    os.makedirs(dds_dir, exist_ok=True)
+
+    def image(name):
+        img = bpy.data.images.new(name + ".png", 4, 4)
+        write_dummy_dds(os.path.join(dds_dir, name + ".dds"))
+        return img
+
+    detail_image = image("bench_detail")
+    vertices, faces = _grid(material_count, 1)
+    obj = _link_mesh_object("bench_materials", vertices, faces)
+    for index in range(material_count):
+        images = {kind: image(f"bench_{index:05d}_{kind}") for kind in ("base", "orm", "normal")}
+        obj.data.materials.append(_msfs_material(f"bench_{index:05d}", layout, images, detail_image))
+    obj.data.polygons.foreach_set("material_index", list(range(material_count)))
+    obj["aliza_cast_shadow"] = 1
+    obj["exporter_junk"] = list(range(16))
+    obj.data["exporter_junk"] = 1.0
+    _activate(obj)
+    return {"object": obj, "dds_dir": dds_dir}
+
+
+def build_island_scene(island_count, material_count=8):
+    """One mesh with *island_count* islands (2×2-quad patches at random
+    heights, half of them tilted), *material_count* 'roof_*' materials and
+    all faces selected, above a flat terrain object."""
+    reset_scene()
+    rng = random.Random(island_count)
+
+    per_row = max(1, int(island_count ** 0.5))
+    patch_vertices, patch_faces = _grid(2, 2, size=0.4)
+    vertices = []
+    faces = []
+    for index in range(island_count):
+        ox, oy = (index % per_row) * 2.0, (index // per_row) * 2.0
+        oz = rng.uniform(0.0, 10.0)
+        tilt = rng.uniform(0.0, 3.0) if index % 2 else 0.0
+        start = len(vertices)
+        vertices.extend((ox + x, oy + y, oz + z + tilt * x) for x, y, z in patch_vertices)
+        faces.extend(tuple(start + v for v in face) for face in patch_faces)
+    obj = _link_mesh_object("bench_islands", vertices, faces)
+    for index in range(material_count):
+        mat = bpy.data.materials.new(f"roof_{index:02d}")
+        mat.use_nodes = True
+        obj.data.materials.append(mat)
+    obj.data.polygons.foreach_set("select", [True] * len(obj.data.polygons))
+
+    extent = per_row * 2.0 + 10.0
+    _link_mesh_object(
+        TERRAIN_NAME,
+        [(-10.0, -10.0, -5.0), (extent, -10.0, -5.0), (extent, extent, -5.0), (-10.0, extent, -5.0)],
+        [(0, 1, 2, 3)],
+    )
+    _activate(obj)
+    return {"object": obj, "terrain": TERRAIN_NAME}
+
+
+def build_grid_scene(columns, rows, scratch_dir):
+    """A columns×rows tile grid with a dummy '<col>-<row>.dds' file per
+    tile in <scratch_dir>/grid_dds."""
+    reset_scene()
+    dds_dir = os.path.join(scratch_dir, "grid_dds")
+    os.makedirs(dds_dir, exist_ok=True)
+    for row in range(rows):
+        for col in range(columns):
+            path = os.path.join(dds_dir, f"{col}-{row}.dds")
+            if not os.path.exists(path):
+                write_dummy_dds(path)
+    vertices, faces = _grid(columns, rows, size=10.0)
+    obj = _link_mesh_object("bench_grid", vertices, faces)
+    _activate(obj)
+    return {"object": obj, "dds_dir": dds_dir, "columns": columns, "rows": rows}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Run bleliza_cli.py over a directory of .blend files with a pool of
+background Blender instances and collect one JSON summary.
+
+    python bleliza_batch.py /data/lszh --steps preset_2024,replace_textures \
+        --blender /opt/blender/blender --jobs 4 --save --summary lszh.json
+
+Every file runs in its own `blender -b` process; --jobs controls how many
+run at the same time.  Per-file timings, step reports and errors end up in
+the summary (default: bleliza_batch_summary.json in the input directory).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bleliza_cli.py")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", help="directory containing .blend files")
+    parser.add_argument("--steps", default="", help="comma-separated bleliza_cli.py steps")
+    parser.add_argument("--pipeline", default="", help="JSON/TOML pipeline file passed to bleliza_cli.py")
+    parser.add_argument("--blender", default=shutil.which("blender") or "blender",
+                        help="path to the Blender executable")
+    parser.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="number of Blender instances running in parallel")
+    parser.add_argument("--recursive", action="store_true", help="also search subdirectories")
+    parser.add_argument("--save", action="store_true", help="save every file in place after processing")
+    parser.add_argument("--keep-going", action="store_true", help="continue after a failed step")
+    parser.add_argument("--factory-startup", action="store_true",
+                        help="start Blender without user preferences (the add-on is imported from this checkout)")
+    parser.add_argument("--timeout", type=float, default=None, help="per-file timeout in seconds")
+    parser.add_argument("--summary", default="", help="path of the JSON summary")
+    return parser.parse_args(argv)
+
+
+def find_blend_files(directory, recursive):
+    if not recursive:
+        return sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(".blend")
+        )
+    found = []
+    for root, _, names in os.walk(directory):
+        found.extend(os.path.join(root, name) for name in names if name.lower().endswith(".blend"))
+    return sorted(found)
+
+
+def process_file(index, path, args, report_dir):
+    report_path = os.path.join(report_dir, f"{index:05d}.json")
+    command = [args.blender, "-b"]
+    if args.factory_startup:
+        command.append("--factory-startup")
+    command += [path, "--python-exit-code", "1", "-P", CLI_SCRIPT, "--",
+                "--steps", args.steps, "--report", report_path]
+    if args.pipeline:
+        command += ["--pipeline", os.path.abspath(args.pipeline)]
+    if args.save:
+        command.append("--save")
+    if args.keep_going:
+        command.append("--keep-going")
+
+    entry = {"file": path}
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+        entry["returncode"] = completed.returncode
+        entry["stderr_tail"] = completed.stderr[-4000:]
+    except subprocess.TimeoutExpired:
+        entry["returncode"] = None
+        entry["error"] = f"timed out after {args.timeout}s"
+    except OSError as e:
+        entry["returncode"] = None
+        entry["error"] = str(e)
+    entry["seconds"] = time.perf_counter() - start
+
+    if os.path.exists(report_path):
+        with open(report_path, encoding="utf-8") as f:
+            entry["report"] = json.load(f)
+    entry["ok"] = entry.get("returncode") == 0 and entry.get("report", {}).get("ok", False)
+    return entry
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.steps and not args.pipeline:
+        print("Nothing to do: give --steps and/or --pipeline", file=sys.stderr)
+        return 2
+    files = find_blend_files(args.directory, args.recursive)
+    if not files:
+        print(f"No .blend files found in {args.directory}", file=sys.stderr)
+        return 1
+
+    print(f"Processing {len(files)} file(s) with {args.jobs} Blender instance(s)...")
+    start = time.perf_counter()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bleliza_batch_") as report_dir:
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [
+                pool.submit(process_file, index, path, args, report_dir)
+                for index, path in enumerate(files)
+            ]
+            for future in as_completed(futures):
+                entry = future.result()
+                results.append(entry)
+                status = "ok" if entry["ok"] else "FAILED"
+                print(f"  [{len(results)}/{len(files)}] {status} {entry['seconds']:7.1f}s {entry['file']}")
+
+    results.sort(key=lambda entry: entry["file"])
+    failed = [entry["file"] for entry in results if not entry["ok"]]
+    summary = {
+        "blender": args.blender,
+        "steps": [step for step in args.steps.split(",") if step],
+        "pipeline": args.pipeline,
+        "jobs": args.jobs,
+        "total_seconds": time.perf_counter() - start,
+        "file_count": len(results),
+        "failed": failed,
+        "files": results,
+    }
+    summary_path = args.summary or os.path.join(args.directory, "bleliza_batch_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"Done in {summary['total_seconds']:.1f}s, {len(failed)} failed. Summary: {summary_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Run a sequence of BleLIZA operations on a .blend file without the UI.
+
+    blender -b airport.blend -P bleliza_cli.py -- --steps preset_2024,replace_textures --save
+
+    blender -b airport.blend -P bleliza_cli.py -- --pipeline aliza.json --save
+
+Object steps run once per mesh object in the scene (as if it had been made
+active and the button clicked).  Material steps do too, but skip objects
+whose materials were all handled by the same step already.  File steps
+run once; steps whose operator takes a material scope get scope='FILE'.
+
+A JSON report with per-step timings, operator results and errors is
+written with --report (see bleliza_batch.py for running many files).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+
+import bpy
+
+ADDON_MODULE = "bleliza_utilities"
+
+# step name -> (operator idname, scope, fixed operator options)
+#   'OBJECT' operators work on the active object (its mesh or slots),
+#   'MATERIAL' operators work on the active object's materials,
+#   'FILE' operators work on the whole file.
+STEPS = {
+    "preset_2020": ("node.create_preset_2020", 'MATERIAL', {}),
+    "preset_2024": ("node.create_preset_2024", 'MATERIAL', {}),
+    "cap_resolution": ("object.bleliza_cap_texture_resolution", 'FILE', {}),
+    "convert_dds": ("object.bleliza_convert_missing_dds", 'FILE', {}),
+    "replace_textures": ("object.replace_textures_with_dds", 'FILE', {}),
+    "merge_duplicate_images": ("object.bleliza_merge_duplicate_images", 'FILE', {}),
+    "merge_materials": ("object.bleliza_merge_equivalent_materials", 'FILE', {}),
+    "remove_empty_texture_nodes": ("object.remove_empty_textures_nodes", 'FILE', {"scope": 'FILE'}),
+    "replace_constant_textures": ("object.bleliza_replace_constant_textures", 'FILE', {"scope": 'FILE'}),
+    "texture_extend": ("node.set_texture_extend", 'FILE', {"scope": 'FILE'}),
+    "materials_to_sat": ("node.set_materials_to_sat", 'FILE', {"scope": 'FILE'}),
+    "edit_materials": ("object.bleliza_edit_materials", 'FILE', {"scope": 'FILE'}),
+    "bake_mapping": ("node.bake_mapping_to_detail_uv", 'MATERIAL', {}),
+    "remove_unused_materials": ("object.remove_unused_materials", 'OBJECT', {}),
+    "ground_lod": ("object.bleliza_create_ground_lod", 'OBJECT', {}),
+    "apply_property_rules": ("object.bleliza_apply_property_rules", 'FILE', {}),
+    "scrub_props": ("object.scrub_custom_props", 'FILE', {}),
+    "pipeline": ("node.bleliza_run_pipeline", 'FILE', {}),
+    "audit": ("object.bleliza_audit_scene", 'FILE', {}),
+}
+
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="blender -b file.blend -P bleliza_cli.py --")
+    parser.add_argument("--steps", default="",
+                        help="comma-separated steps to run in order (see --list-steps)")
+    parser.add_argument("--pipeline", default="",
+                        help="JSON/TOML pipeline file run on the whole scene (appended as the 'pipeline' step)")
+    parser.add_argument("--list-steps", action="store_true", help="print the available steps and exit")
+    parser.add_argument("--save", action="store_true", help="save the .blend file in place afterwards")
+    parser.add_argument("--save-as", default="", help="save the result to this .blend path instead")
+    parser.add_argument("--report", default="", help="write a JSON report to this path")
+    parser.add_argument("--keep-going", action="store_true",
+                        help="continue with the next step after a step failed")
+    return parser.parse_args(argv)
+
+
+def ensure_addon():
+    """Enable the add-on, falling back to importing it from next to this script."""
+    import addon_utils
+
+    if addon_utils.check(ADDON_MODULE)[1]:
+        return
+    if addon_utils.enable(ADDON_MODULE, default_set=False) is not None:
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import bleliza_utilities
+    bleliza_utilities.register()
+
+
+def get_operator(idname):
+    category, name = idname.split(".")
+    return getattr(getattr(bpy.ops, category), name)
+
+
+def run_step(name, **options):
+    idname, scope, fixed = STEPS[name]
+    operator = get_operator(idname)
+    options = {**fixed, **options}
+    record = {"step": name, "operator": idname, "calls": 0, "results": {}, "errors": []}
+
+    def call(label):
+        record["calls"] += 1
+        try:
+            result = operator(**options)
+        except Exception as e:
+            record["errors"].append({"target": label, "error": str(e), "traceback": traceback.format_exc()})
+            return
+        for key in result:
+            record["results"][key] = record["results"].get(key, 0) + 1
+
+    start = time.perf_counter()
+    if scope == 'FILE':
+        call(None)
+    else:
+        view_layer = bpy.context.view_layer
+        done_materials = set()
+        for obj in list(bpy.context.scene.objects):
+            if obj.type != 'MESH' or obj.library is not None:
+                continue
+            if scope == 'MATERIAL':
+                materials = {slot.material.name for slot in obj.material_slots if slot.material}
+                if materials and materials <= done_materials:
+                    continue
+                done_materials |= materials
+            view_layer.objects.active = obj
+            call(obj.name)
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def main():
+    args = parse_args(sys.argv)
+    if args.list_steps:
+        for name, (idname, scope, _) in STEPS.items():
+            print(f"{name:<28} {scope:<8} {idname}")
+        return 0
+
+    steps = [step.strip() for step in args.steps.split(",") if step.strip()]
+    if args.pipeline and "pipeline" not in steps:
+        steps.append("pipeline")
+    unknown = [step for step in steps if step not in STEPS]
+    if unknown:
+        print(f"Unknown step(s): {', '.join(unknown)}. Use --list-steps.", file=sys.stderr)
+        return 2
+
+    report = {"file": bpy.data.filepath, "steps": [], "ok": True}
+    start = time.perf_counter()
+    try:
+        ensure_addon()
+        if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        pipeline_options = {"filepath": os.path.abspath(args.pipeline) if args.pipeline else "", "scope": 'SCENE'}
+        for name in steps:
+            record = run_step(name, **(pipeline_options if name == "pipeline" else {}))
+            report["steps"].append(record)
+            status = "FAILED" if record["errors"] else "ok"
+            print(f"[BleLIZA] {name}: {record['calls']} call(s), {record['seconds']:.2f}s, {status}")
+            if record["errors"]:
+                report["ok"] = False
+                if not args.keep_going:
+                    break
+
+        if report["ok"] and (args.save or args.save_as):
+            save_path = bpy.path.abspath(args.save_as) if args.save_as else bpy.data.filepath
+            bpy.ops.wm.save_as_mainfile(filepath=save_path, copy=bool(args.save_as))
+            report["saved_to"] = save_path
+    except Exception as e:
+        report["ok"] = False
+        report["error"] = str(e)
+        report["traceback"] = traceback.format_exc()
+        print(report["traceback"], file=sys.stderr)
+
+    report["total_seconds"] = time.perf_counter() - start
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,39 +8,82 @@ bl_info = {
     "category": "Node",
 }
 
-import bpy
-import importlib
-from . import operators
-from . import ui
+import time
 
-# Force reload of submodules to ensure new classes are picked up
-importlib.reload(operators)
-importlib.reload(ui)
+try:
+    import bpy
+except ImportError:
+    # Plain Python (CI, benchmarks, worker processes): only the bpy-free
+    # bleliza_utilities.core package is usable, nothing is registered.
+    bpy = None
 
-classes = (
-    operators.NODE_OT_create_preset_2020,
-    operators.NODE_OT_create_preset_2024,
-    operators.NODE_OT_replace_textures_script,
-    operators.NODE_OT_remove_empty_textures_nodes_script,
-    operators.NODE_OT_create_and_assign_materials,
-    operators.NODE_OT_snap_islands_to_terrain,
-    operators.NODE_OT_select_flat_islands,
-    operators.OBJECT_OT_bleliza_set_custom_property,
-    operators.NODE_OT_set_texture_extend,
-    operators.NODE_OT_assign_random_materials_islands,
-    operators.NODE_OT_assign_random_materials_selected_islands,
-    operators.NODE_OT_set_materials_to_sat,
-    operators.OBJECT_OT_remove_unused_materials,
-    operators.NODE_OT_bake_mapping_to_detail_uv,
-    operators.OBJECT_OT_remove_non_aliza_custom_props,
-    operators.OBJECT_OT_remove_non_aliza_material_custom_props,
-    ui.BLELIZA_MATERIAL_PT_parent,
-    ui.MATERIAL_PT_texture_preset_panel,
-    ui.MATERIAL_PT_create_materials_panel,
-    ui.BLELIZA_PT_object_tools,
-)
+if bpy is not None:
+    # Reload the submodules only when the add-on itself is reloaded (F3
+    # "Reload Scripts"); a normal startup imports each of them once.
+    if "operators" in locals():
+        import importlib
+        importlib.reload(instrumentation)
+        importlib.reload(preferences)
+        importlib.reload(operators)
+        importlib.reload(stats)
+        importlib.reload(ui)
+        importlib.reload(pipeline)
+        importlib.reload(audit)
+    else:
+        from . import instrumentation
+        from . import preferences
+        from . import operators
+        from . import stats
+        from . import ui
+        from . import pipeline
+        from . import audit
+
+    classes = (
+        preferences.BLELIZA_AP_preferences,
+        operators.BLELIZA_PG_property_rule,
+        operators.NODE_OT_create_preset_2020,
+        operators.NODE_OT_create_preset_2024,
+        operators.NODE_OT_replace_textures_script,
+        operators.OBJECT_OT_bleliza_convert_missing_dds,
+        operators.OBJECT_OT_bleliza_cap_texture_resolution,
+        operators.OBJECT_OT_bleliza_merge_duplicate_images,
+        operators.NODE_OT_remove_empty_textures_nodes_script,
+        operators.OBJECT_OT_bleliza_replace_constant_textures,
+        operators.NODE_OT_create_and_assign_materials,
+        operators.OBJECT_OT_bleliza_create_ground_lod,
+        operators.NODE_OT_snap_islands_to_terrain,
+        operators.NODE_OT_select_flat_islands,
+        operators.OBJECT_OT_bleliza_set_custom_property,
+        operators.NODE_OT_set_texture_extend,
+        operators.OBJECT_OT_bleliza_edit_materials,
+        operators.NODE_OT_assign_random_materials_islands,
+        operators.NODE_OT_assign_random_materials_selected_islands,
+        operators.NODE_OT_set_materials_to_sat,
+        operators.OBJECT_OT_remove_unused_materials,
+        operators.OBJECT_OT_bleliza_merge_equivalent_materials,
+        operators.OBJECT_OT_bleliza_build_texture_atlas,
+        operators.NODE_OT_bake_mapping_to_detail_uv,
+        operators.OBJECT_OT_remove_non_aliza_custom_props,
+        operators.OBJECT_OT_remove_non_aliza_material_custom_props,
+        operators.OBJECT_OT_scrub_custom_props,
+        pipeline.NODE_OT_run_pipeline,
+        audit.OBJECT_OT_bleliza_audit_scene,
+        operators.OBJECT_OT_bleliza_clear_timings,
+        operators.OBJECT_OT_bleliza_property_rule_add,
+        operators.OBJECT_OT_bleliza_property_rule_remove,
+        operators.OBJECT_OT_bleliza_apply_property_rules,
+        operators.OBJECT_OT_bleliza_import_property_table,
+        ui.BLELIZA_UL_property_rules,
+        ui.BLELIZA_MATERIAL_PT_parent,
+        ui.MATERIAL_PT_texture_preset_panel,
+        ui.MATERIAL_PT_create_materials_panel,
+        ui.BLELIZA_PT_object_tools,
+        ui.BLELIZA_PT_property_rules,
+        ui.BLELIZA_PT_timings,
+    )
 
 def register():
+    start = time.perf_counter()
     for cls in classes:
         bpy.utils.register_class(cls)
     
@@ -100,14 +143,49 @@ def register():
         default="roof"
     )
     
+    bpy.types.Scene.bleliza_mat_filter_mode = bpy.props.EnumProperty(
+        name="Filter Mode",
+        description="How the materials filter is matched against material names",
+        items=[
+            ('SUBSTRING', "Contains", "Material name contains the filter text"),
+            ('GLOB', "Wildcard", "Material name matches a wildcard pattern (e.g. 'roof_*')"),
+            ('REGEX', "Regex", "Material name matches a regular expression"),
+        ],
+        default='SUBSTRING'
+    )
+    
     bpy.types.Scene.bleliza_flat_threshold = bpy.props.FloatProperty(
         name="Flat Threshold",
         description="Max Z difference for an island to be selected",
         default=1.0,
         min=0.0
     )
+    
+    bpy.types.Scene.bleliza_property_rules = bpy.props.CollectionProperty(
+        name="Property Rules",
+        type=operators.BLELIZA_PG_property_rule,
+        description="Rules applied by 'Apply Property Rules'"
+    )
+    
+    bpy.types.Scene.bleliza_property_rules_index = bpy.props.IntProperty(
+        name="Active Property Rule",
+        default=0
+    )
+    
+    bpy.types.Scene.bleliza_pipeline_file = bpy.props.StringProperty(
+        name="Pipeline File",
+        description="JSON/TOML stage list for 'Run Pipeline' (empty: built-in ALIZA preparation pipeline)",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+    stats.register()
+
+    instrumentation.registration_seconds = time.perf_counter() - start
 
 def unregister():
+    stats.unregister()
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     
@@ -120,7 +198,11 @@ def unregister():
     del bpy.types.Scene.bleliza_tex_name_suffix
     del bpy.types.Scene.bleliza_terrain_obj
     del bpy.types.Scene.bleliza_mat_filter
+    del bpy.types.Scene.bleliza_mat_filter_mode
     del bpy.types.Scene.bleliza_flat_threshold
+    del bpy.types.Scene.bleliza_property_rules
+    del bpy.types.Scene.bleliza_property_rules_index
+    del bpy.types.Scene.bleliza_pipeline_file
 
 if __name__ == "__main__":
     register()
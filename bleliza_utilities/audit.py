@@ -0,0 +1,367 @@
+import bpy
+import os
+import re
+import html
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import core
+from . import operators
+from . import instrumentation
+from .stats import PRESET_MARKER_NODE
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ALIZA export audit
+#
+# gather_audit() visits every datablock collection of bpy.data exactly once
+# and collects, per collection, what the export checklist needs:
+#
+#   materials – unconverted MSFS materials, materials using the ALIZA preset
+#   objects   – material slots per object; meshes that use an ALIZA preset
+#               material (which samples the Detail UV) but have no
+#               "<uv>_Detail" layer (checked once per mesh)
+#   images    – unique image files, orphans, estimated texture memory from
+#               the file headers (read in a thread pool, once per file)
+#   all       – custom properties not matching the keep pattern
+#
+# The report lists are sorted by cost (bytes, slot count, face count) so the
+# top rows are the ones worth fixing first.
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Node names only found in MSFS 2020/2024 exporter layouts
+MSFS_MARKER_NODES = (
+    "Occlusion(R) Roughness(G) Metallic(B)",
+    "Occlusion (R), Roughness (G), Metallic (B)",
+    "Base Color Texture (RGBA)",
+    "Detail Color(RGBA)",
+)
+
+HEADER_WORKERS = 8
+
+# Rows per table in the HTML report (the JSON report has everything)
+HTML_ROWS = 200
+
+# Visit order: materials first, so objects can be checked against the
+# preset materials
+_AUDIT_ORDER = ("materials", "images") + tuple(
+    attr for attr in operators._SCRUB_ID_COLLECTIONS if attr not in ("materials", "images")
+)
+
+
+def _image_entry(image):
+    """(entry, header source) for one image: header source is the absolute
+    path to read, the packed bytes, or None."""
+    entry = {
+        "name": image.name,
+        "filepath": image.filepath,
+        "source": image.source,
+        "users": image.users,
+        "orphan": image.users == (1 if image.use_fake_user else 0),
+        "packed": image.packed_file is not None,
+        "missing": False,
+        "format": "",
+        "width": 0,
+        "height": 0,
+        "mips": 0,
+        "bytes": 0,
+    }
+    if image.packed_file is not None:
+        return entry, bytes(image.packed_file.data[:core.textures.HEADER_BYTES])
+    if image.source in ('FILE', 'TILED', 'SEQUENCE') and image.filepath:
+        path = os.path.normpath(bpy.path.abspath(image.filepath, library=image.library))
+        entry["path"] = path
+        return entry, path
+    if image.source == 'GENERATED':
+        width, height = image.generated_width, image.generated_height
+        info = {"format": 'GENERATED', "width": width, "height": height, "mips": 1, "bits_per_pixel": 32}
+        _apply_header(entry, info)
+    return entry, None
+
+
+def _apply_header(entry, info):
+    if info is None:
+        return
+    entry["format"] = info["format"]
+    entry["width"] = info["width"]
+    entry["height"] = info["height"]
+    entry["mips"] = info["mips"]
+    entry["bytes"] = core.textures.estimate_texture_bytes(info)
+
+
+def gather_audit(keep, workers=HEADER_WORKERS):
+    """Collect the audit report (a JSON-serialisable dict) for the current
+    file.  *keep* is a predicate on custom property names (kept names are
+    ALIZA properties)."""
+
+    start = time.perf_counter()
+    data = bpy.data
+
+    unconverted = []
+    preset_materials = set()
+    object_rows = []
+    mesh_rows = {}
+    image_rows = []
+    header_jobs = {}  # path or packed bytes key -> list of entries
+    prop_rows = []
+
+    for attr in _AUDIT_ORDER:
+        id_collection = getattr(data, attr, None)
+        if id_collection is None:
+            continue
+
+        prop_blocks = prop_count = prop_bytes = 0
+        for id_block in id_collection:
+            # Custom properties (all collections)
+            rejected = [key for key in operators._custom_property_keys(id_block) if not keep(key)]
+            if rejected:
+                prop_blocks += 1
+                prop_count += len(rejected)
+                prop_bytes += sum(
+                    operators._IDPROP_HEADER_BYTES + operators._estimate_idprop_bytes(id_block[key])
+                    for key in rejected
+                )
+
+            if attr == "materials":
+                tree = id_block.node_tree if id_block.use_nodes else None
+                if tree is None:
+                    continue
+                nodes = tree.nodes
+                if nodes.get(PRESET_MARKER_NODE) is not None:
+                    preset_materials.add(id_block.name)
+                elif any(nodes.get(name) is not None for name in MSFS_MARKER_NODES):
+                    unconverted.append(id_block.name)
+
+            elif attr == "images":
+                entry, header_source = _image_entry(id_block)
+                image_rows.append(entry)
+                if header_source is not None:
+                    key = header_source if isinstance(header_source, str) else (id_block.name, header_source)
+                    header_jobs.setdefault(key, []).append(entry)
+
+            elif attr == "objects":
+                slots = id_block.material_slots
+                if not slots:
+                    continue
+                names = {slot.material.name for slot in slots if slot.material is not None}
+                object_rows.append({"name": id_block.name, "type": id_block.type,
+                                    "slots": len(slots), "materials": len(names)})
+                mesh = id_block.data if id_block.type == 'MESH' else None
+                if mesh is None or mesh.name in mesh_rows or not (names & preset_materials):
+                    continue
+                uv_names = mesh.uv_layers.keys()
+                mesh_rows[mesh.name] = {
+                    "mesh": mesh.name,
+                    "object": id_block.name,
+                    "faces": len(mesh.polygons),
+                    "uv_layers": list(uv_names),
+                    "has_detail_uv": any(name.endswith("_Detail") for name in uv_names),
+                }
+
+        if prop_count:
+            prop_rows.append({"collection": attr, "datablocks": prop_blocks,
+                              "properties": prop_count, "bytes": prop_bytes})
+
+    # Image headers: one read per unique file, in parallel (plain file I/O)
+    def read(key):
+        if isinstance(key, str):
+            return key, core.textures.read_image_header(key), os.path.exists(key)
+        return key, core.textures.parse_image_header(key[1]), True
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for key, info, exists in pool.map(read, list(header_jobs)):
+            for entry in header_jobs[key]:
+                entry["missing"] = not exists
+                _apply_header(entry, info)
+    instrumentation.count("image_headers_read", len(header_jobs))
+
+    # Memory of unique files: images sharing a file are uploaded once per
+    # image datablock, but the duplicates are worth listing separately
+    unique_files = {}
+    for entry in image_rows:
+        unique_files.setdefault(entry.get("path") or entry["name"], entry)
+    duplicates = len(image_rows) - len(unique_files)
+
+    image_rows.sort(key=lambda row: row["bytes"], reverse=True)
+    object_rows.sort(key=lambda row: (row["slots"], row["materials"]), reverse=True)
+    missing_detail = sorted(
+        (row for row in mesh_rows.values() if not row["has_detail_uv"]),
+        key=lambda row: row["faces"], reverse=True,
+    )
+    prop_rows.sort(key=lambda row: row["bytes"], reverse=True)
+    instrumentation.count("objects_audited", len(data.objects))
+
+    totals = {
+        "objects": len(data.objects),
+        "objects_with_materials": len(object_rows),
+        "material_slots": sum(row["slots"] for row in object_rows),
+        "max_materials_per_object": object_rows[0]["slots"] if object_rows else 0,
+        "materials": len(data.materials),
+        "unconverted_msfs_materials": len(unconverted),
+        "images": len(image_rows),
+        "unique_images": len(unique_files),
+        "duplicate_image_datablocks": duplicates,
+        "missing_image_files": sum(1 for row in image_rows if row["missing"]),
+        "orphan_images": sum(1 for row in image_rows if row["orphan"]),
+        "texture_bytes": sum(row["bytes"] for row in image_rows),
+        "unique_texture_bytes": sum(row["bytes"] for row in unique_files.values()),
+        "orphan_texture_bytes": sum(row["bytes"] for row in image_rows if row["orphan"]),
+        "non_aliza_properties": sum(row["properties"] for row in prop_rows),
+        "non_aliza_property_bytes": sum(row["bytes"] for row in prop_rows),
+        "meshes_missing_detail_uv": len(missing_detail),
+    }
+    return {
+        "file": data.filepath,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seconds": time.perf_counter() - start,
+        "totals": totals,
+        "images": image_rows,
+        "objects": object_rows,
+        "unconverted_msfs_materials": sorted(unconverted),
+        "meshes_missing_detail_uv": missing_detail,
+        "custom_properties": prop_rows,
+    }
+
+
+def _format_bytes(size):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024.0 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
+
+
+def _html_table(title, rows, columns):
+    """columns: (header, key, formatter or None)"""
+    out = [f"<h2>{html.escape(title)} ({len(rows)})</h2>"]
+    if not rows:
+        out.append("<p>None.</p>")
+        return out
+    out.append("<table><tr>" + "".join(f"<th>{html.escape(header)}</th>" for header, _, _ in columns) + "</tr>")
+    for row in rows[:HTML_ROWS]:
+        cells = []
+        for _, key, fmt in columns:
+            value = row[key] if isinstance(row, dict) else row
+            cells.append(f"<td>{html.escape(str(fmt(value) if fmt else value))}</td>")
+        out.append("<tr>" + "".join(cells) + "</tr>")
+    out.append("</table>")
+    if len(rows) > HTML_ROWS:
+        out.append(f"<p>… {len(rows) - HTML_ROWS} more in the JSON report.</p>")
+    return out
+
+
+def write_html(report, path):
+    totals = report["totals"]
+    byte_keys = {"texture_bytes", "unique_texture_bytes", "orphan_texture_bytes", "non_aliza_property_bytes"}
+    out = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>BleLIZA audit</title>",
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:1em}"
+        "td,th{border:1px solid #ccc;padding:2px 8px;text-align:left}th{background:#eee}</style></head><body>",
+        f"<h1>BleLIZA audit: {html.escape(os.path.basename(report['file']) or 'unsaved file')}</h1>",
+        f"<p>{html.escape(report['created'])}, gathered in {report['seconds']:.2f} s</p>",
+        "<table>",
+    ]
+    for key, value in totals.items():
+        shown = _format_bytes(value) if key in byte_keys else value
+        out.append(f"<tr><th>{html.escape(key.replace('_', ' '))}</th><td>{html.escape(str(shown))}</td></tr>")
+    out.append("</table>")
+
+    out += _html_table("Images by estimated texture memory", report["images"], (
+        ("image", "name", None), ("format", "format", None), ("width", "width", None),
+        ("height", "height", None), ("mips", "mips", None), ("memory", "bytes", _format_bytes),
+        ("users", "users", None), ("orphan", "orphan", None), ("missing", "missing", None),
+        ("file", "filepath", None),
+    ))
+    out += _html_table("Objects by material slots", report["objects"], (
+        ("object", "name", None), ("type", "type", None), ("slots", "slots", None),
+        ("unique materials", "materials", None),
+    ))
+    out += _html_table("Meshes missing the Detail UV layer", report["meshes_missing_detail_uv"], (
+        ("mesh", "mesh", None), ("object", "object", None), ("faces", "faces", None),
+        ("UV layers", "uv_layers", ", ".join),
+    ))
+    out += _html_table("Non-ALIZA custom properties", report["custom_properties"], (
+        ("collection", "collection", None), ("datablocks", "datablocks", None),
+        ("properties", "properties", None), ("size", "bytes", _format_bytes),
+    ))
+    out += _html_table("Unconverted MSFS materials", report["unconverted_msfs_materials"], (
+        ("material", None, None),
+    ))
+    out.append("</body></html>")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(out))
+
+
+class OBJECT_OT_bleliza_audit_scene(bpy.types.Operator):
+    bl_idname = "object.bleliza_audit_scene"
+    bl_label = "Audit Scene for ALIZA Export"
+    bl_description = (
+        "Collects material, image, texture memory, custom property and Detail UV totals for the whole "
+        "file in one pass and writes a JSON/HTML report sorted by cost"
+    )
+    bl_options = {'REGISTER'}
+
+    report_format: bpy.props.EnumProperty(
+        name="Report",
+        items=[
+            ('BOTH', "JSON + HTML", "Write both reports"),
+            ('JSON', "JSON", "Write the JSON report only"),
+            ('HTML', "HTML", "Write the HTML report only"),
+            ('NONE', "Console Only", "Only print the totals"),
+        ],
+        default='BOTH'
+    )
+    filepath: bpy.props.StringProperty(
+        name="Report Path",
+        description="Report file path without extension (empty: the profiling report folder)",
+        default="",
+        subtype='FILE_PATH'
+    )
+    keep_pattern: bpy.props.StringProperty(
+        name="Keep Pattern",
+        description="Regular expression (case-insensitive); custom properties matching it are ALIZA properties",
+        default="aliza"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        try:
+            keep = re.compile(self.keep_pattern, re.IGNORECASE).search
+        except re.error as e:
+            self.report({'ERROR'}, f"Invalid keep pattern '{self.keep_pattern}': {e}")
+            return {'CANCELLED'}
+
+        report = gather_audit(keep)
+        totals = report["totals"]
+
+        print(f"--- BleLIZA audit ({report['seconds'] * 1000.0:.1f} ms) ---")
+        for key, value in totals.items():
+            print(f"  {key:<28} {value}")
+
+        written = []
+        if self.report_format != 'NONE':
+            if self.filepath:
+                base = os.path.splitext(bpy.path.abspath(self.filepath))[0]
+            else:
+                stamp = report["created"].replace(":", "").replace("-", "")
+                base = os.path.join(instrumentation.report_dir(context), f"bleliza_audit_{stamp}")
+            try:
+                if self.report_format in ('BOTH', 'JSON'):
+                    with open(base + ".json", "w", encoding="utf-8") as f:
+                        json.dump(report, f, indent=2)
+                    written.append(base + ".json")
+                if self.report_format in ('BOTH', 'HTML'):
+                    write_html(report, base + ".html")
+                    written.append(base + ".html")
+            except OSError as e:
+                self.report({'ERROR'}, f"Could not write the audit report: {e}")
+                return {'CANCELLED'}
+
+        self.report(
+            {'INFO'},
+            f"{totals['unique_images']} unique image(s), ~{_format_bytes(totals['unique_texture_bytes'])} texture memory, "
+            f"{totals['orphan_images']} orphan(s), {totals['unconverted_msfs_materials']} unconverted material(s), "
+            f"{totals['meshes_missing_detail_uv']} mesh(es) without Detail UV"
+            + (f". Report: {', '.join(os.path.basename(path) for path in written)}" if written else ""),
+        )
+        return {'FINISHED'}
@@ -0,0 +1,38 @@
+"""
+bpy-free computational core of BleLIZA.
+
+The modules in this package work on plain Python values and NumPy arrays
+only, so they can be imported, tested and benchmarked with a regular
+Python interpreter (CI machines, worker processes) as well as inside
+Blender, where the operators read mesh/material data with foreach_get,
+call these kernels and write the results back.
+
+    islands  – connected components, face and vertex islands, per-island reductions
+    grid     – row-major ordering of grid tiles
+    names    – name matching and texture filename resolution
+    uv       – Detail UV scaling
+    textures – image file headers and texture memory estimates
+    dds      – BC1/BC3/BC5 DDS encoder and decoder
+    images   – pixel resampling (box, Lanczos), content analysis and PNG writing
+    workers  – process pool with thread fallback for the image work
+    files    – path normalisation and content-identical file detection
+    slots    – material slot compaction (material_index rewrites)
+    atlas    – rectangle packing, atlas pixel blits and UV remapping
+
+The submodules are imported on first access (core.islands, ...), so
+importing the package does not import NumPy.
+"""
+
+import importlib
+
+_SUBMODULES = ("islands", "grid", "names", "uv", "textures", "dds", "images", "workers", "files", "slots", "atlas")
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES))
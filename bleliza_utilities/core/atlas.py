@@ -0,0 +1,118 @@
+import numpy as np
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Texture atlases
+#
+# Pixel arrays are (height, width, 4) in Blender's order: row 0 is the
+# bottom row, like UV v = 0.  Rectangles are packed on shelves (tallest
+# first) into the smallest power-of-two atlas they fit in; each tile gets
+# `padding` pixels of its own edge pixels around it, so mipmaps and
+# bilinear filtering do not bleed neighbouring tiles into it.
+# ─────────────────────────────────────────────────────────────────────────────
+def next_power_of_two(value):
+    return 1 << max(0, int(value) - 1).bit_length()
+
+
+def _shelf_pack(sizes, order, width, height):
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for index in order:
+        w, h = sizes[index]
+        if x + w > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if w > width or y + h > height:
+            continue
+        positions[index] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions
+
+
+def pack_rectangles(sizes, padding=0, max_size=4096):
+    """Pack (width, height) rectangles into one power-of-two atlas.
+
+    Returns (atlas_width, atlas_height, positions): positions holds the
+    bottom-left pixel (x, y) of every rectangle's content (inside its
+    padding), or None for rectangles that do not fit a max_size×max_size
+    atlas."""
+
+    padded = [(w + 2 * padding, h + 2 * padding) for w, h in sizes]
+    if not padded:
+        return 0, 0, []
+    # Atlases are powers of two: the largest one within max_size
+    max_size = 1 << max(1, int(max_size)).bit_length() - 1
+    order = sorted(range(len(padded)), key=lambda i: (-padded[i][1], -padded[i][0]))
+
+    area = sum(w * h for w, h in padded)
+    width = next_power_of_two(max(max(w for w, _ in padded), area ** 0.5))
+    height = next_power_of_two(max(h for _, h in padded))
+    width, height = min(width, max_size), min(height, max_size)
+    while True:
+        positions = _shelf_pack(padded, order, width, height)
+        if all(position is not None for position in positions) or (width >= max_size and height >= max_size):
+            break
+        # Grow the shorter side; atlases stay close to square
+        if (height < width and height < max_size) or width >= max_size:
+            height *= 2
+        else:
+            width *= 2
+
+    positions = [None if p is None else (p[0] + padding, p[1] + padding) for p in positions]
+    return width, height, positions
+
+
+def fit_pixels(pixels, width, height):
+    """Nearest-neighbour resample of (h, w, c) *pixels* to width×height."""
+    src_height, src_width = pixels.shape[:2]
+    if (src_width, src_height) == (width, height):
+        return pixels
+    rows = (np.arange(height) * src_height // height)
+    cols = (np.arange(width) * src_width // width)
+    return pixels[rows[:, None], cols[None, :]]
+
+
+def blit(atlas, pixels, x, y, padding=0):
+    """Copy (h, w, 4) *pixels* into *atlas* at (x, y), surrounded by
+    *padding* pixels of repeated edge pixels (clipped at the atlas
+    border)."""
+    height, width = pixels.shape[:2]
+    if padding:
+        pixels = np.pad(pixels, ((padding, padding), (padding, padding), (0, 0)), mode="edge")
+        x, y = x - padding, y - padding
+    atlas_height, atlas_width = atlas.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + pixels.shape[1], atlas_width), min(y + pixels.shape[0], atlas_height)
+    atlas[y0:y1, x0:x1] = pixels[y0 - y:y1 - y, x0 - x:x1 - x]
+
+
+def uv_rects(sizes, positions, atlas_width, atlas_height):
+    """(offset, scale) arrays, shape (n, 2), mapping the unit UV square of
+    every rectangle onto its place in the atlas (NaN for unplaced ones)."""
+    offset = np.full((len(sizes), 2), np.nan)
+    scale = np.full((len(sizes), 2), np.nan)
+    for index, ((w, h), position) in enumerate(zip(sizes, positions)):
+        if position is not None:
+            offset[index] = (position[0] / atlas_width, position[1] / atlas_height)
+            scale[index] = (w / atlas_width, h / atlas_height)
+    return offset, scale
+
+
+def remap_uvs(uv, loop_tile, offset, scale):
+    """Map the (n, 2) *uv* of every loop into its tile: uv * scale + offset
+    for loops with loop_tile >= 0; loops with -1 are left unchanged."""
+    uv = np.array(uv, dtype=np.float32, copy=True)
+    mask = loop_tile >= 0
+    tiles = loop_tile[mask]
+    uv[mask] = uv[mask] * scale[tiles] + offset[tiles]
+    return uv
+
+
+def uv_bounds(uv, loop_slot, slot_count):
+    """Per-slot (min, max) UV, shape (slot_count, 2) each; +inf/-inf for
+    slots without loops."""
+    low = np.full((slot_count, 2), np.inf)
+    high = np.full((slot_count, 2), -np.inf)
+    np.minimum.at(low, loop_slot, uv)
+    np.maximum.at(high, loop_slot, uv)
+    return low, high
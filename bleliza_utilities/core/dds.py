@@ -0,0 +1,327 @@
+import struct
+
+import numpy as np
+
+from . import files, textures
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Block-compressed DDS encoder (BC1 / BC3 / BC5)
+#
+# Pixels are (height, width, 4) uint8 arrays with the top row first, the
+# order DDS files store them in.  Every mip level is cut into 4×4 blocks
+# (edge pixels repeated to a multiple of 4) and encoded in chunks of
+# CHUNK_BLOCKS blocks, all blocks of a chunk at once:
+#
+#   colour (BC1, BC3)  endpoints on the principal axis of the block's
+#                      colours, indices by projection onto the quantised
+#                      endpoints
+#   alpha, R/G (BC3 alpha, BC5)  BC4 blocks: min/max endpoints, 8-level
+#                      indices by rounding
+#
+# That is a fast single-pass encoder, not an exhaustive one; quality is in
+# line with the "fast" settings of the usual texture tools.
+# ─────────────────────────────────────────────────────────────────────────────
+CHUNK_BLOCKS = 1 << 16
+
+FOURCC = {"BC1": b"DXT1", "BC3": b"DXT5", "BC5": b"ATI2"}
+BLOCK_BYTES = {"BC1": 8, "BC3": 16, "BC5": 16}
+FORMAT_BY_FOURCC = {"DXT1": "BC1", "DXT5": "BC3", "ATI2": "BC5", "BC5U": "BC5"}
+
+_DDSD_CAPS, _DDSD_HEIGHT, _DDSD_WIDTH = 0x1, 0x2, 0x4
+_DDSD_PIXELFORMAT, _DDSD_MIPMAPCOUNT, _DDSD_LINEARSIZE = 0x1000, 0x20000, 0x80000
+_DDPF_FOURCC = 0x4
+_DDSCAPS_COMPLEX, _DDSCAPS_TEXTURE, _DDSCAPS_MIPMAP = 0x8, 0x1000, 0x400000
+
+# Palette position (0 = second endpoint ... 3 or 7 = first endpoint) -> index
+_BC1_INDEX = np.array([1, 3, 2, 0], dtype=np.uint32)
+_BC4_INDEX = np.array([1, 7, 6, 5, 4, 3, 2, 0], dtype=np.uint64)
+_SHIFT_2 = np.arange(16, dtype=np.uint32) * 2
+_SHIFT_3 = np.arange(16, dtype=np.uint64) * 3
+
+
+def to_blocks(pixels):
+    """(h, w, c) -> (blocks, 16, c), blocks in row order, edge-padded to a
+    multiple of 4 pixels."""
+    height, width, channels = pixels.shape
+    pad_y, pad_x = -height % 4, -width % 4
+    if pad_y or pad_x:
+        pixels = np.pad(pixels, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge")
+    height, width = pixels.shape[:2]
+    blocks = pixels.reshape(height // 4, 4, width // 4, 4, channels).swapaxes(1, 2)
+    return blocks.reshape(-1, 16, channels)
+
+
+def _quantize_565(colors):
+    colors = np.clip(colors, 0.0, 255.0)
+    r = np.rint(colors[:, 0] * (31 / 255)).astype(np.uint16)
+    g = np.rint(colors[:, 1] * (63 / 255)).astype(np.uint16)
+    b = np.rint(colors[:, 2] * (31 / 255)).astype(np.uint16)
+    return (r << 11) | (g << 5) | b
+
+
+def _expand_565(packed):
+    r = (packed >> 11) & 31
+    g = (packed >> 5) & 63
+    b = packed & 31
+    return np.stack(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)), axis=1).astype(np.float32)
+
+
+def encode_color_blocks(rgb):
+    """(n, 16, 3) uint8 -> (n, 8) uint8 BC1 colour blocks (4-colour mode)."""
+    rgb = rgb.astype(np.float32)
+    mean = rgb.mean(axis=1)
+    centered = rgb - mean[:, None, :]
+
+    # Principal axis by power iteration on the 3×3 covariance matrices
+    covariance = np.einsum("nki,nkj->nij", centered, centered)
+    axis = rgb.max(axis=1) - rgb.min(axis=1) + 1e-3
+    for _ in range(4):
+        axis = np.einsum("nij,nj->ni", covariance, axis)
+        axis /= np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-12)
+    projection = np.einsum("nki,ni->nk", centered, axis)
+    c0 = _quantize_565(mean + axis * projection.max(axis=1, keepdims=True))
+    c1 = _quantize_565(mean + axis * projection.min(axis=1, keepdims=True))
+
+    # 4-colour mode needs c0 > c1
+    swap = c0 < c1
+    c0[swap], c1[swap] = c1[swap], c0[swap]
+
+    start = _expand_565(c1)
+    direction = _expand_565(c0) - start
+    length = np.einsum("ni,ni->n", direction, direction)
+    t = np.einsum("nki,ni->nk", rgb - start[:, None, :], direction) / np.maximum(length, 1e-12)[:, None]
+    levels = np.clip(np.rint(t * 3), 0, 3).astype(np.intp)
+    indices = _BC1_INDEX[levels]
+    indices[c0 == c1] = 0
+
+    out = np.empty(len(rgb), dtype=[("c0", "<u2"), ("c1", "<u2"), ("indices", "<u4")])
+    out["c0"], out["c1"] = c0, c1
+    out["indices"] = np.bitwise_or.reduce(indices << _SHIFT_2, axis=1)
+    return out.view(np.uint8).reshape(-1, 8)
+
+
+def encode_bc4_blocks(values):
+    """(n, 16) uint8 -> (n, 8) uint8 BC4 blocks (8-level mode)."""
+    a0 = values.max(axis=1)
+    a1 = values.min(axis=1)
+    span = (a0.astype(np.float32) - a1)[:, None]
+    t = (values - a1[:, None]) / np.maximum(span, 1e-12)
+    levels = np.clip(np.rint(t * 7), 0, 7).astype(np.intp)
+    indices = _BC4_INDEX[levels]
+    indices[a0 == a1] = 0
+
+    bits = np.bitwise_or.reduce(indices << _SHIFT_3, axis=1).astype("<u8")
+    out = np.empty((len(values), 8), dtype=np.uint8)
+    out[:, 0], out[:, 1] = a0, a1
+    out[:, 2:] = bits.view(np.uint8).reshape(-1, 8)[:, :6]
+    return out
+
+
+def encode_blocks(blocks, fmt):
+    """(n, 16, 4) uint8 blocks -> bytes of *fmt* ('BC1', 'BC3', 'BC5')."""
+    chunks = []
+    for start in range(0, len(blocks), CHUNK_BLOCKS):
+        chunk = blocks[start:start + CHUNK_BLOCKS]
+        if fmt == "BC1":
+            chunks.append(encode_color_blocks(chunk[..., :3]))
+        elif fmt == "BC3":
+            chunks.append(np.hstack((encode_bc4_blocks(chunk[..., 3]), encode_color_blocks(chunk[..., :3]))))
+        elif fmt == "BC5":
+            chunks.append(np.hstack((encode_bc4_blocks(chunk[..., 0]), encode_bc4_blocks(chunk[..., 1]))))
+        else:
+            raise ValueError(f"Unsupported DDS format '{fmt}'")
+    return b"".join(chunk.tobytes() for chunk in chunks)
+
+
+def _halve_axis(values, axis):
+    """Box-filter *values* down to max(1, n // 2) along *axis*; an odd last
+    sample is averaged into the last output sample (3-tap box)."""
+    size = values.shape[axis]
+    if size == 1:
+        return values
+    half = size // 2
+    values = np.moveaxis(values, axis, 0)
+    out = (values[0:2 * half:2] + values[1:2 * half:2]) * 0.5
+    if size % 2:
+        out[-1] = (values[-3] + values[-2] + values[-1]) * (1.0 / 3.0)
+    return np.moveaxis(out, 0, axis)
+
+
+def downsample(pixels):
+    """Next mip level of (h, w, c) uint8 pixels: max(1, h // 2) ×
+    max(1, w // 2) as in the DDS mip chain (box filter; an odd last
+    row/column is folded into the last output row/column)."""
+    values = _halve_axis(_halve_axis(pixels.astype(np.float32), 0), 1)
+    return np.rint(values).astype(np.uint8)
+
+
+def dds_header(width, height, mips, fmt):
+    """The 128-byte DDS header of a *fmt* texture with *mips* levels."""
+    flags = _DDSD_CAPS | _DDSD_HEIGHT | _DDSD_WIDTH | _DDSD_PIXELFORMAT | _DDSD_LINEARSIZE
+    caps = _DDSCAPS_TEXTURE
+    if mips > 1:
+        flags |= _DDSD_MIPMAPCOUNT
+        caps |= _DDSCAPS_COMPLEX | _DDSCAPS_MIPMAP
+    linear_size = max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * BLOCK_BYTES[fmt]
+    header = struct.pack("<4s7I", b"DDS ", 124, flags, height, width, linear_size, 0, mips)
+    header += b"\0" * 44
+    header += struct.pack("<2I4s5I", 32, _DDPF_FOURCC, FOURCC[fmt], 0, 0, 0, 0, 0)
+    header += struct.pack("<5I", caps, 0, 0, 0, 0)
+    return header
+
+
+def choose_format(pixels):
+    """'BC3' for pixels with any transparency, 'BC1' otherwise."""
+    return "BC3" if pixels.shape[2] == 4 and (pixels[..., 3] < 255).any() else "BC1"
+
+
+def encode_dds(pixels, fmt="AUTO", mipmaps=True):
+    """Encode (h, w, 4) uint8 *pixels* (top row first) as a DDS file with
+    a full mip chain.  *fmt* is 'BC1', 'BC3', 'BC5' or 'AUTO' (BC1/BC3 by
+    alpha)."""
+    if fmt == "AUTO":
+        fmt = choose_format(pixels)
+    height, width = pixels.shape[:2]
+    levels = [pixels]
+    while mipmaps and max(levels[-1].shape[:2]) > 1:
+        levels.append(downsample(levels[-1]))
+    body = b"".join(encode_blocks(to_blocks(level), fmt) for level in levels)
+    return dds_header(width, height, len(levels), fmt) + body
+
+
+def write_dds(path, pixels, fmt="AUTO", mipmaps=True):
+    """encode_dds() to *path*, written to a temporary file first so that
+    readers never see a partial file.  Returns (path, error message or
+    None)."""
+    try:
+        files.write_atomic(path, encode_dds(pixels, fmt, mipmaps))
+    except (OSError, ValueError) as e:
+        return path, str(e)
+    return path, None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Decoder (single mip levels; for analysing existing DDS files without
+# loading them into Blender)
+# ─────────────────────────────────────────────────────────────────────────────
+_SHIFT_2_U64 = _SHIFT_2.astype(np.uint64)
+
+
+def decode_color_blocks(blocks, punch_through=True):
+    """(n, 8) uint8 BC1 colour blocks -> (n, 16, 4) uint8.  With
+    *punch_through*, blocks with c0 <= c1 use the 3-colour + transparent
+    mode (BC1); BC3 colour blocks always use 4 colours."""
+    words = blocks.view("<u2").reshape(-1, 4)
+    c0, c1 = words[:, 0], words[:, 1]
+    p0, p1 = _expand_565(c0), _expand_565(c1)
+    four = c0 > c1 if punch_through else np.ones(len(blocks), dtype=bool)
+    p2 = np.where(four[:, None], (2 * p0 + p1) / 3, (p0 + p1) / 2)
+    p3 = np.where(four[:, None], (p0 + 2 * p1) / 3, 0.0)
+    palette = np.stack((p0, p1, p2, p3), axis=1)
+    alpha = np.full((len(blocks), 4), 255.0)
+    alpha[~four, 3] = 0.0
+
+    indices = (blocks[:, 4:8].copy().view("<u4").astype(np.uint64) >> _SHIFT_2_U64) & 3
+    indices = indices.astype(np.intp)
+    rgb = np.take_along_axis(palette, indices[..., None].repeat(3, axis=2), axis=1)
+    a = np.take_along_axis(alpha, indices, axis=1)
+    return np.clip(np.rint(np.concatenate((rgb, a[..., None]), axis=2)), 0, 255).astype(np.uint8)
+
+
+def decode_bc4_blocks(blocks):
+    """(n, 8) uint8 BC4 blocks -> (n, 16) uint8."""
+    a0, a1 = blocks[:, 0].astype(np.float32), blocks[:, 1].astype(np.float32)
+    eight = a0 > a1
+    levels = [a0, a1]
+    for i in range(2, 8):
+        six_value = np.where(i < 6, ((6 - i + 1) * a0 + (i - 1) * a1) / 5, 255.0 if i == 7 else 0.0)
+        levels.append(np.where(eight, ((8 - i) * a0 + (i - 1) * a1) / 7, six_value))
+    palette = np.stack(levels, axis=1)
+    bits = np.zeros((len(blocks), 8), dtype=np.uint8)
+    bits[:, :6] = blocks[:, 2:8]
+    indices = ((bits.view("<u8") >> _SHIFT_3) & 7).astype(np.intp)
+    return np.clip(np.rint(np.take_along_axis(palette, indices, axis=1)), 0, 255).astype(np.uint8)
+
+
+def from_blocks(blocks, width, height):
+    """Inverse of to_blocks(): (n, 16, c) -> (height, width, c)."""
+    block_rows, block_cols = (height + 3) // 4, (width + 3) // 4
+    channels = blocks.shape[2]
+    pixels = blocks.reshape(block_rows, block_cols, 4, 4, channels).swapaxes(1, 2)
+    return pixels.reshape(block_rows * 4, block_cols * 4, channels)[:height, :width]
+
+
+def mip_levels(width, height, mips, fmt):
+    """(width, height, byte offset) of every mip level of a *fmt* DDS file
+    with a top level of width×height."""
+    levels, offset = [], 128
+    for _ in range(max(1, mips)):
+        levels.append((width, height, offset))
+        offset += ((width + 3) // 4) * ((height + 3) // 4) * BLOCK_BYTES[fmt]
+        width, height = max(1, width // 2), max(1, height // 2)
+    return levels
+
+
+def _decode_level(body, fmt, width, height):
+    count = ((width + 3) // 4) * ((height + 3) // 4)
+    body = np.frombuffer(body, dtype=np.uint8, count=count * BLOCK_BYTES[fmt]).reshape(count, -1)
+
+    if fmt == "BC1":
+        blocks = decode_color_blocks(body)
+    elif fmt == "BC3":
+        blocks = decode_color_blocks(np.ascontiguousarray(body[:, 8:]), punch_through=False)
+        blocks[..., 3] = decode_bc4_blocks(body[:, :8])
+    else:
+        x = decode_bc4_blocks(body[:, :8])
+        y = decode_bc4_blocks(np.ascontiguousarray(body[:, 8:]))
+        xy = np.stack((x, y), axis=-1).astype(np.float32) * (2.0 / 255.0) - 1.0
+        z = np.sqrt(np.clip(1.0 - (xy ** 2).sum(axis=-1), 0.0, 1.0))
+        blocks = np.empty((count, 16, 4), dtype=np.uint8)
+        blocks[..., 0], blocks[..., 1] = x, y
+        blocks[..., 2] = np.rint((z + 1.0) * 127.5).astype(np.uint8)
+        blocks[..., 3] = 255
+    return from_blocks(blocks, width, height)
+
+
+def _header_format(head):
+    info = textures.parse_image_header(head)
+    if info is None or info["format"] != 'DDS':
+        return None, None
+    return info, FORMAT_BY_FOURCC.get(info.get("fourcc"))
+
+
+def decode_dds(data, level=0):
+    """(h, w, 4) uint8 pixels (top row first) of mip *level* (clamped to
+    the last one) of the BC1/BC3/BC5 DDS file *data*; None for other
+    formats.  BC5 blue is reconstructed as the Z of a unit normal."""
+    info, fmt = _header_format(data[:textures.HEADER_BYTES])
+    if fmt is None:
+        return None
+    levels = mip_levels(info["width"], info["height"], info["mips"], fmt)
+    width, height, offset = levels[min(level, len(levels) - 1)]
+    return _decode_level(data[offset:], fmt, width, height)
+
+
+def read_dds(path, min_size=None):
+    """Decoded pixels of the top mip level of the DDS file at *path* (see
+    decode_dds()); None if it cannot be read or decoded.  With *min_size*,
+    the smallest mip level whose sides are both at least *min_size* is
+    read instead, and only that level's bytes are read from the file."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(textures.HEADER_BYTES)
+            info, fmt = _header_format(head)
+            if fmt is None:
+                return None
+            levels = mip_levels(info["width"], info["height"], info["mips"], fmt)
+            if min_size is None:
+                width, height, offset = levels[0]
+            else:
+                fitting = [level for level in levels if min(level[:2]) >= min_size] or levels[:1]
+                width, height, offset = fitting[-1]
+            f.seek(offset)
+            size = ((width + 3) // 4) * ((height + 3) // 4) * BLOCK_BYTES[fmt]
+            return _decode_level(f.read(size), fmt, width, height)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,64 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+def normalize_path(path):
+    """Canonical form of an absolute file path for comparisons: symlinks,
+    '..' and '.' resolved, case folded where the file system is case
+    insensitive (Windows)."""
+    return os.path.normcase(os.path.realpath(path))
+
+
+def write_atomic(path, data):
+    """Write *data* to a temporary file next to *path* and rename it into
+    place, so that *path* is either the old or the complete new file."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """BLAKE2b hex digest of the file at *path*, or None if it cannot be
+    read."""
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def identical_files(paths, workers=8):
+    """Group *paths* (distinct files) by content.
+
+    Only files whose size matches another file's are hashed, in a thread
+    pool of *workers*.  Returns (groups, hashed): groups is a list of lists
+    of paths with identical content (two or more each), hashed the number
+    of files read."""
+
+    by_size = {}
+    for path in paths:
+        try:
+            by_size.setdefault(os.path.getsize(path), []).append(path)
+        except OSError:
+            continue
+    candidates = [(size, path) for size, same_size in by_size.items() if len(same_size) > 1 for path in same_size]
+    if not candidates:
+        return [], 0
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        digests = list(pool.map(file_digest, [path for _, path in candidates]))
+
+    by_content = {}
+    for (size, path), digest in zip(candidates, digests):
+        if digest is not None:
+            by_content.setdefault((size, digest), []).append(path)
+    return [group for group in by_content.values() if len(group) > 1], len(candidates)
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Grid tiles
+#
+# Tiles are counted from the top-left tile in top view: left to right, then
+# row by row downwards.  Column = X index, row = Y index.
+# ─────────────────────────────────────────────────────────────────────────────
+def grid_order(centers):
+    """Return the face indices sorted into grid order for an (n, 2) or
+    (n, 3) array of world-space face centers: largest Y first, then
+    smallest X first."""
+    centers = np.asarray(centers, dtype=np.float64).reshape(len(centers), -1)
+    # lexsort sorts by the last key first
+    return np.lexsort((centers[:, 0], -centers[:, 1]))
+
+
+def grid_cells(count, columns):
+    """(rows, cols) index arrays of the first *count* tiles in grid order."""
+    index = np.arange(count)
+    return index // columns, index % columns
@@ -0,0 +1,173 @@
+import struct
+import zlib
+
+import numpy as np
+
+from . import dds, files
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Resampling
+#
+# Separable filters applied one axis at a time (rows first, which shrinks
+# the data the second pass works on).  Every output pixel of an axis is a
+# weighted sum of a fixed number of source pixels ("taps"), so the cost is
+# O(pixels × taps) and only the (smaller) output is held as float32.
+# 'BOX' averages the exact source area every output pixel covers (integer
+# factors take a plain block mean); 'LANCZOS' is Lanczos-3 stretched by
+# the reduction factor.  Pixels are (height, width, channels) uint8, any
+# row order.
+# ─────────────────────────────────────────────────────────────────────────────
+LANCZOS_RADIUS = 3
+
+
+def _taps(source, target, kind):
+    """(indices, weights), both (target, taps): the source pixels every
+    output pixel is made of and their normalised weights.  Taps outside
+    the image get weight 0."""
+    scale = source / target
+    output = np.arange(target)
+    if kind == 'BOX':
+        start = output * scale
+        indices = np.floor(start).astype(np.int64)[:, None] + np.arange(int(np.ceil(scale)) + 1)
+        weights = np.clip(np.minimum(start[:, None] + scale, indices + 1) - np.maximum(start[:, None], indices), 0.0, None)
+    elif kind == 'LANCZOS':
+        support = max(scale, 1.0)
+        center = (output + 0.5) * scale - 0.5
+        radius = LANCZOS_RADIUS * support
+        indices = np.floor(center - radius).astype(np.int64)[:, None] + 1 + np.arange(int(np.ceil(2 * radius)) + 1)
+        x = (indices - center[:, None]) / support
+        weights = np.sinc(x) * np.sinc(x / LANCZOS_RADIUS)
+        weights[np.abs(x) >= LANCZOS_RADIUS] = 0.0
+    else:
+        raise ValueError(f"Unknown resampling filter '{kind}'")
+    weights[(indices < 0) | (indices >= source)] = 0.0
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.clip(indices, 0, source - 1), weights.astype(np.float32)
+
+
+def _filter_axis(values, source, target, kind, axis):
+    """*values* resampled from *source* to *target* pixels along *axis*,
+    as float32."""
+    indices, weights = _taps(source, target, kind)
+    shape = [1] * values.ndim
+    shape[axis] = target
+    result = np.zeros(values.shape[:axis] + (target,) + values.shape[axis + 1:], dtype=np.float32)
+    for tap in range(indices.shape[1]):
+        if weights[:, tap].any():
+            result += np.take(values, indices[:, tap], axis=axis) * weights[:, tap].reshape(shape)
+    return result
+
+
+def resample(pixels, width, height, kind='LANCZOS'):
+    """*pixels* resampled to width×height with filter *kind*."""
+    src_height, src_width = pixels.shape[:2]
+    if (src_width, src_height) == (width, height):
+        return pixels
+    if kind == 'BOX' and src_height % height == 0 and src_width % width == 0:
+        blocks = pixels.reshape(height, src_height // height, width, src_width // width, -1)
+        values = blocks.mean(axis=(1, 3), dtype=np.float32)
+    else:
+        values = pixels
+        if src_height != height:
+            values = _filter_axis(values, src_height, height, kind, 0)
+        if src_width != width:
+            values = _filter_axis(values, src_width, width, kind, 1)
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+
+def renormalize(pixels):
+    """Rescale the RGB vectors of a tangent-space normal map to unit
+    length (filtering shortens them)."""
+    vectors = pixels[..., :3].astype(np.float32) * (2.0 / 255.0) - 1.0
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-6)
+    out = pixels.copy()
+    out[..., :3] = np.clip(np.rint((vectors + 1.0) * 127.5), 0, 255).astype(np.uint8)
+    return out
+
+
+def capped_size(width, height, limit, multiple=1):
+    """(width, height) scaled down so that neither exceeds *limit*,
+    keeping the aspect ratio; unchanged if already within it.  The sides
+    of a scaled size are rounded to a *multiple* (4 for block-compressed
+    DDS, so that no block of the top level is padded)."""
+    if max(width, height) <= limit:
+        return width, height
+    scale = limit / max(width, height)
+    largest = max(multiple, limit // multiple * multiple)
+    return tuple(
+        min(largest, max(multiple, round(side * scale / multiple) * multiple)) for side in (width, height)
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Content analysis
+# ─────────────────────────────────────────────────────────────────────────────
+def channel_constants(pixels, tolerance=2):
+    """Per-channel (values, constant) of (h, w, c) uint8 *pixels*: the mean
+    of every channel in 0..1 and whether its values stay within
+    *tolerance* levels of each other."""
+    flat = pixels.reshape(-1, pixels.shape[-1])
+    spread = flat.max(axis=0).astype(np.int32) - flat.min(axis=0)
+    return flat.mean(axis=0) / 255.0, spread <= tolerance
+
+
+def is_flat_normal(values, tolerance=2):
+    """Whether the RGB *values* (0..1) encode the unperturbed tangent-space
+    normal (0.5, 0.5, 1)."""
+    margin = (tolerance + 1) / 255.0
+    return abs(values[0] - 0.5) <= margin and abs(values[1] - 0.5) <= margin and values[2] >= 1.0 - margin
+
+
+def srgb_to_linear(values):
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+
+def summarize_pixels(pixels, thumbnail_size=0):
+    """(mean RGBA in 0..1, thumbnail) of (h, w, 4) uint8 *pixels*; the
+    thumbnail is a box-filtered thumbnail_size² copy (same row order), or
+    None for *thumbnail_size* 0."""
+    mean = pixels.reshape(-1, pixels.shape[-1]).mean(axis=0) / 255.0
+    thumbnail = resample(pixels, thumbnail_size, thumbnail_size, 'BOX') if thumbnail_size else None
+    return mean, thumbnail
+
+
+def summarize_dds(path, thumbnail_size=0):
+    """summarize_pixels() of the DDS file at *path*, computed from its
+    smallest mip level that still covers the thumbnail (4×4 without one),
+    so large textures are never decoded in full.  None if the file cannot
+    be decoded."""
+    pixels = dds.read_dds(path, max(thumbnail_size, 4))
+    return None if pixels is None else summarize_pixels(pixels, thumbnail_size)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Output
+# ─────────────────────────────────────────────────────────────────────────────
+def encode_png(pixels):
+    """8-bit RGBA PNG bytes of (h, w, 4) uint8 *pixels*, top row first."""
+    height, width = pixels.shape[:2]
+    rows = np.hstack((np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, -1)))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">2I5B", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)) + chunk(b"IEND", b""))
+
+
+def resize_to_file(path, pixels, width, height, kind='LANCZOS', fmt='PNG', is_normal_map=False):
+    """Resample (h, w, 4) uint8 *pixels* (top row first) to width×height
+    and write them to *path* as PNG (*fmt* 'PNG') or DDS (a core.dds
+    format, with mipmaps).  Returns (path, error message or None)."""
+    try:
+        pixels = resample(pixels, width, height, kind)
+        if is_normal_map and fmt != 'BC5':
+            pixels = renormalize(pixels)
+        data = encode_png(pixels) if fmt == 'PNG' else dds.encode_dds(pixels, fmt)
+        files.write_atomic(path, data)
+    except (OSError, ValueError, MemoryError) as e:
+        return path, str(e)
+    return path, None
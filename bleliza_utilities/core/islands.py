@@ -0,0 +1,127 @@
+import numpy as np
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Island labelling
+#
+# Face islands are the connected components of the face graph in which two
+# faces are adjacent when they share an edge; vertex islands are the
+# connected components of the edge graph.  Inputs are the flat arrays
+# Blender's foreach_get returns (loop starts/totals, loop edge indices,
+# edge vertex pairs).
+# ─────────────────────────────────────────────────────────────────────────────
+def connected_components(count, a, b):
+    """Label the connected components of an undirected graph with *count*
+    nodes and edges (a[i], b[i]).  Returns an int array in which every node
+    carries the smallest node index of its component."""
+
+    labels = np.arange(count, dtype=np.int64)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+
+    while a.size:
+        la = labels[a]
+        lb = labels[b]
+        pending = la != lb
+        if not pending.any():
+            break
+        a, b, la, lb = a[pending], b[pending], la[pending], lb[pending]
+
+        # Hook the larger root onto the smaller one (pointers only ever
+        # decrease, so this can never create a cycle) ...
+        labels[np.maximum(la, lb)] = np.minimum(la, lb)
+
+        # ... then flatten every tree with pointer jumping.
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    return labels
+
+
+def _compact(roots, mask=None):
+    """Renumber component roots to 0 .. n-1; entries outside *mask* get -1.
+    Returns (labels, n)."""
+    if mask is None:
+        _, labels = np.unique(roots, return_inverse=True)
+        labels = labels.reshape(-1)
+        return labels, int(labels.max()) + 1 if labels.size else 0
+
+    labels = np.full(roots.size, -1, dtype=np.int64)
+    if mask.any():
+        _, masked = np.unique(roots[mask], return_inverse=True)
+        labels[mask] = masked.reshape(-1)
+    return labels, int(labels.max()) + 1
+
+
+def face_island_labels(loop_starts, loop_totals, loop_edges, face_mask=None):
+    """Return (labels, island_count) for a mesh given as polygon loop
+    starts/totals and the edge index of every loop.
+
+    labels[i] is the island index (0 .. island_count-1) of face i.  With a
+    boolean *face_mask* only masked faces are considered, they are connected
+    only through other masked faces, and unmasked faces are labelled -1."""
+
+    loop_starts = np.asarray(loop_starts, dtype=np.int64)
+    loop_totals = np.asarray(loop_totals, dtype=np.int64)
+    loop_edges = np.asarray(loop_edges, dtype=np.int64)
+    face_count = loop_starts.size
+    if face_count == 0:
+        return np.empty(0, dtype=np.int64), 0
+
+    # Face index owning every loop (does not assume sorted loop_start values)
+    face_ids = np.repeat(np.arange(face_count, dtype=np.int64), loop_totals)
+    corner = np.arange(face_ids.size) - np.repeat(np.cumsum(loop_totals) - loop_totals, loop_totals)
+    loop_faces = np.empty(loop_edges.size, dtype=np.int64)
+    loop_faces[np.repeat(loop_starts, loop_totals) + corner] = face_ids
+
+    if face_mask is not None:
+        face_mask = np.asarray(face_mask, dtype=bool)
+        keep = face_mask[loop_faces]
+        loop_faces = loop_faces[keep]
+        loop_edges = loop_edges[keep]
+
+    # Faces sharing an edge: sort the loops by edge and connect every face of
+    # an edge run to the first face of that run.
+    order = np.argsort(loop_edges, kind="stable")
+    sorted_edges = loop_edges[order]
+    sorted_faces = loop_faces[order]
+    run_start = np.ones(sorted_edges.size, dtype=bool)
+    run_start[1:] = sorted_edges[1:] != sorted_edges[:-1]
+    first = np.maximum.accumulate(np.where(run_start, np.arange(sorted_edges.size), 0))
+    shared = ~run_start
+
+    roots = connected_components(face_count, sorted_faces[first[shared]], sorted_faces[shared])
+    return _compact(roots, face_mask)
+
+
+def vertex_island_labels(vertex_count, edge_vertices):
+    """Return (labels, island_count) for the vertices of a mesh whose edges
+    are given as a flat [v0, v1, v0, v1, ...] array (or an (n, 2) array).
+    Loose vertices form islands of their own."""
+
+    if vertex_count == 0:
+        return np.empty(0, dtype=np.int64), 0
+    edge_vertices = np.asarray(edge_vertices, dtype=np.int64).reshape(-1, 2)
+    roots = connected_components(vertex_count, edge_vertices[:, 0], edge_vertices[:, 1])
+    return _compact(roots)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-island reductions (labels must be 0 .. island_count-1, no -1 entries)
+# ─────────────────────────────────────────────────────────────────────────────
+def island_min_max(labels, island_count, values):
+    """Return (minimum, maximum) arrays of *values* per island."""
+    values = np.asarray(values)
+    order = np.argsort(labels, kind="stable")
+    starts = np.searchsorted(labels[order], np.arange(island_count))
+    ordered = values[order]
+    return np.minimum.reduceat(ordered, starts), np.maximum.reduceat(ordered, starts)
+
+
+def island_means(labels, island_count, values):
+    """Mean of *values* per island."""
+    sizes = np.bincount(labels, minlength=island_count)
+    return np.bincount(labels, weights=values, minlength=island_count) / np.maximum(sizes, 1)
@@ -0,0 +1,76 @@
+import os
+import re
+import fnmatch
+
+
+def compile_name_matcher(pattern, mode):
+    """Return a case-insensitive predicate name -> bool for *pattern*.
+
+    mode is 'SUBSTRING', 'GLOB' or 'REGEX'.  Raises re.error for an
+    invalid regular expression."""
+
+    if mode == 'REGEX':
+        return re.compile(pattern, re.IGNORECASE).search
+    if mode == 'GLOB':
+        return re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+    needle = pattern.lower()
+    return lambda name: needle in name.lower()
+
+
+# Regular expression to find base names ending in common image extensions,
+# followed by an optional numeric or other suffix.
+# It handles names like "texture.png", "texture.png.001", "texture.jpg.other_suffix".
+IMAGE_NAME_RE = re.compile(r'(.+?)\.(png|jpg|jpeg)\b(.*)', re.IGNORECASE)
+
+
+def dds_filename(image_name):
+    """The DDS file name for a PNG/JPG image name ("tex.png.001" ->
+    "tex.dds"), or None if the name is not a PNG/JPG image name."""
+    match = IMAGE_NAME_RE.match(image_name)
+    return match.group(1) + ".dds" if match else None
+
+
+def normalize_extension(extension):
+    """'dds' -> '.dds'; extensions with a leading dot are returned as is."""
+    return extension if extension.startswith(".") else f".{extension}"
+
+
+def tile_texture_candidates(col, row, prefix="", suffix="", extension=".dds"):
+    """File names tried for the grid tile (col, row), in order.  Some
+    datasets separate the coordinates with '-', others with '_'."""
+    extension = normalize_extension(extension)
+    return [
+        f"{prefix}{col}-{row}{suffix}{extension}",
+        f"{prefix}{col}_{row}{suffix}{extension}",
+    ]
+
+
+def resolve_first_existing(folder, file_names, existing=None):
+    """Return the path of the first of *file_names* present in *folder*, or
+    None.  *existing* may be the list_files() mapping of *folder* (one
+    directory listing instead of a stat call per candidate); names are
+    then matched case-insensitively, as Windows file systems do, and the
+    path uses the file's real name."""
+    for file_name in file_names:
+        if existing is not None:
+            real_name = existing.get(file_name.casefold())
+            if real_name is not None:
+                return os.path.join(folder, real_name)
+        else:
+            path = os.path.join(folder, file_name)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def list_files(folder):
+    """Map of casefolded name -> real name of the files in *folder* (empty
+    if it does not exist), for resolve_first_existing()."""
+    try:
+        entries = sorted(entry.name for entry in os.scandir(folder) if entry.is_file())
+    except OSError:
+        return {}
+    files = {}
+    for name in entries:
+        files.setdefault(name.casefold(), name)
+    return files
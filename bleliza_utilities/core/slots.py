@@ -0,0 +1,27 @@
+import numpy as np
+
+
+def compact_slots(slot_keys, material_index):
+    """Merge material slots that hold the same material.
+
+    *slot_keys* has one hashable key per slot (e.g. the material name, None
+    for an empty slot); *material_index* is the per-face slot index array.
+    Returns (kept, new_index): kept lists the slot indices to keep (the
+    first slot of each key, in order), new_index is *material_index*
+    rewritten to index into kept.  Out-of-range face indices are clamped
+    to the last slot, as Blender does when drawing them."""
+
+    first_slot = {}
+    lookup = np.empty(max(len(slot_keys), 1), dtype=np.int32)
+    kept = []
+    for slot, key in enumerate(slot_keys):
+        if key not in first_slot:
+            first_slot[key] = len(kept)
+            kept.append(slot)
+        lookup[slot] = first_slot[key]
+    if not slot_keys:
+        lookup[0] = 0
+
+    material_index = np.asarray(material_index)
+    clamped = np.clip(material_index, 0, len(lookup) - 1)
+    return kept, lookup[clamped].astype(material_index.dtype, copy=False)
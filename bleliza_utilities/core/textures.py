@@ -0,0 +1,145 @@
+import struct
+
+
+# DDS pixel formats (FourCC) -> bytes per 4×4 block
+DDS_FOURCC_BLOCK_BYTES = {
+    b"DXT1": 8, b"DXT2": 16, b"DXT3": 16, b"DXT4": 16, b"DXT5": 16,
+    b"ATI1": 8, b"BC4U": 8, b"BC4S": 8,
+    b"ATI2": 16, b"BC5U": 16, b"BC5S": 16,
+}
+
+# DX10 header DXGI_FORMAT ranges -> bytes per 4×4 block
+# (BC1, BC2, BC3, BC4, BC5, BC6H, BC7; typeless/unorm/srgb variants)
+DXGI_BLOCK_BYTES = {
+    **dict.fromkeys((70, 71, 72), 8),
+    **dict.fromkeys((73, 74, 75), 16),
+    **dict.fromkeys((76, 77, 78), 16),
+    **dict.fromkeys((79, 80, 81), 8),
+    **dict.fromkeys((82, 83, 84), 16),
+    **dict.fromkeys((94, 95, 96), 16),
+    **dict.fromkeys((97, 98, 99), 16),
+}
+
+# Header bytes needed by read_image_header (DDS + DX10 extension)
+HEADER_BYTES = 148
+
+_DDSD_MIPMAPCOUNT = 0x20000
+_DDPF_FOURCC = 0x4
+
+
+def parse_image_header(head):
+    """Parse the first HEADER_BYTES bytes of an image file.
+
+    Returns a dict with "format" ('DDS', 'PNG', 'JPEG', 'TGA'), "width",
+    "height", "mips" and either "block_bytes" (block-compressed DDS) or
+    "bits_per_pixel"; None if the format is not recognised.  JPEG is only
+    recognised if its frame header lies within *head*; use
+    read_image_header() for files."""
+
+    if head[:4] == b"DDS " and len(head) >= 128:
+        height, width = struct.unpack_from("<2I", head, 12)
+        flags = struct.unpack_from("<I", head, 8)[0]
+        mips = struct.unpack_from("<I", head, 28)[0] if flags & _DDSD_MIPMAPCOUNT else 1
+        pf_flags, fourcc, rgb_bits = struct.unpack_from("<I4sI", head, 80)
+        info = {"format": 'DDS', "width": width, "height": height, "mips": max(1, mips)}
+        if pf_flags & _DDPF_FOURCC:
+            if fourcc == b"DX10" and len(head) >= 132:
+                dxgi = struct.unpack_from("<I", head, 128)[0]
+                info["fourcc"] = f"DX10:{dxgi}"
+                if dxgi in DXGI_BLOCK_BYTES:
+                    info["block_bytes"] = DXGI_BLOCK_BYTES[dxgi]
+                    return info
+            else:
+                info["fourcc"] = fourcc.decode("ascii", "replace")
+                if fourcc in DDS_FOURCC_BLOCK_BYTES:
+                    info["block_bytes"] = DDS_FOURCC_BLOCK_BYTES[fourcc]
+                    return info
+        info["bits_per_pixel"] = rgb_bits or 32
+        return info
+
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and len(head) >= 26:
+        width, height, depth, color_type = struct.unpack_from(">2I2B", head, 16)
+        channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(color_type, 4)
+        return {"format": 'PNG', "width": width, "height": height, "mips": 1,
+                "bits_per_pixel": depth * channels}
+
+    if head[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 <= len(head):
+            marker, length = struct.unpack_from(">2H", head, offset)
+            if 0xFFC0 <= marker <= 0xFFCF and marker not in (0xFFC4, 0xFFC8, 0xFFCC):
+                height, width, components = struct.unpack_from(">xHHB", head, offset + 4)
+                return {"format": 'JPEG', "width": width, "height": height, "mips": 1,
+                        "bits_per_pixel": 8 * components}
+            offset += 2 + length
+        return None
+
+    if len(head) >= 18 and head[2] in (2, 3, 10, 11) and head[1] == 0:
+        width, height, bits = struct.unpack_from("<2HB", head, 12)
+        if width and height and bits in (8, 16, 24, 32):
+            return {"format": 'TGA', "width": width, "height": height, "mips": 1, "bits_per_pixel": bits}
+    return None
+
+
+def read_image_header(path):
+    """parse_image_header() for a file; None if it cannot be read or is not
+    a recognised image.  Reads only the header (a few hundred bytes at most
+    for JPEG files with large metadata segments before the frame header)."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(HEADER_BYTES)
+            if head[:2] == b"\xff\xd8":
+                return _read_jpeg_header(f)
+    except OSError:
+        return None
+    return parse_image_header(head)
+
+
+def _read_jpeg_header(f):
+    f.seek(2)
+    while True:
+        segment = f.read(4)
+        if len(segment) < 4 or segment[0] != 0xFF:
+            return None
+        marker, length = struct.unpack(">2H", segment)
+        if 0xFFC0 <= marker <= 0xFFCF and marker not in (0xFFC4, 0xFFC8, 0xFFCC):
+            frame = f.read(6)
+            if len(frame) < 6:
+                return None
+            height, width, components = struct.unpack(">xHHB", frame)
+            return {"format": 'JPEG', "width": width, "height": height, "mips": 1,
+                    "bits_per_pixel": 8 * components}
+        f.seek(length - 2, 1)
+
+
+def mip_chain_bytes(width, height, mips, block_bytes=None, bits_per_pixel=32):
+    """Bytes of *mips* levels of a width×height texture, block-compressed
+    (4×4 blocks of *block_bytes*) or uncompressed."""
+    total = 0
+    for _ in range(max(1, mips)):
+        if block_bytes:
+            total += max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * block_bytes
+        else:
+            total += (width * height * bits_per_pixel + 7) // 8
+        if width == 1 and height == 1:
+            break
+        width, height = max(1, width // 2), max(1, height // 2)
+    return total
+
+
+def full_mip_count(width, height):
+    return max(width, height, 1).bit_length()
+
+
+def estimate_texture_bytes(info):
+    """Estimated GPU memory of an image described by parse_image_header().
+
+    DDS files are uploaded as stored (their own mip count and block
+    format).  Other formats are decoded to 8-bit RGBA and get a full mip
+    chain generated, which is what Blender does when it draws them."""
+    if info is None:
+        return 0
+    width, height = info["width"], info["height"]
+    if info["format"] == 'DDS':
+        return mip_chain_bytes(width, height, info["mips"], info.get("block_bytes"), info.get("bits_per_pixel", 32))
+    return mip_chain_bytes(width, height, full_mip_count(width, height), bits_per_pixel=32)
@@ -0,0 +1,18 @@
+import numpy as np
+
+
+def detail_uv_factors(scale_x, scale_y):
+    """UV factors for a Mapping-node TEXTURE-space scale: the inverse of the
+    scale (0.1 -> 10x tiling -> UVs x10).  A zero scale leaves the axis
+    unchanged."""
+    inv_x = (1.0 / scale_x) if scale_x != 0.0 else 1.0
+    inv_y = (1.0 / scale_y) if scale_y != 0.0 else 1.0
+    return inv_x, inv_y
+
+
+def scale_uvs(uvs, factor_x, factor_y):
+    """Return a copy of the flat [u0, v0, u1, v1, ...] array *uvs* with U
+    multiplied by *factor_x* and V by *factor_y*."""
+    scaled = np.array(uvs, dtype=np.float32).reshape(-1, 2)
+    scaled *= np.array((factor_x, factor_y), dtype=np.float32)
+    return scaled.reshape(-1)
@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Worker pools for CPU-bound image work
+#
+# Encoding and resampling run in a process pool ("spawn": forking Blender is
+# not safe).  Where worker processes cannot be started or cannot import
+# bleliza_utilities.core (some embedded interpreters), a thread pool is used
+# instead; NumPy releases the GIL for most of the work.  Jobs are pulled
+# lazily, so only a few decoded images are in memory at once.
+# ─────────────────────────────────────────────────────────────────────────────
+def _probe():
+    return True
+
+
+def worker_count(workers=None):
+    return workers or os.cpu_count() or 1
+
+
+def make_pool(workers=None):
+    """A started executor: process pool if worker processes can run this
+    package, thread pool otherwise.  Returns (executor, kind)."""
+    workers = worker_count(workers)
+    try:
+        import multiprocessing
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            if pool.submit(_probe).result(timeout=120):
+                return pool, "process"
+        except Exception:
+            pool.shutdown(wait=False)
+            raise
+    except Exception:
+        pass
+    return ThreadPoolExecutor(max_workers=workers), "thread"
+
+
+def map_bounded(pool, function, jobs, limit):
+    """function(*job) for every argument tuple of the iterable *jobs* on
+    *pool*, with at most *limit* jobs in flight (the next job is only taken
+    from *jobs* when one finishes).  Returns the results in job order."""
+    results, pending = [], []
+    for job in jobs:
+        pending.append(pool.submit(function, *job))
+        while len(pending) >= limit:
+            results.append(pending.pop(0).result())
+    results.extend(future.result() for future in pending)
+    return results
@@ -0,0 +1,270 @@
+import bpy
+import os
+import sys
+import json
+import time
+import tempfile
+import functools
+import tracemalloc
+import collections
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Operator instrumentation
+#
+# Every BleLIZA operator's execute() is wrapped with @instrumented, which
+# records wall time, CPU time and the named work counters reported through
+# count() while the operator runs ("nodes_created", "links_created",
+# "images_loaded", "faces_touched", ...).  Finished runs go to a rolling
+# in-session history (shown in the BleLIZA Timings panel) and, if a log
+# file is set in the add-on preferences, are appended to it as JSON lines.
+#
+# With "Memory Profiling" enabled in the preferences every run also records
+# resident memory, the top Python allocators (tracemalloc) and the change in
+# Blender datablock counts, and writes a JSON report to the profile folder.
+# The "cProfile" preference wraps the next (or every) top-level run in
+# cProfile, dumps a .prof file there and reports the top cumulative entries.
+# ─────────────────────────────────────────────────────────────────────────────
+HISTORY_LENGTH = 100
+
+# bpy.data collections whose sizes are compared before/after a run
+DATABLOCK_TYPES = ("images", "materials", "meshes", "objects", "textures", "node_groups")
+
+TRACEMALLOC_TOP = 15
+
+history = collections.deque(maxlen=HISTORY_LENGTH)
+
+# Seconds the last register() took (set by the add-on's register())
+registration_seconds = None
+
+# Records of the operator runs in progress (innermost last)
+_active = []
+
+
+def count(name, amount=1):
+    """Add *amount* to the work counter *name* of the running operator.
+    Does nothing when called outside an instrumented operator."""
+    if _active:
+        counters = _active[-1]["counters"]
+        counters[name] = counters.get(name, 0) + amount
+
+
+def get_preferences(context=None):
+    """The add-on preferences, or None when the add-on is not enabled as such."""
+    context = context or bpy.context
+    addon = context.preferences.addons.get(__package__)
+    return addon.preferences if addon else None
+
+
+def report_dir(context=None):
+    """Folder for profiling reports: the preference if set, else the folder
+    of the saved .blend file, else the system temp folder."""
+    prefs = get_preferences(context)
+    if prefs and prefs.profile_dir:
+        return bpy.path.abspath(prefs.profile_dir)
+    if bpy.data.filepath:
+        return os.path.dirname(bpy.data.filepath)
+    return tempfile.gettempdir()
+
+
+def report_path(record, extension, context=None):
+    """Report file name built from the operator idname and the start time."""
+    name = record["operator"].replace(".", "_")
+    stamp = record["started"].replace(":", "").replace("-", "")
+    return os.path.join(report_dir(context), f"bleliza_{name}_{stamp}{extension}")
+
+
+def _rss_bytes():
+    """Return (current, peak) resident set size of this process in bytes
+    (None where the platform does not provide a value)."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize, counters.PeakWorkingSetSize
+        return None, None
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+    current = None
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    return current, peak
+
+
+def _datablock_counts():
+    return {name: len(getattr(bpy.data, name)) for name in DATABLOCK_TYPES}
+
+
+def _memory_begin():
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    return {
+        "rss": _rss_bytes(),
+        "datablocks": _datablock_counts(),
+        "snapshot": tracemalloc.take_snapshot(),
+        "started_tracing": started_tracing,
+    }
+
+
+def _memory_end(state, record, context):
+    current_after, peak_after = _rss_bytes()
+    current_before, peak_before = state["rss"]
+    _, python_peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    if state["started_tracing"]:
+        tracemalloc.stop()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    top = snapshot.filter_traces(ignore).compare_to(
+        state["snapshot"].filter_traces(ignore), "lineno"
+    )[:TRACEMALLOC_TOP]
+    after = _datablock_counts()
+    report = {
+        "operator": record["operator"],
+        "file": record["file"],
+        "started": record["started"],
+        "wall_seconds": record["wall_seconds"],
+        "rss_before_bytes": current_before,
+        "rss_after_bytes": current_after,
+        # The OS only reports the lifetime peak; a higher value after the run
+        # means this operator set a new peak.
+        "peak_rss_before_bytes": peak_before,
+        "peak_rss_after_bytes": peak_after,
+        "python_peak_bytes": python_peak,
+        "datablocks_before": state["datablocks"],
+        "datablock_deltas": {name: after[name] - state["datablocks"][name] for name in DATABLOCK_TYPES},
+        "top_python_allocators": [
+            {"location": str(stat.traceback), "size_diff_bytes": stat.size_diff, "count_diff": stat.count_diff}
+            for stat in top
+        ],
+    }
+
+    record["memory"] = {
+        "peak_rss_bytes": peak_after,
+        "python_peak_bytes": python_peak,
+        "datablock_deltas": {key: value for key, value in report["datablock_deltas"].items() if value},
+    }
+
+    path = report_path(record, ".mem.json", context)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        record["memory"]["report"] = path
+    except OSError as e:
+        print(f"BleLIZA: could not write memory report {path}: {e}")
+
+
+def _profile_end(profiler, record, operator, top_count, context):
+    import io
+    import pstats
+
+    path = report_path(record, ".prof", context)
+    try:
+        profiler.dump_stats(path)
+        record["profile"] = path
+    except OSError as e:
+        print(f"BleLIZA: could not write profile {path}: {e}")
+        path = None
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(top_count)
+    print(f"--- BleLIZA cProfile: {record['operator']} ({path or 'not saved'}) ---")
+    print(stream.getvalue())
+
+    # execute() itself trivially owns all the time; name what it spent it on
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    hot = [
+        f"{function} {cumulative:.2f}s"
+        for (_, _, function), (_, _, _, cumulative, _) in entries
+        if function != "execute" and "_lsprof.Profiler" not in function
+    ][:5]
+    operator.report(
+        {'INFO'},
+        f"cProfile{' saved to ' + os.path.basename(path) if path else ''}; top cumulative: " + ", ".join(hot),
+    )
+
+
+def _finish(record, context):
+    history.append(record)
+
+    prefs = get_preferences(context)
+    log_path = bpy.path.abspath(prefs.timing_log_path) if prefs and prefs.timing_log_path else ""
+    if log_path:
+        try:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"BleLIZA: could not append timing record to {log_path}: {e}")
+
+
+def instrumented(execute):
+    """Decorator for Operator.execute recording timings and work counters."""
+
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        record = {
+            "operator": self.bl_idname,
+            "label": self.bl_label,
+            "file": bpy.data.filepath,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "result": "ERROR",
+            "counters": {},
+        }
+        prefs = get_preferences(context)
+        memory = _memory_begin() if prefs and prefs.memory_profiling else None
+
+        # Only profile top-level runs; cProfile cannot be nested.
+        profiler = None
+        if prefs and prefs.cprofile_mode != 'OFF' and not _active:
+            import cProfile
+            profiler = cProfile.Profile()
+            if prefs.cprofile_mode == 'NEXT':
+                prefs.cprofile_mode = 'OFF'
+
+        _active.append(record)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            if profiler is not None:
+                result = profiler.runcall(execute, self, context)
+            else:
+                result = execute(self, context)
+            record["result"] = ",".join(sorted(result))
+            return result
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            _active.pop()
+            if profiler is not None:
+                _profile_end(profiler, record, self, prefs.cprofile_top, context)
+            if memory is not None:
+                _memory_end(memory, record, context)
+            _finish(record, context)
+
+    return wrapper
@@ -1,9 +1,53 @@
 import bpy
 import os
 import re
-import bmesh
-import random
+import time
 from mathutils import Vector
+from bpy_extras.io_utils import ImportHelper
+
+from . import core
+from . import instrumentation
+
+# NumPy (and csv/json/fnmatch for the property tables) are imported inside the
+# functions that use them, and core loads its kernels on first access, so
+# registering the add-on does not pay for them; the first execute does.
+
+
+def _scene_defaults(operator, context, mapping):
+    """Fill the operator properties in *mapping* (operator property -> Scene
+    property) that the caller did not set explicitly from the scene
+    settings shown in the panels.  Explicit values (scripts, the CLI, the
+    redo panel) win; the panels therefore do not have to copy the scene
+    settings into the operator on every redraw.  Values Blender remembers
+    from the last run ("ghost" values) do not count as set, or later
+    changes in the panels would be ignored."""
+    for prop_name, scene_prop in mapping.items():
+        if not operator.properties.is_property_set(prop_name, ghost=False):
+            setattr(operator, prop_name, getattr(context.scene, scene_prop))
+
+
+MATERIAL_SCOPE_ITEMS = [
+    ('OBJECT', "Active Object", "Materials of the active object"),
+    ('SELECTED', "Selected Objects", "Materials of all selected objects"),
+    ('FILE', "Whole File", "All local materials in the file"),
+]
+
+
+def _scope_materials(context, scope):
+    """The unique materials of *scope* ('OBJECT', 'SELECTED' or 'FILE'), in
+    slot order, without empty slots."""
+    if scope == 'FILE':
+        return [mat for mat in bpy.data.materials if mat.library is None]
+    if scope == 'SELECTED':
+        objects = context.selected_objects
+    else:
+        objects = [context.active_object] if context.active_object else []
+    materials = {}
+    for obj in objects:
+        for slot in getattr(obj, "material_slots", ()):
+            if slot.material is not None:
+                materials.setdefault(slot.material, None)
+    return list(materials)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -15,45 +59,390 @@ from mathutils import Vector
 #   source_uv_name  – name of the base UV layer to copy from
 #   scale_x, scale_y – Mapping node TEXTURE-space scale values
 #                     (scale 0.1 → 10× tiling → UV coords ×10)
+#   meshes          – the meshes using *mat*, if the caller already knows
+#                     them (the pipeline); None scans bpy.data.objects
 # Returns
 #   detail_uv_name  – the name of the created/updated Detail UV layer
 # ─────────────────────────────────────────────────────────────────────────────
-def _create_detail_uv_for_material(mat, source_uv_name, scale_x, scale_y):
-    """Create (or update) a '<source_uv>_Detail' UV layer on every mesh object
-    that uses *mat*, with UVs copied from *source_uv_name* and scaled by the
-    inverse of the given Mapping-node scale values."""
+def _material_meshes(mat):
+    """The meshes of all mesh objects using *mat*, each once."""
+    meshes = {}
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH' and any(slot.material == mat for slot in obj.material_slots):
+            meshes.setdefault(obj.data, None)
+    return list(meshes)
+
+
+def _create_detail_uv_for_material(mat, source_uv_name, scale_x, scale_y, meshes=None):
+    """Create (or update) a '<source_uv>_Detail' UV layer on every mesh
+    that uses *mat* (or on *meshes*), with UVs copied from *source_uv_name*
+    and scaled by the inverse of the given Mapping-node scale values."""
+
+    import numpy as np
 
     detail_uv_name = source_uv_name + "_Detail"
 
     # Invert: Mapping scale 0.1 → UV factor 10 (more tiling)
-    inv_x = (1.0 / scale_x) if scale_x != 0.0 else 1.0
-    inv_y = (1.0 / scale_y) if scale_y != 0.0 else 1.0
-
-    for obj in bpy.data.objects:
-        if obj.type != 'MESH':
-            continue
-        # Check whether this object uses the material
-        if not any(slot.material == mat for slot in obj.material_slots):
-            continue
+    inv_x, inv_y = core.uv.detail_uv_factors(scale_x, scale_y)
 
-        mesh = obj.data
-        source_layer = mesh.uv_layers.get(source_uv_name)
-        if not source_layer:
+    for mesh in _material_meshes(mat) if meshes is None else meshes:
+        if not mesh.uv_layers.get(source_uv_name):
             continue  # object has no matching UV layer – skip silently
 
         # Create detail layer if missing; otherwise reuse the existing one
         if detail_uv_name not in mesh.uv_layers:
-            detail_layer = mesh.uv_layers.new(name=detail_uv_name)
-        else:
-            detail_layer = mesh.uv_layers[detail_uv_name]
+            mesh.uv_layers.new(name=detail_uv_name)
+        # Look both layers up again: adding a layer may reallocate the data
+        source_layer = mesh.uv_layers[source_uv_name]
+        detail_layer = mesh.uv_layers[detail_uv_name]
 
-        for i, loop_uv in enumerate(source_layer.data):
-            detail_layer.data[i].uv[0] = loop_uv.uv[0] * inv_x
-            detail_layer.data[i].uv[1] = loop_uv.uv[1] * inv_y
+        uvs = np.empty(len(source_layer.data) * 2, dtype=np.float32)
+        source_layer.data.foreach_get("uv", uvs)
+        detail_layer.data.foreach_set("uv", core.uv.scale_uvs(uvs, inv_x, inv_y))
+        instrumentation.count("uv_loops_written", len(source_layer.data))
 
     return detail_uv_name
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Module-level helpers: mesh islands
+#
+# Thin adapters reading the mesh topology with foreach_get and passing the
+# flat arrays to the NumPy kernels in core.islands, so no BMesh or Edit
+# Mode round-trip is needed.
+# ─────────────────────────────────────────────────────────────────────────────
+def _face_island_labels(mesh, face_mask=None):
+    """Return (labels, island_count) for the faces of *mesh*.
+
+    labels[i] is the island index (0 .. island_count-1) of face i.  With a
+    boolean *face_mask* only masked faces are considered, they are connected
+    only through other masked faces, and unmasked faces are labelled -1."""
+
+    import numpy as np
+
+    # foreach_get only takes its fast buffer path when the dtype matches
+    # the property exactly (int32 here); core widens the arrays itself
+    face_count = len(mesh.polygons)
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    return core.islands.face_island_labels(loop_starts, loop_totals, loop_edges, face_mask)
+
+
+def _vertex_island_labels(mesh):
+    """Return (labels, island_count) for the vertices of *mesh* (vertices
+    connected by edges form an island)."""
+
+    import numpy as np
+
+    edge_vertices = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_vertices)
+    return core.islands.vertex_island_labels(len(mesh.vertices), edge_vertices)
+
+
+def _vertex_coordinates(mesh):
+    """(n, 3) float64 array of the local vertex coordinates of *mesh*."""
+    import numpy as np
+
+    # Read as float32 (the property type, foreach_get's fast path), then widen
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3).astype(np.float64)
+
+
+def _first_uv_name(obj):
+    """Name of the first UV map of *obj* ('UVMap' if it has none)."""
+    if hasattr(obj.data, "uv_layers") and obj.data.uv_layers:
+        return obj.data.uv_layers[0].name
+    return "UVMap"  # fallback if no UV maps exist
+
+
+def _build_preset_2020(mat, first_uv, meshes=None):
+    """Rebuild the node tree of an MSFS 2020 material as the ALIZA preset
+    layout.  *first_uv* is the UV map used by the base textures; the Detail
+    UV layer is derived from it on *meshes* (default: every mesh using
+    *mat*)."""
+
+    node_tree = mat.node_tree
+
+    # Retrieve values from nodes that might exist before clearing.
+    base_color_value = None
+    metallic_value = None
+    roughness_value = None
+    emissive_value = None
+    detail_scale_value = None
+
+    base_color_node = node_tree.nodes.get("Base Color RGB")
+    base_color_alpha_node = node_tree.nodes.get("Base Color A")
+
+    # Check if the node exists and has valid outputs
+    if base_color_node and hasattr(base_color_node, "outputs") and base_color_node.outputs:
+        base_color_value = base_color_node.outputs[0].default_value
+    else:
+        base_color_value = (1.0, 1.0, 1.0)  # Fallback to white
+
+    # Check if the node exists and has valid outputs
+    if base_color_alpha_node and hasattr(base_color_node, "outputs") and base_color_node.outputs:
+        base_color_alpha_value = base_color_alpha_node.outputs[0].default_value
+    else:
+        base_color_alpha_value = 1.0  # Fallback to opaque
+
+    # Ensure base_color_value has an RGBA format by adding an alpha channel
+    if len(base_color_value) == 3:
+        base_color_rgba = (*base_color_value, base_color_alpha_value)  # Adds the alpha value
+    elif len(base_color_value) == 4:
+        base_color_rgba = base_color_value  # It already has 4 sequences (RGBA)
+
+    metallic_node = node_tree.nodes.get("Metallic Scale")
+    if metallic_node and hasattr(metallic_node, "outputs") and metallic_node.outputs:
+        metallic_value = metallic_node.outputs[0].default_value
+
+    roughness_node = node_tree.nodes.get("Roughness Scale")
+    if roughness_node and hasattr(roughness_node, "outputs") and roughness_node.outputs:
+        roughness_value = roughness_node.outputs[0].default_value
+
+    emissive_node = node_tree.nodes.get("Emissive Scale")
+    if emissive_node and hasattr(emissive_node, "outputs") and emissive_node.outputs:
+        emissive_value = emissive_node.outputs[0].default_value
+
+    detail_scale_node = node_tree.nodes.get("Detail UV Sca  le")
+    if detail_scale_node and hasattr(detail_scale_node, "outputs") and detail_scale_node.outputs:
+        detail_scale_value = detail_scale_node.outputs[0].default_value
+
+    # Try to find existing nodes (if any) before clearing the node tree.
+    existing_base = node_tree.nodes.get("Base Color Texture")
+    existing_detail = node_tree.nodes.get("Detail Color(RGBA)")
+    existing_base_mat = node_tree.nodes.get("Occlusion(R) Roughness(G) Metallic(B)")
+    existing_detail_mat = node_tree.nodes.get("Detail Occlusion(R) Roughness(G) Metallic(B)")
+    existing_normal = node_tree.nodes.get("Normal Texture")
+    existing_normal_map_node = node_tree.nodes.get("Normal Map Sampler")
+
+    base_image = existing_base.image if existing_base and existing_base.image else None
+    detail_image = existing_detail.image if existing_detail and existing_detail.image else None
+    base_mat_image = existing_base_mat.image if existing_base_mat and existing_base_mat.image else None
+    detail_mat_image = existing_detail_mat.image if existing_detail_mat and existing_detail_mat.image else None
+    normal_image = existing_normal.image if existing_normal and existing_normal.image else None
+    # Get the 'Strength' value from the existing node if it has the input
+    if existing_normal_map_node and "Strength" in existing_normal_map_node.inputs:
+        strength_value_to_apply = existing_normal_map_node.inputs["Strength"].default_value
+
+    # Clear existing nodes (optional – here we rebuild the node tree)
+    for node in list(node_tree.nodes):
+        node_tree.nodes.remove(node)
+
+    # Create Material Output node
+    output_node = node_tree.nodes.new(type="ShaderNodeOutputMaterial")
+    output_node.location = (500, 0)
+
+    # Create Principled BSDF node
+    bsdf_node = node_tree.nodes.new(type="ShaderNodeBsdfPrincipled")
+    bsdf_node.location = (200, 0)
+    node_tree.links.new(bsdf_node.outputs["BSDF"], output_node.inputs["Surface"])
+
+    # Transfer value from "Base Color" to BSDF input "Base Color"
+    if base_color_value is not None:
+        bsdf_node.inputs["Base Color"].default_value = base_color_rgba
+
+    # Transfer value from "Metallic Factor" to BSDF input "Metallic"
+    if metallic_value is not None:
+        bsdf_node.inputs["Metallic"].default_value = metallic_value
+
+    # Transfer value from "Roughness Factor" to BSDF input "Roughness"
+    if roughness_value is not None:
+        bsdf_node.inputs["Roughness"].default_value = roughness_value
+
+    # For emission, assume there is a custom input called "Emission Strength" in the shader.
+    if emissive_value is not None and "Emission Strength" in bsdf_node.inputs:
+        bsdf_node.inputs["Emission Strength"].default_value = emissive_value
+
+    # Create Image Texture node for Base Color and assign image from existing node if available
+    base_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    base_color_node.location = (-500, 100)
+    base_color_node.name = "Base Color Texture"  # set name for clarity
+    if base_image:
+        base_color_node.image = base_image
+        base_color_node.image.colorspace_settings.name = 'sRGB'
+
+    # Create another Image Texture node for Detail Color and assign image from existing node if available
+    detail_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    detail_color_node.location = (-500, -200)
+    detail_color_node.name = "Detail Color"
+    if detail_image:
+        detail_color_node.image = detail_image
+        detail_color_node.image.colorspace_settings.name = 'sRGB'
+
+    # Create Image Texture node for Base Color Material and assign image from existing node if available
+    base_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    base_mat_color_node.location = (-800, 0)
+    base_mat_color_node.name = "Base Color Material Texture"  # set name for clarity
+    if base_mat_image:
+        base_mat_color_node.image = base_mat_image
+        base_mat_color_node.image.colorspace_settings.name = 'Non-Color'
+
+    # Create another Image Texture node for Detail Color Material and assign image from existing node if available
+    detail_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    detail_mat_color_node.location = (-800, -300)
+    detail_mat_color_node.name = "Detail Color"
+    if detail_mat_image:
+        detail_mat_color_node.image = detail_mat_image
+        detail_mat_color_node.image.colorspace_settings.name = 'Non-Color'
+
+    # Create another Image Texture node for Normal Map and assign image from existing node if available
+    normal_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    normal_color_node.location = (-500, -500)
+    normal_color_node.name = "Normal Image"
+    if normal_image:
+        normal_color_node.image = normal_image
+        normal_color_node.image.colorspace_settings.name = 'Non-Color'
+
+    # Create a Normal Map node
+    if existing_normal_map_node:
+        normal_map_node = node_tree.nodes.new(type="ShaderNodeNormalMap")
+        normal_map_node.inputs["Strength"].default_value = strength_value_to_apply
+        normal_map_node.location = (-200, -500)
+    else:
+        normal_map_node = node_tree.nodes.new(type="ShaderNodeNormalMap")
+        normal_map_node.location = (-200, -500)
+
+    # Connect the Normal Map node to the Principled BSDF node's Normal input
+    node_tree.links.new(normal_map_node.outputs["Normal"], bsdf_node.inputs["Normal"])
+
+    # Link the normal image texture node into the Normal Map node's "Color" input
+    node_tree.links.new(normal_color_node.outputs["Color"], normal_map_node.inputs["Color"])
+
+    # Check if base and detail textures have images
+    has_base_image = base_color_node.image is not None
+    has_detail_image = detail_color_node.image is not None
+
+    if has_base_image and has_detail_image:
+        # Create a Mix Color node for albedo images
+        mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
+        mix_node.location = (-200, 100)
+        mix_node.blend_type = 'MIX'  # Use MIX mode (default)
+        mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
+        # Link the two albedo image texture nodes into the MixRGB node
+        node_tree.links.new(base_color_node.outputs["Color"], mix_node.inputs[1])
+        node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
+        # Link the output of the Mix Color node to the Principled BSDF's Base Color input
+        node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
+    elif has_base_image:
+        node_tree.links.new(base_color_node.outputs["Color"], bsdf_node.inputs["Base Color"])
+    elif has_detail_image:
+        # Create a Mix Color node for albedo images
+        mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
+        mix_node.location = (0, 100)
+        mix_node.blend_type = 'MIX'  # Use MIX mode (default)
+        mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
+        color_input = node_tree.nodes.new(type="ShaderNodeRGB")
+        color_input.location = (-200, 100)
+        color_input.label = "Base Color Input"  # Name it for clarity
+        # Set the color value (RGBA format: (R, G, B, Alpha))
+        color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
+        node_tree.links.new(color_input.outputs["Color"], mix_node.inputs[1])  # Connect to input 1
+        node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
+        # Link the output of the Mix Color node to the Principled BSDF's Base Color input
+        node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
+    else:
+        color_input = node_tree.nodes.new(type="ShaderNodeRGB")
+        color_input.label = "Base Color Input"  # Name it for clarity
+        color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
+        node_tree.links.new(color_input.outputs["Color"], bsdf_node.inputs["Base Color"])
+
+    # Check if base and detail material textures have images
+    has_base_mat_image = base_mat_color_node.image is not None
+    has_detail_mat_image = detail_mat_color_node.image is not None
+
+    if has_base_mat_image and has_detail_mat_image:
+        # Create a Mix Color node for material images
+        mix_mat_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
+        mix_mat_node.location = (-200, -150)
+        mix_mat_node.blend_type = 'MIX'  # Use MIX mode (default)
+        mix_mat_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
+
+        # Link the two material image texture nodes into the MixRGB node
+        node_tree.links.new(base_mat_color_node.outputs["Color"], mix_mat_node.inputs[1])
+        node_tree.links.new(detail_mat_color_node.outputs["Color"], mix_mat_node.inputs[2])
+
+        # Create a Separate Color node
+        separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
+        separate_node.location = (0, -150)  # adjust the location as needed
+
+        # Link the output of the Mix Color material node to the Separate Color node input
+        node_tree.links.new(mix_mat_node.outputs["Color"], separate_node.inputs["Color"])
+
+        # Connect the Green channel from the Separate Color node to the Metallic input.
+        node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
+
+        # Connect the Red channel from the Separate Color node to the Roughness input.
+        node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
+    elif has_base_mat_image:
+        # Create a Separate Color node
+        separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
+        separate_node.location = (0, -150)  # adjust the location as needed
+
+        # Link the output of the Base Color material node to the Separate Color node input
+        node_tree.links.new(base_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
+
+        # Connect the Green channel from the Separate Color node to the Metallic input.
+        node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
+
+        # Connect the Red channel from the Separate Color node to the Roughness input.
+        node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
+    elif has_detail_mat_image:
+        # Create a Separate Color node
+        separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
+        separate_node.location = (0, -150)  # adjust the location as needed
+
+        # Link the output of the Detail Color material node to the Separate Color node input
+        node_tree.links.new(detail_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
+
+        # Connect the Green channel from the Separate Color node to the Metallic input.
+        node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
+
+        # Connect the Red channel from the Separate Color node to the Roughness input.
+        node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
+
+    # Create a UV Map node
+    uv_map_node = node_tree.nodes.new(type="ShaderNodeUVMap")
+    uv_map_node.location = (-1200, 0)  # adjust location as needed
+    uv_map_node.uv_map = first_uv  # use the first UV map name from the object
+
+    # Connect the UV Map node output to the Vector input of each image texture node
+    node_tree.links.new(uv_map_node.outputs["UV"], base_color_node.inputs["Vector"])
+
+    node_tree.links.new(uv_map_node.outputs["UV"], base_mat_color_node.inputs["Vector"])
+    node_tree.links.new(uv_map_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
+    node_tree.links.new(uv_map_node.outputs["UV"], normal_color_node.inputs["Vector"])
+
+    # --- Bake Detail UV scale into a dedicated UV layer ---
+    # Convert stored detail_scale_value (e.g. 20) → Mapping-node scale (0.2).
+    # A Mapping scale of 0.2 means 1/0.2 = 5× tiling in UV space.
+    if detail_scale_value is not None:
+        mapping_scale = detail_scale_value / 100.0
+    else:
+        mapping_scale = 1.0
+
+    detail_uv_name = _create_detail_uv_for_material(
+        mat, first_uv, mapping_scale, mapping_scale, meshes
+    )
+
+    # Create a UV Map shader node pointing at the new Detail UV layer
+    detail_uv_node = node_tree.nodes.new(type="ShaderNodeUVMap")
+    detail_uv_node.location = (-1000, -300)
+    detail_uv_node.uv_map = detail_uv_name
+    detail_uv_node.label = detail_uv_name
+
+    # Wire Detail UV node into the detail image texture nodes
+    node_tree.links.new(detail_uv_node.outputs["UV"], detail_color_node.inputs["Vector"])
+    node_tree.links.new(detail_uv_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
+
+    instrumentation.count("nodes_created", len(node_tree.nodes))
+    instrumentation.count("links_created", len(node_tree.links))
+
+
 # Operator to add image texture nodes and create a node preset layout,
 # filling them with images from existing nodes if available.
 class NODE_OT_create_preset_2020(bpy.types.Operator):
@@ -62,6 +451,7 @@ class NODE_OT_create_preset_2020(bpy.types.Operator):
     bl_description = "Creates image texture nodes with existing image values and arranges nodes in a preset layout for all materials"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @instrumentation.instrumented
     def execute(self, context):
         obj = context.object
         if not obj or not obj.data.materials:
@@ -75,287 +465,292 @@ class NODE_OT_create_preset_2020(bpy.types.Operator):
                 continue
             
             materials_processed += 1
-            node_tree = mat.node_tree
-        
-            # Retrieve values from nodes that might exist before clearing.
-            base_color_value = None
-            metallic_value = None
-            roughness_value = None
-            emissive_value = None
-            detail_scale_value = None
+            _build_preset_2020(mat, _first_uv_name(obj))
         
-            base_color_node = node_tree.nodes.get("Base Color RGB")
-            base_color_alpha_node = node_tree.nodes.get("Base Color A")
+        self.report({'INFO'}, f"Node preset layout created for {materials_processed} material(s)")
+        return {'FINISHED'}
 
-            # Check if the node exists and has valid outputs
-            if base_color_node and hasattr(base_color_node, "outputs") and base_color_node.outputs:
-                base_color_value = base_color_node.outputs[0].default_value
-            else:
-                base_color_value = (1.0, 1.0, 1.0)  # Fallback to white
-            
-            # Check if the node exists and has valid outputs
-            if base_color_alpha_node and hasattr(base_color_node, "outputs") and base_color_node.outputs:
-                base_color_alpha_value = base_color_alpha_node.outputs[0].default_value
-            else:
-                base_color_alpha_value = (1)  # Fallback to white
-        
-            # Ensure base_color_value has an RGBA format by adding an alpha channel
-            if len(base_color_value) == 3:
-                base_color_rgba = (*base_color_value, *base_color_alpha_value)  # Adds the alpha value
-            elif len(base_color_value) == 4:
-                base_color_rgba = base_color_value  # It already has 4 sequences (RGBA)
-        
-            metallic_node = node_tree.nodes.get("Metallic Scale")
-            if metallic_node and hasattr(metallic_node, "outputs") and metallic_node.outputs:
-                metallic_value = metallic_node.outputs[0].default_value
 
-            roughness_node = node_tree.nodes.get("Roughness Scale")
-            if roughness_node and hasattr(roughness_node, "outputs") and roughness_node.outputs:
-                roughness_value = roughness_node.outputs[0].default_value
+def _build_preset_2024(mat, first_uv, meshes=None):
+    """Rebuild the node tree of an MSFS 2024 material as the ALIZA preset
+    layout.  *first_uv* is the UV map used by the base textures; the Detail
+    UV layer is derived from it on *meshes* (default: every mesh using
+    *mat*)."""
+
+    node_tree = mat.node_tree
+
+    # Retrieve values from nodes that might exist before clearing.
+    base_color_value = None
+    metallic_value = None
+    roughness_value = None
+    emissive_value = None
+    detail_scale_value = None
+
+    base_color_node = node_tree.nodes.get("Base Color")
+
+    # Check if the node exists and has valid outputs
+    if base_color_node and hasattr(base_color_node, "outputs") and base_color_node.outputs:
+        base_color_value = base_color_node.outputs[0].default_value
+    else:
+        base_color_value = (1.0, 1.0, 1.0)  # Fallback to white
+
+    # Ensure base_color_value has an RGBA format by adding an alpha channel
+    if len(base_color_value) == 3:
+        base_color_rgba = (*base_color_value, 1.0)  # Adds 1.0 as the alpha value
+    elif len(base_color_value) == 4:
+        base_color_rgba = base_color_value  # It already has 4 sequences (RGBA)
+
+    # Initialize variables to None before conditional checks
+    metallic_value = None
+    roughness_value = None
+    emissive_value = None
+    detail_scale_value = None
+
+    metallic_node = node_tree.nodes.get("Metallic Factor")
+    if metallic_node and hasattr(metallic_node, "outputs") and metallic_node.outputs:
+        metallic_value = metallic_node.outputs[0].default_value
+
+    roughness_node = node_tree.nodes.get("Roughness Factor")
+    if roughness_node and hasattr(roughness_node, "outputs") and roughness_node.outputs:
+        roughness_value = roughness_node.outputs[0].default_value
+
+    emissive_node = node_tree.nodes.get("Emissive Scale")
+    if emissive_node and hasattr(emissive_node, "outputs") and emissive_node.outputs:
+        emissive_value = emissive_node.outputs[0].default_value
+
+    detail_scale_node = node_tree.nodes.get("Detail UV Scale")
+    if detail_scale_node and hasattr(detail_scale_node, "outputs") and detail_scale_node.outputs:
+        detail_scale_value = detail_scale_node.outputs[0].default_value
+
+    # Retrieve the normal scale value from an existing node named "Normal Scale"
+    normal_scale_value = None
+    normal_scale_node = node_tree.nodes.get("Normal Scale")
+    if normal_scale_node and hasattr(normal_scale_node, "outputs") and normal_scale_node.outputs:
+        normal_scale_value = normal_scale_node.outputs[0].default_value
+
+    # Try to find existing nodes (if any) before clearing the node tree.
+    existing_base = node_tree.nodes.get("Base Color Texture (RGBA)")
+    existing_detail = node_tree.nodes.get("Detail Color (RGB), Alpha (A)")
+    existing_base_mat = node_tree.nodes.get("Occlusion (R), Roughness (G), Metallic (B)")
+    existing_detail_mat = node_tree.nodes.get("Detail Occlusion (R), Roughness (G), Metallic (B)")
+    existing_normal = node_tree.nodes.get("Normal Texture (RGB)")
+
+    base_image = existing_base.image if existing_base and existing_base.image else None
+    detail_image = existing_detail.image if existing_detail and existing_detail.image else None
+    base_mat_image = existing_base_mat.image if existing_base_mat and existing_base_mat.image else None
+    detail_mat_image = existing_detail_mat.image if existing_detail_mat and existing_detail_mat.image else None
+    normal_image = existing_normal.image if existing_normal and existing_normal.image else None
+
+    # Clear existing nodes (optional – here we rebuild the node tree)
+    for node in list(node_tree.nodes):
+        node_tree.nodes.remove(node)
+
+    # Create Material Output node
+    output_node = node_tree.nodes.new(type="ShaderNodeOutputMaterial")
+    output_node.location = (500, 0)
+
+    # Create Principled BSDF node
+    bsdf_node = node_tree.nodes.new(type="ShaderNodeBsdfPrincipled")
+    bsdf_node.location = (200, 0)
+    node_tree.links.new(bsdf_node.outputs["BSDF"], output_node.inputs["Surface"])
+
+    # Transfer value from "Base Color" to BSDF input "Base Color"
+    if base_color_value is not None:
+        bsdf_node.inputs["Base Color"].default_value = base_color_rgba
+
+    # Transfer value from "Metallic Factor" to BSDF input "Metallic"
+    if metallic_value is not None:
+        bsdf_node.inputs["Metallic"].default_value = metallic_value
+
+    # Transfer value from "Roughness Factor" to BSDF input "Roughness"
+    if roughness_value is not None:
+        bsdf_node.inputs["Roughness"].default_value = roughness_value
+
+    # For emission, assume there is a custom input called "Emission Strength" in the shader.
+    if emissive_value is not None and "Emission Strength" in bsdf_node.inputs:
+        bsdf_node.inputs["Emission Strength"].default_value = emissive_value
+
+    # Create Image Texture node for Base Color and assign image from existing node if available
+    base_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    base_color_node.location = (-500, 100)
+    base_color_node.name = "Base Color Texture"  # set name for clarity
+    if base_image:
+        base_color_node.image = base_image
+        base_color_node.image.colorspace_settings.name = 'sRGB'
+
+    # Create another Image Texture node for Detail Color and assign image from existing node if available
+    detail_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    detail_color_node.location = (-500, -200)
+    detail_color_node.name = "Detail Color"
+    if detail_image:
+        detail_color_node.image = detail_image
+        detail_color_node.image.colorspace_settings.name = 'sRGB'
+
+    # Create Image Texture node for Base Color Material and assign image from existing node if available
+    base_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    base_mat_color_node.location = (-800, 0)
+    base_mat_color_node.name = "Base Color Material Texture"  # set name for clarity
+    if base_mat_image:
+        base_mat_color_node.image = base_mat_image
+        base_mat_color_node.image.colorspace_settings.name = 'Non-Color'
+
+    # Create another Image Texture node for Detail Color Material and assign image from existing node if available
+    detail_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    detail_mat_color_node.location = (-800, -300)
+    detail_mat_color_node.name = "Detail Color"
+    if detail_mat_image:
+        detail_mat_color_node.image = detail_mat_image
+        detail_mat_color_node.image.colorspace_settings.name = 'Non-Color'
+
+    # Create another Image Texture node for Normal Map and assign image from existing node if available
+    normal_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
+    normal_color_node.location = (-500, -500)
+    normal_color_node.name = "Normal Image"
+    if normal_image:
+        normal_color_node.image = normal_image
+        normal_color_node.image.colorspace_settings.name = 'Non-Color'
+
+    # Create a Normal Map node
+    normal_map_node = node_tree.nodes.new(type="ShaderNodeNormalMap")
+    normal_map_node.location = (-200, -500)
+    if normal_scale_value is not None:
+        normal_map_node.inputs["Strength"].default_value = normal_scale_value
+
+    # Connect the Normal Map node to the Principled BSDF node's Normal input
+    node_tree.links.new(normal_map_node.outputs["Normal"], bsdf_node.inputs["Normal"])
+
+    # Link the normal image texture node into the Normal Map node's "Color" input
+    node_tree.links.new(normal_color_node.outputs["Color"], normal_map_node.inputs["Color"])
+
+    # Check if base and detail textures have images
+    has_base_image = base_color_node.image is not None
+    has_detail_image = detail_color_node.image is not None
+
+    if has_base_image and has_detail_image:
+        # Create a Mix Color node for albedo images
+        mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
+        mix_node.location = (-200, 100)
+        mix_node.blend_type = 'MIX'  # Use MIX mode (default)
+        mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
+        # Link the two albedo image texture nodes into the MixRGB node
+        node_tree.links.new(base_color_node.outputs["Color"], mix_node.inputs[1])
+        node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
+        # Link the output of the Mix Color node to the Principled BSDF's Base Color input
+        node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
+    elif has_base_image:
+        node_tree.links.new(base_color_node.outputs["Color"], bsdf_node.inputs["Base Color"])
+        node_tree.links.new(base_color_node.outputs["Alpha"], bsdf_node.inputs["Alpha"])
+    elif has_detail_image:
+        # Create a Mix Color node for albedo images
+        mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
+        mix_node.location = (0, 100)
+        mix_node.blend_type = 'MIX'  # Use MIX mode (default)
+        mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
+        color_input = node_tree.nodes.new(type="ShaderNodeRGB")
+        color_input.location = (-200, 100)
+        color_input.label = "Base Color Input"  # Name it for clarity
+        # Set the color value (RGBA format: (R, G, B, Alpha))
+        color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
+        node_tree.links.new(color_input.outputs["Color"], mix_node.inputs[1])  # Connect to input 1
+        node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
+        # Link the output of the Mix Color node to the Principled BSDF's Base Color input
+        node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
+    else:
+        color_input = node_tree.nodes.new(type="ShaderNodeRGB")
+        color_input.label = "Base Color Input"  # Name it for clarity
+        color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
+        node_tree.links.new(color_input.outputs["Color"], bsdf_node.inputs["Base Color"])
+
+    # Check if base and detail material textures have images
+    has_base_mat_image = base_mat_color_node.image is not None
+    has_detail_mat_image = detail_mat_color_node.image is not None
+
+    if has_base_mat_image and has_detail_mat_image:
+        # Create a Mix Color node for material images
+        mix_mat_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
+        mix_mat_node.location = (-200, -150)
+        mix_mat_node.blend_type = 'MIX'  # Use MIX mode (default)
+        mix_mat_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
+
+        # Link the two material image texture nodes into the MixRGB node
+        node_tree.links.new(base_mat_color_node.outputs["Color"], mix_mat_node.inputs[1])
+        node_tree.links.new(detail_mat_color_node.outputs["Color"], mix_mat_node.inputs[2])
+
+        # Create a Separate Color node
+        separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
+        separate_node.location = (0, -150)  # adjust the location as needed
+
+        # Link the output of the Mix Color material node to the Separate Color node input
+        node_tree.links.new(mix_mat_node.outputs["Color"], separate_node.inputs["Color"])
+
+        # Connect the Green channel from the Separate Color node to the Metallic input.
+        node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
+
+        # Connect the Red channel from the Separate Color node to the Roughness input.
+        node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
+    elif has_base_mat_image:
+        # Create a Separate Color node
+        separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
+        separate_node.location = (0, -150)  # adjust the location as needed
+
+        # Link the output of the Base Color material node to the Separate Color node input
+        node_tree.links.new(base_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
+
+        # Connect the Green channel from the Separate Color node to the Metallic input.
+        node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
+
+        # Connect the Red channel from the Separate Color node to the Roughness input.
+        node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
+    elif has_detail_mat_image:
+        # Create a Separate Color node
+        separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
+        separate_node.location = (0, -150)  # adjust the location as needed
+
+        # Link the output of the Detail Color material node to the Separate Color node input
+        node_tree.links.new(detail_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
+
+        # Connect the Green channel from the Separate Color node to the Metallic input.
+        node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
+
+        # Connect the Red channel from the Separate Color node to the Roughness input.
+        node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
+
+    # Create a UV Map node
+    uv_map_node = node_tree.nodes.new(type="ShaderNodeUVMap")
+    uv_map_node.location = (-1200, 0)  # adjust location as needed
+    uv_map_node.uv_map = first_uv  # use the first UV map name from the object
+
+    # Connect the UV Map node output to the Vector input of each image texture node
+    node_tree.links.new(uv_map_node.outputs["UV"], base_color_node.inputs["Vector"])
+
+    node_tree.links.new(uv_map_node.outputs["UV"], base_mat_color_node.inputs["Vector"])
+    node_tree.links.new(uv_map_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
+    node_tree.links.new(uv_map_node.outputs["UV"], normal_color_node.inputs["Vector"])
+
+    # --- Bake Detail UV scale into a dedicated UV layer ---
+    if detail_scale_value is not None:
+        mapping_scale = detail_scale_value / 100.0
+    else:
+        mapping_scale = 1.0
+
+    detail_uv_name = _create_detail_uv_for_material(
+        mat, first_uv, mapping_scale, mapping_scale, meshes
+    )
 
-            emissive_node = node_tree.nodes.get("Emissive Scale")
-            if emissive_node and hasattr(emissive_node, "outputs") and emissive_node.outputs:
-                emissive_value = emissive_node.outputs[0].default_value
-            
-            detail_scale_node = node_tree.nodes.get("Detail UV Sca  le")
-            if detail_scale_node and hasattr(detail_scale_node, "outputs") and detail_scale_node.outputs:
-                detail_scale_value = detail_scale_node.outputs[0].default_value
-
-            # Try to find existing nodes (if any) before clearing the node tree.
-            existing_base = node_tree.nodes.get("Base Color Texture")
-            existing_detail = node_tree.nodes.get("Detail Color(RGBA)")
-            existing_base_mat = node_tree.nodes.get("Occlusion(R) Roughness(G) Metallic(B)")
-            existing_detail_mat = node_tree.nodes.get("Detail Occlusion(R) Roughness(G) Metallic(B)")
-            existing_normal = node_tree.nodes.get("Normal Texture")
-            existing_normal_map_node = node_tree.nodes.get("Normal Map Sampler")
-        
-            base_image = existing_base.image if existing_base and existing_base.image else None
-            detail_image = existing_detail.image if existing_detail and existing_detail.image else None
-            base_mat_image = existing_base_mat.image if existing_base_mat and existing_base_mat.image else None
-            detail_mat_image = existing_detail_mat.image if existing_detail_mat and existing_detail_mat.image else None
-            normal_image = existing_normal.image if existing_normal and existing_normal.image else None
-            # Get the 'Strength' value from the existing node if it has the input
-            if "Strength" in existing_normal_map_node.inputs:
-                strength_value_to_apply = existing_normal_map_node.inputs["Strength"].default_value
-        
-            # Clear existing nodes (optional – here we rebuild the node tree)
-            for node in list(node_tree.nodes):
-                node_tree.nodes.remove(node)
-        
-            # Create Material Output node
-            output_node = node_tree.nodes.new(type="ShaderNodeOutputMaterial")
-            output_node.location = (500, 0)
-        
-            # Create Principled BSDF node
-            bsdf_node = node_tree.nodes.new(type="ShaderNodeBsdfPrincipled")
-            bsdf_node.location = (200, 0)
-            node_tree.links.new(bsdf_node.outputs["BSDF"], output_node.inputs["Surface"])
-        
-            # Transfer value from "Base Color" to BSDF input "Base Color"
-            if base_color_value is not None:
-                bsdf_node.inputs["Base Color"].default_value = base_color_rgba
-        
-            # Transfer value from "Metallic Factor" to BSDF input "Metallic"
-            if metallic_value is not None:
-                bsdf_node.inputs["Metallic"].default_value = metallic_value
-        
-            # Transfer value from "Roughness Factor" to BSDF input "Roughness"
-            if roughness_value is not None:
-                bsdf_node.inputs["Roughness"].default_value = roughness_value
+    # Create a UV Map shader node pointing at the new Detail UV layer
+    detail_uv_node = node_tree.nodes.new(type="ShaderNodeUVMap")
+    detail_uv_node.location = (-1000, -300)
+    detail_uv_node.uv_map = detail_uv_name
+    detail_uv_node.label = detail_uv_name
 
-            # For emission, assume there is a custom input called "Emission Strength" in the shader.
-            if emissive_value is not None and "Emission Strength" in bsdf_node.inputs:
-                bsdf_node.inputs["Emission Strength"].default_value = emissive_value
-        
-            # Create Image Texture node for Base Color and assign image from existing node if available
-            base_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            base_color_node.location = (-500, 100)
-            base_color_node.name = "Base Color Texture"  # set name for clarity
-            if base_image:
-                base_color_node.image = base_image
-                base_color_node.image.colorspace_settings.name = 'sRGB'
-        
-            # Create another Image Texture node for Detail Color and assign image from existing node if available
-            detail_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            detail_color_node.location = (-500, -200)
-            detail_color_node.name = "Detail Color"
-            if detail_image:
-                detail_color_node.image = detail_image
-                detail_color_node.image.colorspace_settings.name = 'sRGB'
-            
-            # Create Image Texture node for Base Color Material and assign image from existing node if available
-            base_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            base_mat_color_node.location = (-800, 0)
-            base_mat_color_node.name = "Base Color Material Texture"  # set name for clarity
-            if base_mat_image:
-                base_mat_color_node.image = base_mat_image
-                base_mat_color_node.image.colorspace_settings.name = 'Non-Color'
-        
-            # Create another Image Texture node for Detail Color Material and assign image from existing node if available
-            detail_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            detail_mat_color_node.location = (-800, -300)
-            detail_mat_color_node.name = "Detail Color"
-            if detail_mat_image:
-                detail_mat_color_node.image = detail_mat_image
-                detail_mat_color_node.image.colorspace_settings.name = 'Non-Color'
-            
-            # Create another Image Texture node for Normal Map and assign image from existing node if available
-            normal_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            normal_color_node.location = (-500, -500)
-            normal_color_node.name = "Normal Image"
-            if normal_image:
-                normal_color_node.image = normal_image
-                normal_color_node.image.colorspace_settings.name = 'Non-Color'
-        
-            # Create a Normal Map node
-            if existing_normal_map_node:
-                normal_map_node = node_tree.nodes.new(type="ShaderNodeNormalMap")
-                normal_map_node.inputs["Strength"].default_value = strength_value_to_apply
-                normal_map_node.location = (-200, -500)
-            else:
-                normal_map_node = node_tree.nodes.new(type="ShaderNodeNormalMap")
-                normal_map_node.location = (-200, -500)
-        
-            # Connect the Normal Map node to the Principled BSDF node's Normal input
-            node_tree.links.new(normal_map_node.outputs["Normal"], bsdf_node.inputs["Normal"])
-        
-            # Link the normal image texture node into the Normal Map node's "Color" input
-            node_tree.links.new(normal_color_node.outputs["Color"], normal_map_node.inputs["Color"])
-        
-            # Check if base and detail textures have images
-            has_base_image = base_color_node.image is not None
-            has_detail_image = detail_color_node.image is not None
-        
-            if has_base_image and has_detail_image:
-                # Create a Mix Color node for albedo images
-                mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
-                mix_node.location = (-200, 100)
-                mix_node.blend_type = 'MIX'  # Use MIX mode (default)
-                mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
-                # Link the two albedo image texture nodes into the MixRGB node
-                node_tree.links.new(base_color_node.outputs["Color"], mix_node.inputs[1])
-                node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
-                # Link the output of the Mix Color node to the Principled BSDF's Base Color input
-                node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
-            elif has_base_image:
-                node_tree.links.new(base_color_node.outputs["Color"], bsdf_node.inputs["Base Color"])
-            elif has_detail_image:
-                # Create a Mix Color node for albedo images
-                mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
-                mix_node.location = (0, 100)
-                mix_node.blend_type = 'MIX'  # Use MIX mode (default)
-                mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
-                color_input = node_tree.nodes.new(type="ShaderNodeRGB")
-                color_input.location = (-200, 100)
-                color_input.label = "Base Color Input"  # Name it for clarity
-                # Set the color value (RGBA format: (R, G, B, Alpha))
-                color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
-                node_tree.links.new(color_input.outputs["Color"], mix_node.inputs[1])  # Connect to input 1
-                node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
-                # Link the output of the Mix Color node to the Principled BSDF's Base Color input
-                node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
-            else:
-                color_input = node_tree.nodes.new(type="ShaderNodeRGB")
-                color_input.label = "Base Color Input"  # Name it for clarity
-                color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
-                node_tree.links.new(color_input.outputs["Color"], bsdf_node.inputs["Base Color"])
-        
-            # Check if base and detail material textures have images
-            has_base_mat_image = base_mat_color_node.image is not None
-            has_detail_mat_image = detail_mat_color_node.image is not None
-        
-            if has_base_mat_image and has_detail_mat_image:
-                # Create a Mix Color node for material images
-                mix_mat_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
-                mix_mat_node.location = (-200, -150)
-                mix_mat_node.blend_type = 'MIX'  # Use MIX mode (default)
-                mix_mat_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
-        
-                # Link the two material image texture nodes into the MixRGB node
-                node_tree.links.new(base_mat_color_node.outputs["Color"], mix_mat_node.inputs[1])
-                node_tree.links.new(detail_mat_color_node.outputs["Color"], mix_mat_node.inputs[2])
-            
-                # Create a Separate Color node
-                separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
-                separate_node.location = (0, -150)  # adjust the location as needed
-            
-                # Link the output of the Mix Color material node to the Separate Color node input
-                node_tree.links.new(mix_mat_node.outputs["Color"], separate_node.inputs["Color"])
-            
-                # Connect the Green channel from the Separate Color node to the Metallic input.
-                node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
-            
-                # Connect the Red channel from the Separate Color node to the Roughness input.
-                node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
-            elif has_base_mat_image:
-                # Create a Separate Color node
-                separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
-                separate_node.location = (0, -150)  # adjust the location as needed
-            
-                # Link the output of the Base Color material node to the Separate Color node input
-                node_tree.links.new(base_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
-            
-                # Connect the Green channel from the Separate Color node to the Metallic input.
-                node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
-            
-                # Connect the Red channel from the Separate Color node to the Roughness input.
-                node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
-            elif has_detail_mat_image:
-                # Create a Separate Color node
-                separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
-                separate_node.location = (0, -150)  # adjust the location as needed
-            
-                # Link the output of the Detail Color material node to the Separate Color node input
-                node_tree.links.new(detail_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
-            
-                # Connect the Green channel from the Separate Color node to the Metallic input.
-                node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
-            
-                # Connect the Red channel from the Separate Color node to the Roughness input.
-                node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
-        
-            # Create a UV Map node
-            obj = context.object
-            if hasattr(obj.data, "uv_layers") and obj.data.uv_layers:
-                first_uv = obj.data.uv_layers[0].name
-            else:
-                first_uv = "UVMap"  # fallback if no UV maps exist
-            uv_map_node = node_tree.nodes.new(type="ShaderNodeUVMap")
-            uv_map_node.location = (-1200, 0)  # adjust location as needed
-            uv_map_node.uv_map = first_uv  # use the first UV map name from the object
-        
-            # Connect the UV Map node output to the Vector input of each image texture node
-            node_tree.links.new(uv_map_node.outputs["UV"], base_color_node.inputs["Vector"])
-        
-            node_tree.links.new(uv_map_node.outputs["UV"], base_mat_color_node.inputs["Vector"])
-            node_tree.links.new(uv_map_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
-            node_tree.links.new(uv_map_node.outputs["UV"], normal_color_node.inputs["Vector"])
-        
-            # --- Bake Detail UV scale into a dedicated UV layer ---
-            # Convert stored detail_scale_value (e.g. 20) → Mapping-node scale (0.2).
-            # A Mapping scale of 0.2 means 1/0.2 = 5× tiling in UV space.
-            if detail_scale_value is not None:
-                mapping_scale = detail_scale_value / 100.0
-            else:
-                mapping_scale = 1.0
+    # Wire Detail UV node into the detail image texture nodes
+    node_tree.links.new(detail_uv_node.outputs["UV"], detail_color_node.inputs["Vector"])
+    node_tree.links.new(detail_uv_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
 
-            detail_uv_name = _create_detail_uv_for_material(
-                mat, first_uv, mapping_scale, mapping_scale
-            )
+    instrumentation.count("nodes_created", len(node_tree.nodes))
+    instrumentation.count("links_created", len(node_tree.links))
 
-            # Create a UV Map shader node pointing at the new Detail UV layer
-            detail_uv_node = node_tree.nodes.new(type="ShaderNodeUVMap")
-            detail_uv_node.location = (-1000, -300)
-            detail_uv_node.uv_map = detail_uv_name
-            detail_uv_node.label = detail_uv_name
 
-            # Wire Detail UV node into the detail image texture nodes
-            node_tree.links.new(detail_uv_node.outputs["UV"], detail_color_node.inputs["Vector"])
-            node_tree.links.new(detail_uv_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
-        
-        self.report({'INFO'}, f"Node preset layout created for {materials_processed} material(s)")
-        return {'FINISHED'}
-        
 # Operator to add image texture nodes and create a node preset layout,
 # filling them with images from existing nodes if available.
 class NODE_OT_create_preset_2024(bpy.types.Operator):
@@ -364,6 +759,7 @@ class NODE_OT_create_preset_2024(bpy.types.Operator):
     bl_description = "Creates image texture nodes with existing image values and arranges nodes in a preset layout for all materials"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @instrumentation.instrumented
     def execute(self, context):
         obj = context.object
         if not obj or not obj.data.materials:
@@ -377,283 +773,78 @@ class NODE_OT_create_preset_2024(bpy.types.Operator):
                 continue
             
             materials_processed += 1
-            node_tree = mat.node_tree
+            _build_preset_2024(mat, _first_uv_name(obj))
         
-            # Retrieve values from nodes that might exist before clearing.
-            base_color_value = None
-            metallic_value = None
-            roughness_value = None
-            emissive_value = None
-            detail_scale_value = None
-        
-            base_color_node = node_tree.nodes.get("Base Color")
+        self.report({'INFO'}, f"Node preset layout created for {materials_processed} material(s)")
+        return {'FINISHED'}
 
-            # Check if the node exists and has valid outputs
-            if base_color_node and hasattr(base_color_node, "outputs") and base_color_node.outputs:
-                base_color_value = base_color_node.outputs[0].default_value
-            else:
-                base_color_value = (1.0, 1.0, 1.0)  # Fallback to white
-        
-            # Ensure base_color_value has an RGBA format by adding an alpha channel
-            if len(base_color_value) == 3:
-                base_color_rgba = (*base_color_value, 1.0)  # Adds 1.0 as the alpha value
-            elif len(base_color_value) == 4:
-                base_color_rgba = base_color_value  # It already has 4 sequences (RGBA)
-        
-            # Initialize variables to None before conditional checks
-            metallic_value = None
-            roughness_value = None
-            emissive_value = None
-            detail_scale_value = None
-        
-            metallic_node = node_tree.nodes.get("Metallic Factor")
-            if metallic_node and hasattr(metallic_node, "outputs") and metallic_node.outputs:
-                metallic_value = metallic_node.outputs[0].default_value
+def _default_dds_dir():
+    """The '../dds' folder next to the current .blend file."""
+    blend_file_dir = bpy.path.abspath('//')
+    parent_dir = os.path.abspath(os.path.join(blend_file_dir, os.pardir))
+    return os.path.join(parent_dir, 'dds')
+
+
+def _collect_image_users(materials, textures=()):
+    """image -> [(user, material name or None)] for the image texture nodes
+    of *materials* and the old-style image *textures*."""
+    users = {}
+    for material in materials:
+        if material and material.use_nodes:
+            for node in material.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image is not None:
+                    users.setdefault(node.image, []).append((node, material.name))
+    for texture in textures:
+        if texture.type == 'IMAGE' and texture.image is not None:
+            users.setdefault(texture.image, []).append((texture, None))
+    return users
+
+
+def _replace_textures_with_dds(materials, path_to_dds_files, textures=()):
+    """Swap every PNG/JPG image used by the image texture nodes of *materials*
+    (and by the old-style image *textures*) for the DDS file with the same
+    base name in *path_to_dds_files*.  Users are collected in one pass and
+    each image is resolved and loaded only once.
+    Returns (images_replaced, images_missing)."""
+
+    users = _collect_image_users(materials, textures)
+    replaced = 0
+    missing = 0
+    for image, image_users in users.items():
+        if not image.name:
+            continue
 
-            roughness_node = node_tree.nodes.get("Roughness Factor")
-            if roughness_node and hasattr(roughness_node, "outputs") and roughness_node.outputs:
-                roughness_value = roughness_node.outputs[0].default_value
+        # "name.png", "name.png.001", ... -> "name.dds"
+        dds_filename = core.names.dds_filename(image.name)
+        if dds_filename is None:
+            continue
+        dds_file_path = os.path.join(path_to_dds_files, dds_filename)
 
-            emissive_node = node_tree.nodes.get("Emissive Scale")
-            if emissive_node and hasattr(emissive_node, "outputs") and emissive_node.outputs:
-                emissive_value = emissive_node.outputs[0].default_value
-            
-            detail_scale_node = node_tree.nodes.get("Detail UV Scale")
-            if detail_scale_node and hasattr(detail_scale_node, "outputs") and detail_scale_node.outputs:
-                detail_scale_value = detail_scale_node.outputs[0].default_value
-        
-            # Retrieve the normal scale value from an existing node named "Normal Scale"
-            normal_scale_value = None
-            normal_scale_node = node_tree.nodes.get("Normal Scale")
-            if normal_scale_node and hasattr(normal_scale_node, "outputs") and normal_scale_node.outputs:
-                normal_scale_value = normal_scale_node.outputs[0].default_value
-        
-            # Try to find existing nodes (if any) before clearing the node tree.
-            existing_base = node_tree.nodes.get("Base Color Texture (RGBA)")
-            existing_detail = node_tree.nodes.get("Detail Color (RGB), Alpha (A)")
-            existing_base_mat = node_tree.nodes.get("Occlusion (R), Roughness (G), Metallic (B)")
-            existing_detail_mat = node_tree.nodes.get("Detail Occlusion (R), Roughness (G), Metallic (B)")
-            existing_normal = node_tree.nodes.get("Normal Texture (RGB)")
-        
-            base_image = existing_base.image if existing_base and existing_base.image else None
-            detail_image = existing_detail.image if existing_detail and existing_detail.image else None
-            base_mat_image = existing_base_mat.image if existing_base_mat and existing_base_mat.image else None
-            detail_mat_image = existing_detail_mat.image if existing_detail_mat and existing_detail_mat.image else None
-            normal_image = existing_normal.image if existing_normal and existing_normal.image else None
-        
-            # Clear existing nodes (optional – here we rebuild the node tree)
-            for node in list(node_tree.nodes):
-                node_tree.nodes.remove(node)
-        
-            # Create Material Output node
-            output_node = node_tree.nodes.new(type="ShaderNodeOutputMaterial")
-            output_node.location = (500, 0)
-        
-            # Create Principled BSDF node
-            bsdf_node = node_tree.nodes.new(type="ShaderNodeBsdfPrincipled")
-            bsdf_node.location = (200, 0)
-            node_tree.links.new(bsdf_node.outputs["BSDF"], output_node.inputs["Surface"])
-        
-            # Transfer value from "Base Color" to BSDF input "Base Color"
-            if base_color_value is not None:
-                bsdf_node.inputs["Base Color"].default_value = base_color_rgba
-        
-            # Transfer value from "Metallic Factor" to BSDF input "Metallic"
-            if metallic_value is not None:
-                bsdf_node.inputs["Metallic"].default_value = metallic_value
-        
-            # Transfer value from "Roughness Factor" to BSDF input "Roughness"
-            if roughness_value is not None:
-                bsdf_node.inputs["Roughness"].default_value = roughness_value
+        # Check if the DDS file exists on the disk
+        if not os.path.exists(dds_file_path):
+            print(f"DDS file not found for {image.name}: {dds_file_path}")
+            missing += 1
+            continue
 
-            # For emission, assume there is a custom input called "Emission Strength" in the shader.
-            if emissive_value is not None and "Emission Strength" in bsdf_node.inputs:
-                bsdf_node.inputs["Emission Strength"].default_value = emissive_value
-        
-            # Create Image Texture node for Base Color and assign image from existing node if available
-            base_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            base_color_node.location = (-500, 100)
-            base_color_node.name = "Base Color Texture"  # set name for clarity
-            if base_image:
-                base_color_node.image = base_image
-                base_color_node.image.colorspace_settings.name = 'sRGB'
-        
-            # Create another Image Texture node for Detail Color and assign image from existing node if available
-            detail_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            detail_color_node.location = (-500, -200)
-            detail_color_node.name = "Detail Color"
-            if detail_image:
-                detail_color_node.image = detail_image
-                detail_color_node.image.colorspace_settings.name = 'sRGB'
-            
-            # Create Image Texture node for Base Color Material and assign image from existing node if available
-            base_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            base_mat_color_node.location = (-800, 0)
-            base_mat_color_node.name = "Base Color Material Texture"  # set name for clarity
-            if base_mat_image:
-                base_mat_color_node.image = base_mat_image
-                base_mat_color_node.image.colorspace_settings.name = 'Non-Color'
-        
-            # Create another Image Texture node for Detail Color Material and assign image from existing node if available
-            detail_mat_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            detail_mat_color_node.location = (-800, -300)
-            detail_mat_color_node.name = "Detail Color"
-            if detail_mat_image:
-                detail_mat_color_node.image = detail_mat_image
-                detail_mat_color_node.image.colorspace_settings.name = 'Non-Color'
-            
-            # Create another Image Texture node for Normal Map and assign image from existing node if available
-            normal_color_node = node_tree.nodes.new(type="ShaderNodeTexImage")
-            normal_color_node.location = (-500, -500)
-            normal_color_node.name = "Normal Image"
-            if normal_image:
-                normal_color_node.image = normal_image
-                normal_color_node.image.colorspace_settings.name = 'Non-Color'
-        
-            # Create a Normal Map node
-            normal_map_node = node_tree.nodes.new(type="ShaderNodeNormalMap")
-            normal_map_node.location = (-200, -500)
-            if normal_scale_value is not None:
-                normal_map_node.inputs["Strength"].default_value = normal_scale_value
-        
-            # Connect the Normal Map node to the Principled BSDF node's Normal input
-            node_tree.links.new(normal_map_node.outputs["Normal"], bsdf_node.inputs["Normal"])
-        
-            # Link the normal image texture node into the Normal Map node's "Color" input
-            node_tree.links.new(normal_color_node.outputs["Color"], normal_map_node.inputs["Color"])
-        
-            # Check if base and detail textures have images
-            has_base_image = base_color_node.image is not None
-            has_detail_image = detail_color_node.image is not None
-        
-            if has_base_image and has_detail_image:
-                # Create a Mix Color node for albedo images
-                mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
-                mix_node.location = (-200, 100)
-                mix_node.blend_type = 'MIX'  # Use MIX mode (default)
-                mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
-                # Link the two albedo image texture nodes into the MixRGB node
-                node_tree.links.new(base_color_node.outputs["Color"], mix_node.inputs[1])
-                node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
-                # Link the output of the Mix Color node to the Principled BSDF's Base Color input
-                node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
-            elif has_base_image:
-                node_tree.links.new(base_color_node.outputs["Color"], bsdf_node.inputs["Base Color"])
-                node_tree.links.new(base_color_node.outputs["Alpha"], bsdf_node.inputs["Alpha"])
-            elif has_detail_image:
-                # Create a Mix Color node for albedo images
-                mix_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
-                mix_node.location = (0, 100)
-                mix_node.blend_type = 'MIX'  # Use MIX mode (default)
-                mix_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
-                color_input = node_tree.nodes.new(type="ShaderNodeRGB")
-                color_input.location = (-200, 100)
-                color_input.label = "Base Color Input"  # Name it for clarity
-                # Set the color value (RGBA format: (R, G, B, Alpha))
-                color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
-                node_tree.links.new(color_input.outputs["Color"], mix_node.inputs[1])  # Connect to input 1
-                node_tree.links.new(detail_color_node.outputs["Color"], mix_node.inputs[2])
-                # Link the output of the Mix Color node to the Principled BSDF's Base Color input
-                node_tree.links.new(mix_node.outputs["Color"], bsdf_node.inputs["Base Color"])
-            else:
-                color_input = node_tree.nodes.new(type="ShaderNodeRGB")
-                color_input.label = "Base Color Input"  # Name it for clarity
-                color_input.outputs[0].default_value = base_color_rgba  # Must be a tuple (R, G, B, A)
-                node_tree.links.new(color_input.outputs["Color"], bsdf_node.inputs["Base Color"])
-        
-            # Check if base and detail material textures have images
-            has_base_mat_image = base_mat_color_node.image is not None
-            has_detail_mat_image = detail_mat_color_node.image is not None
-        
-            if has_base_mat_image and has_detail_mat_image:
-                # Create a Mix Color node for material images
-                mix_mat_node = node_tree.nodes.new(type="ShaderNodeMixRGB")
-                mix_mat_node.location = (-200, -150)
-                mix_mat_node.blend_type = 'MIX'  # Use MIX mode (default)
-                mix_mat_node.inputs["Fac"].default_value = 0.5  # Adjust the factor as needed
-        
-                # Link the two material image texture nodes into the MixRGB node
-                node_tree.links.new(base_mat_color_node.outputs["Color"], mix_mat_node.inputs[1])
-                node_tree.links.new(detail_mat_color_node.outputs["Color"], mix_mat_node.inputs[2])
-            
-                # Create a Separate Color node
-                separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
-                separate_node.location = (0, -150)  # adjust the location as needed
-            
-                # Link the output of the Mix Color material node to the Separate Color node input
-                node_tree.links.new(mix_mat_node.outputs["Color"], separate_node.inputs["Color"])
-            
-                # Connect the Green channel from the Separate Color node to the Metallic input.
-                node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
-            
-                # Connect the Red channel from the Separate Color node to the Roughness input.
-                node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
-            elif has_base_mat_image:
-                # Create a Separate Color node
-                separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
-                separate_node.location = (0, -150)  # adjust the location as needed
-            
-                # Link the output of the Base Color material node to the Separate Color node input
-                node_tree.links.new(base_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
-            
-                # Connect the Green channel from the Separate Color node to the Metallic input.
-                node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
-            
-                # Connect the Red channel from the Separate Color node to the Roughness input.
-                node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
-            elif has_detail_mat_image:
-                # Create a Separate Color node
-                separate_node = node_tree.nodes.new("ShaderNodeSeparateColor")
-                separate_node.location = (0, -150)  # adjust the location as needed
-            
-                # Link the output of the Detail Color material node to the Separate Color node input
-                node_tree.links.new(detail_mat_color_node.outputs["Color"], separate_node.inputs["Color"])
-            
-                # Connect the Green channel from the Separate Color node to the Metallic input.
-                node_tree.links.new(separate_node.outputs["Green"], bsdf_node.inputs["Metallic"])
-            
-                # Connect the Red channel from the Separate Color node to the Roughness input.
-                node_tree.links.new(separate_node.outputs["Red"], bsdf_node.inputs["Roughness"])
-        
-            # Create a UV Map node
-            obj = context.object
-            if hasattr(obj.data, "uv_layers") and obj.data.uv_layers:
-                first_uv = obj.data.uv_layers[0].name
-            else:
-                first_uv = "UVMap"  # fallback if no UV maps exist
-            uv_map_node = node_tree.nodes.new(type="ShaderNodeUVMap")
-            uv_map_node.location = (-1200, 0)  # adjust location as needed
-            uv_map_node.uv_map = first_uv  # use the first UV map name from the object
-        
-            # Connect the UV Map node output to the Vector input of each image texture node
-            node_tree.links.new(uv_map_node.outputs["UV"], base_color_node.inputs["Vector"])
-        
-            node_tree.links.new(uv_map_node.outputs["UV"], base_mat_color_node.inputs["Vector"])
-            node_tree.links.new(uv_map_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
-            node_tree.links.new(uv_map_node.outputs["UV"], normal_color_node.inputs["Vector"])
-        
-            # --- Bake Detail UV scale into a dedicated UV layer ---
-            if detail_scale_value is not None:
-                mapping_scale = detail_scale_value / 100.0
-            else:
-                mapping_scale = 1.0
+        try:
+            # Load the new DDS image and replace the old one
+            new_image = bpy.data.images.load(filepath=dds_file_path, check_existing=True)
+            instrumentation.count("images_loaded")
+        except Exception as e:
+            print(f"Error loading {dds_filename}: {e}")
+            continue
 
-            detail_uv_name = _create_detail_uv_for_material(
-                mat, first_uv, mapping_scale, mapping_scale
-            )
+        old_name = image.name
+        for user, material_name in image_users:
+            user.image = new_image
+            if material_name is not None:
+                print(f"Replaced {old_name} with {dds_filename} in material: {material_name}")
+            else:
+                print(f"Replaced {old_name} with {dds_filename} in texture: {user.name}")
+        replaced += 1
 
-            # Create a UV Map shader node pointing at the new Detail UV layer
-            detail_uv_node = node_tree.nodes.new(type="ShaderNodeUVMap")
-            detail_uv_node.location = (-1000, -300)
-            detail_uv_node.uv_map = detail_uv_name
-            detail_uv_node.label = detail_uv_name
+    return replaced, missing
 
-            # Wire Detail UV node into the detail image texture nodes
-            node_tree.links.new(detail_uv_node.outputs["UV"], detail_color_node.inputs["Vector"])
-            node_tree.links.new(detail_uv_node.outputs["UV"], detail_mat_color_node.inputs["Vector"])
-        
-        self.report({'INFO'}, f"Node preset layout created for {materials_processed} material(s)")
-        return {'FINISHED'}
 
 class NODE_OT_replace_textures_script(bpy.types.Operator):
     bl_idname = "object.replace_textures_with_dds"
@@ -661,106 +852,677 @@ class NODE_OT_replace_textures_script(bpy.types.Operator):
     bl_description = "Replaces all PNG/JPG image textures with corresponding DDS files"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @instrumentation.instrumented
     def execute(self, context):
-        blend_file_dir = bpy.path.abspath('//')
-        parent_dir = os.path.abspath(os.path.join(blend_file_dir, os.pardir))
-        path_to_dds_files = os.path.join(parent_dir, 'dds')
-
-        # Regular expression to find base names ending in common image extensions,
-        # followed by an optional numeric or other suffix.
-        # It handles names like "texture.png", "texture.png.001", "texture.jpg.other_suffix".
-        regex = re.compile(r'(.+?)\.(png|jpg|jpeg)\b(.*)', re.IGNORECASE)
-
-        # Iterate through all images in the .blend file
-        for image in bpy.data.images:
-            if image is None or not image.name:
-                continue
+        _replace_textures_with_dds(bpy.data.materials, _default_dds_dir(), bpy.data.textures)
 
-            # Check if the image name matches our pattern
-            match = regex.match(image.name)
-            if match:
-                # The base name is the first captured group
-                base_name = match.group(1)
-                dds_filename = base_name + ".dds"
-                dds_file_path = os.path.join(path_to_dds_files, dds_filename)
-
-                # Check if the DDS file exists on the disk
-                if os.path.exists(dds_file_path):
-                    try:
-                        # Load the new DDS image and replace the old one
-                        new_image = bpy.data.images.load(filepath=dds_file_path, check_existing=True)
-
-                        # Update the image in all materials that use it
-                        for material in bpy.data.materials:
-                            if material.use_nodes:
-                                for node in material.node_tree.nodes:
-                                    if node.type == 'TEX_IMAGE' and node.image == image:
-                                        node.image = new_image
-                                        print(f"Replaced {image.name} with {dds_filename} in material: {material.name}")
-                        
-                        # Update the image in any old-style textures
-                        for texture in bpy.data.textures:
-                            if texture.type == 'IMAGE' and texture.image == image:
-                                texture.image = new_image
-                                print(f"Replaced {image.name} with {dds_filename} in texture: {texture.name}")
-
-                    except Exception as e:
-                        print(f"Error loading {dds_filename}: {e}")
-                else:
-                    print(f"DDS file not found for {image.name}: {dds_file_path}")
-        
         self.report({'INFO'}, "Texture images successfully changed to .dds!")
         return {'FINISHED'}
 
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DDS conversion
+#
+# PNG/JPG images without a DDS file in the DDS folder are encoded by
+# core.dds (BC1, BC3 when the image has transparency, BC5 or BC1 for
+# normal maps; full mip chain).  Pixels are read here, in Blender's main
+# thread, one image at a time as the worker pool asks for more work;
+# encoding and writing happen in the pool.
+# ─────────────────────────────────────────────────────────────────────────────
+_NORMAL_TEXTURE_NODES = ("Normal Image", "Normal Texture (RGB)")
+
+
+def _is_normal_map_user(user):
+    """Whether *user* (an image texture node or texture) holds a normal map:
+    a preset/MSFS normal texture node or a node feeding a Normal Map node."""
+    if getattr(user, "type", None) != 'TEX_IMAGE':
+        return False
+    if user.name in _NORMAL_TEXTURE_NODES:
+        return True
+    return any(link.to_node.type == 'NORMAL_MAP' for output in user.outputs for link in output.links)
+
+
+def _dds_pixels(image):
+    """(h, w, 4) uint8 pixels of *image*, top row first as DDS stores them."""
+    import numpy as np
+
+    pixels = _read_pixels(image)[::-1]
+    return (np.clip(pixels, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def _convert_missing_dds(materials, path_to_dds_files, textures=(), normal_format='BC5', workers=0):
+    """Write a DDS file into *path_to_dds_files* for every PNG/JPG image of
+    *materials*/*textures* that has none yet.  Returns (written, failed)."""
+
+    targets = {}
+    for image, image_users in _collect_image_users(materials, textures).items():
+        dds_filename = core.names.dds_filename(image.name)
+        if dds_filename is None:
+            continue
+        dds_file_path = os.path.join(path_to_dds_files, dds_filename)
+        if dds_file_path in targets or os.path.exists(dds_file_path):
+            continue
+        if not image.size[0] or not image.size[1]:
+            print(f"Cannot convert {image.name}: image has no pixels (missing file?)")
+            continue
+        fmt = normal_format if any(_is_normal_map_user(user) for user, _ in image_users) else 'AUTO'
+        targets[dds_file_path] = (image, fmt)
+    if not targets:
+        return 0, 0
+
+    os.makedirs(path_to_dds_files, exist_ok=True)
+    pool, kind = core.workers.make_pool(workers or None)
+    print(f"--- Converting {len(targets)} image(s) to DDS ({kind} pool) ---")
+    try:
+        jobs = ((path, _dds_pixels(image), fmt) for path, (image, fmt) in targets.items())
+        results = core.workers.map_bounded(pool, core.dds.write_dds, jobs, 2 * core.workers.worker_count(workers))
+    finally:
+        pool.shutdown()
+
+    failed = 0
+    for path, error in results:
+        if error:
+            print(f"DDS conversion failed for {path}: {error}")
+            failed += 1
+        else:
+            print(f"Wrote {path}")
+    instrumentation.count("dds_written", len(results) - failed)
+    return len(results) - failed, failed
+
+
+class OBJECT_OT_bleliza_convert_missing_dds(bpy.types.Operator):
+    bl_idname = "object.bleliza_convert_missing_dds"
+    bl_label = "Convert Missing Textures to DDS"
+    bl_description = (
+        "Encodes every PNG/JPG texture that has no DDS file in ../dds yet as BC1/BC3 DDS (BC5 for normal maps) "
+        "with mipmaps, using all CPU cores, and optionally swaps the images for the DDS files"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    normal_format: bpy.props.EnumProperty(
+        name="Normal Maps",
+        items=[
+            ('BC5', "BC5", "Two-channel (X/Y) compression, best quality for normal maps"),
+            ('BC1', "BC1", "Three-channel compression, for viewers that cannot reconstruct Z from BC5"),
+        ],
+        default='BC5',
+    )
+    replace: bpy.props.BoolProperty(
+        name="Replace Textures",
+        default=True,
+        description="Swap the images for the DDS files afterwards (like Replace Textures)"
+    )
+    workers: bpy.props.IntProperty(
+        name="Workers",
+        default=0,
+        min=0,
+        description="Encoder processes (0 = one per CPU core)"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        if not bpy.data.filepath:
+            self.report({'ERROR'}, "Save the .blend file first: the DDS files go to ../dds next to it.")
+            return {'CANCELLED'}
+
+        dds_dir = _default_dds_dir()
+        written, failed = _convert_missing_dds(
+            bpy.data.materials, dds_dir, bpy.data.textures, self.normal_format, self.workers,
+        )
+        if self.replace:
+            _replace_textures_with_dds(bpy.data.materials, dds_dir, bpy.data.textures)
+
+        level = {'WARNING'} if failed else {'INFO'}
+        self.report(level, f"Wrote {written} DDS file(s), {failed} failed. See console for details.")
+        return {'FINISHED'}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Resolution caps per texture class
+#
+# Images are classified by the ALIZA preset node that uses them (base
+# colour, ORM, normal) or, for the materials of the ground tile grid
+# (Create & Assign Materials, Scene "Material Prefix"), as ground tiles.
+# Images larger than the cap of their class (the largest cap if they have
+# several) are resampled in the worker pool and written next to the
+# original as "<name>_max<cap>.png" (".dds" for DDS originals, same BC
+# format, with mipmaps).  Only when all files are written are the image
+# file paths switched over, so a failed or cancelled run leaves the
+# images untouched.  Detail textures tile and are not capped.
+# ─────────────────────────────────────────────────────────────────────────────
+TEXTURE_CLASS_NODES = {
+    "Base Color Texture": 'BASE',
+    "Base Color Material Texture": 'ORM',
+    "Normal Image": 'NORMAL',
+}
+TEXTURE_CLASS_LIMITS = {'BASE': 2048, 'ORM': 1024, 'NORMAL': 2048, 'GROUND': 4096}
+
+
+def _classify_images(materials, ground_prefix=""):
+    """image -> set of texture classes it is used as."""
+    classes = {}
+    for mat in materials:
+        if not mat or not mat.use_nodes or not mat.node_tree:
+            continue
+        nodes = mat.node_tree.nodes
+        is_ground = (
+            bool(ground_prefix) and mat.name.startswith(ground_prefix)
+            and nodes.get("Base Color Material Texture") is None
+        )
+        for node in nodes:
+            if node.type != 'TEX_IMAGE' or node.image is None:
+                continue
+            image_class = 'GROUND' if is_ground else TEXTURE_CLASS_NODES.get(node.name)
+            if image_class is not None:
+                classes.setdefault(node.image, set()).add(image_class)
+    return classes
+
+
+def _capped_image_jobs(materials, limits, ground_prefix=""):
+    """(image, output path, width, height, format, is normal map) for every
+    file image of *materials* above the cap of its classes."""
+    jobs = []
+    for image, classes in _classify_images(materials, ground_prefix).items():
+        if image.source != 'FILE' or image.packed_file is not None or image.library is not None:
+            continue
+        limit = max(limits[image_class] for image_class in classes)
+        if max(image.size) <= limit or not min(image.size):
+            continue
+
+        source_path = bpy.path.abspath(image.filepath)
+        stem, extension = os.path.splitext(source_path)
+        fmt = 'PNG'
+        if extension.lower() == ".dds":
+            info = core.textures.read_image_header(source_path) or {}
+            fmt = core.dds.FORMAT_BY_FOURCC.get(info.get("fourcc"), 'AUTO')
+        # DDS sides stay multiples of the 4×4 block size
+        width, height = core.images.capped_size(image.size[0], image.size[1], limit, 1 if fmt == 'PNG' else 4)
+        output_path = f"{stem}_max{limit}{'.dds' if fmt != 'PNG' else '.png'}"
+        jobs.append((image, output_path, width, height, fmt, 'NORMAL' in classes))
+    return jobs
+
+
+def _cap_texture_resolution(materials, limits, ground_prefix="", kind='LANCZOS', workers=0):
+    """Resample the images of *materials* above their class cap and point
+    them at the new files, all of them or (if any job failed) none.
+    Returns (images resized, failed)."""
+
+    jobs = _capped_image_jobs(materials, limits, ground_prefix)
+    if not jobs:
+        return 0, 0
+
+    pool, pool_kind = core.workers.make_pool(workers or None)
+    print(f"--- Capping texture resolution of {len(jobs)} image(s) ({pool_kind} pool) ---")
+    try:
+        arguments = (
+            (path, _dds_pixels(image), width, height, kind, fmt, is_normal)
+            for image, path, width, height, fmt, is_normal in jobs
+        )
+        # Every job in flight holds a full decoded image: one per worker
+        results = core.workers.map_bounded(
+            pool, core.images.resize_to_file, arguments, core.workers.worker_count(workers),
+        )
+    finally:
+        pool.shutdown()
+
+    failed = 0
+    for (image, _, _, _, _, _), (_, error) in zip(jobs, results):
+        if error:
+            print(f"Resizing {image.name} failed: {error}")
+            failed += 1
+    if failed:
+        print(f"{failed} of {len(jobs)} image(s) failed; no image was switched over")
+        return 0, failed
+
+    # All files are complete now; switch the images over in one pass
+    for image, path, width, height, _, _ in jobs:
+        relative = image.filepath.startswith("//") and bpy.data.filepath
+        print(f"{image.name}: {image.size[0]}x{image.size[1]} -> {width}x{height} ({path})")
+        image.filepath = bpy.path.relpath(path) if relative else path
+    instrumentation.count("images_resized", len(jobs))
+    return len(jobs), 0
+
+
+class OBJECT_OT_bleliza_cap_texture_resolution(bpy.types.Operator):
+    bl_idname = "object.bleliza_cap_texture_resolution"
+    bl_label = "Cap Texture Resolution"
+    bl_description = (
+        "Downsizes base colour, ORM, normal and ground tile textures above a maximum resolution per class, "
+        "writes the smaller files next to the originals and points the images at them"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    max_base: bpy.props.IntProperty(
+        name="Base Color", default=TEXTURE_CLASS_LIMITS['BASE'], min=4, description="Maximum base colour texture size"
+    )
+    max_orm: bpy.props.IntProperty(
+        name="ORM", default=TEXTURE_CLASS_LIMITS['ORM'], min=4,
+        description="Maximum occlusion/roughness/metallic texture size"
+    )
+    max_normal: bpy.props.IntProperty(
+        name="Normal", default=TEXTURE_CLASS_LIMITS['NORMAL'], min=4, description="Maximum normal map size"
+    )
+    max_ground: bpy.props.IntProperty(
+        name="Ground Tiles", default=TEXTURE_CLASS_LIMITS['GROUND'], min=4,
+        description="Maximum size of the ground tile textures (materials with the Scene's Material Prefix)"
+    )
+    resample_filter: bpy.props.EnumProperty(
+        name="Filter",
+        items=[
+            ('LANCZOS', "Lanczos", "Sharp downsizing (Lanczos-3)"),
+            ('BOX', "Box", "Plain area average, fastest"),
+        ],
+        default='LANCZOS',
+    )
+    workers: bpy.props.IntProperty(
+        name="Workers",
+        default=0,
+        min=0,
+        description="Resampling processes (0 = one per CPU core)"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        limits = {'BASE': self.max_base, 'ORM': self.max_orm, 'NORMAL': self.max_normal, 'GROUND': self.max_ground}
+        resized, failed = _cap_texture_resolution(
+            bpy.data.materials, limits, context.scene.bleliza_mat_prefix, self.resample_filter, self.workers,
+        )
+        if failed:
+            self.report(
+                {'WARNING'}, f"Resizing {failed} texture(s) failed; no image was changed. See console for details."
+            )
+        else:
+            self.report({'INFO'}, f"Resized {resized} texture(s).")
+        return {'FINISHED'}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Duplicate images
+#
+# Images are grouped by their normalised absolute file path; the remaining
+# groups are merged further when their files have identical content (only
+# files of equal size are hashed, in a thread pool).  Images are only merged
+# when colour space and alpha mode agree, since those are per datablock.
+# Every group keeps one canonical image; the users of the others are
+# remapped to it and the duplicates are removed.
+# ─────────────────────────────────────────────────────────────────────────────
+_NUMBERED_NAME_RE = re.compile(r"\.\d{3}$")
+
+
+def _canonical_id(id_blocks):
+    """The datablock to keep out of equivalent *id_blocks*: prefer names
+    without a '.001' suffix, then the most users, then the shortest name."""
+    return min(id_blocks, key=lambda id_block: (
+        bool(_NUMBERED_NAME_RE.search(id_block.name)), -id_block.users, len(id_block.name), id_block.name,
+    ))
+
+
+def _find_duplicate_images(use_content_hash=True, workers=8):
+    """Return (groups, files_hashed); every group is a list of local,
+    file-backed, unpacked images to be merged into group[0]."""
+
+    by_path = {}
+    for image in bpy.data.images:
+        if image.library is not None or image.packed_file is not None:
+            continue
+        if image.source != 'FILE' or not image.filepath:
+            continue
+        path = core.files.normalize_path(bpy.path.abspath(image.filepath))
+        key = (image.colorspace_settings.name, image.alpha_mode)
+        by_path.setdefault((path, key), []).append(image)
+
+    # Merge the path groups whose files have the same content
+    hashed = 0
+    merged = {path_key: path_key for path_key in by_path}
+    if use_content_hash:
+        paths_by_key = {}
+        for path, key in by_path:
+            paths_by_key.setdefault(key, []).append(path)
+        for key, paths in paths_by_key.items():
+            if len(paths) < 2:
+                continue
+            same_content, files_read = core.files.identical_files(paths, workers)
+            hashed += files_read
+            for group in same_content:
+                for path in group[1:]:
+                    merged[(path, key)] = (group[0], key)
+
+    groups = {}
+    for path_key, images in by_path.items():
+        groups.setdefault(merged[path_key], []).extend(images)
+
+    result = []
+    for images in groups.values():
+        if len(images) < 2:
+            continue
+        canonical = _canonical_id(images)
+        result.append([canonical] + [image for image in images if image is not canonical])
+    instrumentation.count("files_hashed", hashed)
+    return result, hashed
+
+
+def _merge_duplicate_images(groups):
+    """Remap every user of the duplicates in *groups* to the group's first
+    image and remove the duplicates.  Returns the number of removed images."""
+
+    duplicates = []
+    for canonical, *others in groups:
+        for image in others:
+            image.user_remap(canonical)
+            duplicates.append(image)
+    if duplicates:
+        bpy.data.batch_remove(duplicates)
+    instrumentation.count("images_removed", len(duplicates))
+    return len(duplicates)
+
+
+class OBJECT_OT_bleliza_merge_duplicate_images(bpy.types.Operator):
+    bl_idname = "object.bleliza_merge_duplicate_images"
+    bl_label = "Merge Duplicate Images"
+    bl_description = (
+        "Finds image datablocks that use the same file (through different paths or '.001' copies) or files "
+        "with identical content, remaps all users to one image and removes the duplicates"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_content_hash: bpy.props.BoolProperty(
+        name="Compare File Contents",
+        default=True,
+        description="Also merge images whose different files have identical content (hashes files of equal size)"
+    )
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        default=False,
+        description="Only report what would be merged"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        groups, hashed = _find_duplicate_images(self.use_content_hash)
+        duplicate_count = sum(len(group) - 1 for group in groups)
+
+        header = "DRY RUN - " if self.dry_run else ""
+        print(f"--- {header}Merge Duplicate Images ({len(groups)} group(s), {hashed} file(s) hashed) ---")
+        for canonical, *others in groups:
+            print(f"  {canonical.name} <- {', '.join(image.name for image in others)}")
+
+        if not self.dry_run:
+            _merge_duplicate_images(groups)
+
+        verb = "Would merge" if self.dry_run else "Merged"
+        self.report(
+            {'INFO'},
+            f"{verb} {duplicate_count} duplicate image(s) into {len(groups)} image(s). See console for details.",
+        )
+        return {'FINISHED'}
+
+# Node types that are removed once nothing uses their outputs any more
+_DANGLING_NODE_TYPES = frozenset((
+    'TEX_IMAGE', 'NORMAL_MAP',
+    'MIX', 'MIX_RGB',
+    'SEPARATE_COLOR', 'SEPRGB', 'SEPARATE_XYZ', 'SEPXYZ',
+))
+
+
+def _remove_empty_texture_nodes(mat):
+    """Remove unused image texture nodes (and Normal Map nodes left without
+    an image) from *mat*, together with the Mix/Separate nodes that are
+    left dangling.  Returns the number of removed nodes.
+
+    The links are scanned once into per-node counts, so the cost is linear
+    in nodes + links.  Removing a node releases the nodes feeding it, which
+    are removed in the same pass when nothing else uses them (a texture
+    feeding only an unused Separate Color node, for example)."""
+
+    node_tree = mat.node_tree
+    outgoing = {}
+    sources = {}
+    for link in node_tree.links:
+        outgoing[link.from_node] = outgoing.get(link.from_node, 0) + 1
+        sources.setdefault(link.to_node, []).append(link.from_node)
+
+    pending = []
+    for node in node_tree.nodes:
+        if node.type not in _DANGLING_NODE_TYPES:
+            continue
+        if not outgoing.get(node):
+            pending.append(node)
+        elif node.type == 'TEX_IMAGE' and node.image is None:
+            # An empty texture feeding a Normal Map: both go
+            normal_maps = [link.to_node for link in node.outputs[0].links if link.to_node.type == 'NORMAL_MAP']
+            if normal_maps:
+                pending.append(node)
+                pending.extend(normal_maps)
+        elif node.type == 'NORMAL_MAP' and not node.inputs['Color'].is_linked:
+            pending.append(node)
+
+    nodes_to_remove = set()
+    while pending:
+        node = pending.pop()
+        if node in nodes_to_remove:
+            continue
+        nodes_to_remove.add(node)
+        for source in sources.get(node, ()):
+            outgoing[source] -= 1
+            if not outgoing[source] and source.type in _DANGLING_NODE_TYPES:
+                pending.append(source)
+
+    for node in nodes_to_remove:
+        node_tree.nodes.remove(node)
+    instrumentation.count("nodes_removed", len(nodes_to_remove))
+    return len(nodes_to_remove)
+
+
 class NODE_OT_remove_empty_textures_nodes_script(bpy.types.Operator):
     bl_idname = "object.remove_empty_textures_nodes"
     bl_label = "Remove empty textures nodes"
-    bl_description = "Removes all unused image texture nodes from all materials of the selected object"
+    bl_description = (
+        "Removes all unused image texture nodes, and the Mix/Separate nodes left unused, "
+        "from the materials of the active object, the selection or the whole file"
+    )
     bl_options = {'REGISTER', 'UNDO'}
 
+    scope: bpy.props.EnumProperty(name="Scope", items=MATERIAL_SCOPE_ITEMS, default='OBJECT')
+
+    @instrumentation.instrumented
     def execute(self, context):
-        obj = context.object
-        if not obj or not obj.data.materials:
-            self.report({'WARNING'}, "Active object must have materials")
-            return {'CANCELLED'}
-        
-        removed_nodes_count = 0
+        if self.scope == 'OBJECT':
+            obj = context.object
+            if not obj or not obj.data.materials:
+                self.report({'WARNING'}, "Active object must have materials")
+                return {'CANCELLED'}
 
-        for mat in obj.data.materials:
-            if not mat or not mat.use_nodes:
+        # Shared materials are visited once
+        materials = [mat for mat in _scope_materials(context, self.scope) if mat.use_nodes and mat.node_tree]
+        removed_nodes_count = sum(_remove_empty_texture_nodes(mat) for mat in materials)
+
+        self.report({'INFO'}, f"Removed {removed_nodes_count} empty or unused nodes from {len(materials)} material(s).")
+        return {'FINISHED'}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constant textures
+#
+# Many imported textures are effectively constant: flat normal maps, solid
+# colours, alpha channels that are 1 everywhere.  Each image is analysed
+# once: DDS files are decoded directly by core.dds in a thread pool (the
+# image is not loaded into Blender), everything else is read with one
+# pixels.foreach_get.  Then, per material, links from a texture output
+# whose channels are constant are replaced by the value on the input they
+# fed (colour inputs get linear colour, like Blender's sRGB conversion),
+# flat normal maps drop their Normal Map branch, Separate Color nodes
+# left with a constant input pass their channels on as values, and the
+# empty texture cleanup removes what is no longer connected.
+# ─────────────────────────────────────────────────────────────────────────────
+_LUMINANCE = (0.2126, 0.7152, 0.0722)
+_OUTPUT_CHANNELS = {"Color": (0, 1, 2), "Alpha": (3,)}
+
+
+def _analyze_images(images, tolerance=2, workers=8):
+    """image -> (channel values in 0..1, channel is constant) for *images*;
+    images without readable pixels are left out."""
+    from concurrent.futures import ThreadPoolExecutor
+    import numpy as np
+
+    dds_paths = {}
+    for image in images:
+        if image.source == 'FILE' and image.packed_file is None and image.filepath.lower().endswith(".dds"):
+            dds_paths[image] = bpy.path.abspath(image.filepath, library=image.library)
+
+    analysis = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        decoded = pool.map(core.dds.read_dds, dds_paths.values())
+        for image, pixels in zip(dds_paths, decoded):
+            if pixels is not None:
+                analysis[image] = core.images.channel_constants(pixels, tolerance)
+    instrumentation.count("dds_decoded", len(analysis))
+
+    for image in images:
+        if image in analysis or not image.size[0] or not image.size[1]:
+            continue
+        pixels = (np.clip(_read_pixels(image), 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+        analysis[image] = core.images.channel_constants(pixels, tolerance)
+    instrumentation.count("images_analyzed", len(analysis))
+    return analysis
+
+
+def _constant_socket_value(socket, values, channels, linear):
+    """The default_value for *socket* replacing a texture output of
+    *channels*, or None if the socket cannot take a plain value."""
+    if len(channels) == 1:
+        value = float(values[channels[0]])
+        if socket.type == 'RGBA':
+            return (value, value, value, 1.0)
+        return value if socket.type == 'VALUE' else None
+    if socket.type == 'RGBA':
+        return (*(float(v) for v in linear[:3]), 1.0)
+    if socket.type == 'VALUE':
+        return float(sum(w * v for w, v in zip(_LUMINANCE, linear[:3])))
+    return None
+
+
+def _fold_constant_separate_color(node_tree):
+    """Replace Separate Color/RGB nodes with an unlinked input by their
+    channel values on the inputs they feed.  Returns the number of removed
+    nodes."""
+    removed = 0
+    for node in list(node_tree.nodes):
+        if node.type not in ('SEPARATE_COLOR', 'SEPRGB') or getattr(node, "mode", 'RGB') != 'RGB':
+            continue
+        color_input = node.inputs[0]
+        if color_input.is_linked:
+            continue
+        color = tuple(color_input.default_value)
+        for channel, output in enumerate(node.outputs):
+            for link in list(output.links):
+                if link.to_socket.type == 'VALUE':
+                    target = link.to_socket
+                    node_tree.links.remove(link)
+                    target.default_value = color[channel]
+        if not any(output.is_linked for output in node.outputs):
+            node_tree.nodes.remove(node)
+            removed += 1
+    return removed
+
+
+def _replace_constant_textures(mat, analysis, tolerance=2):
+    """Rewrite the links from constant texture outputs of *mat* to plain
+    values (see above).  Returns (links replaced, nodes removed)."""
+    node_tree = mat.node_tree
+    replaced = 0
+    for node in list(node_tree.nodes):
+        if node.type != 'TEX_IMAGE' or node.image not in analysis:
+            continue
+        values, constant = analysis[node.image]
+        linear = values[:3]
+        if node.image.colorspace_settings.name == 'sRGB' and not node.image.is_float:
+            linear = core.images.srgb_to_linear(values[:3])
+
+        for output in node.outputs:
+            channels = _OUTPUT_CHANNELS.get(output.name)
+            if channels is None or any(channel >= len(constant) or not constant[channel] for channel in channels):
                 continue
+            for link in list(output.links):
+                target = link.to_socket
+                if link.to_node.type == 'NORMAL_MAP':
+                    # A flat normal map does nothing: drop the branch
+                    if len(channels) == 3 and core.images.is_flat_normal(values, tolerance):
+                        node_tree.links.remove(link)
+                        replaced += 1
+                    continue
+                value = _constant_socket_value(target, values, channels, linear)
+                if value is None:
+                    continue
+                node_tree.links.remove(link)
+                target.default_value = value
+                replaced += 1
 
-            nodes = mat.node_tree.nodes
-            links = mat.node_tree.links
-            nodes_to_remove = set()
-
-            for node in nodes:
-                # Check for unused image texture nodes
-                if node.type == 'TEX_IMAGE':
-                    has_outputs = any(link.from_node == node for link in links)
-                    if not has_outputs:
-                        nodes_to_remove.add(node)
-                        continue
-
-                    # Check if the image is empty or None and it's connected to a normal map node
-                    if node.image is None:
-                        for link in node.outputs[0].links:
-                            if link.to_node.type == 'NORMAL_MAP':
-                                nodes_to_remove.add(link.to_node)
-                                nodes_to_remove.add(node)
-
-                # Optional: remove NORMAL_MAP nodes with no input
-                elif node.type == 'NORMAL_MAP':
-                    if not node.inputs['Color'].is_linked:
-                        nodes_to_remove.add(node)
-
-            for node in nodes_to_remove:
-                nodes.remove(node)
-                removed_nodes_count += 1
-
-        self.report({'INFO'}, f"Removed {removed_nodes_count} empty or unused nodes from selected object.")
+    removed = _fold_constant_separate_color(node_tree) if replaced else 0
+    if replaced:
+        removed += _remove_empty_texture_nodes(mat)
+    instrumentation.count("links_replaced", replaced)
+    return replaced, removed
+
+
+class OBJECT_OT_bleliza_replace_constant_textures(bpy.types.Operator):
+    bl_idname = "object.bleliza_replace_constant_textures"
+    bl_label = "Replace Constant Textures with Values"
+    bl_description = (
+        "Finds textures that are effectively constant (flat normal maps, solid colours, alpha that is always 1) "
+        "and replaces them in the node layout with plain values, removing the unused texture nodes"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(name="Scope", items=MATERIAL_SCOPE_ITEMS, default='OBJECT')
+    tolerance: bpy.props.IntProperty(
+        name="Tolerance",
+        default=2,
+        min=0,
+        max=32,
+        description="Largest difference (in 8-bit levels) between pixels of a channel that still counts as constant"
+    )
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        default=False,
+        description="Only analyse the textures and list the constant channels"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        materials = [mat for mat in _scope_materials(context, self.scope) if mat.use_nodes and mat.node_tree]
+        images = {
+            node.image: None
+            for mat in materials for node in mat.node_tree.nodes
+            if node.type == 'TEX_IMAGE' and node.image is not None
+        }
+        analysis = _analyze_images(list(images), self.tolerance)
+
+        header = "DRY RUN - " if self.dry_run else ""
+        print(f"--- {header}Constant Textures ({len(analysis)} image(s) analysed) ---")
+        constant_images = 0
+        for image, (values, constant) in analysis.items():
+            if constant.any():
+                constant_images += 1
+                channels = ", ".join(f"{'RGBA'[i]}={values[i]:.3f}" for i in range(len(constant)) if constant[i])
+                print(f"  {image.name}: {channels}")
+
+        if self.dry_run:
+            self.report({'INFO'}, f"{constant_images} texture(s) with constant channels. See console for details.")
+            return {'FINISHED'}
+
+        replaced = removed = 0
+        for mat in materials:
+            mat_replaced, mat_removed = _replace_constant_textures(mat, analysis, self.tolerance)
+            replaced += mat_replaced
+            removed += mat_removed
+
+        self.report(
+            {'INFO'},
+            f"Replaced {replaced} texture link(s) with values, removed {removed} node(s) "
+            f"({constant_images} texture(s) with constant channels).",
+        )
         return {'FINISHED'}
 
+
 class NODE_OT_create_and_assign_materials(bpy.types.Operator):
     bl_idname = "object.create_and_assign_materials"
     bl_label = "Create and Assign Materials"
@@ -807,7 +1569,20 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
         default=""
     )
 
+    @instrumentation.instrumented
     def execute(self, context):
+        import numpy as np
+
+        _scene_defaults(self, context, {
+            "grid_columns": "bleliza_cols",
+            "grid_rows": "bleliza_rows",
+            "mat_prefix": "bleliza_mat_prefix",
+            "tex_folder": "bleliza_tex_folder",
+            "tex_ext": "bleliza_tex_ext",
+            "tex_name_prefix": "bleliza_tex_name_prefix",
+            "tex_name_suffix": "bleliza_tex_name_suffix",
+        })
+
         # --- Configuration ---
         columns = self.grid_columns
         rows = self.grid_rows
@@ -815,7 +1590,7 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
         # Note: `tex_folder` can be absolute or Blender-relative ("//...").
         # Always resolve it with `bpy.path.abspath()` before joining filenames.
         texture_folder_abs = bpy.path.abspath(self.tex_folder)
-        tex_ext = self.tex_ext if self.tex_ext.startswith(".") else f".{self.tex_ext}"
+        tex_ext = core.names.normalize_extension(self.tex_ext)
 
         # 1. Check for a selected object
         obj = context.object
@@ -845,32 +1620,33 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
 
         missing_textures = []
 
-        # Create and assign materials
         # Sort faces so counting starts at the top-left tile, then goes right,
         # then the next row, etc. (row-major order in screen/top-view terms).
         # We use world-space polygon centers for robustness.
-        polygons_sorted = sorted(
-            obj.data.polygons,
-            key=lambda p: (
-                -(obj.matrix_world @ p.center).y,  # top (largest Y) first
-                (obj.matrix_world @ p.center).x,   # then left (smallest X) to right
-            ),
-        )
-
-        for i, poly in enumerate(polygons_sorted):
+        mesh = obj.data
+        centers = np.empty(TOTAL_FACES * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("center", centers)
+        world = np.array(obj.matrix_world, dtype=np.float64)
+        centers = centers.reshape(-1, 3).astype(np.float64) @ world[:3, :3].T + world[:3, 3]
+        face_order = core.grid.grid_order(centers)
+        tile_rows, tile_cols = core.grid.grid_cells(TOTAL_FACES, columns)
+
+        # One directory listing instead of a stat call per candidate file
+        existing_files = core.names.list_files(texture_folder_abs)
+        material_indices = np.empty(TOTAL_FACES, dtype=np.int32)
+
+        for i, face_index in enumerate(face_order):
             # Coordinate convention:
             # - X = column index, left->right, 0..columns-1 (first number)
             # - Y = row index, top->bottom,  0..rows-1    (second number)
-            row = i // columns  # y
-            col = i % columns   # x
+            row = int(tile_rows[i])  # y
+            col = int(tile_cols[i])  # x
 
             # Determine file and material names
             # File name format: "{prefix}{col}<sep>{row}{suffix}{ext}"
-            # Some datasets use '_' while others use '-'; try both.
-            file_name_candidates = [
-                f"{self.tex_name_prefix}{col}-{row}{self.tex_name_suffix}{tex_ext}",
-                f"{self.tex_name_prefix}{col}_{row}{self.tex_name_suffix}{tex_ext}",
-            ]
+            file_name_candidates = core.names.tile_texture_candidates(
+                col, row, self.tex_name_prefix, self.tex_name_suffix, tex_ext
+            )
             material_name = f"{self.mat_prefix}{col}-{row}"
 
             # 2. Create New Material
@@ -878,19 +1654,16 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
             if mat is None:
                 mat = bpy.data.materials.new(name=material_name)
                 mat.use_nodes = True
+                instrumentation.count("materials_created")
                 print(f"  Created material: {material_name}")
             else:
                 print(f"  Reusing existing material: {material_name}")
 
 
-            # 3. Add Material Slot and Assign to Face
+            # 3. Add Material Slot and remember it for the face (all faces
+            # are assigned with one foreach_set after the loop)
             obj.data.materials.append(mat)
-            
-            # Get the index of the newly added material slot
-            slot_index = len(obj.material_slots) - 1
-            
-            # Assign the material slot index to the current face
-            poly.material_index = slot_index
+            material_indices[face_index] = len(obj.material_slots) - 1
             
 
             # 4. Configure Material Nodes (Albedo Texture)
@@ -917,17 +1690,14 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
             
             # Load Image
             img = None
-            abs_path = None
-            for file_name in file_name_candidates:
-                abs_path = os.path.join(texture_folder_abs, file_name)
-                if not os.path.exists(abs_path):
-                    continue
+            abs_path = core.names.resolve_first_existing(texture_folder_abs, file_name_candidates, existing_files)
+            if abs_path is not None:
                 try:
                     img = bpy.data.images.load(abs_path, check_existing=True)
+                    instrumentation.count("images_loaded")
                 except RuntimeError as e:
                     print(f"  Warning: Could not load image {abs_path}. Error: {e}")
                     img = None
-                break
 
             if img is None:
                 missing_textures.append((row, col, i, tuple(file_name_candidates), texture_folder_abs))
@@ -941,6 +1711,8 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
             
             # Connect Image Texture to Principled BSDF Base Color
             links.new(tex_image.outputs['Color'], principled_bsdf.inputs['Base Color'])
+            instrumentation.count("nodes_created")
+            instrumentation.count("links_created")
             
             # Set image texture color space to Non-Color for DDS (often used for non-albedo data)
             # However, for an "albedo image texture", it is usually sRGB.
@@ -948,6 +1720,10 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
             # If the DDS is raw data, uncomment the line below:
             # tex_image.image.colorspace_settings.name = 'Non-Color'
 
+        mesh.polygons.foreach_set("material_index", material_indices)
+        mesh.update()
+        instrumentation.count("faces_touched", len(face_order))
+
         if missing_textures:
             print("--- Create & Assign Materials: missing texture summary ---")
             print(f"Resolved texture folder: {texture_folder_abs}")
@@ -972,6 +1748,222 @@ class NODE_OT_create_and_assign_materials(bpy.types.Operator):
             self.report({'INFO'}, "Materials created and assigned successfully.")
         return {'FINISHED'}
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Low-LOD ground materials
+#
+# Distant tiles of the ground grid only need their average colour.  The
+# tile textures are summarised in the worker pool straight from their DDS
+# files: only the smallest mip level that covers the thumbnail is read and
+# decoded, so no full-resolution image is loaded into Blender.  Other
+# image files are read through Blender (the first access loads them).
+# The result is either a companion material per tile ("<tile><suffix>",
+# flat colour or a small packed thumbnail texture) or a face-corner colour
+# attribute on the grid mesh.
+# ─────────────────────────────────────────────────────────────────────────────
+def _tile_base_image(mat):
+    """The image on the Base Color input of *mat* (the Create & Assign
+    Materials layout), else the first image texture node's image."""
+    if not mat.use_nodes or not mat.node_tree:
+        return None
+    images = [node.image for node in mat.node_tree.nodes if node.type == 'TEX_IMAGE' and node.image is not None]
+    for node in mat.node_tree.nodes:
+        if node.type == 'BSDF_PRINCIPLED' and node.inputs['Base Color'].is_linked:
+            source = node.inputs['Base Color'].links[0].from_node
+            if source.type == 'TEX_IMAGE' and source.image is not None:
+                return source.image
+    return images[0] if images else None
+
+
+def _summarize_tile_images(images, thumbnail_size=0, workers=0):
+    """image -> (linear mean RGBA, thumbnail (h, w, 4) uint8 bottom row
+    first or None) for *images*; images that cannot be read are left
+    out."""
+    import numpy as np
+
+    dds_paths = {}
+    for image in images:
+        if image.source == 'FILE' and image.packed_file is None and image.filepath.lower().endswith(".dds"):
+            path = bpy.path.abspath(image.filepath, library=image.library)
+            if os.path.isfile(path):
+                dds_paths[image] = path
+
+    summaries = {}
+    if dds_paths:
+        pool, kind = core.workers.make_pool(workers or None)
+        print(f"--- Summarising {len(dds_paths)} DDS tile texture(s) ({kind} pool) ---")
+        try:
+            jobs = ((path, thumbnail_size) for path in dds_paths.values())
+            results = core.workers.map_bounded(
+                pool, core.images.summarize_dds, jobs, 2 * core.workers.worker_count(workers),
+            )
+        finally:
+            pool.shutdown()
+        summaries.update((image, result) for image, result in zip(dds_paths, results) if result is not None)
+    instrumentation.count("dds_summarized", len(summaries))
+
+    for image in images:
+        if image not in summaries and image.size[0] and image.size[1]:
+            summaries[image] = core.images.summarize_pixels(_dds_pixels(image), thumbnail_size)
+
+    result = {}
+    for image, (mean, thumbnail) in summaries.items():
+        mean = np.array(mean, dtype=np.float64)
+        if image.colorspace_settings.name == 'sRGB' and not image.is_float:
+            mean[:3] = core.images.srgb_to_linear(mean[:3])
+        result[image] = (mean, None if thumbnail is None else thumbnail[::-1])
+    return result
+
+
+def _create_lod_material(mat, mean, thumbnail, suffix):
+    """Create (or rebuild) the low-LOD companion of tile material *mat*."""
+    import numpy as np
+
+    lod_name = f"{mat.name}{suffix}"
+    lod = bpy.data.materials.get(lod_name)
+    if lod is None:
+        lod = bpy.data.materials.new(name=lod_name)
+        instrumentation.count("materials_created")
+    lod.use_nodes = True
+    lod.diffuse_color = (*(float(v) for v in mean[:3]), 1.0)
+
+    nodes = lod.node_tree.nodes
+    for node in list(nodes):
+        if node.type not in ('OUTPUT_MATERIAL', 'BSDF_PRINCIPLED'):
+            nodes.remove(node)
+    principled_bsdf = next((node for node in nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    if principled_bsdf is None:
+        return lod
+    principled_bsdf.inputs['Base Color'].default_value = lod.diffuse_color
+    if thumbnail is None:
+        return lod
+
+    height, width = thumbnail.shape[:2]
+    image = bpy.data.images.get(lod_name)
+    if image is None or tuple(image.size) != (width, height):
+        if image is not None:
+            bpy.data.images.remove(image)
+        image = bpy.data.images.new(lod_name, width, height, alpha=False)
+    image.pixels.foreach_set((thumbnail.astype(np.float32) / 255.0).ravel())
+    image.pack()
+
+    tex_image = nodes.new('ShaderNodeTexImage')
+    tex_image.location = (-400, 0)
+    tex_image.image = image
+    tex_image.extension = 'EXTEND'
+    lod.node_tree.links.new(tex_image.outputs['Color'], principled_bsdf.inputs['Base Color'])
+    return lod
+
+
+def _write_lod_colors(mesh, slot_colors, attribute_name):
+    """Write the linear RGBA *slot_colors* (one row per material slot) as a
+    face-corner colour attribute, every corner coloured by its face's
+    slot."""
+    import numpy as np
+
+    face_count = len(mesh.polygons)
+    material_index = np.empty(face_count, dtype=np.int32)
+    loop_total = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    material_index = np.clip(material_index, 0, len(slot_colors) - 1)
+    # Faces are stored in loop order, so repeating per face covers all loops
+    colors = np.repeat(np.asarray(slot_colors, dtype=np.float32)[material_index], loop_total, axis=0)
+
+    attribute = mesh.color_attributes.get(attribute_name)
+    if attribute is not None and attribute.domain != 'CORNER':
+        mesh.color_attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = mesh.color_attributes.new(name=attribute_name, type='BYTE_COLOR', domain='CORNER')
+    attribute.data.foreach_set("color", colors.ravel())
+    mesh.color_attributes.active_color = attribute
+    mesh.update()
+
+
+class OBJECT_OT_bleliza_create_ground_lod(bpy.types.Operator):
+    bl_idname = "object.bleliza_create_ground_lod"
+    bl_label = "Create Low-LOD Ground Materials"
+    bl_description = (
+        "Computes the mean colour (and optionally a small thumbnail) of every ground tile texture of the "
+        "active grid from the small DDS mip levels, and creates flat low-LOD companion materials or a "
+        "vertex colour layer for distant LODs"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mode: bpy.props.EnumProperty(
+        name="Output",
+        items=[
+            ('MATERIALS', "LOD Materials", "Create a companion material per tile (\"<tile><suffix>\")"),
+            ('VERTEX_COLORS', "Vertex Colors", "Write the tile colours to a face-corner colour attribute"),
+        ],
+        default='MATERIALS',
+    )
+    mat_prefix: bpy.props.StringProperty(
+        name="Material Prefix",
+        default="zrhGroundSwisstopo2022-8k_",
+        description="Only materials starting with this prefix are ground tiles"
+    )
+    lod_suffix: bpy.props.StringProperty(name="LOD Suffix", default="_LOD")
+    thumbnail_size: bpy.props.IntProperty(
+        name="Thumbnail Size",
+        default=0,
+        min=0,
+        max=256,
+        description="Give the LOD materials a packed thumbnail texture of this size instead of a flat colour (0 = flat colour)"
+    )
+    attribute_name: bpy.props.StringProperty(name="Attribute", default="LOD_Color")
+    workers: bpy.props.IntProperty(
+        name="Workers",
+        default=0,
+        min=0,
+        description="Worker processes (0 = one per CPU core)"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        _scene_defaults(self, context, {"mat_prefix": "bleliza_mat_prefix"})
+
+        obj = context.object
+        if not obj or obj.type != 'MESH' or not obj.material_slots:
+            self.report({'ERROR'}, "Select the ground grid (a MESH object with tile materials).")
+            return {'CANCELLED'}
+
+        slot_materials = [slot.material for slot in obj.material_slots]
+        tiles = {
+            mat: _tile_base_image(mat) for mat in slot_materials
+            if mat is not None and mat.name.startswith(self.mat_prefix) and not mat.name.endswith(self.lod_suffix)
+        }
+        images = list({image: None for image in tiles.values() if image is not None})
+        thumbnail_size = self.thumbnail_size if self.mode == 'MATERIALS' else 0
+        summaries = _summarize_tile_images(images, thumbnail_size, self.workers)
+
+        missing = [mat.name for mat, image in tiles.items() if image not in summaries]
+        if self.mode == 'MATERIALS':
+            created = 0
+            for mat, image in tiles.items():
+                if image in summaries:
+                    _create_lod_material(mat, *summaries[image], self.lod_suffix)
+                    created += 1
+            message = f"Created {created} low-LOD material(s)"
+        else:
+            slot_colors = []
+            for mat in slot_materials:
+                image = tiles.get(mat)
+                if image in summaries:
+                    slot_colors.append((*summaries[image][0][:3], 1.0))
+                else:
+                    slot_colors.append(tuple(mat.diffuse_color) if mat is not None else (0.8, 0.8, 0.8, 1.0))
+            _write_lod_colors(obj.data, slot_colors, self.attribute_name)
+            message = f"Wrote {len(tiles) - len(missing)} tile colour(s) to '{self.attribute_name}'"
+
+        if missing:
+            print(f"No readable texture for {len(missing)} tile material(s): {', '.join(missing[:10])}")
+            self.report({'WARNING'}, f"{message}; {len(missing)} tile(s) without a readable texture.")
+        else:
+            self.report({'INFO'}, f"{message}.")
+        return {'FINISHED'}
+
+
 class NODE_OT_snap_islands_to_terrain(bpy.types.Operator):
     bl_idname = "object.snap_islands_to_terrain"
     bl_label = "Snap Islands to Terrain"
@@ -984,7 +1976,12 @@ class NODE_OT_snap_islands_to_terrain(bpy.types.Operator):
         description="Name of the terrain object to snap to"
     )
 
+    @instrumentation.instrumented
     def execute(self, context):
+        import numpy as np
+
+        if not self.properties.is_property_set("terrain_name", ghost=False) and context.scene.bleliza_terrain_obj:
+            self.terrain_name = context.scene.bleliza_terrain_obj.name
         terrain_name = self.terrain_name
         
         terrain = bpy.data.objects.get(terrain_name)
@@ -1001,77 +1998,52 @@ class NODE_OT_snap_islands_to_terrain(bpy.types.Operator):
         if context.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
 
-        bm = bmesh.new()
-        bm.from_mesh(obj.data)
-        
-        world_mat = obj.matrix_world
-        inv_world_mat = world_mat.inverted()
-        terr_inv_mat = terrain.matrix_world.inverted()
+        mesh = obj.data
+        labels, island_count = _vertex_island_labels(mesh)
 
-        # --- ROBUST ISLAND DETECTION ---
-        processed_verts = set()
-        islands = []
-
-        for v in bm.verts:
-            if v not in processed_verts:
-                island_verts = []
-                stack = [v]
-                processed_verts.add(v)
-                
-                while stack:
-                    curr_v = stack.pop()
-                    island_verts.append(curr_v)
-                    for edge in curr_v.link_edges:
-                        other_v = edge.other_vert(curr_v)
-                        if other_v not in processed_verts:
-                            processed_verts.add(other_v)
-                            stack.append(other_v)
-                islands.append(island_verts)
-
-        if not islands:
+        instrumentation.count("islands", island_count)
+        if island_count == 0:
             self.report({'WARNING'}, "No geometry found in object.")
-            bm.free()
             return {'CANCELLED'}
 
-        count = 0
-        for island_verts in islands:
-            # 1. Calculate world-space bottom center of this island
-            world_coords = [world_mat @ v.co for v in island_verts]
-            
-            min_z = min(co.z for co in world_coords)
-            avg_x = sum(co.x for co in world_coords) / len(world_coords)
-            avg_y = sum(co.y for co in world_coords) / len(world_coords)
-            
-            island_bottom_center = Vector((avg_x, avg_y, min_z))
+        world_mat = obj.matrix_world
+        inv_world_mat = world_mat.inverted()
+        terr_inv_mat = terrain.matrix_world.inverted()
 
-            # 2. Raycast from 1000 units above the island
-            ray_origin_world = island_bottom_center + Vector((0, 0, 1000))
-            
-            # Convert world ray to terrain-local space
+        # 1. World-space bottom center of every island
+        coords = _vertex_coordinates(mesh)
+        world = np.array(world_mat, dtype=np.float64)
+        world_coords = coords @ world[:3, :3].T + world[:3, 3]
+        min_z, _ = core.islands.island_min_max(labels, island_count, world_coords[:, 2])
+        avg_x = core.islands.island_means(labels, island_count, world_coords[:, 0])
+        avg_y = core.islands.island_means(labels, island_count, world_coords[:, 1])
+
+        # Ray direction in terrain space and the local axis a world Z offset
+        # moves along (works even if the object is rotated)
+        local_dir = terr_inv_mat.to_quaternion() @ Vector((0, 0, -1))
+        local_up = np.array(inv_world_mat.to_quaternion() @ Vector((0, 0, 1)), dtype=np.float64)
+
+        # 2. Raycast from 1000 units above every island
+        offsets = np.zeros(island_count, dtype=np.float64)
+        hit = np.zeros(island_count, dtype=bool)
+        for island in range(island_count):
+            ray_origin_world = Vector((avg_x[island], avg_y[island], min_z[island] + 1000.0))
             local_start = terr_inv_mat @ ray_origin_world
-            local_dir = terr_inv_mat.to_quaternion() @ Vector((0, 0, -1))
 
             success, hit_loc, hit_normal, face_index = terrain.ray_cast(local_start, local_dir)
-
             if success:
                 world_hit_loc = terrain.matrix_world @ hit_loc
-                
-                # 3. Move the island
-                # The vertical distance to move:
-                z_offset_world = world_hit_loc.z - island_bottom_center.z
-                
-                # Convert world Z offset to object-local vector
-                # (Works even if the object is rotated)
-                local_offset = inv_world_mat.to_quaternion() @ Vector((0, 0, z_offset_world))
-                
-                for v in island_verts:
-                    v.co += local_offset
-                count += 1
-
-        # Update the mesh and viewport
-        bm.to_mesh(obj.data)
-        bm.free()
-        obj.data.update()
+                # The vertical distance to move
+                offsets[island] = world_hit_loc.z - min_z[island]
+                hit[island] = True
+
+        # 3. Move all islands at once
+        coords += offsets[labels][:, None] * local_up
+        mesh.vertices.foreach_set("co", coords.astype(np.float32).reshape(-1))
+        mesh.update()
+
+        count = int(hit.sum())
+        instrumentation.count("vertices_touched", int(hit[labels].sum()))
         
         self.report({'INFO'}, f"Successfully snapped {count} islands to {terrain_name}")
         return {'FINISHED'}
@@ -1088,55 +2060,53 @@ class NODE_OT_select_flat_islands(bpy.types.Operator):
         description="Z difference threshold"
     )
 
+    @instrumentation.instrumented
     def execute(self, context):
+        import numpy as np
+
+        _scene_defaults(self, context, {"threshold": "bleliza_flat_threshold"})
+
         obj = context.active_object
         if not obj or obj.type != 'MESH':
             self.report({'ERROR'}, "No mesh object selected.")
             return {'CANCELLED'}
 
-        # Ensure Edit Mode
-        if obj.mode != 'EDIT':
-            bpy.ops.object.mode_set(mode='EDIT')
-
-        mesh = bmesh.from_edit_mesh(obj.data)
-        mesh.verts.ensure_lookup_table()
-
-        bpy.ops.mesh.select_all(action='DESELECT')
-
-        visited = set()
-
-        for vert in mesh.verts:
-            if vert.index in visited:
-                continue
-
-            stack = [vert]
-            island = set()
-            z_values = []
-
-            while stack:
-                v = stack.pop()
-                if v.index in visited:
-                    continue
-                visited.add(v.index)
-                island.add(v)
-                z_values.append(v.co.z)
-
-                for edge in v.link_edges:
-                    other = edge.other_vert(v)
-                    if other.index not in visited:
-                        stack.append(other)
-            
-            if not z_values:
-                continue
+        # Read and write the mesh data in Object Mode, then show the
+        # selection in Edit Mode
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
 
-            z_min = min(z_values)
-            z_max = max(z_values)
+        mesh = obj.data
+        labels, island_count = _vertex_island_labels(mesh)
+        if island_count:
+            z = _vertex_coordinates(mesh)[:, 2]
+            z_min, z_max = core.islands.island_min_max(labels, island_count, z)
+            flat = (z_max - z_min) <= self.threshold
+            vertex_select = flat[labels]
+        else:
+            vertex_select = np.zeros(0, dtype=bool)
+
+        # Edges and faces are selected when all of their vertices are
+        edge_vertices = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edge_vertices)
+        edge_select = vertex_select[edge_vertices].reshape(-1, 2).all(axis=1)
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)
+        loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_starts)
+        if loop_vertices.size:
+            face_select = np.logical_and.reduceat(vertex_select[loop_vertices], loop_starts)
+        else:
+            face_select = np.zeros(0, dtype=bool)
 
-            if (z_max - z_min) <= self.threshold:
-                for v in island:
-                    v.select = True
+        mesh.vertices.foreach_set("select", vertex_select)
+        mesh.edges.foreach_set("select", edge_select)
+        mesh.polygons.foreach_set("select", face_select)
+        mesh.update()
+        bpy.ops.object.mode_set(mode='EDIT')
 
-        bmesh.update_edit_mesh(obj.data)
+        instrumentation.count("islands", island_count)
+        instrumentation.count("vertices_touched", len(labels))
         self.report({'INFO'}, "Flat islands selected.")
         return {'FINISHED'}
 
@@ -1177,60 +2147,687 @@ class OBJECT_OT_bleliza_set_custom_property(bpy.types.Operator):
             
         return cls.bl_description
 
+    @instrumentation.instrumented
+    def execute(self, context):
+        if self.target == 'ALL':
+            objects = context.scene.objects
+        else:
+            objects = context.selected_objects
+            if not objects:
+                self.report({'WARNING'}, "No objects selected")
+                return {'CANCELLED'}
+
+        count = 0
+        for obj in objects:
+            if not self.overwrite and self.prop_name in obj:
+                continue
+            
+            obj[self.prop_name] = self.prop_value
+            count += 1
+            
+        self.report({'INFO'}, f"Set '{self.prop_name}' to {self.prop_value} on {count} objects.")
+        return {'FINISHED'}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rule-based ALIZA custom properties
+#
+# A rule sets one integer custom property on every object whose name matches
+# a regex and which optionally lives in a matching collection or uses a
+# matching material.  All rules are evaluated in a single pass over the
+# objects; later rules win when several rules write the same property.
+# ─────────────────────────────────────────────────────────────────────────────
+class BLELIZA_PG_property_rule(bpy.types.PropertyGroup):
+    enabled: bpy.props.BoolProperty(name="Enabled", default=True)
+    name_pattern: bpy.props.StringProperty(
+        name="Name Pattern",
+        description="Regular expression searched in the object name (empty matches every object)",
+        default=""
+    )
+    predicate: bpy.props.EnumProperty(
+        name="Predicate",
+        items=[
+            ('NONE', "None", "No additional condition"),
+            ('COLLECTION', "Collection", "Object is in a collection whose name matches the predicate pattern"),
+            ('MATERIAL', "Material", "Object uses a material whose name matches the predicate pattern"),
+        ],
+        default='NONE'
+    )
+    predicate_pattern: bpy.props.StringProperty(
+        name="Predicate Pattern",
+        description="Regular expression searched in the collection or material name",
+        default=""
+    )
+    prop_name: bpy.props.StringProperty(name="Property Name", default="aliza_cast_shadow")
+    prop_value: bpy.props.IntProperty(name="Property Value", default=0)
+    overwrite: bpy.props.BoolProperty(name="Overwrite", default=True)
+
+
+def _compile_property_rules(rules):
+    """Turn BLELIZA_PG_property_rule items (or any objects with the same
+    attributes) into plain dicts with precompiled matchers.  Collection
+    predicates are resolved to a set of object names once.  Raises re.error
+    for invalid patterns."""
+
+    compiled = []
+    for rule in rules:
+        if not rule.enabled or not rule.prop_name:
+            continue
+
+        entry = {
+            "label": f"{rule.prop_name}={rule.prop_value}"
+                     + (f" /{rule.name_pattern}/" if rule.name_pattern else ""),
+            "name_match": re.compile(rule.name_pattern).search if rule.name_pattern else None,
+            "collection_objects": None,
+            "material_match": None,
+            "material_cache": {},
+            "prop_name": rule.prop_name,
+            "prop_value": rule.prop_value,
+            "overwrite": rule.overwrite,
+            "matched": 0,
+            "changed": 0,
+            "seconds": 0.0,
+        }
+
+        start = time.perf_counter()
+        if rule.predicate == 'COLLECTION':
+            coll_match = re.compile(rule.predicate_pattern).search
+            entry["collection_objects"] = {
+                obj.name
+                for coll in bpy.data.collections if coll_match(coll.name)
+                for obj in coll.all_objects
+            }
+            entry["label"] += f" in collection /{rule.predicate_pattern}/"
+        elif rule.predicate == 'MATERIAL':
+            entry["material_match"] = re.compile(rule.predicate_pattern).search
+            entry["label"] += f" with material /{rule.predicate_pattern}/"
+        entry["seconds"] += time.perf_counter() - start
+
+        compiled.append(entry)
+    return compiled
+
+
+def _apply_property_rules(objects, compiled):
+    """Apply *compiled* rules to *objects* in one pass.  Per-rule match and
+    change counts and the time spent are accumulated in the rule dicts."""
+
+    needs_materials = any(rule["material_match"] for rule in compiled)
+    clock = time.perf_counter
+
+    for obj in objects:
+        instrumentation.count("objects_visited")
+        name = obj.name
+        material_names = None
+        if needs_materials:
+            material_names = [slot.material.name for slot in obj.material_slots if slot.material]
+
+        for rule in compiled:
+            start = clock()
+            matched = rule["name_match"] is None or rule["name_match"](name)
+            if matched and rule["collection_objects"] is not None:
+                matched = name in rule["collection_objects"]
+            if matched and rule["material_match"] is not None:
+                cache = rule["material_cache"]
+                for mat_name in material_names:
+                    hit = cache.get(mat_name)
+                    if hit is None:
+                        hit = cache[mat_name] = bool(rule["material_match"](mat_name))
+                    if hit:
+                        break
+                else:
+                    matched = False
+
+            if matched:
+                rule["matched"] += 1
+                prop_name = rule["prop_name"]
+                if rule["overwrite"] or prop_name not in obj:
+                    if obj.get(prop_name) != rule["prop_value"]:
+                        obj[prop_name] = rule["prop_value"]
+                        rule["changed"] += 1
+            rule["seconds"] += clock() - start
+
+    return compiled
+
+
+class OBJECT_OT_bleliza_property_rule_add(bpy.types.Operator):
+    bl_idname = "object.bleliza_property_rule_add"
+    bl_label = "Add Property Rule"
+    bl_description = "Add a new ALIZA custom property rule to the scene"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        scene = context.scene
+        scene.bleliza_property_rules.add()
+        scene.bleliza_property_rules_index = len(scene.bleliza_property_rules) - 1
+        return {'FINISHED'}
+
+
+class OBJECT_OT_bleliza_property_rule_remove(bpy.types.Operator):
+    bl_idname = "object.bleliza_property_rule_remove"
+    bl_label = "Remove Property Rule"
+    bl_description = "Remove the active ALIZA custom property rule"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.scene.bleliza_property_rules) > 0
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        scene = context.scene
+        index = scene.bleliza_property_rules_index
+        scene.bleliza_property_rules.remove(index)
+        scene.bleliza_property_rules_index = min(index, len(scene.bleliza_property_rules) - 1)
+        return {'FINISHED'}
+
+
+class OBJECT_OT_bleliza_apply_property_rules(bpy.types.Operator):
+    bl_idname = "object.bleliza_apply_property_rules"
+    bl_label = "Apply Property Rules"
+    bl_description = "Applies all enabled ALIZA custom property rules in a single pass over the objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    target: bpy.props.EnumProperty(
+        name="Target",
+        items=[
+            ('ALL', "All Objects", "Apply to all objects in the scene"),
+            ('SELECTED', "Selected Objects", "Apply to selected objects only"),
+        ],
+        default='ALL'
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        try:
+            compiled = _compile_property_rules(context.scene.bleliza_property_rules)
+        except re.error as e:
+            self.report({'ERROR'}, f"Invalid rule pattern: {e}")
+            return {'CANCELLED'}
+
+        if not compiled:
+            self.report({'WARNING'}, "No enabled property rules.")
+            return {'CANCELLED'}
+
+        objects = context.scene.objects if self.target == 'ALL' else context.selected_objects
+
+        start = time.perf_counter()
+        _apply_property_rules(objects, compiled)
+        total = time.perf_counter() - start
+
+        print(f"--- Apply Property Rules: {len(objects)} object(s), {total * 1000.0:.1f} ms ---")
+        for rule in compiled:
+            print(
+                f"  {rule['label']}: matched {rule['matched']}, changed {rule['changed']}, "
+                f"{rule['seconds'] * 1000.0:.1f} ms"
+            )
+
+        changed = sum(rule["changed"] for rule in compiled)
+        self.report(
+            {'INFO'},
+            f"Applied {len(compiled)} rule(s) to {len(objects)} objects in {total:.2f}s, "
+            f"{changed} propert{'y' if changed == 1 else 'ies'} changed. See console for per-rule counts.",
+        )
+        return {'FINISHED'}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CSV/JSON-driven ALIZA property tables
+#
+# CSV: one row per pattern; columns 'pattern', optional 'match'
+#      (exact | glob | regex, default exact) and one column per property,
+#      e.g.  pattern,match,aliza_cast_shadow,aliza_tree
+#            Tree_*,glob,0,1
+#      Empty cells are ignored.
+# JSON: a list of {"pattern": ..., "match": ..., "properties": {...}}.
+#
+# Glob and regex patterns must match the whole object name and must not use
+# numbered backreferences (they are merged into one regex).  Patterns apply
+# in file order and exact names are applied last, so they win.
+# ─────────────────────────────────────────────────────────────────────────────
+def _parse_table_value(text):
+    """Convert a spreadsheet cell to int, float or (stripped) str."""
+    text = text.strip()
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _load_property_table(filepath):
+    """Load a CSV or JSON property table into a list of
+    (pattern, match, properties) tuples."""
+
+    import csv
+    import json
+
+    entries = []
+    if filepath.lower().endswith(".json"):
+        with open(filepath, encoding="utf-8") as f:
+            data = json.load(f)
+        for item in data:
+            entries.append((
+                item["pattern"],
+                item.get("match", "exact").lower(),
+                dict(item.get("properties", {})),
+            ))
+        return entries
+
+    with open(filepath, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            pattern = (row.pop("pattern", None) or "").strip()
+            if not pattern:
+                continue
+            match = (row.pop("match", None) or "exact").strip().lower()
+            properties = {
+                key.strip(): _parse_table_value(value)
+                for key, value in row.items()
+                if key and value is not None and value.strip()
+            }
+            entries.append((pattern, match, properties))
+    return entries
+
+
+def _compile_property_table(entries):
+    """Compile table entries into one matcher: a dict for exact names plus a
+    single merged regex (one named group per pattern) used to find the first
+    matching pattern.  Raises ValueError for unknown match types and
+    re.error for invalid patterns."""
+
+    import fnmatch
+
+    exact = {}
+    patterns = []
+    for pattern, match, properties in entries:
+        if match == 'exact':
+            exact.setdefault(pattern, {}).update(properties)
+        elif match in ('glob', 'regex'):
+            source = fnmatch.translate(pattern) if match == 'glob' else pattern
+            patterns.append((re.compile(source).fullmatch, properties, source))
+        else:
+            raise ValueError(f"Unknown match type '{match}' for pattern '{pattern}'")
+
+    combined = None
+    if patterns:
+        try:
+            combined = re.compile(
+                "|".join(f"(?P<p{i}>{source})" for i, (_, _, source) in enumerate(patterns))
+            ).fullmatch
+        except re.error:
+            # Patterns reusing the same named group cannot be merged; fall
+            # back to testing them one by one.
+            combined = None
+
+    return {"exact": exact, "patterns": patterns, "combined": combined}
+
+
+def _match_property_table(name, table):
+    """Return the merged properties for object *name*, or None."""
+
+    result = None
+    patterns = table["patterns"]
+    if patterns:
+        first = 0
+        combined = table["combined"]
+        if combined is not None:
+            hit = combined(name)
+            first = int(hit.lastgroup[1:]) if hit else len(patterns)
+        for matcher, properties, _ in patterns[first:]:
+            if matcher(name):
+                if result is None:
+                    result = {}
+                result.update(properties)
+
+    properties = table["exact"].get(name)
+    if properties is not None:
+        if result is None:
+            result = {}
+        result.update(properties)
+    return result
+
+
+class OBJECT_OT_bleliza_import_property_table(bpy.types.Operator, ImportHelper):
+    bl_idname = "object.bleliza_import_property_table"
+    bl_label = "Import ALIZA Property Table"
+    bl_description = (
+        "Loads a CSV/JSON table of object-name patterns and ALIZA custom properties "
+        "and applies it to all scene objects in one pass"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filter_glob: bpy.props.StringProperty(default="*.csv;*.json", options={'HIDDEN'})
+
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        default=False,
+        description="Only list the changes (console and 'BleLIZA Property Diff' text block) without applying them"
+    )
+    overwrite: bpy.props.BoolProperty(
+        name="Overwrite",
+        default=True,
+        description="Overwrite properties that already exist on an object"
+    )
+
+    @instrumentation.instrumented
     def execute(self, context):
-        if self.target == 'ALL':
-            objects = context.scene.objects
-        else:
-            objects = context.selected_objects
-            if not objects:
-                self.report({'WARNING'}, "No objects selected")
-                return {'CANCELLED'}
+        try:
+            table = _compile_property_table(_load_property_table(self.filepath))
+        except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+            self.report({'ERROR'}, f"Could not load property table '{self.filepath}': {e}")
+            return {'CANCELLED'}
 
-        count = 0
-        for obj in objects:
-            if not self.overwrite and self.prop_name in obj:
+        start = time.perf_counter()
+        changes = []
+        objects_matched = 0
+        for obj in context.scene.objects:
+            instrumentation.count("objects_visited")
+            properties = _match_property_table(obj.name, table)
+            if not properties:
                 continue
-            
-            obj[self.prop_name] = self.prop_value
-            count += 1
-            
-        self.report({'INFO'}, f"Set '{self.prop_name}' to {self.prop_value} on {count} objects.")
+            objects_matched += 1
+            for key, value in properties.items():
+                if key in obj and (not self.overwrite or obj[key] == value):
+                    continue
+                changes.append((obj.name, key, obj.get(key), value))
+                if not self.dry_run:
+                    obj[key] = value
+        elapsed = time.perf_counter() - start
+
+        diff_lines = [
+            f"{name}: {key} {'<unset>' if old is None else old} -> {new}"
+            for name, key, old, new in changes
+        ]
+        header = "DRY RUN - " if self.dry_run else ""
+        print(f"--- {header}Import ALIZA Property Table: {os.path.basename(self.filepath)} ---")
+        for line in diff_lines:
+            print("  " + line)
+
+        text = bpy.data.texts.get("BleLIZA Property Diff") or bpy.data.texts.new("BleLIZA Property Diff")
+        text.clear()
+        text.write(f"# {header}{self.filepath}\n" + "\n".join(diff_lines) + "\n")
+
+        verb = "Would change" if self.dry_run else "Changed"
+        self.report(
+            {'INFO'},
+            f"{verb} {len(changes)} propert{'y' if len(changes) == 1 else 'ies'} on "
+            f"{objects_matched} matching object(s) in {elapsed:.2f}s.",
+        )
         return {'FINISHED'}
 
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Batch material edits
+#
+# An edit is (label, predicate, path, value):
+#
+#   predicate  a node type ('TEX_IMAGE'), a tuple of node types, a callable
+#              node -> bool, or None for the material itself
+#   path       attribute path from the node/material: "extension",
+#              "image.colorspace_settings.name",
+#              "inputs[Roughness].default_value"; or a tuple of alternative
+#              paths, of which the first one that exists is written
+#              (sockets renamed between Blender versions)
+#
+# All edits are applied in one traversal over the unique materials, and a
+# property is only written when its value differs (every write tags the
+# material for a depsgraph update).  Counts are kept per edit label.
+# ─────────────────────────────────────────────────────────────────────────────
+_EDIT_PATH_SEGMENT_RE = re.compile(r"^(\w+)(?:\[(.+)\])?$")
+
+
+def _compile_edit_path(path):
+    """[(attribute, key or None), ...] for an edit path."""
+    segments = []
+    for part in re.split(r"\.(?![^\[]*\])", path):
+        match = _EDIT_PATH_SEGMENT_RE.match(part)
+        if match is None:
+            raise ValueError(f"Invalid property path '{path}'")
+        segments.append((match.group(1), match.group(2)))
+    if segments[-1][1] is not None:
+        raise ValueError(f"Property path '{path}' must end with an attribute")
+    return segments
+
+
+def _compile_edit_predicate(predicate):
+    if predicate is None or callable(predicate):
+        return predicate
+    node_types = (predicate,) if isinstance(predicate, str) else tuple(predicate)
+    return lambda node: node.type in node_types
+
+
+def _resolve_edit_target(owner, segments):
+    """(object, attribute) the compiled path *segments* address from
+    *owner*, or None if a step of the path does not exist."""
+    for attribute, key in segments[:-1]:
+        owner = getattr(owner, attribute, None)
+        if owner is not None and key is not None:
+            owner = owner.get(key)
+        if owner is None:
+            return None
+    attribute = segments[-1][0]
+    return (owner, attribute) if hasattr(owner, attribute) else None
+
+
+def _same_value(current, value):
+    if isinstance(value, (tuple, list)):
+        try:
+            current = tuple(current)
+        except TypeError:
+            return False
+        return len(current) == len(value) and all(_same_value(a, b) for a, b in zip(current, value))
+    if isinstance(value, float) and isinstance(current, (int, float)):
+        return abs(current - value) <= 1e-6 * max(1.0, abs(value))
+    return current == value
+
+
+def _apply_material_edits(materials, edits):
+    """Apply *edits* (see above) to *materials*, each unique material once.
+
+    Returns {label: {"matched": n, "changed": n, "failed": n}}: matched
+    counts the nodes/materials an edit's path resolved on, changed the
+    writes actually made."""
+
+    compiled = []
+    for label, predicate, paths, value in edits:
+        paths = (paths,) if isinstance(paths, str) else tuple(paths)
+        compiled.append((label, _compile_edit_predicate(predicate), [_compile_edit_path(p) for p in paths], value))
+    node_edits = [edit for edit in compiled if edit[1] is not None]
+    material_edits = [edit for edit in compiled if edit[1] is None]
+    counts = {label: {"matched": 0, "changed": 0, "failed": 0} for label, *_ in compiled}
+
+    def apply(owner, label, path_options, value):
+        for segments in path_options:
+            target = _resolve_edit_target(owner, segments)
+            if target is None:
+                continue
+            counts[label]["matched"] += 1
+            obj, attribute = target
+            if _same_value(getattr(obj, attribute), value):
+                return
+            try:
+                setattr(obj, attribute, value)
+            except (AttributeError, TypeError, ValueError) as e:
+                print(f"Warning: could not set {label} on {getattr(owner, 'name', owner)}: {e}")
+                counts[label]["failed"] += 1
+                return
+            counts[label]["changed"] += 1
+            return
+
+    seen = set()
+    for material in materials:
+        if material is None or material in seen:
+            continue
+        seen.add(material)
+        for label, _, path_options, value in material_edits:
+            apply(material, label, path_options, value)
+        if not node_edits or not material.use_nodes or not material.node_tree:
+            continue
+        for node in material.node_tree.nodes:
+            for label, predicate, path_options, value in node_edits:
+                if predicate(node):
+                    apply(node, label, path_options, value)
+
+    instrumentation.count("materials_visited", len(seen))
+    instrumentation.count("properties_written", sum(count["changed"] for count in counts.values()))
+    return counts
+
+
+def _print_edit_counts(title, counts):
+    print(f"--- {title} ---")
+    print(f"  {'Edit':<28} {'Matched':>8} {'Changed':>8} {'Failed':>7}")
+    for label, count in counts.items():
+        print(f"  {label:<28} {count['matched']:>8} {count['changed']:>8} {count['failed']:>7}")
+
+
+def _edit_counts_summary(counts):
+    return ", ".join(f"{label}: {count['changed']}/{count['matched']} changed" for label, count in counts.items())
+
+
+def _texture_extension_edits(extension):
+    return (("extension", 'TEX_IMAGE', "extension", extension),)
+
+
+SAT_EDITS = (
+    ("roughness", 'BSDF_PRINCIPLED', "inputs[Roughness].default_value", 1.0),
+    # "Specular" became "Specular IOR Level" in Blender 4.0
+    ("specular", 'BSDF_PRINCIPLED',
+     ("inputs[Specular].default_value", "inputs[Specular IOR Level].default_value"), 0.0),
+)
+
+
+def _set_texture_extension(materials, extension):
+    """Set the extension mode of every image texture node in *materials*.
+    Returns the number of texture nodes visited."""
+    counts = _apply_material_edits(materials, _texture_extension_edits(extension))
+    instrumentation.count("nodes_modified", counts["extension"]["changed"])
+    return counts["extension"]["matched"]
+
+
 class NODE_OT_set_texture_extend(bpy.types.Operator):
     bl_idname = "node.set_texture_extend"
     bl_label = "Set Image Extension to Extend"
-    bl_description = "Sets the extension mode of all image texture nodes in the active object's materials to 'EXTEND'"
+    bl_description = (
+        "Sets the extension mode of all image texture nodes to 'EXTEND', in the materials of the "
+        "active object, the selected objects or the whole file (Scope)"
+    )
     bl_options = {'REGISTER', 'UNDO'}
 
+    scope: bpy.props.EnumProperty(name="Scope", items=MATERIAL_SCOPE_ITEMS, default='OBJECT')
+
+    @instrumentation.instrumented
     def execute(self, context):
         obj = context.active_object
-        if not obj:
+        if self.scope == 'OBJECT' and not obj:
             self.report({'ERROR'}, "No active object.")
             return {'CANCELLED'}
         
         # Ensure Object Mode (optional but safer as per script)
-        if obj.mode != 'OBJECT':
+        if obj and obj.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
 
-        count = 0
-        for material in obj.data.materials:
-            if material and material.use_nodes:
-                for node in material.node_tree.nodes:
-                    if node.type == 'TEX_IMAGE':
-                        node.extension = 'EXTEND'
-                        count += 1
+        counts = _apply_material_edits(_scope_materials(context, self.scope), _texture_extension_edits('EXTEND'))
+        count = counts["extension"]
+        instrumentation.count("nodes_modified", count["changed"])
                         
-        self.report({'INFO'}, f"Set extension to EXTEND for {count} texture nodes.")
+        self.report({'INFO'}, f"Set extension to EXTEND for {count['matched']} texture nodes ({count['changed']} changed).")
+        return {'FINISHED'}
+
+
+_KEEP_ITEM = ('KEEP', "Keep", "Do not change")
+
+
+class OBJECT_OT_bleliza_edit_materials(bpy.types.Operator):
+    bl_idname = "object.bleliza_edit_materials"
+    bl_label = "Batch Edit Materials"
+    bl_description = (
+        "Sets texture interpolation, extension, colour space and the material blend mode on all materials "
+        "of the active object, the selection or the whole file in one pass, skipping values already set"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(name="Scope", items=MATERIAL_SCOPE_ITEMS, default='OBJECT')
+    interpolation: bpy.props.EnumProperty(
+        name="Interpolation",
+        items=[_KEEP_ITEM, ('Linear', "Linear", ""), ('Closest', "Closest", ""),
+               ('Cubic', "Cubic", ""), ('Smart', "Smart", "")],
+        default='KEEP',
+    )
+    extension: bpy.props.EnumProperty(
+        name="Extension",
+        items=[_KEEP_ITEM, ('REPEAT', "Repeat", ""), ('EXTEND', "Extend", ""),
+               ('CLIP', "Clip", ""), ('MIRROR', "Mirror", "")],
+        default='KEEP',
+    )
+    colorspace: bpy.props.EnumProperty(
+        name="Color Space",
+        items=[_KEEP_ITEM, ('sRGB', "sRGB", "Colour textures"), ('Non-Color', "Non-Color", "Data textures")],
+        default='KEEP',
+    )
+    colorspace_nodes: bpy.props.StringProperty(
+        name="Color Space Nodes",
+        default="*",
+        description="Only images of texture nodes whose name or label matches this pattern get the colour space"
+    )
+    blend_method: bpy.props.EnumProperty(
+        name="Blend Mode",
+        items=[_KEEP_ITEM, ('OPAQUE', "Opaque", ""), ('CLIP', "Alpha Clip", ""),
+               ('HASHED', "Alpha Hashed", ""), ('BLEND', "Alpha Blend", "")],
+        default='KEEP',
+    )
+
+    def material_edits(self):
+        import fnmatch
+
+        edits = []
+        if self.interpolation != 'KEEP':
+            edits.append(("interpolation", 'TEX_IMAGE', "interpolation", self.interpolation))
+        if self.extension != 'KEEP':
+            edits.append(("extension", 'TEX_IMAGE', "extension", self.extension))
+        if self.colorspace != 'KEEP':
+            pattern = self.colorspace_nodes or "*"
+            edits.append((
+                "colorspace",
+                lambda node: node.type == 'TEX_IMAGE' and (
+                    fnmatch.fnmatchcase(node.name, pattern) or fnmatch.fnmatchcase(node.label, pattern)
+                ),
+                "image.colorspace_settings.name",
+                self.colorspace,
+            ))
+        if self.blend_method != 'KEEP':
+            edits.append(("blend mode", None, "blend_method", self.blend_method))
+        return edits
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        edits = self.material_edits()
+        if not edits:
+            self.report({'WARNING'}, "Nothing to change: all settings are 'Keep'.")
+            return {'CANCELLED'}
+
+        counts = _apply_material_edits(_scope_materials(context, self.scope), edits)
+        _print_edit_counts("Batch Edit Materials", counts)
+        self.report({'INFO'}, _edit_counts_summary(counts))
         return {'FINISHED'}
 
+
 class NODE_OT_assign_random_materials_islands(bpy.types.Operator):
     bl_idname = "mesh.assign_random_materials_islands"
     bl_label = "Assign Random Materials to Islands"
     bl_description = "Assigns a random material index to each connected face group (island)"
     bl_options = {'REGISTER', 'UNDO'}
 
+    seed: bpy.props.IntProperty(
+        name="Seed",
+        default=0,
+        min=0,
+        description="Random seed; the same seed always produces the same assignment"
+    )
+
+    @instrumentation.instrumented
     def execute(self, context):
+        import numpy as np
+
         obj = context.active_object
         if not obj or obj.type != 'MESH':
             self.report({'ERROR'}, "No mesh object selected.")
@@ -1242,51 +2839,25 @@ class NODE_OT_assign_random_materials_islands(bpy.types.Operator):
             self.report({'WARNING'}, "No materials assigned to object.")
             return {'CANCELLED'}
 
-        # Ensure Object Mode initially
+        # Work on the mesh data directly in Object Mode
         if obj.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
-        
-        # Switch to Edit Mode to get BMesh
-        bpy.ops.object.mode_set(mode='EDIT')
-        
-        bm = bmesh.from_edit_mesh(obj.data)
-        bm.faces.ensure_lookup_table()
-        
-        # Deselect all
-        for face in bm.faces:
-            face.select = False
-        
-        visited = set()
-        face_groups = []
 
-        # Find islands
-        for face in bm.faces:
-            if face.index in visited:
-                continue
-            group = set()
-            stack = [face]
-            while stack:
-                f = stack.pop()
-                if f.index in visited:
-                    continue
-                visited.add(f.index)
-                group.add(f)
-                for e in f.edges:
-                    for linked_face in e.link_faces:
-                        if linked_face.index not in visited:
-                            stack.append(linked_face)
-            face_groups.append(group)
-        
-        # Assign random materials
-        for group in face_groups:
-            mat_index = random.randint(0, num_materials - 1)
-            for face in group:
-                face.material_index = mat_index
-        
-        bmesh.update_edit_mesh(obj.data, loop_triangles=False, destructive=False)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        mesh = obj.data
+        island_labels, island_count = _face_island_labels(mesh)
+        if island_count == 0:
+            self.report({'WARNING'}, "Object has no faces.")
+            return {'CANCELLED'}
+
+        # One RNG draw for all islands, then scatter back to the faces
+        rng = np.random.default_rng(self.seed)
+        island_materials = rng.integers(0, num_materials, size=island_count, dtype=np.int32)
+        mesh.polygons.foreach_set("material_index", island_materials[island_labels])
+        mesh.update()
+        instrumentation.count("islands", island_count)
+        instrumentation.count("faces_touched", len(island_labels))
         
-        self.report({'INFO'}, f"Assigned materials to {len(face_groups)} islands.")
+        self.report({'INFO'}, f"Assigned materials to {island_count} islands (seed {self.seed}).")
         return {'FINISHED'}
 
 class NODE_OT_assign_random_materials_selected_islands(bpy.types.Operator):
@@ -1297,133 +2868,229 @@ class NODE_OT_assign_random_materials_selected_islands(bpy.types.Operator):
 
     material_name_filter: bpy.props.StringProperty(
         name="Material Name Filter",
-        description="Only use materials containing this string (case-insensitive)",
+        description="Only use materials matching this filter (case-insensitive)",
         default="roof"
     )
 
+    filter_mode: bpy.props.EnumProperty(
+        name="Filter Mode",
+        items=[
+            ('SUBSTRING', "Contains", "Material name contains the filter text"),
+            ('GLOB', "Wildcard", "Material name matches a wildcard pattern (e.g. 'roof_*')"),
+            ('REGEX', "Regex", "Material name matches a regular expression"),
+        ],
+        default='SUBSTRING'
+    )
+
+    weighting: bpy.props.EnumProperty(
+        name="Weighting",
+        items=[
+            ('UNIFORM', "Uniform", "Every matching material is equally likely"),
+            ('FREQUENCY', "Frequency", "Weight materials by how many faces of the object already use them"),
+        ],
+        default='UNIFORM'
+    )
+
+    seed: bpy.props.IntProperty(
+        name="Seed",
+        default=0,
+        min=0,
+        description="Random seed; the same seed always produces the same assignment"
+    )
+
+    @instrumentation.instrumented
     def execute(self, context):
+        import numpy as np
+
+        _scene_defaults(self, context, {
+            "material_name_filter": "bleliza_mat_filter",
+            "filter_mode": "bleliza_mat_filter_mode",
+        })
+
         obj = context.active_object
         if not obj or obj.type != 'MESH':
             self.report({'ERROR'}, "Please select a mesh object.")
             return {'CANCELLED'}
 
-        # Ensure Edit Mode
-        if context.mode != 'EDIT_MESH':
-            bpy.ops.object.mode_set(mode='EDIT')
-
-        # Filter materials
-        filter_str = self.material_name_filter.lower()
-        roof_materials = [mat for mat in bpy.data.materials if filter_str in mat.name.lower()]
+        # Filter materials (single scan of bpy.data.materials)
+        try:
+            matches = core.names.compile_name_matcher(self.material_name_filter, self.filter_mode)
+        except re.error as e:
+            self.report({'ERROR'}, f"Invalid regular expression '{self.material_name_filter}': {e}")
+            return {'CANCELLED'}
+        roof_materials = [mat for mat in bpy.data.materials if matches(mat.name)]
 
         if not roof_materials:
             self.report({'WARNING'}, f"No materials matching '{self.material_name_filter}' found.")
             return {'CANCELLED'}
 
-        bm = bmesh.from_edit_mesh(obj.data)
-        bm.faces.ensure_lookup_table()
+        # Leave Edit Mode so the face selection is flushed to the mesh data
+        was_edit_mode = obj.mode == 'EDIT'
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
 
-        selected_faces = [f for f in bm.faces if f.select]
+        mesh = obj.data
+        face_count = len(mesh.polygons)
+        selected = np.zeros(face_count, dtype=bool)
+        mesh.polygons.foreach_get("select", selected)
 
-        if not selected_faces:
+        if not selected.any():
+            if was_edit_mode:
+                bpy.ops.object.mode_set(mode='EDIT')
             self.report({'INFO'}, "No faces selected.")
             return {'CANCELLED'}
 
-        # Ensure material slots exist
+        # Material name -> slot index, appending slots for missing materials
+        slot_map = {}
+        for index, slot in enumerate(obj.material_slots):
+            if slot.material:
+                slot_map.setdefault(slot.material.name, index)
         for mat in roof_materials:
-            if obj.data.materials.find(mat.name) == -1:
-                obj.data.materials.append(mat)
+            if mat.name not in slot_map:
+                mesh.materials.append(mat)
+                slot_map[mat.name] = len(mesh.materials) - 1
+        candidate_slots = np.array([slot_map[mat.name] for mat in roof_materials], dtype=np.int32)
+
+        material_indices = np.zeros(face_count, dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", material_indices)
+
+        if self.weighting == 'FREQUENCY':
+            # +1 so that materials not used yet can still be picked
+            usage = np.bincount(material_indices, minlength=len(mesh.materials))
+            weights = usage[candidate_slots].astype(np.float64) + 1.0
+            weights /= weights.sum()
+        else:
+            weights = None
 
-        visited_faces = set()
-        count = 0
+        island_labels, count = _face_island_labels(mesh, face_mask=selected)
 
-        for face in selected_faces:
-            if face in visited_faces:
-                continue
+        rng = np.random.default_rng(self.seed)
+        island_slots = candidate_slots[rng.choice(len(candidate_slots), size=count, p=weights)]
+        material_indices[selected] = island_slots[island_labels[selected]]
+        mesh.polygons.foreach_set("material_index", material_indices)
+        mesh.update()
+        instrumentation.count("islands", count)
+        instrumentation.count("faces_touched", int(selected.sum()))
 
-            # Connected component
-            connected_component = set()
-            queue = [face]
-            visited_faces.add(face)
-            connected_component.add(face)
-
-            while queue:
-                current_face = queue.pop(0)
-                for edge in current_face.edges:
-                    for linked_face in edge.link_faces:
-                        # Must be selected and not visited
-                        if linked_face.select and linked_face not in visited_faces:
-                            queue.append(linked_face)
-                            visited_faces.add(linked_face)
-                            connected_component.add(linked_face)
-
-            # Assign random material
-            chosen_material = random.choice(roof_materials)
-            material_index = obj.data.materials.find(chosen_material.name)
-            
-            if material_index != -1:
-                for f in connected_component:
-                    f.material_index = material_index
-            
-            count += 1
+        if was_edit_mode:
+            bpy.ops.object.mode_set(mode='EDIT')
 
-        bmesh.update_edit_mesh(obj.data)
         self.report({'INFO'}, f"Assigned materials to {count} connected components.")
         return {'FINISHED'}
 
+
 class NODE_OT_set_materials_to_sat(bpy.types.Operator):
     bl_idname = "node.set_materials_to_sat"
     bl_label = "Set materials to SAT"
-    bl_description = "Set material properties of all materials of the selected object to SAT"
+    bl_description = (
+        "Sets the Principled BSDF of the materials of the active object, the selected objects or the "
+        "whole file (Scope) to SAT: Roughness 1, Specular 0"
+    )
     bl_options = {'REGISTER', 'UNDO'}
 
+    scope: bpy.props.EnumProperty(name="Scope", items=MATERIAL_SCOPE_ITEMS, default='OBJECT')
+
+    @instrumentation.instrumented
     def execute(self, context):
-        obj = context.active_object
-        
-        if not obj or obj.type != 'MESH':
-            self.report({'ERROR'}, "Please select a MESH object.")
-            return {'CANCELLED'}
-            
-        if not obj.data.materials:
-            self.report({'WARNING'}, f"Selected object '{obj.name}' has no material slots.")
-            return {'CANCELLED'}
+        if self.scope == 'OBJECT':
+            obj = context.active_object
 
-        modified_count = 0
-        
-        for material in obj.data.materials:
-            if not material or not material.use_nodes:
-                continue
-                
-            nodes = material.node_tree.nodes
-            
-            principled_bsdf = None
-            for node in nodes:
-                if node.type == 'BSDF_PRINCIPLED':
-                    principled_bsdf = node
-                    break
-            
-            if principled_bsdf:
-                try:
-                    # Set Roughness to 1.0
-                    if 'Roughness' in principled_bsdf.inputs:
-                        principled_bsdf.inputs['Roughness'].default_value = 1.0
-                    
-                    # Set Specular to 0.0
-                    if 'Specular' in principled_bsdf.inputs:
-                        principled_bsdf.inputs['Specular'].default_value = 0.0
-                    elif 'Specular IOR Level' in principled_bsdf.inputs: # For Blender 4.0+
-                         principled_bsdf.inputs['Specular IOR Level'].default_value = 0.0
-                    
-                    modified_count += 1
-                except Exception as e:
-                    print(f"Warning: Error updating material {material.name}: {e}")
-
-        if modified_count == 0:
-            self.report({'WARNING'}, "No materials were modified (ensure Principled BSDF exists).")
+            if not obj or obj.type != 'MESH':
+                self.report({'ERROR'}, "Please select a MESH object.")
+                return {'CANCELLED'}
+
+            if not obj.data.materials:
+                self.report({'WARNING'}, f"Selected object '{obj.name}' has no material slots.")
+                return {'CANCELLED'}
+
+        counts = _apply_material_edits(_scope_materials(context, self.scope), SAT_EDITS)
+        matched = counts["roughness"]["matched"]
+        changed = sum(count["changed"] for count in counts.values())
+
+        if matched == 0:
+            self.report({'WARNING'}, "No Principled BSDF node found; no material was modified.")
+        elif changed == 0:
+            self.report({'INFO'}, f"All {matched} Principled BSDF node(s) are already SAT.")
         else:
-            self.report({'INFO'}, f"Modified {modified_count} materials.")
-            
+            self.report(
+                {'INFO'},
+                f"Changed {changed} value(s) on {matched} Principled BSDF node(s) ({_edit_counts_summary(counts)}).",
+            )
+
         return {'FINISHED'}
 
+def _bake_mapping_to_detail_uv(mat, mesh, meshes=None):
+    """Bake the scale of the first Mapping node of *mat* into a Detail UV
+    layer on every mesh using *mat* (or on *meshes*) and replace the Mapping
+    node with a UV Map node pointing at that layer.  *mesh* provides the
+    fallback UV layer when the Mapping node is not fed by a UV Map node.
+    Returns 'PROCESSED', 'NO_MAPPING' or 'NO_UV'."""
+
+    node_tree = mat.node_tree
+    nodes = node_tree.nodes
+    links = node_tree.links
+
+    # ── 1. Find the first Mapping node in the shader ──────────────────
+    mapping_node = None
+    for node in nodes:
+        if node.type == 'MAPPING':
+            mapping_node = node
+            break
+
+    if not mapping_node:
+        return 'NO_MAPPING'  # Nothing to do for this material
+
+    # ── 2. Read scale from the Mapping node ───────────────────────────
+    scale = mapping_node.inputs["Scale"].default_value
+    scale_x = scale[0]
+    scale_y = scale[1]
+
+    # ── 3. Determine the source UV map ────────────────────────────────
+    source_uv_name = None
+    for lnk in mapping_node.inputs["Vector"].links:
+        if lnk.from_node.type == 'UVMAP':
+            source_uv_name = lnk.from_node.uv_map
+            break
+
+    # Fallback: use the first UV layer on the mesh
+    if not source_uv_name:
+        if mesh.uv_layers:
+            source_uv_name = mesh.uv_layers[0].name
+        else:
+            return 'NO_UV'
+
+    # ── 4. Bake Detail UV on ALL scene objects that use this material ──
+    # _create_detail_uv_for_material handles scale inversion internally.
+    detail_uv_name = _create_detail_uv_for_material(
+        mat, source_uv_name, scale_x, scale_y, meshes
+    )
+
+    # ── 5. Collect Image Texture nodes wired to Mapping's output ──────
+    image_tex_inputs = []
+    for lnk in list(mapping_node.outputs["Vector"].links):
+        if lnk.to_node.type == 'TEX_IMAGE':
+            image_tex_inputs.append(lnk.to_node.inputs["Vector"])
+
+    # ── 7. Remember position, then delete the Mapping node ────────────
+    mapping_loc = mapping_node.location.copy()
+    nodes.remove(mapping_node)
+
+    # ── 8. Create a new UV Map node pointing to the Detail UV layer ───
+    uv_map_node = nodes.new(type="ShaderNodeUVMap")
+    uv_map_node.uv_map = detail_uv_name
+    uv_map_node.location = mapping_loc
+    uv_map_node.label = detail_uv_name
+
+    # ── 9. Wire the UV Map node into the Image Texture nodes ──────────
+    for tex_vector_input in image_tex_inputs:
+        links.new(uv_map_node.outputs["UV"], tex_vector_input)
+
+    instrumentation.count("nodes_created")
+    instrumentation.count("links_created", len(image_tex_inputs))
+
+    return 'PROCESSED'
+
+
 class NODE_OT_bake_mapping_to_detail_uv(bpy.types.Operator):
     bl_idname = "node.bake_mapping_to_detail_uv"
     bl_label = "Bake Mapping Node to Detail UV"
@@ -1435,6 +3102,7 @@ class NODE_OT_bake_mapping_to_detail_uv(bpy.types.Operator):
     )
     bl_options = {'REGISTER', 'UNDO'}
 
+    @instrumentation.instrumented
     def execute(self, context):
         obj = context.active_object
         if not obj or obj.type != 'MESH':
@@ -1454,67 +3122,14 @@ class NODE_OT_bake_mapping_to_detail_uv(bpy.types.Operator):
                 skipped_count += 1
                 continue
 
-            node_tree = mat.node_tree
-            nodes = node_tree.nodes
-            links = node_tree.links
-
-            # ── 1. Find the first Mapping node in the shader ──────────────────
-            mapping_node = None
-            for node in nodes:
-                if node.type == 'MAPPING':
-                    mapping_node = node
-                    break
-
-            if not mapping_node:
+            status = _bake_mapping_to_detail_uv(mat, mesh)
+            if status == 'NO_UV':
+                self.report({'WARNING'}, f"Material '{mat.name}': no UV layer found – skipped.")
+                skipped_count += 1
+                continue
+            if status == 'NO_MAPPING':
                 continue  # Nothing to do for this material
 
-            # ── 2. Read scale from the Mapping node ───────────────────────────
-            scale = mapping_node.inputs["Scale"].default_value
-            scale_x = scale[0]
-            scale_y = scale[1]
-
-            # ── 3. Determine the source UV map ────────────────────────────────
-            source_uv_name = None
-            for lnk in mapping_node.inputs["Vector"].links:
-                if lnk.from_node.type == 'UVMAP':
-                    source_uv_name = lnk.from_node.uv_map
-                    break
-
-            # Fallback: use the first UV layer on the mesh
-            if not source_uv_name:
-                if mesh.uv_layers:
-                    source_uv_name = mesh.uv_layers[0].name
-                else:
-                    self.report({'WARNING'}, f"Material '{mat.name}': no UV layer found – skipped.")
-                    skipped_count += 1
-                    continue
-
-            # ── 4. Bake Detail UV on ALL scene objects that use this material ──
-            # _create_detail_uv_for_material handles scale inversion internally.
-            detail_uv_name = _create_detail_uv_for_material(
-                mat, source_uv_name, scale_x, scale_y
-            )
-
-            # ── 5. Collect Image Texture nodes wired to Mapping's output ──────
-            image_tex_inputs = []
-            for lnk in list(mapping_node.outputs["Vector"].links):
-                if lnk.to_node.type == 'TEX_IMAGE':
-                    image_tex_inputs.append(lnk.to_node.inputs["Vector"])
-
-            # ── 7. Remember position, then delete the Mapping node ────────────
-            mapping_loc = mapping_node.location.copy()
-            nodes.remove(mapping_node)
-
-            # ── 8. Create a new UV Map node pointing to the Detail UV layer ───
-            uv_map_node = nodes.new(type="ShaderNodeUVMap")
-            uv_map_node.uv_map = detail_uv_name
-            uv_map_node.location = mapping_loc
-            uv_map_node.label = detail_uv_name
-
-            # ── 9. Wire the UV Map node into the Image Texture nodes ──────────
-            for tex_vector_input in image_tex_inputs:
-                links.new(uv_map_node.outputs["UV"], tex_vector_input)
-
             processed_count += 1
 
         if processed_count == 0:
@@ -1537,13 +3152,14 @@ class OBJECT_OT_remove_non_aliza_custom_props(bpy.types.Operator):
     )
     bl_options = {'REGISTER', 'UNDO'}
 
+    @instrumentation.instrumented
     def execute(self, context):
         removed_count = 0
         objects_affected = 0
 
         for obj in bpy.data.objects:
             keys_to_remove = [
-                key for key in obj.keys()
+                key for key in _custom_property_keys(obj)
                 if "aliza" not in key.lower()
             ]
             if keys_to_remove:
@@ -1569,6 +3185,7 @@ class OBJECT_OT_remove_non_aliza_material_custom_props(bpy.types.Operator):
     )
     bl_options = {'REGISTER', 'UNDO'}
 
+    @instrumentation.instrumented
     def execute(self, context):
         removed_count = 0
         materials_affected = 0
@@ -1581,7 +3198,7 @@ class OBJECT_OT_remove_non_aliza_material_custom_props(bpy.types.Operator):
                     continue
                 visited.add(mat.name)
                 keys_to_remove = [
-                    key for key in mat.keys()
+                    key for key in _custom_property_keys(mat)
                     if "aliza" not in key.lower()
                 ]
                 if keys_to_remove:
@@ -1598,12 +3215,134 @@ class OBJECT_OT_remove_non_aliza_material_custom_props(bpy.types.Operator):
         return {'FINISHED'}
 
 
+# ID collections of bpy.data visited by the custom property scrubber
+_SCRUB_ID_COLLECTIONS = (
+    "objects", "meshes", "materials", "images", "textures", "node_groups",
+    "collections", "curves", "cameras", "lights", "worlds", "scenes",
+    "actions", "armatures",
+)
+
+# Rough in-file size of one IDProperty struct (header + name buffer)
+_IDPROP_HEADER_BYTES = 136
+
+
+def _estimate_idprop_bytes(value):
+    """Approximate the storage taken by a custom property value."""
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    elif hasattr(value, "to_list"):
+        value = value.to_list()
+
+    if isinstance(value, dict):
+        return sum(_IDPROP_HEADER_BYTES + _estimate_idprop_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_idprop_bytes(v) for v in value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, float):
+        return 8
+    if isinstance(value, int):
+        return 4
+    return 8  # ID pointers and anything else
+
+
+def _custom_property_keys(id_block):
+    """Names of the user custom properties of *id_block*.  keys() also
+    lists the values of properties that add-ons registered through RNA
+    (this add-on's Scene settings, Cycles settings, ...); those are not
+    custom properties and are left out."""
+    registered = id_block.bl_rna.properties
+    return [key for key in id_block.keys() if key not in registered]
+
+
+def _scrub_custom_props(keep, dry_run=False):
+    """Remove every custom property whose name is rejected by the predicate
+    *keep* from all local datablocks in _SCRUB_ID_COLLECTIONS.  Returns a list
+    of (collection, datablocks_affected, properties_removed, bytes) rows."""
+
+    stats = []
+    for attr in _SCRUB_ID_COLLECTIONS:
+        id_collection = getattr(bpy.data, attr, None)
+        if id_collection is None:
+            continue
+
+        affected = removed = size = 0
+        for id_block in id_collection:
+            if id_block.library is not None:
+                continue  # linked datablocks are read-only
+            keys_to_remove = [key for key in _custom_property_keys(id_block) if not keep(key)]
+            if not keys_to_remove:
+                continue
+            affected += 1
+            for key in keys_to_remove:
+                size += _IDPROP_HEADER_BYTES + _estimate_idprop_bytes(id_block[key])
+                if not dry_run:
+                    del id_block[key]
+                removed += 1
+
+        if removed:
+            stats.append((attr, affected, removed, size))
+            instrumentation.count("properties_removed", removed)
+    return stats
+
+
+class OBJECT_OT_scrub_custom_props(bpy.types.Operator):
+    bl_idname = "object.scrub_custom_props"
+    bl_label = "Scrub Non-ALIZA Custom Properties (All Datablocks)"
+    bl_description = (
+        "Removes every custom property whose name does not match the keep pattern from all "
+        "objects, meshes, materials, images, collections, node groups and other datablocks in one pass"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    keep_pattern: bpy.props.StringProperty(
+        name="Keep Pattern",
+        description="Regular expression (case-insensitive); properties whose name matches are kept",
+        default="aliza"
+    )
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        default=False,
+        description="Only report what would be removed"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        try:
+            keep = re.compile(self.keep_pattern, re.IGNORECASE).search
+        except re.error as e:
+            self.report({'ERROR'}, f"Invalid keep pattern '{self.keep_pattern}': {e}")
+            return {'CANCELLED'}
+
+        start = time.perf_counter()
+        stats = _scrub_custom_props(keep, self.dry_run)
+        elapsed = time.perf_counter() - start
+
+        total_removed = sum(row[2] for row in stats)
+        total_bytes = sum(row[3] for row in stats)
+        header = "DRY RUN - " if self.dry_run else ""
+        print(f"--- {header}Scrub Custom Properties (keep /{self.keep_pattern}/), {elapsed * 1000.0:.1f} ms ---")
+        for attr, affected, removed, size in stats:
+            print(f"  {attr:<12} {affected:>7} datablock(s) {removed:>8} propert{'y' if removed == 1 else 'ies'} ~{size / 1024.0:10.1f} KiB")
+
+        verb = "Would remove" if self.dry_run else "Removed"
+        self.report(
+            {'INFO'},
+            f"{verb} {total_removed} custom propert{'y' if total_removed == 1 else 'ies'} "
+            f"(~{total_bytes / 1024.0:.1f} KiB) from {len(stats)} datablock type(s). See console for details.",
+        )
+        return {'FINISHED'}
+
+
 class OBJECT_OT_remove_unused_materials(bpy.types.Operator):
     bl_idname = "object.remove_unused_materials"
     bl_label = "Remove Unused Materials"
     bl_description = "Removes material slots that are not assigned to any face on the selected object"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @instrumentation.instrumented
     def execute(self, context):
         obj = context.active_object
         if not obj or obj.type != 'MESH':
@@ -1619,3 +3358,524 @@ class OBJECT_OT_remove_unused_materials(bpy.types.Operator):
         
         self.report({'INFO'}, "Unused materials removed.")
         return {'FINISHED'}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Equivalent materials
+#
+# The preset builders leave many materials that only differ by name.  Each
+# material gets a signature of its settings and node graph: node types and
+# settings, images, unlinked input values rounded to `digits` decimals and
+# the link topology.  Node names and locations are ignored, so nodes are
+# put into a canonical order by their own signature before the links are
+# described by node position and socket identifier.  Materials with equal
+# signatures are merged into one; mesh slots that end up holding the same
+# material are merged too and material_index is rewritten in one pass.
+# ─────────────────────────────────────────────────────────────────────────────
+_MATERIAL_SIGNATURE_ATTRIBUTES = (
+    "blend_method", "shadow_method", "alpha_threshold", "use_backface_culling", "show_transparent_back",
+    "pass_index", "diffuse_color", "metallic", "roughness",
+)
+_NODE_SIGNATURE_ATTRIBUTES = (
+    "image", "node_tree", "interpolation", "projection", "extension", "blend_type", "data_type",
+    "clamp_result", "clamp_factor", "factor_mode", "use_clamp", "operation", "space", "uv_map",
+    "vector_type", "layer_name", "attribute_name", "attribute_type", "mode", "distribution",
+    "subsurface_method",
+)
+
+
+def _rounded(value, digits):
+    if isinstance(value, float):
+        return round(value, digits)
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, bpy.types.ID):
+        return (value.name, value.library.filepath if value.library else "")
+    try:
+        return tuple(_rounded(item, digits) for item in value)
+    except TypeError:
+        return repr(value)
+
+
+def _material_signature(mat, digits=4, ignore_image_nodes=()):
+    """Hex digest describing what *mat* renders like (see above).  For the
+    nodes named in *ignore_image_nodes* only whether they have an image
+    counts, not which one."""
+    import hashlib
+
+    settings = tuple(_rounded(getattr(mat, attr, None), digits) for attr in _MATERIAL_SIGNATURE_ATTRIBUTES)
+    custom_props = tuple(sorted((key, _rounded(value, digits)) for key, value in mat.items()))
+    nodes, links = (), ()
+
+    if mat.use_nodes and mat.node_tree:
+        tree_nodes = [node for node in mat.node_tree.nodes if node.bl_idname != "NodeFrame"]
+        local = []
+        for node in tree_nodes:
+            attrs = tuple(_rounded(getattr(node, attr, None), digits) for attr in _NODE_SIGNATURE_ATTRIBUTES)
+            if node.name in ignore_image_nodes:
+                attrs = (node.image is not None,) + attrs[1:]  # "image" comes first
+            inputs = tuple(
+                (socket.identifier, None if socket.is_linked else _rounded(getattr(socket, "default_value", None), digits))
+                for socket in node.inputs
+            )
+            outputs = ()
+            if node.type in ('VALUE', 'RGB'):
+                outputs = tuple(_rounded(socket.default_value, digits) for socket in node.outputs)
+            local.append(repr((node.bl_idname, node.mute, attrs, inputs, outputs)))
+
+        order = sorted(range(len(tree_nodes)), key=local.__getitem__)
+        position = {tree_nodes[index].name: rank for rank, index in enumerate(order)}
+        nodes = tuple(local[index] for index in order)
+        links = tuple(sorted(
+            (position[link.from_node.name], link.from_socket.identifier,
+             position[link.to_node.name], link.to_socket.identifier, link.is_muted)
+            for link in mat.node_tree.links
+            if link.from_node.name in position and link.to_node.name in position
+        ))
+
+    signature = repr((mat.use_nodes, settings, custom_props, nodes, links))
+    return hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+
+
+def _find_equivalent_materials(digits=4):
+    """Groups of equivalent local materials; every group is a list to be
+    merged into group[0]."""
+    by_signature = {}
+    for mat in bpy.data.materials:
+        if mat.library is None:
+            by_signature.setdefault(_material_signature(mat, digits), []).append(mat)
+    instrumentation.count("materials_hashed", sum(len(group) for group in by_signature.values()))
+
+    groups = []
+    for materials in by_signature.values():
+        if len(materials) > 1:
+            canonical = _canonical_id(materials)
+            groups.append([canonical] + [mat for mat in materials if mat is not canonical])
+    return groups
+
+
+def _compact_material_slots(mesh):
+    """Merge the slots of *mesh* that hold the same material; returns the
+    number of slots removed."""
+    import numpy as np
+
+    slot_materials = list(mesh.materials)
+    if len(set(slot_materials)) == len(slot_materials):
+        return 0
+
+    material_index = np.zeros(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    kept, material_index = core.slots.compact_slots(slot_materials, material_index)
+
+    for slot, source in enumerate(kept):
+        mesh.materials[slot] = slot_materials[source]
+    for _ in range(len(slot_materials) - len(kept)):
+        mesh.materials.pop()
+    # Popping slots shifts material_index, so write it afterwards
+    mesh.polygons.foreach_set("material_index", material_index)
+    mesh.update()
+    return len(slot_materials) - len(kept)
+
+
+def _merge_materials(groups):
+    """Remap the users of the duplicates in *groups* to the group's first
+    material, compact the slots of the affected meshes and remove the
+    duplicates.  Returns (materials removed, slots removed)."""
+
+    duplicates = [mat for _, *others in groups for mat in others]
+    if not duplicates:
+        return 0, 0
+    duplicate_set = set(duplicates)
+
+    # Slots linked to the object instead of the mesh cannot be merged at mesh level
+    object_linked = {
+        obj.data for obj in bpy.data.objects
+        if obj.type == 'MESH' and any(slot.link == 'OBJECT' for slot in obj.material_slots)
+    }
+    affected = [
+        mesh for mesh in bpy.data.meshes
+        if mesh.library is None and mesh not in object_linked and not duplicate_set.isdisjoint(mesh.materials)
+    ]
+
+    for canonical, *others in groups:
+        for mat in others:
+            mat.user_remap(canonical)
+    slots_removed = sum(_compact_material_slots(mesh) for mesh in affected)
+    bpy.data.batch_remove(duplicates)
+
+    instrumentation.count("materials_removed", len(duplicates))
+    instrumentation.count("slots_removed", slots_removed)
+    return len(duplicates), slots_removed
+
+
+class OBJECT_OT_bleliza_merge_equivalent_materials(bpy.types.Operator):
+    bl_idname = "object.bleliza_merge_equivalent_materials"
+    bl_label = "Merge Equivalent Materials"
+    bl_description = (
+        "Finds materials with the same settings and node graph (same images and values, any node names), "
+        "merges them into one and merges the material slots that end up identical. Fewer materials means "
+        "fewer draw calls in ALIZA"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    digits: bpy.props.IntProperty(
+        name="Precision",
+        default=4,
+        min=0,
+        max=8,
+        description="Decimal places node values are rounded to before comparing"
+    )
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        default=False,
+        description="Only report what would be merged"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        obj = context.active_object
+        if obj and obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        groups = _find_equivalent_materials(self.digits)
+        duplicate_count = sum(len(group) - 1 for group in groups)
+
+        header = "DRY RUN - " if self.dry_run else ""
+        print(f"--- {header}Merge Equivalent Materials ({len(groups)} group(s)) ---")
+        for canonical, *others in groups:
+            print(f"  {canonical.name} <- {', '.join(mat.name for mat in others)}")
+
+        if self.dry_run:
+            self.report(
+                {'INFO'},
+                f"Would merge {duplicate_count} material(s) into {len(groups)} material(s). See console for details.",
+            )
+            return {'FINISHED'}
+
+        removed, slots_removed = _merge_materials(groups)
+        self.report(
+            {'INFO'},
+            f"Merged {removed} material(s) into {len(groups)} material(s), "
+            f"removed {slots_removed} duplicate material slot(s). See console for details.",
+        )
+        return {'FINISHED'}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Texture atlases
+#
+# Materials with the ALIZA preset whose base/ORM/normal textures are small
+# and whose UVs stay inside the unit square are grouped into texture sets:
+# materials that only differ by those three images.  Each set with two or
+# more materials gets one atlas image per channel (core.atlas packs the
+# tiles), one copy of its first material pointing at the atlases, and the
+# UVs of its faces are moved into the tiles in one foreach_get/foreach_set
+# per mesh.  Detail textures tile over the Detail UV and are left alone.
+# ─────────────────────────────────────────────────────────────────────────────
+ATLAS_CHANNELS = (
+    ("base", "Base Color Texture"),
+    ("orm", "Base Color Material Texture"),
+    ("normal", "Normal Image"),
+)
+_ATLAS_NODE_NAMES = tuple(node_name for _, node_name in ATLAS_CHANNELS)
+_ATLAS_UV_TOLERANCE = 1e-3
+
+
+def _atlas_channel_images(mat):
+    """channel -> image of the preset texture nodes of *mat*; None if *mat*
+    has no ALIZA preset."""
+    if not mat.use_nodes or not mat.node_tree:
+        return None
+    nodes = mat.node_tree.nodes
+    if nodes.get("Base Color Material Texture") is None:
+        return None
+    images = {}
+    for channel, node_name in ATLAS_CHANNELS:
+        node = nodes.get(node_name)
+        if node is not None and node.image is not None:
+            images[channel] = node.image
+    return images
+
+
+def _mesh_loop_uvs(mesh, uv_name):
+    """((loops, 2) UVs of layer *uv_name*, per-loop material slot)."""
+    import numpy as np
+
+    face_count, loop_count = len(mesh.polygons), len(mesh.loops)
+    material_index = np.zeros(face_count, dtype=np.int32)
+    loop_total = np.zeros(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    uv = np.zeros(loop_count * 2, dtype=np.float32)
+    mesh.uv_layers[uv_name].data.foreach_get("uv", uv)
+    return uv.reshape(-1, 2), np.repeat(material_index, loop_total)
+
+
+def _read_pixels(image):
+    """(height, width, 4) float32 pixels of *image*."""
+    import numpy as np
+
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+
+def _atlas_uv_name(mat):
+    """Name of the UV map the preset texture nodes of *mat* sample, read
+    from the UV Map node feeding them ('' for the mesh's active render UV
+    map, which unlinked Vector inputs and empty UV Map nodes use).  None
+    if they sample different maps or transformed coordinates."""
+    names = set()
+    for node_name in _ATLAS_NODE_NAMES:
+        node = mat.node_tree.nodes.get(node_name)
+        if node is None or node.image is None:
+            continue
+        vector = node.inputs["Vector"]
+        if not vector.is_linked:
+            names.add("")
+            continue
+        source = vector.links[0].from_node
+        if source.type != 'UVMAP':
+            return None
+        names.add(source.uv_map)
+    return names.pop() if len(names) == 1 else None
+
+
+def _mesh_uv_layer(mesh, uv_name):
+    """The name of the UV layer of *mesh* that *uv_name* (see
+    _atlas_uv_name()) refers to, or None if the mesh has no such layer."""
+    if uv_name:
+        return uv_name if mesh.uv_layers.get(uv_name) is not None else None
+    for layer in mesh.uv_layers:
+        if layer.active_render:
+            return layer.name
+    return mesh.uv_layers[0].name if mesh.uv_layers else None
+
+
+def _atlas_texture_sets(objects, max_tile_size):
+    """Return (texture sets, meshes): lists of materials that can share an
+    atlas (two or more each), and mesh -> {material: UV layer name} for
+    the meshes involved (the layer each material's textures sample)."""
+
+    meshes = {}
+    for obj in objects:
+        if obj.type != 'MESH' or any(slot.link == 'OBJECT' for slot in obj.material_slots):
+            continue
+        if obj.data.library is None and obj.data.uv_layers:
+            meshes.setdefault(obj.data, {})
+
+    # Materials whose textures are small enough and sample one plain UV
+    # map, by first appearance
+    candidates = {}
+    uv_names = {}
+    for mesh in meshes:
+        for mat in mesh.materials:
+            if mat is None or mat in candidates or mat.library is not None:
+                continue
+            images = _atlas_channel_images(mat)
+            if images and all(0 < max(image.size) <= max_tile_size for image in images.values()):
+                uv_name = _atlas_uv_name(mat)
+                if uv_name is not None:
+                    candidates[mat] = images
+                    uv_names[mat] = uv_name
+
+    # ...whose UV map exists on every mesh and stays inside the unit square
+    rejected = set()
+    for mesh, layers in meshes.items():
+        slots = list(mesh.materials)
+        slots_by_layer = {}
+        for slot, mat in enumerate(slots):
+            if mat not in candidates:
+                continue
+            layer = _mesh_uv_layer(mesh, uv_names[mat])
+            if layer is None:
+                rejected.add(mat)
+                continue
+            layers[mat] = layer
+            slots_by_layer.setdefault(layer, []).append(slot)
+
+        for layer, layer_slots in slots_by_layer.items():
+            uv, loop_slot = _mesh_loop_uvs(mesh, layer)
+            low, high = core.atlas.uv_bounds(uv, loop_slot.clip(0, max(len(slots) - 1, 0)), max(len(slots), 1))
+            for slot in layer_slots:
+                if (low[slot] < -_ATLAS_UV_TOLERANCE).any() or (high[slot] > 1.0 + _ATLAS_UV_TOLERANCE).any():
+                    rejected.add(slots[slot])
+
+    texture_sets = {}
+    for mat, images in candidates.items():
+        if mat not in rejected:
+            key = (tuple(sorted(images)), _material_signature(mat, ignore_image_nodes=_ATLAS_NODE_NAMES))
+            texture_sets.setdefault(key, []).append(mat)
+    return [materials for materials in texture_sets.values() if len(materials) > 1], meshes
+
+
+def _write_atlas_image(name, pixels, source, directory):
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new(name, width, height, alpha=True)
+    image.pixels.foreach_set(pixels.ravel())
+    image.colorspace_settings.name = source.colorspace_settings.name
+    image.filepath_raw = os.path.join(directory, name + ".png")
+    image.file_format = 'PNG'
+    image.save()
+    return image
+
+
+def _build_texture_atlas(materials, directory, padding=4, max_atlas_size=4096):
+    """Pack the channel textures of *materials* (one texture set) into atlas
+    images written to *directory* and create the atlas material.
+
+    Returns (atlas material, {material: (offset, scale)}) for the materials
+    that fit; (None, {}) if fewer than two fit."""
+    import numpy as np
+
+    textures = {mat: _atlas_channel_images(mat) for mat in materials}
+    sizes = [
+        (max(image.size[0] for image in textures[mat].values()), max(image.size[1] for image in textures[mat].values()))
+        for mat in materials
+    ]
+    width, height, positions = core.atlas.pack_rectangles(sizes, padding, max_atlas_size)
+    placed = [index for index, position in enumerate(positions) if position is not None]
+    if len(placed) < 2:
+        return None, {}
+    offset, scale = core.atlas.uv_rects(sizes, positions, width, height)
+
+    first = materials[placed[0]]
+    atlas_mat = first.copy()
+    atlas_mat.name = f"{first.name}_atlas"
+    pixel_cache = {}
+    for channel, node_name in ATLAS_CHANNELS:
+        if channel not in textures[first]:
+            continue
+        atlas = np.zeros((height, width, 4), dtype=np.float32)
+        for index in placed:
+            image = textures[materials[index]][channel]
+            if image not in pixel_cache:
+                pixel_cache[image] = _read_pixels(image)
+            tile = core.atlas.fit_pixels(pixel_cache[image], *sizes[index])
+            core.atlas.blit(atlas, tile, *positions[index], padding=padding)
+        node = atlas_mat.node_tree.nodes[node_name]
+        node.image = _write_atlas_image(f"{atlas_mat.name}_{channel}", atlas, textures[first][channel], directory)
+        node.extension = 'EXTEND'
+
+    instrumentation.count("atlas_pixels", width * height)
+    return atlas_mat, {materials[index]: (offset[index], scale[index]) for index in placed}
+
+
+def _apply_texture_atlases(meshes, atlases):
+    """Move the UVs of the atlased faces into their tiles (on the UV layer
+    their material samples) and point the slots at the atlas materials.
+    *meshes* is the mapping from _atlas_texture_sets(); *atlases* maps
+    material -> (atlas material, offset, scale)."""
+    import numpy as np
+
+    slots_removed = 0
+    for mesh, layers in meshes.items():
+        slots = list(mesh.materials)
+        slots_by_layer = {}
+        for index, mat in enumerate(slots):
+            if mat in atlases and mat in layers:
+                slots_by_layer.setdefault(layers[mat], set()).add(index)
+        if not slots_by_layer:
+            continue
+        offset = np.array([atlases[mat][1] if mat in atlases else (0.0, 0.0) for mat in slots])
+        scale = np.array([atlases[mat][2] if mat in atlases else (1.0, 1.0) for mat in slots])
+
+        for layer, layer_slots in slots_by_layer.items():
+            slot_tiles = np.array([index if index in layer_slots else -1 for index in range(len(slots))])
+            uv, loop_slot = _mesh_loop_uvs(mesh, layer)
+            loop_tile = slot_tiles[loop_slot.clip(0, len(slot_tiles) - 1)]
+            uv = core.atlas.remap_uvs(uv, loop_tile, offset, scale)
+            mesh.uv_layers[layer].data.foreach_set("uv", uv.ravel())
+
+        for index, mat in enumerate(slots):
+            if mat in atlases and mat in layers:
+                mesh.materials[index] = atlases[mat][0]
+        slots_removed += _compact_material_slots(mesh)
+    return slots_removed
+
+
+class OBJECT_OT_bleliza_build_texture_atlas(bpy.types.Operator):
+    bl_idname = "object.bleliza_build_texture_atlas"
+    bl_label = "Build Texture Atlas"
+    bl_description = (
+        "Packs the small base/ORM/normal textures of the selected objects' ALIZA preset materials into atlas "
+        "images, moves the UVs into the atlas tiles and replaces each set of materials that only differ by "
+        "those textures with one atlas material"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    directory: bpy.props.StringProperty(
+        name="Atlas Folder",
+        subtype='DIR_PATH',
+        default="//atlas/",
+        description="Folder the atlas PNG images are written to"
+    )
+    max_tile_size: bpy.props.IntProperty(
+        name="Max Texture Size",
+        default=512,
+        min=1,
+        description="Only textures up to this width and height are packed into atlases"
+    )
+    max_atlas_size: bpy.props.IntProperty(
+        name="Max Atlas Size",
+        default=4096,
+        min=64,
+        description="Maximum atlas width and height; textures that do not fit keep their material"
+    )
+    padding: bpy.props.IntProperty(
+        name="Padding",
+        default=4,
+        min=0,
+        max=64,
+        description="Pixels of repeated edge pixels around every tile, against bleeding in mipmaps"
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        if self.directory.startswith("//") and not bpy.data.filepath:
+            self.report({'ERROR'}, "Save the .blend file first or choose an absolute atlas folder.")
+            return {'CANCELLED'}
+
+        obj = context.active_object
+        if obj and obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        texture_sets, meshes = _atlas_texture_sets(context.selected_objects, self.max_tile_size)
+        if not texture_sets:
+            self.report({'INFO'}, "No materials with small textures to share an atlas.")
+            return {'CANCELLED'}
+
+        directory = bpy.path.abspath(self.directory)
+        os.makedirs(directory, exist_ok=True)
+
+        atlases = {}
+        atlas_materials = []
+        for materials in texture_sets:
+            atlas_mat, rects = _build_texture_atlas(materials, directory, self.padding, self.max_atlas_size)
+            if atlas_mat is None:
+                continue
+            atlas_materials.append(atlas_mat)
+            for mat, (offset, scale) in rects.items():
+                atlases[mat] = (atlas_mat, offset, scale)
+
+        slots_removed = _apply_texture_atlases(meshes, atlases)
+        instrumentation.count("atlases", len(atlas_materials))
+        instrumentation.count("materials_atlased", len(atlases))
+
+        self.report(
+            {'INFO'},
+            f"Packed {len(atlases)} material(s) into {len(atlas_materials)} atlas material(s), "
+            f"removed {slots_removed} material slot(s).",
+        )
+        return {'FINISHED'}
+
+
+class OBJECT_OT_bleliza_clear_timings(bpy.types.Operator):
+    bl_idname = "object.bleliza_clear_timings"
+    bl_label = "Clear BleLIZA Timings"
+    bl_description = "Clears the in-session history of BleLIZA operator timings"
+
+    def execute(self, context):
+        instrumentation.history.clear()
+        return {'FINISHED'}
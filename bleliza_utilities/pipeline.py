@@ -0,0 +1,324 @@
+import bpy
+import os
+import re
+import json
+import time
+
+from . import operators
+from . import instrumentation
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pipeline definition
+#
+# JSON:  {"scope": "SELECTED", "stages": ["preset_2024", {"name": "scrub_props",
+#                                                         "keep_pattern": "aliza"}]}
+# TOML:  scope = "SCENE"
+#        [[stages]]
+#        name = "preset_2024"
+#
+# A stage is a name or a table with a "name" and stage options.  The scope
+# ('ACTIVE', 'SELECTED' or 'SCENE') picks the mesh objects whose materials
+# are collected once and shared by all stages.
+# ─────────────────────────────────────────────────────────────────────────────
+DEFAULT_PIPELINE = {
+    "scope": "SELECTED",
+    "stages": [
+        "preset_2024",
+        "replace_textures",
+        "remove_empty_texture_nodes",
+        "texture_extend",
+        "bake_mapping",
+        "scrub_props",
+    ],
+}
+
+
+def _node_materials(state):
+    return [mat for mat in state["materials"] if mat.use_nodes]
+
+
+def _stage_preset_2020(state):
+    materials = _node_materials(state)
+    for mat in materials:
+        operators._build_preset_2020(mat, state["first_uv"][mat.name], state["meshes"][mat.name])
+    return {"materials": len(materials)}
+
+
+def _stage_preset_2024(state):
+    materials = _node_materials(state)
+    for mat in materials:
+        operators._build_preset_2024(mat, state["first_uv"][mat.name], state["meshes"][mat.name])
+    return {"materials": len(materials)}
+
+
+def _stage_replace_textures(state, dds_dir=""):
+    dds_dir = bpy.path.abspath(dds_dir) if dds_dir else operators._default_dds_dir()
+    replaced, missing = operators._replace_textures_with_dds(state["materials"], dds_dir)
+    return {"images replaced": replaced, "dds missing": missing}
+
+
+def _stage_convert_dds(state, dds_dir="", normal_format='BC5', workers=0):
+    dds_dir = bpy.path.abspath(dds_dir) if dds_dir else operators._default_dds_dir()
+    written, failed = operators._convert_missing_dds(state["materials"], dds_dir, (), normal_format, workers)
+    return {"dds written": written, "failed": failed}
+
+
+def _stage_cap_resolution(state, max_base=2048, max_orm=1024, max_normal=2048, max_ground=4096,
+                          resample_filter='LANCZOS', workers=0):
+    limits = {'BASE': max_base, 'ORM': max_orm, 'NORMAL': max_normal, 'GROUND': max_ground}
+    resized, failed = operators._cap_texture_resolution(
+        state["materials"], limits, state["context"].scene.bleliza_mat_prefix, resample_filter, workers,
+    )
+    return {"images resized": resized, "failed": failed}
+
+
+def _stage_merge_duplicate_images(state, use_content_hash=True):
+    groups, hashed = operators._find_duplicate_images(use_content_hash)
+    return {"images removed": operators._merge_duplicate_images(groups), "files hashed": hashed}
+
+
+def _stage_merge_materials(state, digits=4):
+    groups = operators._find_equivalent_materials(digits)
+
+    # Later stages work on the merged materials: replace every duplicate in
+    # the state by the material it is merged into (before it is removed)
+    replacement = {mat: canonical for canonical, *others in groups for mat in others}
+    materials, seen = [], set()
+    for mat in state["materials"]:
+        canonical = replacement.get(mat, mat)
+        if canonical not in seen:
+            seen.add(canonical)
+            materials.append(canonical)
+            state["owners"].setdefault(canonical.name, state["owners"][mat.name])
+            state["first_uv"].setdefault(canonical.name, state["first_uv"][mat.name])
+        # The merged material is now on the meshes of all its duplicates
+        state["meshes"].setdefault(canonical.name, {}).update(state["meshes"][mat.name])
+    state["materials"] = materials
+
+    removed, slots_removed = operators._merge_materials(groups)
+    return {"materials removed": removed, "slots removed": slots_removed}
+
+
+def _stage_remove_empty_texture_nodes(state):
+    removed = sum(operators._remove_empty_texture_nodes(mat) for mat in _node_materials(state))
+    return {"nodes removed": removed}
+
+
+def _stage_replace_constant_textures(state, tolerance=2):
+    materials = _node_materials(state)
+    images = {node.image for mat in materials for node in mat.node_tree.nodes
+              if node.type == 'TEX_IMAGE' and node.image is not None}
+    analysis = operators._analyze_images(list(images), tolerance)
+    replaced = removed = 0
+    for mat in materials:
+        mat_replaced, mat_removed = operators._replace_constant_textures(mat, analysis, tolerance)
+        replaced += mat_replaced
+        removed += mat_removed
+    return {"textures analyzed": len(analysis), "links replaced": replaced, "nodes removed": removed}
+
+
+def _stage_texture_extend(state, extension='EXTEND'):
+    return {"texture nodes": operators._set_texture_extension(state["materials"], extension)}
+
+
+def _stage_materials_to_sat(state):
+    counts = operators._apply_material_edits(_node_materials(state), operators.SAT_EDITS)
+    return {"principled nodes": counts["roughness"]["matched"],
+            "values changed": sum(count["changed"] for count in counts.values())}
+
+
+def _stage_edit_materials(state, edits=()):
+    """*edits*: a list of {"label", "node_type" (string, list or null for the
+    material), "path" (string or list of alternatives), "value"} tables."""
+    counts = operators._apply_material_edits(state["materials"], [
+        (edit.get("label", edit["path"] if isinstance(edit["path"], str) else edit["path"][0]),
+         edit.get("node_type"), edit["path"], edit["value"])
+        for edit in edits
+    ])
+    return {f"{label} changed": count["changed"] for label, count in counts.items()}
+
+
+def _stage_bake_mapping(state):
+    counts = {"PROCESSED": 0, "NO_MAPPING": 0, "NO_UV": 0}
+    for mat in _node_materials(state):
+        status = operators._bake_mapping_to_detail_uv(
+            mat, state["owners"][mat.name].data, state["meshes"][mat.name]
+        )
+        counts[status] += 1
+    return {"baked": counts["PROCESSED"], "no UV": counts["NO_UV"]}
+
+
+def _stage_apply_property_rules(state):
+    compiled = operators._compile_property_rules(state["context"].scene.bleliza_property_rules)
+    operators._apply_property_rules(state["objects"], compiled)
+    return {"rules": len(compiled), "changed": sum(rule["changed"] for rule in compiled)}
+
+
+def _stage_scrub_props(state, keep_pattern="aliza", dry_run=False):
+    keep = re.compile(keep_pattern, re.IGNORECASE).search
+    stats = operators._scrub_custom_props(keep, dry_run)
+    return {"properties removed": sum(row[2] for row in stats)}
+
+
+STAGES = {
+    "preset_2020": _stage_preset_2020,
+    "preset_2024": _stage_preset_2024,
+    "cap_resolution": _stage_cap_resolution,
+    "convert_dds": _stage_convert_dds,
+    "replace_textures": _stage_replace_textures,
+    "merge_duplicate_images": _stage_merge_duplicate_images,
+    "merge_materials": _stage_merge_materials,
+    "remove_empty_texture_nodes": _stage_remove_empty_texture_nodes,
+    "replace_constant_textures": _stage_replace_constant_textures,
+    "texture_extend": _stage_texture_extend,
+    "materials_to_sat": _stage_materials_to_sat,
+    "edit_materials": _stage_edit_materials,
+    "bake_mapping": _stage_bake_mapping,
+    "apply_property_rules": _stage_apply_property_rules,
+    "scrub_props": _stage_scrub_props,
+}
+
+
+def load_pipeline(filepath):
+    """Read a JSON or TOML pipeline file and return (scope, stages) where
+    stages is a list of (name, options).  Raises ValueError for unknown
+    stages or unsupported files."""
+
+    if not filepath:
+        definition = DEFAULT_PIPELINE
+    elif filepath.lower().endswith(".toml"):
+        try:
+            import tomllib  # Python 3.11+ (Blender 4.x)
+        except ImportError:
+            raise ValueError("TOML pipelines need Python 3.11+; use a .json file instead") from None
+        with open(filepath, "rb") as f:
+            definition = tomllib.load(f)
+    else:
+        with open(filepath, encoding="utf-8") as f:
+            definition = json.load(f)
+
+    stages = []
+    for item in definition.get("stages", []):
+        if isinstance(item, str):
+            name, options = item, {}
+        else:
+            options = dict(item)
+            name = options.pop("name", None) or options.pop("stage", None)
+        if name not in STAGES:
+            raise ValueError(f"Unknown pipeline stage '{name}'. Available: {', '.join(STAGES)}")
+        stages.append((name, options))
+    return definition.get("scope", "SELECTED").upper(), stages
+
+
+def collect_pipeline_state(context, scope):
+    """Collect the mesh objects of *scope* and the unique materials they use,
+    remembering the first object (and its first UV map) and the meshes of
+    *scope* using it for every material."""
+
+    if scope == 'ACTIVE':
+        candidates = [context.active_object] if context.active_object else []
+    elif scope == 'SCENE':
+        candidates = list(context.scene.objects)
+    else:
+        candidates = list(context.selected_objects)
+
+    objects = [obj for obj in candidates if obj.type == 'MESH']
+    materials = []
+    owners = {}
+    first_uv = {}
+    meshes = {}
+    for obj in objects:
+        for slot in obj.material_slots:
+            mat = slot.material
+            if mat is None:
+                continue
+            if mat.name not in owners:
+                materials.append(mat)
+                owners[mat.name] = obj
+                first_uv[mat.name] = operators._first_uv_name(obj)
+                meshes[mat.name] = {}
+            meshes[mat.name].setdefault(obj.data, None)
+
+    return {
+        "context": context,
+        "objects": objects,
+        "materials": materials,
+        "owners": owners,
+        "first_uv": first_uv,
+        "meshes": meshes,
+    }
+
+
+def run_pipeline(context, scope, stages):
+    """Run *stages* on the objects/materials of *scope*.  Returns a list of
+    (stage name, seconds, counters) rows."""
+
+    start = time.perf_counter()
+    state = collect_pipeline_state(context, scope)
+    rows = [("collect", time.perf_counter() - start,
+             {"objects": len(state["objects"]), "materials": len(state["materials"])})]
+
+    for name, options in stages:
+        start = time.perf_counter()
+        counters = STAGES[name](state, **options)
+        rows.append((name, time.perf_counter() - start, counters))
+    return rows
+
+
+class NODE_OT_run_pipeline(bpy.types.Operator):
+    bl_idname = "node.bleliza_run_pipeline"
+    bl_label = "Run BleLIZA Pipeline"
+    bl_description = (
+        "Runs a sequence of BleLIZA stages (default: preset 2024, replace textures, remove empty "
+        "texture nodes, EXTEND, bake mapping, scrub props) as a single undo step"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(
+        name="Pipeline File",
+        description="JSON/TOML stage list (empty: built-in ALIZA preparation pipeline)",
+        default="",
+        subtype='FILE_PATH'
+    )
+    scope: bpy.props.EnumProperty(
+        name="Scope",
+        items=[
+            ('FILE', "From File", "Use the scope given in the pipeline file"),
+            ('ACTIVE', "Active Object", "Materials of the active object"),
+            ('SELECTED', "Selected Objects", "Materials of all selected objects"),
+            ('SCENE', "Scene", "Materials of all objects in the scene"),
+        ],
+        default='FILE'
+    )
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        operators._scene_defaults(self, context, {"filepath": "bleliza_pipeline_file"})
+        filepath = bpy.path.abspath(self.filepath) if self.filepath else ""
+        try:
+            file_scope, stages = load_pipeline(filepath)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not load pipeline '{filepath}': {e}")
+            return {'CANCELLED'}
+
+        scope = file_scope if self.scope == 'FILE' else self.scope
+        if context.object and context.object.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        try:
+            rows = run_pipeline(context, scope, stages)
+        except (TypeError, re.error) as e:
+            self.report({'ERROR'}, f"Pipeline failed: {e}")
+            return {'CANCELLED'}
+
+        total = sum(row[1] for row in rows)
+        print(f"--- BleLIZA pipeline ({os.path.basename(filepath) or 'default'}, scope {scope}) ---")
+        print(f"  {'stage':<28} {'ms':>10}  counters")
+        for name, seconds, counters in rows:
+            details = ", ".join(f"{key} {value}" for key, value in counters.items())
+            print(f"  {name:<28} {seconds * 1000.0:>10.1f}  {details}")
+        print(f"  {'total':<28} {total * 1000.0:>10.1f}")
+
+        self.report({'INFO'}, f"Pipeline ran {len(stages)} stage(s) in {total:.2f}s. See console for the timing table.")
+        return {'FINISHED'}
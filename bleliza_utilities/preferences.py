@@ -0,0 +1,59 @@
+import bpy
+
+
+# Add-on preferences (Edit > Preferences > Add-ons > BleLIZA)
+class BLELIZA_AP_preferences(bpy.types.AddonPreferences):
+    bl_idname = __package__
+
+    timing_log_path: bpy.props.StringProperty(
+        name="Timing Log (JSONL)",
+        description="Append one JSON line with timings and work counters per BleLIZA operator run (empty: disabled)",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+    memory_profiling: bpy.props.BoolProperty(
+        name="Memory Profiling",
+        description=(
+            "Record resident memory, top Python allocators and datablock count changes for every "
+            "BleLIZA operator run and write a report to the profile folder (slows operators down)"
+        ),
+        default=False
+    )
+
+    cprofile_mode: bpy.props.EnumProperty(
+        name="cProfile",
+        description="Profile BleLIZA operator runs with cProfile and save a .prof file to the profile folder",
+        items=[
+            ('OFF', "Off", "Do not profile"),
+            ('NEXT', "Next Run", "Profile the next BleLIZA operator run only"),
+            ('ALWAYS', "Every Run", "Profile every BleLIZA operator run"),
+        ],
+        default='OFF'
+    )
+
+    cprofile_top: bpy.props.IntProperty(
+        name="Top Entries",
+        description="Number of cumulative-time entries printed for a profiled run",
+        default=25,
+        min=1
+    )
+
+    profile_dir: bpy.props.StringProperty(
+        name="Profile Folder",
+        description="Folder for profiling reports (empty: next to the .blend file, or the temp folder if unsaved)",
+        default="",
+        subtype='DIR_PATH'
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text="Instrumentation:")
+        layout.prop(self, "timing_log_path")
+        layout.separator()
+        layout.label(text="Profiling:")
+        layout.prop(self, "memory_profiling")
+        row = layout.row()
+        row.prop(self, "cprofile_mode")
+        row.prop(self, "cprofile_top")
+        layout.prop(self, "profile_dir")
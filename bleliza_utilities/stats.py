@@ -0,0 +1,206 @@
+import bpy
+import os
+import time
+
+from bpy.app.handlers import persistent
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cached scene statistics for the panels
+#
+# Panels must not walk bpy.data in draw(): it runs on every redraw (mouse
+# hover included).  Instead, depsgraph updates and file loads only mark the
+# cache dirty and schedule a bpy.app.timers refresh; once edits have settled
+# for REFRESH_DELAY seconds the timer recomputes the counts, stores them in
+# `cache` and tags the Properties editors for redraw.  draw() only reads
+# `cache`.
+#
+# Island counts need the mesh topology, so they are cached per mesh and only
+# recomputed after a geometry update of that mesh.  Whether an image file
+# exists is cached per resolved path (a stat call can take long on network
+# drives): new images and changed paths are checked once, and the cache is
+# emptied on file load and for images that are updated (e.g. reloaded).
+# ─────────────────────────────────────────────────────────────────────────────
+REFRESH_DELAY = 0.5
+
+# Node created by both ALIZA preset builders; materials without it still
+# have their original (MSFS or other) layout.
+PRESET_MARKER_NODE = "Base Color Material Texture"
+
+cache = {}
+
+# mesh name -> (face count, loop count, island count)
+_island_cache = {}
+# resolved image file path -> whether the file exists
+_file_cache = {}
+_dirty = True
+
+
+def _count_islands(mesh):
+    key = (len(mesh.polygons), len(mesh.loops))
+    cached = _island_cache.get(mesh.name)
+    if cached is not None and cached[:2] == key:
+        return cached[2]
+
+    from .operators import _face_island_labels
+    _, island_count = _face_island_labels(mesh)
+    _island_cache[mesh.name] = (*key, island_count)
+    return island_count
+
+
+def _image_path(image):
+    """The resolved path of a file image, or None for other images."""
+    if image.source != 'FILE' or image.packed_file is not None or not image.filepath:
+        return None
+    return bpy.path.abspath(image.filepath, library=image.library)
+
+
+def _count_missing_files(images):
+    """Number of *images* whose file does not exist, checking only paths
+    not in _file_cache yet."""
+    paths = [path for path in map(_image_path, images) if path is not None]
+    # Forget the paths of removed images and old paths
+    for path in _file_cache.keys() - set(paths):
+        del _file_cache[path]
+    missing = 0
+    for path in paths:
+        if path not in _file_cache:
+            _file_cache[path] = os.path.exists(path)
+        missing += not _file_cache[path]
+    return missing
+
+
+def compute(context):
+    """Compute the panel statistics for the current file (the expensive
+    part; called from the refresh timer, never from draw())."""
+    start = time.perf_counter()
+
+    materials = [mat for mat in bpy.data.materials if mat.library is None]
+    unconverted = sum(
+        1 for mat in materials
+        if mat.use_nodes and mat.node_tree and mat.node_tree.nodes.get(PRESET_MARKER_NODE) is None
+    )
+
+    missing_textures = _count_missing_files(list(bpy.data.images))
+
+    obj = context.view_layer.objects.active if context.view_layer else None
+    islands = None
+    if obj is not None and obj.type == 'MESH' and obj.mode != 'EDIT':
+        islands = _count_islands(obj.data)
+
+    return {
+        "materials": len(materials),
+        "unconverted_materials": unconverted,
+        "missing_textures": missing_textures,
+        "images": len(bpy.data.images),
+        "active_object": obj.name if obj is not None else "",
+        "islands": islands,
+        "compute_seconds": time.perf_counter() - start,
+    }
+
+
+def _tag_redraw():
+    window_manager = bpy.context.window_manager
+    for window in getattr(window_manager, "windows", ()):
+        for area in window.screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
+
+
+def _refresh():
+    global _dirty
+    _dirty = False
+    try:
+        cache.update(compute(bpy.context))
+    except Exception as e:  # a failed refresh must not kill the timer machinery
+        print(f"BleLIZA: statistics refresh failed: {e}")
+        cache.clear()
+    _tag_redraw()
+    return None  # one-shot; invalidate() schedules the next refresh
+
+
+def invalidate(delay=REFRESH_DELAY):
+    """Mark the statistics stale and (re)start the refresh timer."""
+    global _dirty
+    _dirty = True
+    if bpy.app.timers.is_registered(_refresh):
+        bpy.app.timers.unregister(_refresh)
+    bpy.app.timers.register(_refresh, first_interval=delay)
+
+
+def request(context):
+    """Cached statistics for draw(); schedules a refresh if there are none
+    yet.  Never computes anything itself."""
+    if not cache and not bpy.app.timers.is_registered(_refresh):
+        bpy.app.timers.register(_refresh, first_interval=0.0)
+    return cache
+
+
+def is_stale():
+    return _dirty
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, bpy.types.Mesh):
+            _island_cache.pop(update.id.name, None)
+        elif update.is_updated_geometry and isinstance(update.id, bpy.types.Object) and update.id.type == 'MESH':
+            _island_cache.pop(update.id.data.name, None)
+        elif isinstance(update.id, bpy.types.Image):
+            _file_cache.pop(_image_path(update.id), None)
+    invalidate()
+
+
+@persistent
+def _on_load_post(*args):
+    _island_cache.clear()
+    _file_cache.clear()
+    cache.clear()
+    invalidate(0.0)
+
+
+def draw_counts(layout, context, keys):
+    """Draw the cached statistics named in *keys* as labels."""
+    stats = request(context)
+    if not stats:
+        layout.label(text="Statistics: updating…", icon='TIME')
+        return
+
+    labels = {
+        "materials": ("Materials", 'MATERIAL'),
+        "unconverted_materials": ("Without ALIZA preset", 'NODETREE'),
+        "missing_textures": ("Missing texture files", 'ERROR'),
+        "islands": ("Islands (active object)", 'MESH_DATA'),
+    }
+    col = layout.column(align=True)
+    for key in keys:
+        text, icon = labels[key]
+        value = stats.get(key)
+        if key == "islands" and value is None:
+            value = "–"
+        elif key == "missing_textures" and not value:
+            icon = 'CHECKMARK'
+        col.label(text=f"{text}: {value}", icon=icon)
+    if is_stale():
+        col.label(text="Updating…", icon='TIME')
+
+
+def register():
+    if _on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+    invalidate(0.0)
+
+
+def unregister():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    if bpy.app.timers.is_registered(_refresh):
+        bpy.app.timers.unregister(_refresh)
+    cache.clear()
+    _island_cache.clear()
+    _file_cache.clear()
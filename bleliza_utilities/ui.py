@@ -1,5 +1,8 @@
 import bpy
 
+from . import instrumentation
+from . import stats
+
 # Custom parent panel to group our tools
 class BLELIZA_MATERIAL_PT_parent(bpy.types.Panel):
     bl_label = "BleLIZA Material Parameters"
@@ -10,13 +13,24 @@ class BLELIZA_MATERIAL_PT_parent(bpy.types.Panel):
     
     def draw(self, context):
         layout = self.layout
+        stats.draw_counts(layout.box(), context, ("materials", "unconverted_materials", "missing_textures"))
+
         layout.label(text="Material Tools:")
         layout.operator("object.remove_unused_materials", text="Remove Unused Materials from Object")
+        layout.operator("object.bleliza_merge_duplicate_images", text="Merge Duplicate Images")
+        layout.operator("object.bleliza_merge_equivalent_materials", text="Merge Equivalent Materials")
 
         layout.separator()
         layout.label(text="Custom Properties (Scene-wide):")
         layout.operator("object.remove_non_aliza_custom_props", text="Remove Non-ALIZA Custom Props from All Objects")
         layout.operator("object.remove_non_aliza_material_custom_props", text="Remove Non-ALIZA Custom Props from All Materials")
+        op = layout.operator("object.scrub_custom_props", text="Preview Scrub of All Datablocks")
+        op.dry_run = True
+        op = layout.operator("object.scrub_custom_props", text="Scrub Non-ALIZA Custom Props from All Datablocks")
+        op.dry_run = False
+
+        layout.separator()
+        layout.operator("object.bleliza_audit_scene", text="Audit Scene for ALIZA Export", icon='CHECKMARK')
 
 # Panel nested inside our custom parent panel
 class MATERIAL_PT_texture_preset_panel(bpy.types.Panel):
@@ -32,18 +46,30 @@ class MATERIAL_PT_texture_preset_panel(bpy.types.Panel):
         layout.operator("node.create_preset_2020", text="Generate ALIZA Texture Preset from MSFS2020 Shader Mess ;-)")
         layout.operator("node.create_preset_2024", text="Generate ALIZA Texture Preset from MSFS2024 Shader Mess ;-)")
         layout.operator("object.replace_textures_with_dds", text="Replace Texures")
+        layout.operator("object.bleliza_convert_missing_dds", text="Convert Missing Textures to DDS")
+        layout.operator("object.bleliza_cap_texture_resolution", text="Cap Texture Resolution")
         layout.operator("object.remove_empty_textures_nodes", text="Remove empty textures nodes")
+        op = layout.operator("object.remove_empty_textures_nodes", text="Remove empty textures nodes (All Materials)")
+        op.scope = 'FILE'
+        layout.operator("object.bleliza_replace_constant_textures", text="Replace Constant Textures with Values")
+        layout.operator("object.bleliza_build_texture_atlas", text="Build Texture Atlas (Selected)")
         layout.operator("node.set_texture_extend", text="Set Texture Extension to EXTEND")
         layout.operator("mesh.assign_random_materials_islands", text="Assign Random Materials to Islands")
         layout.operator("node.set_materials_to_sat", text="Set materials to SAT")
+        layout.operator("object.bleliza_edit_materials", text="Batch Edit Materials")
         layout.operator("node.bake_mapping_to_detail_uv", text="Bake Mapping Node → Detail UV")
         
+        layout.separator()
+        layout.label(text="Pipeline:")
+        layout.prop(context.scene, "bleliza_pipeline_file", text="File")
+        layout.operator("node.bleliza_run_pipeline", text="Run Pipeline (Single Undo)")
+        
         layout.separator()
         layout.label(text="Materials Filter:")
         scene = context.scene
         layout.prop(scene, "bleliza_mat_filter", text="Filter")
-        op_roof = layout.operator("mesh.assign_random_materials_selected_islands", text="Assign Filtered Materials to Selected Islands")
-        op_roof.material_name_filter = scene.bleliza_mat_filter
+        layout.prop(scene, "bleliza_mat_filter_mode", text="Mode")
+        layout.operator("mesh.assign_random_materials_selected_islands", text="Assign Filtered Materials to Selected Islands")
 
 # Panel for creating materials
 class MATERIAL_PT_create_materials_panel(bpy.types.Panel):
@@ -71,14 +97,9 @@ class MATERIAL_PT_create_materials_panel(bpy.types.Panel):
         col.prop(scene, "bleliza_tex_ext", text="Extension")
         
         col.separator()
-        op = col.operator("object.create_and_assign_materials", text="Create & Assign Materials")
-        op.grid_columns = scene.bleliza_cols
-        op.grid_rows = scene.bleliza_rows
-        op.mat_prefix = scene.bleliza_mat_prefix
-        op.tex_folder = scene.bleliza_tex_folder
-        op.tex_ext = scene.bleliza_tex_ext
-        op.tex_name_prefix = scene.bleliza_tex_name_prefix
-        op.tex_name_suffix = scene.bleliza_tex_name_suffix
+        # The operator reads the settings above from the scene
+        col.operator("object.create_and_assign_materials", text="Create & Assign Materials")
+        col.operator("object.bleliza_create_ground_lod", text="Create Low-LOD Ground Materials")
 
 # Panel for object tools
 class BLELIZA_PT_object_tools(bpy.types.Panel):
@@ -91,20 +112,18 @@ class BLELIZA_PT_object_tools(bpy.types.Panel):
     def draw(self, context):
         layout = self.layout
         scene = context.scene
-        
+        stats.draw_counts(layout.box(), context, ("islands",))
+
         layout.label(text="Snap Islands:")
         layout.prop(scene, "bleliza_terrain_obj")
         
-        op = layout.operator("object.snap_islands_to_terrain", text="Snap Islands to Terrain")
-        if scene.bleliza_terrain_obj:
-            op.terrain_name = scene.bleliza_terrain_obj.name
+        layout.operator("object.snap_islands_to_terrain", text="Snap Islands to Terrain")
             
         layout.separator()
         layout.label(text="Selection:")
         layout.prop(scene, "bleliza_flat_threshold")
         
-        op_sel = layout.operator("mesh.select_flat_islands", text="Select Flat Z Islands")
-        op_sel.threshold = scene.bleliza_flat_threshold
+        layout.operator("mesh.select_flat_islands", text="Select Flat Z Islands")
         
         layout.separator()
         layout.label(text="Custom Properties (Scene-wide):")
@@ -146,3 +165,100 @@ class BLELIZA_PT_object_tools(bpy.types.Panel):
         op.prop_value = 0
         op.target = 'SELECTED'
         op.overwrite = True
+
+# List of ALIZA custom property rules
+class BLELIZA_UL_property_rules(bpy.types.UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.prop(item, "enabled", text="")
+        row.label(text=item.name_pattern or "*")
+        row.label(text=f"{item.prop_name}={item.prop_value}")
+
+# Panel nested inside the object tools for rule-based custom properties
+class BLELIZA_PT_property_rules(bpy.types.Panel):
+    bl_label = "Custom Property Rules"
+    bl_idname = "BLELIZA_PT_property_rules"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "object"
+    bl_parent_id = "BLELIZA_PT_object_tools"
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        row = layout.row()
+        row.template_list("BLELIZA_UL_property_rules", "", scene, "bleliza_property_rules",
+                          scene, "bleliza_property_rules_index", rows=4)
+        col = row.column(align=True)
+        col.operator("object.bleliza_property_rule_add", icon='ADD', text="")
+        col.operator("object.bleliza_property_rule_remove", icon='REMOVE', text="")
+
+        rules = scene.bleliza_property_rules
+        index = scene.bleliza_property_rules_index
+        if 0 <= index < len(rules):
+            rule = rules[index]
+            col = layout.column()
+            col.prop(rule, "name_pattern")
+            col.prop(rule, "predicate")
+            if rule.predicate != 'NONE':
+                col.prop(rule, "predicate_pattern")
+            col.prop(rule, "prop_name")
+            col.prop(rule, "prop_value")
+            col.prop(rule, "overwrite")
+
+        layout.separator()
+        op = layout.operator("object.bleliza_apply_property_rules", text="Apply Rules (All)")
+        op.target = 'ALL'
+        op = layout.operator("object.bleliza_apply_property_rules", text="Apply Rules (Selected)")
+        op.target = 'SELECTED'
+
+        layout.separator()
+        layout.label(text="Property Table (CSV/JSON):")
+        op = layout.operator("object.bleliza_import_property_table", text="Preview Table Changes")
+        op.dry_run = True
+        op = layout.operator("object.bleliza_import_property_table", text="Import Property Table")
+        op.dry_run = False
+
+# Panel listing the most recent BleLIZA operator runs
+class BLELIZA_PT_timings(bpy.types.Panel):
+    bl_label = "BleLIZA Timings"
+    bl_idname = "BLELIZA_PT_timings"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "material"
+    bl_parent_id = "BLELIZA_MATERIAL_PT_parent"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    max_rows = 10
+
+    def draw(self, context):
+        layout = self.layout
+
+        prefs = instrumentation.get_preferences(context)
+        if prefs:
+            row = layout.row()
+            row.prop(prefs, "cprofile_mode")
+            row.prop(prefs, "memory_profiling", text="Memory")
+
+        if instrumentation.registration_seconds is not None:
+            layout.label(text=f"Add-on registered in {instrumentation.registration_seconds * 1000.0:.1f} ms")
+
+        if not instrumentation.history:
+            layout.label(text="No operator runs recorded yet.")
+            return
+
+        col = layout.column(align=True)
+        for record in reversed(list(instrumentation.history)[-self.max_rows:]):
+            col.label(
+                text=f"{record['label']}: {record['wall_seconds'] * 1000.0:.0f} ms "
+                     f"(CPU {record['cpu_seconds'] * 1000.0:.0f} ms) {record['result']}"
+            )
+            if record["counters"]:
+                col.label(text="    " + ", ".join(f"{key} {value}" for key, value in record["counters"].items()))
+            memory = record.get("memory")
+            if memory and memory["peak_rss_bytes"]:
+                col.label(text=f"    peak RSS {memory['peak_rss_bytes'] / 2**20:.0f} MiB, "
+                               f"Python peak {memory['python_peak_bytes'] / 2**20:.1f} MiB")
+
+        layout.operator("object.bleliza_clear_timings", text="Clear History")
@@ -0,0 +1,37 @@
+"""
+pytest setup: the operators run in plain Python against the fake bpy layer
+in benchmarks/fakebpy, on the synthetic scenes of benchmarks/scenes.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+BENCH_DIR = os.path.join(REPO_DIR, "benchmarks")
+
+sys.path[:0] = [REPO_DIR, BENCH_DIR]
+
+import fakebpy  # noqa: E402
+
+fakebpy.install()
+
+
+@pytest.fixture(scope="session")
+def addon():
+    import bleliza_utilities
+    bleliza_utilities.register()
+    yield bleliza_utilities
+    bleliza_utilities.unregister()
+
+
+@pytest.fixture
+def bpy(addon, tmp_path):
+    """The fake bpy module with an empty file saved in <tmp_path>/blend
+    (so that the "//../dds" texture folder resolves to <tmp_path>/dds)."""
+    fakebpy.reset()
+    os.makedirs(tmp_path / "blend")
+    fakebpy.bpy.ops.wm.save_as_mainfile(filepath=str(tmp_path / "blend" / "test.blend"))
+    return fakebpy.bpy
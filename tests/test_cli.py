@@ -0,0 +1,46 @@
+"""
+Step scopes of bleliza_cli.run_step(): which objects a step runs on.
+"""
+
+import bleliza_cli
+
+
+def _mesh_object(bpy, name, materials):
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+    for mat in materials:
+        mesh.materials.append(mat)
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def test_object_steps_run_on_meshes_sharing_materials(bpy):
+    used, unused = bpy.data.materials.new("used"), bpy.data.materials.new("unused")
+    objects = [_mesh_object(bpy, f"shared_{index}", [used, unused]) for index in range(3)]
+
+    record = bleliza_cli.run_step("remove_unused_materials")
+
+    assert record["calls"] == len(objects) and not record["errors"]
+    assert all([slot.material for slot in obj.material_slots] == [used] for obj in objects)
+
+
+def test_material_steps_skip_meshes_whose_materials_are_done(bpy):
+    mat = bpy.data.materials.new("shared")
+    mat.use_nodes = True
+    for index in range(3):
+        _mesh_object(bpy, f"shared_{index}", [mat])
+
+    record = bleliza_cli.run_step("preset_2024")
+
+    assert record["calls"] == 1 and not record["errors"]
+
+
+def test_scoped_material_steps_run_once_on_the_file(bpy):
+    for index in range(3):
+        _mesh_object(bpy, f"mesh_{index}", [bpy.data.materials.new(f"mat_{index}")])
+
+    record = bleliza_cli.run_step("texture_extend")
+
+    assert record["calls"] == 1 and not record["errors"]
+    assert record["results"] == {'FINISHED': 1}
@@ -0,0 +1,68 @@
+"""
+DDS encoder/decoder round trips, including non-power-of-two sizes whose
+mip chain must follow the DDS rule max(1, n // 2) per level.
+"""
+
+import numpy as np
+import pytest
+
+from bleliza_utilities.core import dds, textures
+
+SIZES = [(53, 37), (100, 60), (37, 53), (5, 3), (1, 7), (64, 64)]
+
+
+def _gradient(width, height):
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    pixels[..., 0] = x * 255 // max(1, width - 1)
+    pixels[..., 1] = y * 255 // max(1, height - 1)
+    pixels[..., 2] = 96
+    pixels[..., 3] = 255
+    return pixels
+
+
+@pytest.mark.parametrize("fmt", ["BC1", "BC3", "BC5"])
+@pytest.mark.parametrize("width, height", SIZES)
+def test_mip_chain_matches_header(width, height, fmt):
+    data = dds.encode_dds(_gradient(width, height), fmt)
+
+    info = textures.parse_image_header(data[:textures.HEADER_BYTES])
+    assert (info["width"], info["height"]) == (width, height)
+    assert info["mips"] == max(width, height).bit_length()
+
+    levels = dds.mip_levels(width, height, info["mips"], fmt)
+    last_width, last_height, last_offset = levels[-1]
+    assert (last_width, last_height) == (1, 1)
+    end = last_offset + ((last_width + 3) // 4) * ((last_height + 3) // 4) * dds.BLOCK_BYTES[fmt]
+    assert len(data) == end
+
+    for level, (level_width, level_height, _) in enumerate(levels):
+        assert dds.decode_dds(data, level).shape == (level_height, level_width, 4)
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_mip_levels_keep_a_flat_colour(width, height):
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    pixels[...] = (200, 100, 40, 255)
+    data = dds.encode_dds(pixels, "BC1")
+
+    info = textures.parse_image_header(data[:textures.HEADER_BYTES])
+    for level in range(info["mips"]):
+        decoded = dds.decode_dds(data, level).astype(int)
+        assert np.abs(decoded - pixels[0, 0]).max() <= 8
+
+
+def test_downsample_floors_odd_sizes():
+    pixels = np.arange(5 * 3 * 4, dtype=np.uint8).reshape(3, 5, 4)
+    half = dds.downsample(pixels)
+    assert half.shape == (1, 2, 4)
+    # The odd last column is averaged into the last output column
+    assert half[0, 1, 0] == np.rint(pixels[:, 2:, 0].mean())
+
+
+def test_read_dds_min_size_reads_the_matching_level(tmp_path):
+    path = str(tmp_path / "tile.dds")
+    dds.write_dds(path, _gradient(100, 60), "BC1")
+
+    assert dds.read_dds(path).shape == (60, 100, 4)
+    assert dds.read_dds(path, min_size=12).shape == (15, 25, 4)
@@ -0,0 +1,68 @@
+"""
+bpy API call budgets of the operators, checked against the fake bpy layer
+(see conftest.py).  A budget is the most calls an operator may make for a
+scene; exceeding one means per-element or per-material work crept back in.
+"""
+
+import os
+
+import pytest
+
+import fakebpy
+import scenes
+
+MATERIALS = 10
+ISLANDS = 200
+
+# The 2024 preset graph is built from scratch for every material: Material
+# Output, Principled BSDF, UV Map, five Image Textures, Normal Map, two Mix
+# nodes and Separate Color.  Every node created must end up in that graph.
+PRESET_2024_NODES = 12
+
+
+def test_preset_2024_creates_only_the_preset_graph(bpy, tmp_path):
+    scenes.build_material_scene(MATERIALS, str(tmp_path), "2024")
+    budget = {"nodes.new": PRESET_2024_NODES * MATERIALS, "images.load": 0, "element_access": 0}
+
+    with fakebpy.budget(budget) as made:
+        result, _ = fakebpy.run_operator("node.create_preset_2024")
+
+    assert result == {'FINISHED'}
+    trees = [mat.node_tree for mat in bpy.data.materials]
+    assert all(len(tree.nodes) == PRESET_2024_NODES for tree in trees)
+    assert made["nodes.new"] == sum(len(tree.nodes) for tree in trees)
+
+
+def test_replace_textures_reuses_the_texture_nodes(bpy, tmp_path):
+    scenes.build_material_scene(MATERIALS, str(tmp_path), "2024")
+    fakebpy.run_operator("node.create_preset_2024")
+    # Unique base, ORM and normal images per material plus the shared detail
+    budget = {"nodes.new": 0, "links.new": 0, "images.load": 3 * MATERIALS + 1}
+
+    with fakebpy.budget(budget):
+        result, _ = fakebpy.run_operator("object.replace_textures_with_dds")
+
+    assert result == {'FINISHED'}
+    paths = [
+        node.image.filepath
+        for mat in bpy.data.materials
+        for node in mat.node_tree.nodes
+        if node.type == 'TEX_IMAGE' and node.image is not None
+    ]
+    assert paths and all(os.path.splitext(path)[1] == ".dds" for path in paths)
+
+
+@pytest.mark.parametrize("idname, options, budget", [
+    ("mesh.assign_random_materials_islands", {}, {"element_access": 0, "ray_cast": 0}),
+    ("mesh.assign_random_materials_selected_islands", {"material_name_filter": "roof_"}, {"element_access": 0}),
+    ("mesh.select_flat_islands", {}, {"element_access": 0}),
+    ("object.snap_islands_to_terrain", {}, {"element_access": 0, "ray_cast": ISLANDS}),
+])
+def test_island_operators_use_bulk_mesh_access(bpy, idname, options, budget):
+    scenes.build_island_scene(ISLANDS)
+
+    with fakebpy.budget(budget) as made:
+        result, _ = fakebpy.run_operator(idname, **options)
+
+    assert result == {'FINISHED'}
+    assert made["foreach_get"] > 0
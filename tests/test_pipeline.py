@@ -0,0 +1,33 @@
+"""
+The pipeline works on the objects of its scope only.
+"""
+
+import scenes
+from bleliza_utilities import pipeline
+
+
+def test_preset_stage_writes_detail_uvs_only_inside_the_scope(bpy, tmp_path):
+    selected = scenes.build_material_scene(4, str(tmp_path), "2024")["object"]
+    mesh = bpy.data.meshes.new("outside")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0)], [], [(0, 1, 2)])
+    mesh.uv_layers.new(name="UVMap")
+    mesh.materials.append(selected.data.materials[0])
+    outside = bpy.data.objects.new("outside", mesh)
+    bpy.context.scene.collection.objects.link(outside)
+
+    pipeline.run_pipeline(bpy.context, 'SELECTED', [("preset_2024", {})])
+
+    assert selected.data.uv_layers.get("UVMap_Detail") is not None
+    assert outside.data.uv_layers.get("UVMap_Detail") is None
+
+
+def test_collected_meshes_are_shared_by_all_users(bpy, tmp_path):
+    obj = scenes.build_material_scene(2, str(tmp_path), "2024")["object"]
+    twin = bpy.data.objects.new("twin", obj.data)
+    bpy.context.scene.collection.objects.link(twin)
+
+    state = pipeline.collect_pipeline_state(bpy.context, 'SCENE')
+
+    assert {name: list(meshes) for name, meshes in state["meshes"].items()} == {
+        mat.name: [obj.data] for mat in obj.data.materials
+    }
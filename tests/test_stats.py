@@ -0,0 +1,56 @@
+"""
+Panel statistics: image files are only checked when they may have changed.
+"""
+
+import os
+
+import pytest
+
+from bleliza_utilities import stats
+
+
+@pytest.fixture
+def exists_calls(monkeypatch):
+    calls = []
+    real_exists = os.path.exists
+
+    def exists(path):
+        calls.append(path)
+        return real_exists(path)
+
+    monkeypatch.setattr(stats.os.path, "exists", exists)
+    return calls
+
+
+def _file_image(bpy, name, filepath):
+    image = bpy.data.images.new(name, 4, 4)
+    image.source = 'FILE'
+    image.filepath = filepath
+    return image
+
+
+def test_missing_files_are_checked_once_per_path(bpy, tmp_path, exists_calls):
+    stats._on_load_post()
+    present = tmp_path / "present.png"
+    present.write_bytes(b"")
+    _file_image(bpy, "present", str(present))
+    missing = _file_image(bpy, "missing", str(tmp_path / "missing.png"))
+
+    assert stats.compute(bpy.context)["missing_textures"] == 1
+    assert len(exists_calls) == 2
+
+    # Selection, transforms, frame changes...: no stat calls
+    stats.compute(bpy.context)
+    assert len(exists_calls) == 2
+
+    # A changed path is checked
+    other = tmp_path / "other.png"
+    other.write_bytes(b"")
+    missing.filepath = str(other)
+    assert stats.compute(bpy.context)["missing_textures"] == 0
+    assert exists_calls[2:] == [str(other)]
+
+    # Loading a file checks everything again
+    stats._on_load_post()
+    stats.compute(bpy.context)
+    assert len(exists_calls) == 5
@@ -0,0 +1,57 @@
+"""
+Texture resolution cap: capped sizes and all-or-nothing re-pointing.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from bleliza_utilities import core, operators
+
+LIMITS = {'BASE': 50, 'ORM': 50, 'NORMAL': 50, 'GROUND': 50}
+
+
+@pytest.mark.parametrize("size, limit, multiple, expected", [
+    ((4096, 2048), 2048, 1, (2048, 1024)),
+    ((1000, 600), 500, 1, (500, 300)),
+    ((100, 60), 50, 4, (48, 32)),
+    ((1000, 30), 512, 4, (512, 16)),
+    ((2000, 2), 50, 4, (48, 4)),
+    ((30, 20), 50, 4, (30, 20)),
+])
+def test_capped_size(size, limit, multiple, expected):
+    assert core.images.capped_size(*size, limit, multiple) == expected
+
+
+def _dds_material(bpy, folder, names):
+    rng = np.random.default_rng(0)
+    mat = bpy.data.materials.new("capped")
+    mat.use_nodes = True
+    for name, node_name in zip(names, ("Base Color Texture", "Normal Image")):
+        path = os.path.join(folder, name + ".dds")
+        core.dds.write_dds(path, rng.integers(0, 256, (60, 100, 4), dtype=np.uint8), "BC1")
+        node = mat.node_tree.nodes.new("ShaderNodeTexImage")
+        node.name = node_name
+        node.image = bpy.data.images.load(path)
+    return mat
+
+
+def test_cap_writes_block_aligned_dds(bpy, tmp_path):
+    mat = _dds_material(bpy, str(tmp_path), ["base"])
+
+    assert operators._cap_texture_resolution([mat], LIMITS, workers=1) == (1, 0)
+
+    image = mat.node_tree.nodes["Base Color Texture"].image
+    info = core.textures.read_image_header(bpy.path.abspath(image.filepath))
+    assert (info["width"], info["height"]) == (48, 32)
+
+
+def test_cap_switches_no_image_when_a_job_fails(bpy, tmp_path):
+    mat = _dds_material(bpy, str(tmp_path), ["base", "normal"])
+    paths = [image.filepath for image in bpy.data.images]
+    # The normal map's output path is taken by a directory
+    os.mkdir(tmp_path / "normal_max50.dds")
+
+    assert operators._cap_texture_resolution([mat], LIMITS, workers=1) == (0, 1)
+    assert [image.filepath for image in bpy.data.images] == paths